@@ -1,71 +1,133 @@
+import gzip
+import os
+import sys
+import time
+
 import requests
 import xmltodict
 import json
 
-def analyze_xml():
+from feed import DEFAULT_CACHE_DIR, FeedCache, StringPool, fetch_feed, iter_product_elements, product_from_element
+
+FEED_URL = os.environ.get('XML_FEED_URL', 'https://stildiva.sentos.com.tr/xml-sentos-out/1')
+
+
+def _print_first_product(first_product):
+    """İlk ürünün ve ilk varyantının detaylarını yazdırır"""
+    print("\n=== İLK ÜRÜN ANALİZİ ===")
+    print(f"Ürün ID: {first_product.get('id')}")
+    print(f"Ürün Adı: {first_product.get('urunismi')}")
+    print(f"Stok Kodu: {first_product.get('stok_kodu')}")
+    print(f"Kategori: {first_product.get('kategori_ismi')}")
+    print(f"Marka: {first_product.get('marka')}")
+    print(f"Stok: {first_product.get('stok')}")
+    print(f"Satış Fiyatı: {first_product.get('satis_fiyati')}")
+    print(f"İndirimli Fiyat: {first_product.get('indirimli_fiyat')}")
+    print(f"Alış Fiyatı: {first_product.get('alis_fiyati')}")
+
+    # Varyant analizi
+    print("\n=== VARYANT ANALİZİ ===")
+    if 'Varyantlar' in first_product and 'Varyant' in first_product['Varyantlar']:
+        variants = first_product['Varyantlar']['Varyant']
+        variant_count = len(variants) if isinstance(variants, list) else 1
+
+        print(f"Bu üründe {variant_count} varyant var")
+        print(f"Varyant İsimleri: {first_product.get('varyant_isimleri')}")
+        print(f"Renk İsimleri: {first_product.get('renk_isimleri')}")
+
+        # İlk varyantı detaylı göster
+        first_variant = variants[0] if isinstance(variants, list) else variants
+        print("\nİlk Varyant:")
+        print(f"- Varyant İsim: {first_variant.get('Varyant_isim')}")
+        print(f"- Varyant Değer: {first_variant.get('Varyant_deger')}")
+        print(f"- Renk: {first_variant.get('renk')}")
+        print(f"- Stok Kodu: {first_variant.get('stok_kodu')}")
+        print(f"- Barkod: {first_variant.get('barkod')}")
+        print(f"- Stok: {first_variant.get('stok')}")
+
+        if 'resimler' in first_variant and 'resim' in first_variant['resimler']:
+            images = first_variant['resimler']['resim']
+            image_count = len(images) if isinstance(images, list) else 1
+            print(f"- Resim Sayısı: {image_count}")
+            if isinstance(images, list):
+                print(f"- İlk Resim: {images[0]}")
+            else:
+                print(f"- Resim: {images}")
+
+
+def _print_summary_and_save(first_product, product_total, total_variants, samples, output_path, analytics=None):
+    """Toplam istatistikleri yazdırır ve özeti JSON olarak kaydeder.
+
+    samples: ilk 5 ürün için (id, urunismi, varyant_sayisi) listesi
+    analytics: verilirse (sütunlu mod) JSON'a "analytics" anahtarıyla eklenir
+    """
+    print("\n=== TOPLAM İSTATİSTİKLER ===")
+    print(f"Toplam Ürün: {product_total}")
+    print(f"Toplam Varyant: {total_variants}")
+    print(f"Ortalama Varyant/Ürün: {total_variants / product_total:.2f}")
+
+    # Birkaç ürünün varyant sayılarını göster
+    print("\n=== ÖRNEK ÜRÜNLER ===")
+    variant_count = 1
+    for i, (product_id, full_name, variant_count) in enumerate(samples):
+        full_name = full_name or ''
+        name = full_name[:30] + "..." if len(full_name) > 30 else full_name
+        print(f"Ürün {i+1}: ID={product_id}, Name=\"{name}\", Variants={variant_count}")
+
+    # XML yapısının özetini JSON olarak kaydet
+    sample_data = {
+        "xml_structure": {
+            "root": "Urunler",
+            "product_node": "Urun",
+            "total_products": product_total,
+            "total_variants": total_variants
+        },
+        "product_fields": list(first_product.keys()),
+        "variant_structure": first_product.get('Varyantlar', {}).get('Varyant', [{}])[0] if isinstance(first_product.get('Varyantlar', {}).get('Varyant', []), list) else first_product.get('Varyantlar', {}).get('Varyant', {}),
+        "sample_product": {
+            "id": first_product.get('id'),
+            "name": first_product.get('urunismi'),
+            "price": first_product.get('satis_fiyati'),
+            "stock": first_product.get('stok'),
+            "variants": variant_count if 'Varyantlar' in first_product else 0
+        }
+    }
+    if analytics is not None:
+        sample_data["analytics"] = analytics
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(sample_data, f, ensure_ascii=False, indent=2)
+
+    print("\n=== ANALİZ TAMAMLANDI ===")
+    print(f"Detaylı analiz {output_path} dosyasına kaydedildi.")
+
+
+def analyze_xml(url=FEED_URL, output_path='xml-analysis.json'):
     try:
         print("XML analizi başlıyor...")
-        
+
         # XML'i çek
-        response = requests.get('https://stildiva.sentos.com.tr/xml-sentos-out/1', timeout=30)
+        response = requests.get(url, timeout=30)
         response.encoding = 'utf-8'
-        
+
         print(f"XML boyutu: {len(response.text)} karakter")
-        
+
         # Parse et
         parsed = xmltodict.parse(response.text)
-        
+
         # Ürün yapısını analiz et
         products = parsed['Urunler']['Urun']
         product_count = len(products) if isinstance(products, list) else 1
         print(f"Toplam ürün sayısı: {product_count}")
-        
+
         # İlk ürünü detaylı analiz et
         first_product = products[0] if isinstance(products, list) else products
-        print("\n=== İLK ÜRÜN ANALİZİ ===")
-        print(f"Ürün ID: {first_product.get('id')}")
-        print(f"Ürün Adı: {first_product.get('urunismi')}")
-        print(f"Stok Kodu: {first_product.get('stok_kodu')}")
-        print(f"Kategori: {first_product.get('kategori_ismi')}")
-        print(f"Marka: {first_product.get('marka')}")
-        print(f"Stok: {first_product.get('stok')}")
-        print(f"Satış Fiyatı: {first_product.get('satis_fiyati')}")
-        print(f"İndirimli Fiyat: {first_product.get('indirimli_fiyat')}")
-        print(f"Alış Fiyatı: {first_product.get('alis_fiyati')}")
-        
-        # Varyant analizi
-        print("\n=== VARYANT ANALİZİ ===")
-        if 'Varyantlar' in first_product and 'Varyant' in first_product['Varyantlar']:
-            variants = first_product['Varyantlar']['Varyant']
-            variant_count = len(variants) if isinstance(variants, list) else 1
-            
-            print(f"Bu üründe {variant_count} varyant var")
-            print(f"Varyant İsimleri: {first_product.get('varyant_isimleri')}")
-            print(f"Renk İsimleri: {first_product.get('renk_isimleri')}")
-            
-            # İlk varyantı detaylı göster
-            first_variant = variants[0] if isinstance(variants, list) else variants
-            print("\nİlk Varyant:")
-            print(f"- Varyant İsim: {first_variant.get('Varyant_isim')}")
-            print(f"- Varyant Değer: {first_variant.get('Varyant_deger')}")
-            print(f"- Renk: {first_variant.get('renk')}")
-            print(f"- Stok Kodu: {first_variant.get('stok_kodu')}")
-            print(f"- Barkod: {first_variant.get('barkod')}")
-            print(f"- Stok: {first_variant.get('stok')}")
-            
-            if 'resimler' in first_variant and 'resim' in first_variant['resimler']:
-                images = first_variant['resimler']['resim']
-                image_count = len(images) if isinstance(images, list) else 1
-                print(f"- Resim Sayısı: {image_count}")
-                if isinstance(images, list):
-                    print(f"- İlk Resim: {images[0]}")
-                else:
-                    print(f"- Resim: {images}")
-        
+        _print_first_product(first_product)
+
         # Toplam varyant sayısını hesapla
         total_variants = 0
         product_array = products if isinstance(products, list) else [products]
-        
+
         for product in product_array:
             if 'Varyantlar' in product and 'Varyant' in product['Varyantlar']:
                 variants = product['Varyantlar']['Varyant']
@@ -73,52 +135,182 @@ def analyze_xml():
                 total_variants += variant_count
             else:
                 total_variants += 1  # Varyantı olmayan ürünler için 1
-        
-        print("\n=== TOPLAM İSTATİSTİKLER ===")
-        print(f"Toplam Ürün: {len(product_array)}")
-        print(f"Toplam Varyant: {total_variants}")
-        print(f"Ortalama Varyant/Ürün: {total_variants / len(product_array):.2f}")
-        
-        # Birkaç ürünün varyant sayılarını göster
-        print("\n=== ÖRNEK ÜRÜNLER ===")
+
+        samples = []
         for i in range(min(5, len(product_array))):
             product = product_array[i]
             variant_count = 1
-            
+
             if 'Varyantlar' in product and 'Varyant' in product['Varyantlar']:
                 variants = product['Varyantlar']['Varyant']
                 variant_count = len(variants) if isinstance(variants, list) else 1
-            
-            name = product.get('urunismi', '')[:30] + "..." if len(product.get('urunismi', '')) > 30 else product.get('urunismi', '')
-            print(f"Ürün {i+1}: ID={product.get('id')}, Name=\"{name}\", Variants={variant_count}")
-        
-        # XML yapısının özetini JSON olarak kaydet
-        sample_data = {
-            "xml_structure": {
-                "root": "Urunler",
-                "product_node": "Urun",
-                "total_products": len(product_array),
-                "total_variants": total_variants
-            },
-            "product_fields": list(first_product.keys()),
-            "variant_structure": first_product.get('Varyantlar', {}).get('Varyant', [{}])[0] if isinstance(first_product.get('Varyantlar', {}).get('Varyant', []), list) else first_product.get('Varyantlar', {}).get('Varyant', {}),
-            "sample_product": {
-                "id": first_product.get('id'),
-                "name": first_product.get('urunismi'),
-                "price": first_product.get('satis_fiyati'),
-                "stock": first_product.get('stok'),
-                "variants": variant_count if 'Varyantlar' in first_product else 0
-            }
-        }
-        
-        with open('xml-analysis.json', 'w', encoding='utf-8') as f:
-            json.dump(sample_data, f, ensure_ascii=False, indent=2)
-        
-        print("\n=== ANALİZ TAMAMLANDI ===")
-        print("Detaylı analiz xml-analysis.json dosyasına kaydedildi.")
-        
+
+            samples.append((product.get('id'), product.get('urunismi', ''), variant_count))
+
+        _print_summary_and_save(first_product, len(product_array), total_variants, samples, output_path)
+
     except Exception as error:
         print(f"Hata: {error}")
 
+
+def _element_to_dict(element):
+    """Bir XML elementini xmltodict ile aynı biçimde sözlüğe çevirir.
+
+    Boş elementler None, sadece metin içerenler string, tekrar eden
+    alt elementler liste olur. Sentos feed'inde attribute kullanılmadığı
+    için attribute'lar yok sayılır.
+    """
+    children = list(element)
+    if not children:
+        text = (element.text or '').strip()
+        return text or None
+
+    result = {}
+    for child in children:
+        value = _element_to_dict(child)
+        if child.tag in result:
+            if not isinstance(result[child.tag], list):
+                result[child.tag] = [result[child.tag]]
+            result[child.tag].append(value)
+        else:
+            result[child.tag] = value
+    return result
+
+
+def _print_analytics(analytics, elapsed_ms):
+    """Sütunlu modun özetini yazdırır"""
+    price = analytics['price']
+    print("\n=== SÜTUNLU ANALİZ ===")
+    print(f"Toplam Stok: {analytics['stock_total']} (stoksuz ürün: {analytics['out_of_stock_products']})")
+    print(f"Fiyat: min {price['min']}, medyan {price['percentiles'].get('p50')}, max {price['max']} "
+          f"(fiyatsız ürün: {price['zero_price_products']})")
+    print(f"Sıfır stoklu varyant: {analytics['zero_stock_variants']} (%{analytics['zero_stock_ratio'] * 100:.1f})")
+    print(f"Barkodsuz varyant: {analytics['missing_barcode_variants']}")
+    for row in analytics['by_category'][:5]:
+        print(f"- {row['category'] or '(kategorisiz)'}: {row['products']} ürün, {row['stock']} stok, "
+              f"medyan fiyat {row['median_price']}")
+    print(f"Hesaplama süresi: {elapsed_ms:.1f} ms")
+
+
+def _analyze_product_stream(source, output_path, columnar=False):
+    """Binary XML akışındaki ürünleri tek tek işleyip raporu üretir.
+
+    columnar=True ise ürünler aynı geçişte sütunlara da yazılır ve vektörel
+    istatistikler (feed.columnar) JSON çıktısına eklenir.
+    """
+    builder = None
+    if columnar:
+        from feed.columnar import ColumnBuilder
+        builder = ColumnBuilder()
+    pool = StringPool()
+    first_product = None
+    product_total = 0
+    total_variants = 0
+    samples = []
+
+    for element in iter_product_elements(source):
+        if first_product is None:
+            first_product = _element_to_dict(element)
+            _print_first_product(first_product)
+
+        product = product_from_element(element, pool)
+        if builder is not None:
+            builder.add(product)
+        total_variants += product.variant_count
+        if len(samples) < 5:
+            samples.append((product.id or None, product.name, product.variant_count))
+        product_total += 1
+
+    if first_product is None:
+        raise ValueError("XML dosyasında ürün bulunamadı")
+
+    print(f"Toplam ürün sayısı: {product_total}")
+    analytics = None
+    if builder is not None:
+        from feed.columnar import feed_analytics
+        start = time.perf_counter()
+        analytics = feed_analytics(builder.build())
+        _print_analytics(analytics, (time.perf_counter() - start) * 1000)
+    _print_summary_and_save(first_product, product_total, total_variants, samples, output_path, analytics)
+
+
+def analyze_xml_stream(url=FEED_URL, output_path='xml-analysis.json', cache_dir=None, columnar=False):
+    """analyze_xml ile aynı analizi, feed'i parça parça okuyarak yapar.
+
+    Yanıt gövdesi bellekte tutulmaz; ürünler iterparse ile sırayla işlenip
+    bırakıldığı için bellek kullanımı feed boyutundan bağımsızdır. cache_dir
+    verilirse feed koşullu indirilir ve değişmediyse diskteki kopya okunur.
+    columnar=True kategori, fiyat ve stok istatistiklerini de hesaplar (NumPy gerekir).
+    """
+    try:
+        print("XML analizi başlıyor (stream modu)...")
+
+        if cache_dir:
+            result = fetch_feed(url, cache_dir=cache_dir, parse=False)
+            print(f"Feed önbelleği: {result.status} ({result.body_path})")
+            with gzip.open(result.body_path, 'rb') as source:
+                _analyze_product_stream(source, output_path, columnar)
+            return
+
+        with requests.get(url, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            # gzip/deflate aktarım kodlamasını urllib3 çözsün
+            response.raw.decode_content = True
+            _analyze_product_stream(response.raw, output_path, columnar)
+            print(f"XML boyutu: {response.raw.tell()} bayt")
+
+    except Exception as error:
+        print(f"Hata: {error}")
+
+
+def analyze_snapshot(url=FEED_URL, output_path='xml-analysis.json', cache_dir=DEFAULT_CACHE_DIR):
+    """Sunucunun (api.js / feedCache.ts) diske yazdığı parse edilmiş anlık görüntüyü okur.
+
+    Feed indirilmez ve parse edilmez; istatistikler anlık görüntüde hazırdır.
+    Anlık görüntü yoksa önbellekli stream moduna düşer.
+    """
+    cache = FeedCache(cache_dir)
+    snapshot = cache.read_snapshot(url)
+    if snapshot is None:
+        print(f"Anlık görüntü bulunamadı ({cache.snapshot_path(url)}), feed indirilecek...")
+        analyze_xml_stream(url, output_path, cache_dir=cache_dir)
+        return
+    try:
+        stats = snapshot['stats']
+        age_min = (time.time() * 1000 - snapshot['fetchedAt']) / 60000
+        print(f"XML analizi anlık görüntüden ({cache.snapshot_path(url)}, {age_min:.1f} dk önce alındı)")
+        if not snapshot['products']:
+            raise ValueError("Anlık görüntüde ürün yok")
+        _print_first_product(snapshot['products'][0])
+        print(f"Toplam ürün sayısı: {stats['productCount']}")
+        print(f"Toplam stok: {stats['totalStock']}, kategori sayısı: {stats['categoryCount']}")
+        samples = [(s['id'], s['name'], s['variants']) for s in stats['samples']]
+        _print_summary_and_save(snapshot['products'][0], stats['productCount'], stats['variantCount'],
+                                samples, output_path)
+    except Exception as error:
+        print(f"Hata: {error}")
+
+
+def _feed_urls(argv):
+    """--url birden çok kez verilebilir; verilmezse XML_FEED_URL / varsayılan feed"""
+    urls = [argv[i + 1] for i, arg in enumerate(argv[:-1]) if arg == '--url']
+    return urls or [FEED_URL]
+
+
 if __name__ == "__main__":
-    analyze_xml()
+    args = sys.argv[1:]
+    columnar = '--columnar' in args
+    urls = _feed_urls(args)
+    for index, url in enumerate(urls):
+        # Birden çok feed'de her biri ayrı dosyaya: xml-analysis-1.json, xml-analysis-2.json, ...
+        output_path = 'xml-analysis.json' if len(urls) == 1 else f'xml-analysis-{index + 1}.json'
+        if len(urls) > 1:
+            print(f"\n##### {url} #####")
+        if '--snapshot' in args:
+            analyze_snapshot(url, output_path)
+        elif '--cache' in args:
+            analyze_xml_stream(url, output_path, cache_dir=DEFAULT_CACHE_DIR, columnar=columnar)
+        elif '--stream' in args or columnar:
+            analyze_xml_stream(url, output_path, columnar=columnar)
+        else:
+            analyze_xml(url, output_path)
@@ -0,0 +1,139 @@
+"""analyze_xml ile analyze_xml_stream'i tepe bellek (RSS) ve süre açısından karşılaştırır.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.analyze_xml_bench --products 1623 --products 16230
+
+Her ölçüm ayrı bir alt süreçte çalışır; tepe RSS os.wait4 ile o sürece
+özel okunur. Feed, yerel bir HTTP sunucusundan servis edilen sentetik bir
+Sentos XML'idir.
+"""
+import argparse
+import filecmp
+import functools
+import http.server
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DESCRIPTION = (
+    "<p>Büyük Beden Cepli Bol Kesim Likralı Jarse Pantolon</p>"
+    "<ul>" + "<li><p><strong>Kumaş İçeriği:</strong> %95 Viskoz, %5 Elastan</p></li>" * 20 + "</ul>"
+)
+CATEGORY = 'Giyim > Büyük Beden > Alt Giyim > Pantolon'
+SIZES = ['40', '42', '44', '46', '48', '50 - 52', '54 - 56']
+
+
+def write_synthetic_feed(path, product_count, variants_per_product=6, categories=(CATEGORY,)):
+    """Gerçek feed ile aynı yapıda (Urunler/Urun/Varyantlar) sentetik XML yazar.
+
+    categories verilirse ürünler bu kategorilere sırayla dağıtılır.
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n<Urunler>\n')
+        for i in range(product_count):
+            product_id = 1000 + i
+            f.write(
+                f"  <Urun>\n"
+                f"    <id>{product_id}</id>\n"
+                f"    <stok_kodu><![CDATA[{product_id}Siyah]]></stok_kodu>\n"
+                f"    <barkod/>\n"
+                f"    <kategori_id>33</kategori_id>\n"
+                f"    <kategori_ismi><![CDATA[{categories[i % len(categories)]}]]></kategori_ismi>\n"
+                f"    <urunismi><![CDATA[Büyük Beden Likralı Jarse Pantolon {product_id}]]></urunismi>\n"
+                f"    <detayaciklama><![CDATA[{DESCRIPTION}]]></detayaciklama>\n"
+                f"    <stok>{i % 300}</stok>\n"
+                f"    <marka><![CDATA[Stil Diva]]></marka>\n"
+                f"    <alis_fiyati>190,00</alis_fiyati>\n"
+                f"    <satis_fiyati>0,00</satis_fiyati>\n"
+                f"    <indirimli_fiyat>0,00</indirimli_fiyat>\n"
+                f"    <renk_isimleri><![CDATA[Siyah]]></renk_isimleri>\n"
+                f"    <resimler/>\n"
+                f"    <Varyantlar>\n"
+            )
+            for v in range(variants_per_product):
+                size = SIZES[v % len(SIZES)]
+                f.write(
+                    f"      <Varyant>\n"
+                    f"        <Varyant_isim><![CDATA[Beden]]></Varyant_isim>\n"
+                    f"        <Varyant_deger><![CDATA[{size}]]></Varyant_deger>\n"
+                    f"        <renk><![CDATA[Siyah]]></renk>\n"
+                    f"        <stok_kodu><![CDATA[{product_id}Siyah-{v}]]></stok_kodu>\n"
+                    f"        <barkod><![CDATA[{product_id}-SYH-{v}]]></barkod>\n"
+                    f"        <stok>{(i + v) % 7}</stok>\n"
+                    f"        <resimler>\n"
+                    f"          <resim>https://stildiva.sentos.com.tr/urunres/{product_id}-1.jpg</resim>\n"
+                    f"          <resim>https://stildiva.sentos.com.tr/urunres/{product_id}-2.jpg</resim>\n"
+                    f"        </resimler>\n"
+                    f"      </Varyant>\n"
+                )
+            f.write("    </Varyantlar>\n  </Urun>\n")
+        f.write('</Urunler>\n')
+
+
+def serve_directory(directory):
+    """Dizini arka planda yerel HTTP üzerinden servis eder, (sunucu, base_url) döndürür"""
+    handler = functools.partial(_QuietHandler, directory=directory)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def measure(function_name, url, output_path):
+    """Analizi ayrı bir süreçte çalıştırır, (süre_sn, tepe_rss_mb) döndürür"""
+    code = (
+        "import analyze_xml; "
+        f"analyze_xml.{function_name}({url!r}, {output_path!r})"
+    )
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-c', code], cwd=ROOT, stdout=subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise RuntimeError(f"{function_name} başarısız oldu (çıkış kodu {process.returncode})")
+    # Linux'ta ru_maxrss KB cinsindendir
+    return elapsed, usage.ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, action='append',
+                        help="Sentetik feed'deki ürün sayısı (birden çok verilebilir)")
+    parser.add_argument('--variants', type=int, default=6, help="Ürün başına varyant sayısı")
+    args = parser.parse_args()
+    sizes = args.products or [1623, 16230]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        server, base_url = serve_directory(workdir)
+        try:
+            print(f"{'ürün':>8} {'feed MB':>8} {'mod':>8} {'süre sn':>9} {'tepe RSS MB':>12}")
+            for product_count in sizes:
+                feed_name = f"feed-{product_count}.xml"
+                feed_path = os.path.join(workdir, feed_name)
+                write_synthetic_feed(feed_path, product_count, args.variants)
+                feed_mb = os.path.getsize(feed_path) / (1024 * 1024)
+
+                outputs = {}
+                for mode, function_name in (('dict', 'analyze_xml'), ('stream', 'analyze_xml_stream')):
+                    outputs[mode] = os.path.join(workdir, f"analysis-{mode}-{product_count}.json")
+                    elapsed, peak_mb = measure(function_name, f"{base_url}/{feed_name}", outputs[mode])
+                    print(f"{product_count:>8} {feed_mb:>8.1f} {mode:>8} {elapsed:>9.2f} {peak_mb:>12.1f}")
+
+                if not filecmp.cmp(outputs['dict'], outputs['stream'], shallow=False):
+                    print(f"UYARI: {product_count} ürün için iki modun JSON çıktısı farklı!")
+        finally:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
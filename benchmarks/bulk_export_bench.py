@@ -0,0 +1,103 @@
+"""Sayfalı GraphQL ürün çekimi ile bulk export'u sahte Shopify'a karşı karşılaştırır.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.bulk_export_bench --products 1600 --variants 12
+
+Mağaza, ürün başına --variants varyantla doldurulur. Sayfalı mod
+shopifyService.ts'teki eski sorguyu (products(first: 50) / variants(first: 10))
+birebir çalıştırır; bulk mod tek bir bulkOperationRunQuery işi başlatıp JSONL
+sonucunu yerel sunucudan akış olarak okur. İstek sayısı, süre, THROTTLED
+sayısı ve kesilen (indekse girmeyen) varyant sayısı raporlanır.
+"""
+import argparse
+import asyncio
+import time
+
+from shopify_tools import MockShopify, ShopifyClient
+from shopify_tools.bulk import export_store_snapshot
+
+ACCESS_TOKEN = 'shpat_mock'
+
+PAGINATED_QUERY = """
+query getAllProducts($cursor: String) {
+  products(first: 50, after: $cursor) {
+    pageInfo { hasNextPage endCursor }
+    edges {
+      node {
+        id
+        handle
+        title
+        variants(first: 10) { edges { node { id sku price compareAtPrice } } }
+      }
+    }
+  }
+}
+"""
+
+
+def seed_store(shop, product_count, variants_per_product):
+    for i in range(product_count):
+        product_id = 1000 + i
+        shop.create_product({
+            'title': f"Büyük Beden Likralı Jarse Pantolon {product_id}",
+            'vendor': 'Stil Diva',
+            'variants': [
+                {'sku': f"{product_id}Siyah-{v}", 'price': '285.00', 'inventory_quantity': v, 'option1': str(40 + 2 * v)}
+                for v in range(variants_per_product)
+            ],
+        })
+
+
+async def fetch_paginated(client):
+    sku_index = {}
+    cursor = None
+    while True:
+        data = await client.graphql(PAGINATED_QUERY, {'cursor': cursor})
+        products = data['products']
+        for edge in products['edges']:
+            for variant_edge in edge['node']['variants']['edges']:
+                sku_index.setdefault(variant_edge['node']['sku'], variant_edge['node']['id'])
+        if not products['pageInfo']['hasNextPage']:
+            return sku_index
+        cursor = products['pageInfo']['endCursor']
+
+
+async def fetch_bulk(client):
+    snapshot = await export_store_snapshot(client)
+    return snapshot.sku_index
+
+
+def run(mode, shop, expected_variants):
+    shop.reset_stats()
+    start = time.perf_counter()
+
+    async def main():
+        async with ShopifyClient(shop.base_url, ACCESS_TOKEN) as client:
+            index = await (fetch_bulk(client) if mode == 'bulk' else fetch_paginated(client))
+            return index, client.retry_count
+
+    sku_index, retries = asyncio.run(main())
+    elapsed = time.perf_counter() - start
+    requests_made = shop.stats()['requests']
+    print(f"{mode:>10} {requests_made:>8} {retries:>10} {elapsed:>8.2f} {len(sku_index):>8} "
+          f"{expected_variants - len(sku_index):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, default=1600, help="Mağazadaki ürün sayısı")
+    parser.add_argument('--variants', type=int, default=12, help="Ürün başına varyant sayısı")
+    parser.add_argument('--latency', type=float, default=0.05, help="Sahte Shopify yanıt gecikmesi (sn)")
+    parser.add_argument('--bulk-duration', type=float, default=2.0, help="Sahte bulk işinin süresi (sn)")
+    args = parser.parse_args()
+
+    with MockShopify(latency=args.latency, bulk_duration=args.bulk_duration) as shop:
+        seed_store(shop, args.products, args.variants)
+        expected = args.products * args.variants
+        print(f"{'mod':>10} {'istek':>8} {'yeniden':>10} {'süre sn':>8} {'SKU':>8} {'eksik':>8}")
+        for mode in ('paginated', 'bulk'):
+            run(mode, shop, expected)
+
+
+if __name__ == "__main__":
+    main()
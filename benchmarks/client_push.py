@@ -0,0 +1,93 @@
+"""ShopifyClient ile katalog yüklemesini sahte Shopify'a karşı ölçer.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.client_push --products 400 --leak-rate 2
+
+Sentetik feed'deki her ürün için bir POST products.json gönderilir. Adaptif
+limiter ile (kovanın izin verdiği en yüksek hız) sabit beklemeli sıralı
+gönderim (api.js'teki eski 30 ms / her 20 üründe 1 sn düzeni) karşılaştırılır.
+Teorik üst sınır bucket_size + leak_rate * süre kadar istektir.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from feed import load_products
+from shopify_tools import MockShopify, ShopifyClient
+
+from .analyze_xml_bench import write_synthetic_feed
+
+ACCESS_TOKEN = 'shpat_mock'
+
+
+def product_payload(product):
+    return {'product': {
+        'title': product.name,
+        'vendor': product.brand,
+        'status': 'draft',
+        'variants': [{'sku': product.sku, 'price': f"{product.price:.2f}", 'inventory_quantity': product.stock}],
+    }}
+
+
+async def push_adaptive(shop, products, max_concurrency):
+    async with ShopifyClient(shop.base_url, ACCESS_TOKEN, max_concurrency=max_concurrency,
+                             bucket_size=shop.rest_bucket.size, leak_rate=shop.rest_bucket.leak_rate) as client:
+        async def push(client, product):
+            return await client.post('products.json', json=product_payload(product))
+
+        results = await client.map(push, products)
+    return sum(1 for result in results if isinstance(result, Exception))
+
+
+async def push_fixed_sleep(shop, products):
+    async with ShopifyClient(shop.base_url, ACCESS_TOKEN, max_concurrency=1, max_retries=0) as client:
+        errors = 0
+        for index, product in enumerate(products):
+            try:
+                await client.post('products.json', json=product_payload(product))
+            except Exception:
+                errors += 1
+            await asyncio.sleep(1.0 if (index + 1) % 20 == 0 else 0.03)
+    return errors
+
+
+def run(mode, products, args):
+    with MockShopify(latency=args.latency, rest_bucket_size=args.bucket_size,
+                     rest_leak_rate=args.leak_rate) as shop:
+        start = time.perf_counter()
+        if mode == 'adaptive':
+            errors = asyncio.run(push_adaptive(shop, products, args.concurrency))
+        else:
+            errors = asyncio.run(push_fixed_sleep(shop, products))
+        elapsed = time.perf_counter() - start
+        stats = shop.stats()
+        created = len(shop.products)
+    print(f"{mode:>10} {created:>8} {errors:>6} {elapsed:>8.1f} {created / elapsed:>8.2f} "
+          f"{stats['throttled']:>6} {stats['p50'] * 1000:>8.1f} {stats['p99'] * 1000:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, default=400, help="Gönderilecek ürün sayısı")
+    parser.add_argument('--latency', type=float, default=0.05, help="Sahte Shopify yanıt gecikmesi (sn)")
+    parser.add_argument('--bucket-size', type=int, default=40, help="REST kova kapasitesi")
+    parser.add_argument('--leak-rate', type=float, default=2.0, help="REST kova boşalma hızı (istek/sn)")
+    parser.add_argument('--concurrency', type=int, default=20, help="Adaptif modda en fazla eşzamanlı istek")
+    parser.add_argument('--mode', choices=['adaptive', 'fixed'], action='append',
+                        help="Çalıştırılacak mod (varsayılan: ikisi de)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        feed_path = os.path.join(workdir, 'feed.xml')
+        write_synthetic_feed(feed_path, args.products, 1)
+        products = load_products(feed_path)
+
+    print(f"{'mod':>10} {'oluşan':>8} {'hata':>6} {'süre sn':>8} {'ürün/sn':>8} {'429':>6} {'p50 ms':>8} {'p99 ms':>8}")
+    for mode in args.mode or ['adaptive', 'fixed']:
+        run(mode, products, args)
+
+
+if __name__ == "__main__":
+    main()
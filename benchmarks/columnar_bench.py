@@ -0,0 +1,107 @@
+"""analyze_xml --columnar istatistiklerini Python döngüsüyle hesaplamaya karşı ölçer.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.columnar_bench --products 1623 --products 16230
+
+Feed bir kez FeedProduct listesine yüklenir; aynı istatistikler (kategori
+kırılımı, fiyat yüzdelikleri, sıfır stok ve barkodsuz varyant sayıları)
+önce ürünler üzerinde dict/list döngüsüyle, sonra sütunlara çevrilip
+feed_analytics ile hesaplanır. İki sonucun tutarlılığı da kontrol edilir.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from feed import load_products
+from feed.columnar import FeedColumns, feed_analytics
+
+from .analyze_xml_bench import write_synthetic_feed
+
+CATEGORIES = [
+    'Giyim > Büyük Beden > Alt Giyim > Pantolon',
+    'Giyim > Büyük Beden > Üst Giyim > Bluz',
+    'Giyim > Büyük Beden > Elbise',
+    'Giyim > Büyük Beden > Dış Giyim > Ceket',
+    'Giyim > Büyük Beden > Alt Giyim > Etek',
+]
+
+
+def python_analytics(products):
+    """feed_analytics'in temel alanlarını ürün listesi üzerinde döngüyle hesaplar"""
+    by_category = {}
+    prices = []
+    zero_stock = missing_barcode = variants = stock_total = 0
+    for product in products:
+        price = product.price if product.price > 0 else product.purchase_price
+        if price > 0:
+            prices.append(price)
+        stock = sum(v.stock for v in product.variants) if product.variants else product.stock
+        stock_total += stock
+        row = by_category.setdefault(product.category, {'products': 0, 'stock': 0, 'zero_stock_variants': 0,
+                                                        'prices': []})
+        row['products'] += 1
+        row['stock'] += stock
+        row['prices'].append(price)
+        for variant in product.variants:
+            variants += 1
+            if variant.stock <= 0:
+                zero_stock += 1
+                row['zero_stock_variants'] += 1
+            if not variant.barcode:
+                missing_barcode += 1
+    quantiles = statistics.quantiles(prices, n=100, method='inclusive') if len(prices) > 1 else prices
+    return {
+        'stock_total': stock_total,
+        'zero_stock_variants': zero_stock,
+        'missing_barcode_variants': missing_barcode,
+        'p50': round(quantiles[49], 2) if quantiles else None,
+        'by_category': {name: (row['products'], row['stock'], row['zero_stock_variants'],
+                               round(statistics.median(row['prices']), 2))
+                        for name, row in by_category.items()},
+    }
+
+
+def _timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, action='append', help="Sentetik feed'deki ürün sayısı")
+    parser.add_argument('--variants', type=int, default=6)
+    args = parser.parse_args()
+    sizes = args.products or [1623, 16230]
+
+    print(f"{'ürün':>8} {'varyant':>8} {'yükleme sn':>11} {'sütun ms':>9} {'döngü ms':>9} {'vektör ms':>10}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for product_count in sizes:
+            feed_path = os.path.join(workdir, f"feed-{product_count}.xml")
+            write_synthetic_feed(feed_path, product_count, args.variants, CATEGORIES)
+
+            products, load_ms = _timed(load_products, feed_path)
+            columns, build_ms = _timed(FeedColumns.from_products, products)
+            expected, loop_ms = _timed(python_analytics, products)
+            analytics, vector_ms = _timed(feed_analytics, columns)
+
+            print(f"{product_count:>8} {len(columns.variant_stock):>8} {load_ms / 1000:>11.2f} "
+                  f"{build_ms:>9.1f} {loop_ms:>9.1f} {vector_ms:>10.1f}")
+
+            actual = {
+                'stock_total': analytics['stock_total'],
+                'zero_stock_variants': analytics['zero_stock_variants'],
+                'missing_barcode_variants': analytics['missing_barcode_variants'],
+                'p50': analytics['price']['percentiles']['p50'],
+                'by_category': {row['category']: (row['products'], row['stock'], row['zero_stock_variants'],
+                                                  row['median_price'])
+                                for row in analytics['by_category']},
+            }
+            if actual != expected:
+                print(f"UYARI: {product_count} ürün için döngü ve vektör sonuçları farklı!")
+
+
+if __name__ == "__main__":
+    main()
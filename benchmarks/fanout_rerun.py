@@ -0,0 +1,136 @@
+"""Fan-out senkronizasyonunun tekrar çalıştırmada yazma yapmadığını ölçer.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.fanout_rerun --feeds 2 --stores 2 --products 20
+
+Her feed için sentetik bir Sentos feed'i yerel HTTP'den servis edilir, her mağaza için ayrı bir
+MockShopify başlatılır ve POST /api/sync/fanout iki kez (restart: true) çağrılır. İlk çalıştırma
+ürünleri oluşturur; ikincisi parmak izleri (metafield) sayesinde hiçbir REST yazması (POST/PUT)
+yapmamalıdır. Mağaza başına sayımlar ve yazmalar raporlanır, ikinci çalıştırma yazarsa çıkış kodu 1'dir.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import requests
+
+from shopify_tools import MockShopify
+
+from .analyze_xml_bench import serve_directory, write_synthetic_feed
+from .sync_load import start_function_server
+
+ACCESS_TOKEN = 'shpat_mock'
+WRITE_METHODS = ('POST', 'PUT', 'DELETE')
+
+
+def _writes(shop):
+    """GraphQL dışındaki yazma rotaları: {rota: istek sayısı}"""
+    return {route: entry['count'] for route, entry in shop.stats()['routes'].items()
+            if route.split(' ', 1)[0] in WRITE_METHODS and 'graphql' not in route}
+
+
+def _run_fanout(function_base, plan, max_calls=50):
+    """Fan-out'u done olana kadar fanoutId ve resumeToken ile tekrar çağırır"""
+    payload = dict(plan, restart=True)
+    for _ in range(max_calls):
+        response = requests.post(f"{function_base}/api/sync/fanout", json=payload, timeout=None)
+        data = response.json()
+        if not data.get('success') or data.get('done'):
+            return data
+        payload = dict(plan, fanoutId=data['fanoutId'], resumeToken=data.get('resumeToken'))
+    raise RuntimeError(f"Fan-out {max_calls} çağrıda bitmedi")
+
+
+def run_rerun(feed_count, store_count, product_count, variants, latency, runs=2):
+    with tempfile.TemporaryDirectory() as workdir:
+        feed_names = [f"feed{i}.xml" for i in range(feed_count)]
+        for i, name in enumerate(feed_names):
+            # Feed'ler farklı ürünler içersin diye her birinin boyutu farklı
+            write_synthetic_feed(os.path.join(workdir, name), product_count + i * 5, variants)
+        feed_server, feed_base = serve_directory(workdir)
+        shops = [MockShopify(latency=latency, access_token=ACCESS_TOKEN,
+                             rest_bucket_size=400, rest_leak_rate=200) for _ in range(store_count)]
+        for shop in shops:
+            shop.start()
+        env = dict(os.environ,
+                   FEED_CACHE_DIR=os.path.join(workdir, 'feed-cache'),
+                   SYNC_JOB_DIR=os.path.join(workdir, 'sync-jobs'))
+        function_process, function_base = start_function_server(env=env)
+        plan = {
+            'feeds': [f"{feed_base}/{name}" for name in feed_names],
+            'stores': [{'shopUrl': shop.base_url, 'accessToken': ACCESS_TOKEN} for shop in shops],
+        }
+        reports = []
+        try:
+            for run in range(runs):
+                for shop in shops:
+                    shop.reset_stats()
+                start = time.perf_counter()
+                data = _run_fanout(function_base, plan)
+                elapsed = time.perf_counter() - start
+                stores = []
+                for shop, store in zip(shops, data.get('stores') or []):
+                    counts = {'created': 0, 'updated': 0, 'unchanged': 0, 'errors': 0}
+                    for feed in store.get('feeds') or []:
+                        for key in counts:
+                            counts[key] += feed['counts'].get(key, 0)
+                    stores.append({
+                        'shop': shop.base_url,
+                        'fingerprints': store.get('fingerprints'),
+                        'error': store.get('error'),
+                        'counts': counts,
+                        'writes': _writes(shop),
+                    })
+                reports.append({
+                    'run': run + 1,
+                    'success': data.get('success'),
+                    'message': data.get('message'),
+                    'seconds': round(elapsed, 3),
+                    'stores': stores,
+                })
+        finally:
+            function_process.terminate()
+            function_process.wait()
+            for shop in shops:
+                shop.stop()
+            feed_server.shutdown()
+    return reports
+
+
+def print_report(reports):
+    for report in reports:
+        print(f"Çalıştırma {report['run']} ({report['seconds']:.2f} sn, success={report['success']})")
+        if not report['success']:
+            print(f"  {report['message']}")
+        for store in report['stores']:
+            counts = store['counts']
+            writes = ', '.join(f"{route}: {count}" for route, count in store['writes'].items()) or 'yok'
+            print(f"  {store['shop']}: {counts['created']} oluşturuldu, {counts['updated']} güncellendi, "
+                  f"{counts['unchanged']} değişmedi, {counts['errors']} hata "
+                  f"(parmak izi: {store['fingerprints']}){' - ' + store['error'] if store['error'] else ''}")
+            print(f"    yazmalar: {writes}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--feeds', type=int, default=2, help="Feed sayısı")
+    parser.add_argument('--stores', type=int, default=2, help="Sahte mağaza sayısı")
+    parser.add_argument('--products', type=int, default=20, help="İlk feed'deki ürün sayısı")
+    parser.add_argument('--variants', type=int, default=2, help="Ürün başına varyant sayısı")
+    parser.add_argument('--latency', type=float, default=0.0, help="Sahte Shopify yanıt gecikmesi (sn)")
+    args = parser.parse_args()
+
+    reports = run_rerun(args.feeds, args.stores, args.products, args.variants, args.latency)
+    print_report(reports)
+    rerun = reports[-1]
+    rerun_writes = sum(sum(store['writes'].values()) for store in rerun['stores'])
+    if not rerun['success'] or rerun_writes:
+        print(f"\n❌ Tekrar çalıştırma {rerun_writes} yazma yaptı" if rerun['success'] else "\n❌ Tekrar çalıştırma başarısız")
+        sys.exit(1)
+    print("\n✅ Tekrar çalıştırma hiçbir ürün yazmadı")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""xmltodict sözlük ağacı ile feed.load_products modelinin bellek/süre karşılaştırması.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.feed_model_bench --products 1623
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import xmltodict
+
+from feed import load_products
+
+from .analyze_xml_bench import write_synthetic_feed
+
+
+def _measure(label, load):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = load()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:>10} {elapsed:>9.2f} {current / (1024 * 1024):>12.1f}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, default=1623)
+    parser.add_argument('--variants', type=int, default=6)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        feed_path = os.path.join(workdir, 'feed.xml')
+        write_synthetic_feed(feed_path, args.products, args.variants)
+
+        def load_dict():
+            with open(feed_path, 'rb') as f:
+                return xmltodict.parse(f)
+
+        print(f"{'yöntem':>10} {'süre sn':>9} {'tutulan MB':>12}")
+        parsed = _measure('xmltodict', load_dict)
+        del parsed
+        products = _measure('model', lambda: load_products(feed_path))
+        print(f"{len(products)} ürün, {sum(len(p.variants) for p in products)} varyant")
+
+
+if __name__ == "__main__":
+    main()
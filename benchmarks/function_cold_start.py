@@ -0,0 +1,182 @@
+"""Netlify function'larının soğuk başlangıç ve ilk istek süresi.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.function_cold_start --runs 15 --ref HEAD~1
+
+Her ölçüm yeni bir node sürecinde yapılır: function modülünün require süresi
+(soğuk başlangıç), ardından tek bir uç noktaya ilk istek (/config, /xml/stats
+ya da /sync/fanout) ve süreçte yüklü modül sayısı. Ayrı paketlenen function'lar
+(ağaçta varsa functions/fanout.js, eski ağaçlarda functions/xml.js) kendi
+uç noktalarıyla ayrıca ölçülür. /sync/fanout boş gövdeyle çağrılır (400):
+ölçülen, fan-out modüllerinin yüklenmesi ve doğrulamadır. /xml/stats'ın feed adresi sabit
+olduğundan, sentetik feed'in parse edilmiş anlık görüntüsü o adres için
+FEED_CACHE_DIR'e önceden yazılır (ağa çıkılmaz; istek anlık görüntüyü diskten
+okur). --ref verilirse aynı ölçüm o revizyonun netlify/ dizini üzerinde de
+yapılır ve iki ağaç yan yana raporlanır.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import tarfile
+import tempfile
+import time
+
+from .analyze_xml_bench import ROOT, serve_directory, write_synthetic_feed
+
+# /xml/stats'ın (netlify/lib/routes/xml.js) okuduğu sabit feed
+DEFAULT_FEED_URL = 'https://stildiva.sentos.com.tr/xml-sentos-out/1'
+
+# Anlık görüntüyü ağacın kendi feedSnapshot.js'i ile yerel feed'den üretir ve
+# varsayılan feed adresi için diske yazar
+SEED_SCRIPT = r"""
+const fs = require('fs');
+const zlib = require('zlib');
+const [tree, localUrl, targetUrl] = process.argv.slice(1);
+const { getFeedSnapshot, snapshotPath } = require(tree + '/netlify/lib/feedSnapshot');
+getFeedSnapshot(localUrl).then(snapshot => {
+  const { source, ...stored } = snapshot;
+  stored.url = targetUrl;
+  stored.fetchedAt = Date.now();
+  fs.writeFileSync(snapshotPath(targetUrl), zlib.gzipSync(JSON.stringify(stored)));
+  console.log(snapshot.products.length);
+}).catch(error => { console.error(error.message); process.exit(1); });
+"""
+
+MEASURE_SCRIPT = r"""
+const [functionPath, method, requestPath] = process.argv.slice(1);
+const ms = (from, to) => Number(to - from) / 1e6;
+const started = process.hrtime.bigint();
+const { handler } = require(functionPath);
+const loaded = process.hrtime.bigint();
+handler({ httpMethod: method, path: requestPath, headers: {}, queryStringParameters: {}, body: null }, {})
+  .then(response => {
+    const answered = process.hrtime.bigint();
+    console.log(JSON.stringify({
+      requireMs: ms(started, loaded),
+      firstRequestMs: ms(loaded, answered),
+      status: response.statusCode,
+      modules: Object.keys(require.cache).length
+    }));
+  });
+"""
+
+ENDPOINTS = [
+    ('GET', '/config'),
+    ('GET', '/xml/stats'),
+    ('POST', '/sync/fanout'),
+]
+
+# Ayrı paketlenen function -> api'deki karşılığıyla aynı uç noktaları
+SPLIT_FUNCTIONS = {
+    'xml': '/xml/',
+    'fanout': '/sync/fanout',
+}
+
+
+def extract_tree(ref, workdir):
+    """ref'in netlify/ dizinini workdir'e çıkarır; node_modules proje kökünden bağlanır"""
+    archive = os.path.join(workdir, 'tree.tar')
+    with open(archive, 'wb') as f:
+        subprocess.run(['git', 'archive', ref, 'netlify'], cwd=ROOT, stdout=f, check=True)
+    tree = os.path.join(workdir, 'tree')
+    with tarfile.open(archive) as tar:
+        tar.extractall(tree)
+    os.symlink(os.path.join(ROOT, 'node_modules'), os.path.join(tree, 'node_modules'))
+    return tree
+
+
+def seed_snapshot(tree, feed_url, env):
+    result = subprocess.run(['node', '-e', SEED_SCRIPT, tree, feed_url, DEFAULT_FEED_URL],
+                            cwd=tree, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Anlık görüntü yazılamadı: {result.stderr.strip()}")
+    return int(result.stdout.strip())
+
+
+def measure_once(function_path, method, request_path, env):
+    """Yeni bir node sürecinde tek ölçüm; süreç süresi de eklenir"""
+    start = time.perf_counter()
+    result = subprocess.run(['node', '-e', MEASURE_SCRIPT, function_path, method, request_path],
+                            env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"{function_path} {request_path}: {result.stderr.strip()[:300]}")
+    sample = json.loads(result.stdout.strip().splitlines()[-1])
+    sample['processMs'] = elapsed * 1000
+    return sample
+
+
+def measure_tree(label, tree, feed_url, runs):
+    rows = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(os.environ, FEED_CACHE_DIR=cache_dir, FEED_CACHE_TTL_MS=str(24 * 3600 * 1000))
+        product_count = seed_snapshot(tree, feed_url, env)
+        functions = [('api', '/.netlify/functions/api')]
+        for function_name in SPLIT_FUNCTIONS:
+            if os.path.exists(os.path.join(tree, 'netlify', 'functions', f'{function_name}.js')):
+                functions.append((function_name, f'/.netlify/functions/{function_name}'))
+        for function_name, prefix in functions:
+            function_path = os.path.join(tree, 'netlify', 'functions', f'{function_name}.js')
+            for method, endpoint in ENDPOINTS:
+                if function_name != 'api' and not endpoint.startswith(SPLIT_FUNCTIONS[function_name]):
+                    continue
+                # ilk ölçüm ısınma: disk önbelleği ve node'un derleme önbelleği
+                measure_once(function_path, method, f'{prefix}{endpoint}', env)
+                samples = [measure_once(function_path, method, f'{prefix}{endpoint}', env) for _ in range(runs)]
+                rows.append({
+                    'tree': label,
+                    'function': function_name,
+                    'endpoint': endpoint,
+                    'status': samples[-1]['status'],
+                    'modules': samples[-1]['modules'],
+                    'require_ms': statistics.median(s['requireMs'] for s in samples),
+                    'first_request_ms': statistics.median(s['firstRequestMs'] for s in samples),
+                    'cold_total_ms': statistics.median(s['requireMs'] + s['firstRequestMs'] for s in samples),
+                    'process_ms': statistics.median(s['processMs'] for s in samples),
+                })
+    return product_count, rows
+
+
+def print_report(product_count, rows, runs):
+    print(f"Feed anlık görüntüsü: {product_count} ürün, ölçüm başına {runs} yeni node süreci (medyan)\n")
+    print(f"{'ağaç':<12} {'function':<9} {'uç nokta':<13} {'HTTP':>5} {'modül':>6} "
+          f"{'require ms':>11} {'ilk istek ms':>13} {'toplam ms':>10} {'süreç ms':>9}")
+    for row in rows:
+        print(f"{row['tree']:<12} {row['function']:<9} {row['endpoint']:<13} {row['status']:>5} {row['modules']:>6} "
+              f"{row['require_ms']:>11.1f} {row['first_request_ms']:>13.1f} {row['cold_total_ms']:>10.1f} "
+              f"{row['process_ms']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=15, help="Uç nokta başına ölçüm (yeni süreç) sayısı")
+    parser.add_argument('--products', type=int, default=1000, help="Sentetik feed'deki ürün sayısı")
+    parser.add_argument('--variants', type=int, default=6, help="Ürün başına varyant sayısı")
+    parser.add_argument('--ref', help="Karşılaştırılacak git revizyonu (ör. HEAD~1)")
+    parser.add_argument('--json', metavar='DOSYA', help="Raporu JSON olarak da yaz")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        write_synthetic_feed(os.path.join(workdir, 'feed.xml'), args.products, args.variants)
+        feed_server, feed_base = serve_directory(workdir)
+        try:
+            rows = []
+            if args.ref:
+                product_count, ref_rows = measure_tree(args.ref, extract_tree(args.ref, workdir),
+                                                       f"{feed_base}/feed.xml", args.runs)
+                rows.extend(ref_rows)
+            product_count, current_rows = measure_tree('çalışma', ROOT, f"{feed_base}/feed.xml", args.runs)
+            rows.extend(current_rows)
+        finally:
+            feed_server.shutdown()
+
+    print_report(product_count, rows, args.runs)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
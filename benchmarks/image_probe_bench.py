@@ -0,0 +1,86 @@
+"""Resim URL tekilleştirmesi ve HEAD yoklayıcısını yerel statik sunucuya karşı ölçer.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.image_probe_bench --products 1623 --concurrency 1 --concurrency 16
+
+Sentetik feed'deki resimler geçici bir dizine dosya olarak yazılır ve
+serve_directory ile servis edilir. Her eşzamanlılık değeri için üç tur
+çalışır: soğuk (indeks boş), sıcak (hiçbir şey değişmedi) ve --touch kadar
+dosyanın içeriği değiştirildikten sonra. Son sütun, senkronizasyonun
+resimlerini yeniden yükleyeceği ürün sayısıdır.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from feed import load_products
+from feed.images import ImageIndex, collect_image_urls, probe_images
+
+from .analyze_xml_bench import serve_directory, write_synthetic_feed
+
+FEED_IMAGE_HOST = 'https://stildiva.sentos.com.tr'
+
+
+def _product_urls(product, base_url):
+    urls = dict.fromkeys([*product.images, *(url for v in product.variants for url in v.images)])
+    return [url.replace(FEED_IMAGE_HOST, base_url) for url in urls]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, default=1623)
+    parser.add_argument('--variants', type=int, default=6)
+    parser.add_argument('--concurrency', type=int, action='append', help="Eşzamanlı HEAD isteği sayısı")
+    parser.add_argument('--touch', type=int, default=25, help="Sıcak turdan sonra değiştirilecek resim sayısı")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        feed_path = os.path.join(workdir, 'feed.xml')
+        write_synthetic_feed(feed_path, args.products, args.variants)
+        products = load_products(feed_path)
+
+        references = sum(len(p.images) + sum(len(v.images) for v in p.variants) for p in products)
+        unique = collect_image_urls(products)
+        print(f"Resim referansı: {references}, tekil URL: {len(unique)} "
+              f"(%{100 * (1 - len(unique) / references):.1f} tekrar)\n")
+
+        static_dir = os.path.join(workdir, 'static')
+        os.makedirs(os.path.join(static_dir, 'urunres'))
+        for url in unique:
+            with open(os.path.join(static_dir, url.replace(FEED_IMAGE_HOST + '/', '')), 'wb') as f:
+                f.write(os.urandom(2048))
+        server, base_url = serve_directory(static_dir)
+        urls = [url.replace(FEED_IMAGE_HOST, base_url) for url in unique]
+
+        print(f"{'eşzaman':>8} {'tur':>6} {'süre sn':>8} {'yeni/değişen':>13} {'değişmeyen':>11} "
+              f"{'hata':>5} {'yüklenecek ürün':>16}")
+        try:
+            for concurrency in args.concurrency or [1, 16]:
+                index = ImageIndex(os.path.join(workdir, f"index-{concurrency}.json"))
+                for round_name in ('soğuk', 'sıcak', 'değişik'):
+                    if round_name == 'değişik':
+                        # Last-Modified saniye çözünürlüklü: değişikliğin görünmesi için bekle
+                        time.sleep(1.1)
+                        for url in unique[:args.touch]:
+                            with open(os.path.join(static_dir, url.replace(FEED_IMAGE_HOST + '/', '')), 'ab') as f:
+                                f.write(b'\0')
+                    start = time.perf_counter()
+                    result = asyncio.run(probe_images(index, urls, concurrency=concurrency))
+                    elapsed = time.perf_counter() - start
+
+                    uploads = 0
+                    for product in products:
+                        product_urls = _product_urls(product, base_url)
+                        if index.needs_upload(product.id, product_urls):
+                            uploads += 1
+                            index.mark_uploaded(product.id, product_urls)
+                    print(f"{concurrency:>8} {round_name:>6} {elapsed:>8.2f} {len(result.changed):>13} "
+                          f"{result.unchanged:>11} {len(result.failed):>5} {uploads:>16}")
+        finally:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
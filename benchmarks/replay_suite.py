@@ -0,0 +1,397 @@
+"""Sentetik feed'ler ve kayıtlı Shopify yanıtlarıyla çevrimdışı benchmark paketi.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.replay_suite                       # 1k ve 10k
+    python -m benchmarks.replay_suite --size 1000 --size 10000 --size 100000
+    python -m benchmarks.replay_suite --check               # gerilemede çıkış kodu 1
+    python -m benchmarks.replay_suite --record              # kasetleri yeniden kaydet
+
+Her boyut için synthetic_feed ile üretilen (ve .bench-cache altında
+saklanan) feed ayrı bir alt süreçte ölçülür:
+
+    parse      load_products ile tüm feed'in okunması
+    transform  her ürün için product_payload
+    api        ilk --api-products ürünün Python referans senkronizasyonu:
+               bulk export, değişen fiyat/stoklar için VariantBatchWriter,
+               mağazada olmayanlar için POST products.json
+    sync       aynı ürünlerle üretim yolu: netlify/local-server.js'teki
+               function'a tek POST /api/sync/start (feed indirme ve parse
+               dahil; parmak izi taraması, oluşturma ve güncellemeler)
+
+API ve sync aşamaları ağa çıkmaz: yanıtlar daha önce kaydedilmiş kasetlerden
+ReplayTransport ile verilir; Node function'ı kasete TransportServer
+üzerinden bağlanır. Python kaseti MockShopify'a (ya da --shop-url ile gerçek
+bir mağazaya), Node kaseti her zaman MockShopify'a karşı kaydedilir: mağaza
+önce feed'in eski bir sürümüyle (ürünlerin %90'ı, her 5. ürünün açıklaması
+farklı) doldurulur, ardından asıl feed'in senkronizasyonu kaydedilir. Kaset
+yoksa önce kaydedilir. Tepe bellek Python alt sürecinin ru_maxrss'idir.
+
+Sonuçlar commit SHA'sıyla birlikte .bench-results/history.jsonl dosyasına
+eklenir ve aynı boyuttaki bir önceki commit'in sonucuyla karşılaştırılır;
+süre/bellek eşikten fazla artarsa ya da ürün başına API çağrısı yükselirse
+gerileme olarak raporlanır.
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+from feed import load_products, product_payload
+from shopify_tools import MockShopify, ShopifyClient, export_store_snapshot
+from shopify_tools.batch import PriceChange, QuantityChange, VariantBatchWriter
+from shopify_tools.replay import RecordingTransport, ReplayTransport, TransportServer
+
+from .analyze_xml_bench import ROOT, serve_directory
+from .sync_load import start_function_server
+from .synthetic_feed import GENERATOR_VERSION, cached_feed
+
+CACHE_DIR = os.path.join(ROOT, '.bench-cache')
+HISTORY_PATH = os.path.join(ROOT, '.bench-results', 'history.jsonl')
+ACCESS_TOKEN = 'shpat_mock'
+REPLAY_SHOP = 'replay.myshopify.com'
+
+# metrik -> izin verilen göreli artış
+THRESHOLDS = {
+    'parse_s': 0.20,
+    'transform_s': 0.20,
+    'api_s': 0.25,
+    'peak_rss_mb': 0.15,
+    'calls_per_product': 0.01,
+    'sync_s': 0.25,
+    'sync_calls_per_product': 0.01,
+}
+
+
+def seed_store(shop, payloads):
+    """Ürünlerin %90'ını mağazaya ekler; her 5. ürünün fiyatı ve her 3. ürünün stokları farklıdır"""
+    for n, payload in enumerate(payloads):
+        if n % 10 == 9:
+            continue
+        variants = [
+            {**variant,
+             'price': f"{float(variant['price']) - 10:.2f}" if n % 5 == 0 else variant['price'],
+             'inventory_quantity': variant['inventory_quantity'] + 1 if n % 3 == 0 else variant['inventory_quantity']}
+            for variant in payload['variants']
+        ]
+        shop.create_product({**payload, 'variants': variants})
+
+
+async def reference_sync(client, payloads, transport):
+    """Bulk export + toplu varyant yazma + eksik ürünleri oluşturma; özet sayıları döndürür"""
+    snapshot = await export_store_snapshot(client, transport=transport)
+    writer = VariantBatchWriter(client)
+    to_create = []
+    for payload in payloads:
+        entries = [snapshot.sku_index.get(variant['sku']) for variant in payload['variants']]
+        if not any(entries):
+            to_create.append(payload)
+            continue
+        for variant, entry in zip(payload['variants'], entries):
+            if entry is None:
+                continue
+            if entry.price != variant['price']:
+                writer.queue_price(PriceChange(entry.product_id, entry.variant_id, variant['sku'], variant['price']))
+            if entry.inventory_quantity != variant['inventory_quantity']:
+                writer.queue_quantity(QuantityChange(entry.inventory_item_id, variant['sku'],
+                                                     variant['inventory_quantity']))
+        await writer.flush_if_full()
+    batch = await writer.flush()
+
+    async def create(client, payload):
+        return await client.post('products.json', json={'product': payload})
+
+    results = await client.map(create, to_create)
+    return {
+        'created': sum(1 for result in results if not isinstance(result, Exception)),
+        'create_errors': sum(1 for result in results if isinstance(result, Exception)),
+        'variants_updated': len(batch.updated),
+        'variant_errors': len(batch.failed),
+    }
+
+
+def cassette_path(product_count, api_products):
+    count = min(product_count, api_products)
+    return os.path.join(CACHE_DIR, f"cassette-v{GENERATOR_VERSION}-{product_count}-{count}.jsonl.gz")
+
+
+async def _record(payloads, path, shop_url=None, token=None):
+    recorder = RecordingTransport()
+    # Bulk JSONL indirmesi ayrı bir httpx istemcisiyle yapılır; aynı kasete yazar
+    download = RecordingTransport(interactions=recorder.interactions)
+    async with ShopifyClient(shop_url, token, transport=recorder) as client:
+        summary = await reference_sync(client, payloads, download)
+    recorder.save(path)
+    return summary, len(recorder.interactions)
+
+
+def record_cassette(payloads, path, shop_url=None, token=None):
+    """Referans senkronizasyonunu kaydeder; shop_url yoksa tohumlanmış MockShopify kullanılır"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if shop_url:
+        return asyncio.run(_record(payloads, path, shop_url, token))
+    # Kayıt sadece yanıtları toplar; kısıtlama beklemesi kaydı uzatmasın diye kovalar geniş
+    with MockShopify(access_token=ACCESS_TOKEN, rest_bucket_size=10 ** 6, rest_leak_rate=10 ** 6,
+                     graphql_bucket_size=10 ** 9, graphql_restore_rate=10 ** 9, bulk_duration=0) as shop:
+        seed_store(shop, payloads)
+        return asyncio.run(_record(payloads, path, shop.base_url, ACCESS_TOKEN))
+
+
+async def _replay(payloads, path):
+    transport = ReplayTransport.load(path)
+    async with ShopifyClient(REPLAY_SHOP, ACCESS_TOKEN, transport=transport) as client:
+        summary = await reference_sync(client, payloads, transport)
+    summary['api_calls'] = transport.request_count
+    summary['replay_misses'] = len(transport.misses)
+    return summary
+
+
+def node_cassette_path(product_count, api_products):
+    count = min(product_count, api_products)
+    return os.path.join(CACHE_DIR, f"cassette-node-v{GENERATOR_VERSION}-{product_count}-{count}.jsonl.gz")
+
+
+def write_feed_subset(feed_path, count, path, previous=False):
+    """Feed'in ilk count ürününü path'e yazar.
+
+    previous ile feed'in eski bir sürümü yazılır: her 10. ürün yoktur, her 5.
+    ürünün açıklaması farklıdır (asıl feed'e göre oluşturma ve güncelleme üretir).
+    """
+    with open(feed_path, encoding='utf-8-sig') as f:
+        text = f.read()
+    blocks = re.findall(r'<Urun>.*?</Urun>', text, re.S)[:count]
+    if previous:
+        blocks = [block.replace('<detayaciklama><![CDATA[', '<detayaciklama><![CDATA[<p>Eski açıklama</p>', 1)
+                  if n % 5 == 0 else block
+                  for n, block in enumerate(blocks) if n % 10 != 9]
+    with open(path, 'w', encoding='utf-8-sig') as f:
+        f.write(text[:text.index('<Urun>')] + '\n  '.join(blocks) + '\n</Urunler>\n')
+    return path
+
+
+def node_sync(feed_path, shop_url):
+    """Feed'i local-server.js'teki function'a /sync/start ile senkronize ettirir, (süre_sn, yanıt) döndürür.
+    Süre function hazır olduktan sonraki tek çağrıdır; iş ve feed önbelleği her seferinde boştur."""
+    with tempfile.TemporaryDirectory() as workdir:
+        env = {**os.environ, 'FEED_CACHE_DIR': os.path.join(workdir, 'feed-cache'),
+               'SYNC_JOB_DIR': os.path.join(workdir, 'jobs')}
+        feed_server, feed_base = serve_directory(os.path.dirname(feed_path))
+        process, function_base = start_function_server(env=env)
+        try:
+            start = time.perf_counter()
+            response = requests.post(
+                f"{function_base}/api/sync/start",
+                headers={
+                    'x-shopify-shop-url': shop_url,
+                    'x-shopify-access-token': ACCESS_TOKEN,
+                    'x-xml-feed-url': f"{feed_base}/{os.path.basename(feed_path)}",
+                },
+                json={'restart': True},
+                timeout=None,
+            )
+            elapsed = time.perf_counter() - start
+        finally:
+            process.terminate()
+            process.wait()
+            feed_server.shutdown()
+    try:
+        result = response.json()
+    except ValueError:
+        result = {'success': False, 'message': response.text[:200]}
+    if not result.get('success'):
+        raise RuntimeError(f"/sync/start başarısız oldu: {result.get('message')}")
+    return elapsed, result
+
+
+def record_node_cassette(feed_path, api_products, path):
+    """Üretim yolunun senkronizasyonunu MockShopify'a karşı kaydeder, (yanıt, etkileşim sayısı) döndürür"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    recorder = RecordingTransport()
+    with tempfile.TemporaryDirectory() as workdir, \
+            MockShopify(access_token=ACCESS_TOKEN, rest_bucket_size=10 ** 6, rest_leak_rate=10 ** 6,
+                        graphql_bucket_size=10 ** 9, graphql_restore_rate=10 ** 9) as shop:
+        node_sync(write_feed_subset(feed_path, api_products, os.path.join(workdir, 'previous.xml'), previous=True),
+                  shop.base_url)
+        with TransportServer(recorder, upstream=shop.base_url) as server:
+            _, result = node_sync(write_feed_subset(feed_path, api_products, os.path.join(workdir, 'feed.xml')),
+                                  server.base_url)
+    recorder.save(path)
+    return result, len(recorder.interactions)
+
+
+def measure_node(feed_path, cassette, api_products):
+    """Üretim yolunu kasetten oynatarak ölçer"""
+    transport = ReplayTransport.load(cassette)
+    with tempfile.TemporaryDirectory() as workdir:
+        subset = write_feed_subset(feed_path, api_products, os.path.join(workdir, 'feed.xml'))
+        with TransportServer(transport) as server:
+            sync_s, result = node_sync(subset, server.base_url)
+    return {
+        'sync_s': round(sync_s, 4),
+        'sync_calls_per_product': round(transport.request_count / result['xmlProducts'], 4),
+        'sync_created': result['createdCount'],
+        'sync_updated': result['updatedCount'],
+        'sync_unchanged': result['unchangedCount'],
+        'sync_errors': result['errorCount'],
+        'sync_misses': len(transport.misses),
+    }
+
+
+def measure_child(feed_path, cassette, api_products):
+    """Alt süreçte çalışır: aşamaları ölçer, sonucu JSON olarak stdout'a yazar"""
+    start = time.perf_counter()
+    products = load_products(feed_path)
+    parse_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    payloads = [product_payload(product) for product in products]
+    transform_s = time.perf_counter() - start
+
+    api_payloads = payloads[:api_products]
+    start = time.perf_counter()
+    summary = asyncio.run(_replay(api_payloads, cassette))
+    api_s = time.perf_counter() - start
+
+    print(json.dumps({
+        'products': len(products),
+        'variants': sum(len(payload['variants']) for payload in payloads),
+        'parse_s': round(parse_s, 4),
+        'transform_s': round(transform_s, 4),
+        'api_s': round(api_s, 4),
+        'api_products': len(api_payloads),
+        'calls_per_product': round(summary['api_calls'] / len(api_payloads), 4) if api_payloads else 0,
+        **summary,
+    }))
+
+
+def run_child(feed_path, cassette, api_products):
+    """measure_child'ı ayrı süreçte çalıştırır, ölçümlere tepe RSS'i ekler"""
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.replay_suite', '--child', feed_path, cassette, str(api_products)],
+        cwd=ROOT, stdout=subprocess.PIPE)
+    output = process.stdout.read()
+    _, status, usage = os.wait4(process.pid, 0)
+    if os.waitstatus_to_exitcode(status) != 0:
+        raise RuntimeError(f"Ölçüm süreci başarısız oldu: {feed_path}")
+    result = json.loads(output)
+    # Linux'ta ru_maxrss KB cinsindendir
+    result['peak_rss_mb'] = round(usage.ru_maxrss / 1024, 1)
+    return result
+
+
+def git_commit():
+    try:
+        sha = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                             text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f"{sha}-dirty" if dirty else sha
+
+
+def load_history(path=HISTORY_PATH):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except OSError:
+        return []
+
+
+def append_history(records, path=HISTORY_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def baseline_for(history, record):
+    """Aynı boyut ve API alt kümesi için, farklı bir commit'teki en son kayıt"""
+    for previous in reversed(history):
+        if (previous['size'] == record['size'] and previous['api_products'] == record['api_products']
+                and previous['commit'] != record['commit']):
+            return previous
+    return None
+
+
+def regressions(record, baseline):
+    found = []
+    for metric, allowed in THRESHOLDS.items():
+        old, new = baseline.get(metric), record.get(metric)
+        if old and new and (new - old) / old > allowed:
+            found.append(f"{metric}: {old} -> {new} (+%{100 * (new - old) / old:.0f}, eşik %{100 * allowed:.0f})")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, action='append', help="Feed'deki ürün sayısı (birden çok verilebilir)")
+    parser.add_argument('--api-products', type=int, default=2000, help="API aşamasında senkronize edilecek ürün sayısı")
+    parser.add_argument('--record', action='store_true', help="Kasetleri yeniden kaydet")
+    parser.add_argument('--shop-url', help="Python kaydını MockShopify yerine bu mağazaya karşı yap")
+    parser.add_argument('--token', default=os.environ.get('SHOPIFY_ACCESS_TOKEN'), help="--shop-url için erişim anahtarı")
+    parser.add_argument('--check', action='store_true', help="Gerilemede çıkış kodu 1 döndür")
+    parser.add_argument('--no-history', action='store_true', help="Sonuçları geçmişe ekleme")
+    parser.add_argument('--child', nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        feed_path, cassette, api_products = args.child
+        measure_child(feed_path, cassette, int(api_products))
+        return 0
+
+    commit = git_commit()
+    history = load_history()
+    records, problems = [], []
+    print(f"commit {commit}\n")
+    print(f"{'ürün':>7} {'varyant':>8} {'parse sn':>9} {'transform sn':>13} {'api sn':>7} "
+          f"{'çağrı/ürün':>11} {'sync sn':>8} {'sync çağrı/ürün':>16} {'tepe MB':>8}")
+    for size in args.size or [1000, 10000]:
+        feed_path = cached_feed(CACHE_DIR, size)
+        cassette = cassette_path(size, args.api_products)
+        if args.record or not os.path.exists(cassette):
+            payloads = [product_payload(product) for product in load_products(feed_path)[:args.api_products]]
+            _, interactions = record_cassette(payloads, cassette, args.shop_url, args.token)
+            print(f"  kaset kaydedildi: {os.path.basename(cassette)} ({interactions} etkileşim)")
+        node_cassette = node_cassette_path(size, args.api_products)
+        if args.record or not os.path.exists(node_cassette):
+            _, interactions = record_node_cassette(feed_path, args.api_products, node_cassette)
+            print(f"  kaset kaydedildi: {os.path.basename(node_cassette)} ({interactions} etkileşim)")
+
+        result = run_child(feed_path, cassette, args.api_products)
+        result.update(measure_node(feed_path, node_cassette, args.api_products))
+        record = {'commit': commit, 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'size': size, **result}
+        records.append(record)
+        print(f"{size:>7} {result['variants']:>8} {result['parse_s']:>9.2f} {result['transform_s']:>13.2f} "
+              f"{result['api_s']:>7.2f} {result['calls_per_product']:>11.3f} {result['sync_s']:>8.2f} "
+              f"{result['sync_calls_per_product']:>16.3f} {result['peak_rss_mb']:>8.1f}")
+        for key in ('replay_misses', 'sync_misses'):
+            if result[key]:
+                problems.append(f"{size}: {result[key]} istek kasette yok (--record ile yeniden kaydedin)")
+        if result['sync_errors']:
+            problems.append(f"{size}: /sync/start {result['sync_errors']} ürün için hata verdi")
+
+        baseline = baseline_for(history, record)
+        if baseline:
+            problems.extend(f"{size}: {problem} (önceki: {baseline['commit']})"
+                            for problem in regressions(record, baseline))
+
+    if not args.no_history:
+        append_history(records)
+    if problems:
+        print("\nGERİLEME:")
+        for problem in problems:
+            print(f"  {problem}")
+        return 1 if args.check else 0
+    print("\nGerileme yok.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
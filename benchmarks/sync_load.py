@@ -0,0 +1,138 @@
+"""Sync akışını sahte Shopify'a karşı uçtan uca yük testi.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.sync_load --products 1600 --latency 0.05
+
+Sentetik bir Sentos feed'i yerel HTTP'den servis edilir, shopify_tools'daki
+MockShopify (REST leaky bucket + GraphQL maliyet kovası) başlatılır ve
+netlify/local-server.js ile Netlify function'ı ayrı bir node sürecinde
+çalıştırılır. Ardından seçilen sync uç noktası çağrılır ve ürün/sn, rota
+bazında p50/p99 gecikme, 429 sayısı ve kısıtlanmış süre raporlanır.
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import tempfile
+import time
+
+import requests
+
+from shopify_tools import MockShopify
+
+from .analyze_xml_bench import ROOT, serve_directory, write_synthetic_feed
+
+ACCESS_TOKEN = 'shpat_mock'
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_function_server(timeout=15, env=None):
+    """netlify/local-server.js'i başlatır, hazır olunca (süreç, base_url) döndürür.
+    env verilirse function süreci bu ortam değişkenleriyle çalışır (ör. FEED_CACHE_DIR)."""
+    port = _free_port()
+    process = subprocess.Popen(['node', os.path.join('netlify', 'local-server.js'), str(port)],
+                               cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"local-server.js başlatılamadı (çıkış kodu {process.returncode})")
+        try:
+            requests.get(f"{base_url}/api/debug/env", timeout=1)
+            return process, base_url
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("local-server.js zamanında hazır olmadı")
+
+
+def run_load(product_count, variants, latency, endpoint, rest_bucket_size, rest_leak_rate):
+    with tempfile.TemporaryDirectory() as workdir:
+        write_synthetic_feed(os.path.join(workdir, 'feed.xml'), product_count, variants)
+        feed_server, feed_base = serve_directory(workdir)
+        shop = MockShopify(latency=latency, access_token=ACCESS_TOKEN,
+                           rest_bucket_size=rest_bucket_size, rest_leak_rate=rest_leak_rate)
+        shop.start()
+        function_process, function_base = start_function_server()
+        try:
+            start = time.perf_counter()
+            response = requests.post(
+                f"{function_base}/api{endpoint}",
+                headers={
+                    'x-shopify-shop-url': shop.base_url,
+                    'x-shopify-access-token': ACCESS_TOKEN,
+                    'x-xml-feed-url': f"{feed_base}/feed.xml",
+                    'Content-Type': 'application/json',
+                },
+                data='{}',
+                timeout=None,
+            )
+            elapsed = time.perf_counter() - start
+        finally:
+            function_process.terminate()
+            function_process.wait()
+            shop.stop()
+            feed_server.shutdown()
+
+    try:
+        result = response.json()
+    except ValueError:
+        result = {'success': False, 'message': response.text[:200]}
+    processed = result.get('processedCount') or 0
+    stats = shop.stats()
+    return {
+        'endpoint': endpoint,
+        'feed_products': product_count,
+        'http_status': response.status_code,
+        'success': result.get('success'),
+        'processed': processed,
+        'errors': result.get('errorCount'),
+        'seconds': round(elapsed, 3),
+        'products_per_second': round(processed / elapsed, 2) if elapsed else 0.0,
+        'shopify_products': len(shop.products),
+        'shopify': stats,
+    }
+
+
+def print_report(report):
+    stats = report['shopify']
+    print(f"Uç nokta          : {report['endpoint']} (HTTP {report['http_status']}, success={report['success']})")
+    print(f"Feed ürünü        : {report['feed_products']}")
+    print(f"İşlenen / hata    : {report['processed']} / {report['errors']}")
+    print(f"Süre              : {report['seconds']:.2f} sn")
+    print(f"Ürün/sn           : {report['products_per_second']:.2f}")
+    print(f"Shopify istekleri : {stats['requests']} (429: {stats['throttled']}, "
+          f"kısıtlı süre: {stats['throttled_seconds']:.2f} sn)")
+    print(f"\n{'rota':<36} {'istek':>7} {'429':>6} {'hata':>6} {'p50 ms':>8} {'p99 ms':>8}")
+    for route, entry in stats['routes'].items():
+        print(f"{route:<36} {entry['count']:>7} {entry['throttled']:>6} {entry['errors']:>6} "
+              f"{entry['p50'] * 1000:>8.1f} {entry['p99'] * 1000:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, default=1600, help="Sentetik feed'deki ürün sayısı")
+    parser.add_argument('--variants', type=int, default=6, help="Ürün başına varyant sayısı")
+    parser.add_argument('--latency', type=float, default=0.05, help="Sahte Shopify yanıt gecikmesi (sn)")
+    parser.add_argument('--endpoint', default='/sync/start', help="Çağrılacak function yolu")
+    parser.add_argument('--bucket-size', type=int, default=40, help="REST kova kapasitesi")
+    parser.add_argument('--leak-rate', type=float, default=2.0, help="REST kova boşalma hızı (istek/sn)")
+    parser.add_argument('--json', metavar='DOSYA', help="Raporu JSON olarak da yaz")
+    args = parser.parse_args()
+
+    report = run_load(args.products, args.variants, args.latency, args.endpoint,
+                      args.bucket_size, args.leak_rate)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Gerçek Sentos feed'inin yapısında, tekrarlanabilir sentetik feed üreticisi.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.synthetic_feed --products 1000 --products 10000 --out .bench-cache
+
+write_synthetic_feed (analyze_xml_bench) her ürünü aynı tutar; bu üretici
+xml-sample.txt'teki alanların tamamını (alt_kategori_*, kdv, desi,
+varyant_isimleri, ...) yazar ve ürünleri çeşitlendirir: renk başına ayrı
+Urun, 1-10 beden, bazıları varyantsız, ürün düzeyinde de resimler, satır
+sonları ve girintiler içeren, 1-16 KB arası CDATA detayaciklama. Aynı
+seed ile her zaman bayt bayt aynı dosya üretilir.
+"""
+import argparse
+import os
+import random
+
+GENERATOR_VERSION = 1
+
+CATEGORIES = [
+    'Giyim > Büyük Beden > Alt Giyim > Pantolon',
+    'Giyim > Büyük Beden > Alt Giyim > Etek',
+    'Giyim > Büyük Beden > Üst Giyim > Bluz',
+    'Giyim > Büyük Beden > Üst Giyim > Tunik',
+    'Giyim > Büyük Beden > Üst Giyim > Gömlek',
+    'Giyim > Büyük Beden > Elbise',
+    'Giyim > Büyük Beden > Dış Giyim > Ceket',
+    'Giyim > Büyük Beden > Dış Giyim > Trençkot',
+    'Giyim > Büyük Beden > İç Giyim > Pijama Takımı',
+    'Aksesuar > Şal',
+]
+MODELS = ['Cepli Bol Kesim Likralı Jarse Pantolon', 'Düğmeli Uzun Kollu Viskon Gömlek', 'Çiçek Desenli Şifon Elbise',
+          'Yırtmaçlı Kalem Etek', 'Kapüşonlu Şişme Mont', 'Örme Triko Hırka', 'Pamuklu Çizgili Pijama Takımı',
+          'Oversize Keten Tunik', 'Kruvaze Yaka Saten Bluz', 'Desenli İpek Şal']
+COLORS = [('Siyah', 'SYH'), ('Lacivert', 'LCV'), ('Bej', 'BEJ'), ('Haki', 'HAK'), ('Bordo', 'BRD'),
+          ('Ekru', 'EKR'), ('Gri', 'GRI'), ('Pudra', 'PDR')]
+SIZES = ['40', '42', '44', '46', '48', '50 - 52', '54 - 56', '58 - 60', '62 - 64', '66 - 68']
+FABRICS = ['%95 Viskoz, %5 Elastan', '%100 Pamuk', '%65 Polyester, %35 Viskon', '%100 Keten', '%80 Akrilik, %20 Yün']
+PARAGRAPH = ("Gündelik gardırobunuza bu sade ve rahat formdaki parça ile konfor katın. Yumuşacık ve esnek "
+             "kumaşı sayesinde gün boyu rahatlık sunar; ütü gerektirmez, çekmez ve rengini korur. İçine "
+             "sokacağınız basic bir tişört ve spor ayakkabılarınızla kombinleyerek zahmetsiz bir stil yaratın.")
+IMAGE_HOST = 'https://stildiva.sentos.com.tr/urunres'
+
+
+def _description(rng, title, fabric):
+    features = ''.join(
+        f"\t<li>\n\t<p><strong>{label}:</strong> {value}</p>\n\t</li>\n"
+        for label, value in (('Manken Boyu', f"{rng.randint(165, 182)} cm"), ('Manken Bedeni', rng.choice(SIZES)),
+                             ('Kumaş İçeriği', fabric), ('Model Detayı', 'Beli Lastikli, Yanları Cepli'),
+                             ('Paça İç Boyu', f"Yaklaşık {rng.randint(40, 80)} cm"))
+    )
+    # Gerçek feed'de açıklamalar 1-16 KB arası; uzun kuyruk için paragraf sayısı üstel dağılır
+    paragraphs = min(60, 1 + int(rng.expovariate(1 / 6)))
+    body = ''.join(f"<p>{PARAGRAPH}</p>\n\n" for _ in range(paragraphs))
+    return (f"<p>{title}<br />\n </p>\n\n<p><strong>Özellikler:</strong></p>\n\n<ul>\n{features}</ul>\n\n"
+            f"<p><em>Tüm ürünlerimiz büyük beden ürünlerdir.</em><br />\n </p>\n\n"
+            f"<p><strong>Moda Notu:</strong></p>\n\n{body}")
+
+
+def _price(value):
+    return f"{value:.2f}".replace('.', ',')
+
+
+def iter_products_xml(product_count, seed=42):
+    """Her Urun için XML parçası üretir; ürünler model başına 1-4 renk grubu halinde gelir"""
+    rng = random.Random(seed)
+    emitted = 0
+    model_number = 144000
+    while emitted < product_count:
+        model_number += 1
+        model = rng.choice(MODELS)
+        category = rng.choice(CATEGORIES)
+        fabric = rng.choice(FABRICS)
+        purchase = rng.choice([190, 240, 285, 349.9, 420, 599.9])
+        sale = purchase * 1.8 if rng.random() < 0.4 else 0
+        discount = sale * 0.85 if sale and rng.random() < 0.3 else 0
+        size_count = 0 if rng.random() < 0.03 else rng.randint(1, len(SIZES))
+        sizes = SIZES[:size_count]
+        for color, code in rng.sample(COLORS, rng.randint(1, 4)):
+            if emitted >= product_count:
+                break
+            emitted += 1
+            title = f"Büyük Beden {model} {model_number}"
+            images = ''.join(f"          <resim>{IMAGE_HOST}/{model_number}-{code}-{n}.jpg</resim>\n"
+                             for n in range(1, rng.randint(2, 5) + 1))
+            product_images = (f"    <resimler>\n{images}    </resimler>\n"
+                              if not sizes or rng.random() < 0.2 else "    <resimler/>\n")
+            variants = ''.join(
+                f"      <Varyant>\n"
+                f"        <Varyant_isim><![CDATA[Beden]]></Varyant_isim>\n"
+                f"        <Varyant_deger><![CDATA[{size}]]></Varyant_deger>\n"
+                f"        <renk><![CDATA[{color}]]></renk>\n"
+                f"        <stok_kodu><![CDATA[{model_number}{color}-M{n + 40}-R{rng.randint(1, 30)}]]></stok_kodu>\n"
+                f"        <barkod><![CDATA[{model_number}-{code}-{size.replace(' ', '')}]]></barkod>\n"
+                f"        <stok>{rng.choice([0, 0, 1, 2, 3, 5, 8, 13, 40])}</stok>\n"
+                f"        <resimler>\n{images}        </resimler>\n"
+                f"      </Varyant>\n"
+                for n, size in enumerate(sizes)
+            )
+            yield (
+                f"  <Urun>\n"
+                f"    <id>{1000 + emitted}</id>\n"
+                f"    <stok_kodu><![CDATA[{model_number}{color}]]></stok_kodu>\n"
+                f"    <barkod/>\n"
+                f"    <kategori_id>{33 + CATEGORIES.index(category)}</kategori_id>\n"
+                f"    <kategori_ismi><![CDATA[{category}]]></kategori_ismi>\n"
+                f"    <alt_kategori_1/>\n    <alt_kategori_2/>\n    <alt_kategori_3/>\n"
+                f"    <urunismi><![CDATA[{title}]]></urunismi>\n"
+                f"    <alt_baslik><![CDATA[{title}]]></alt_baslik>\n"
+                f"    <detayaciklama><![CDATA[{_description(rng, title, fabric)}]]></detayaciklama>\n"
+                f"    <tedarikci/>\n"
+                f"    <stok>{rng.randint(0, 400)}</stok>\n"
+                f"    <marka><![CDATA[Stil Diva]]></marka>\n"
+                f"    <kdv>10.00</kdv>\n    <desi>1.0000</desi>\n    <doviz_kuru>TL</doviz_kuru>\n"
+                f"    <alis_fiyati>{_price(purchase)}</alis_fiyati>\n"
+                f"    <satis_fiyati>{_price(sale)}</satis_fiyati>\n"
+                f"    <indirimli_fiyat>{_price(discount)}</indirimli_fiyat>\n"
+                f"    <varyant_isimleri><![CDATA[{','.join(f'{s}(Beden)' for s in sizes)}]]></varyant_isimleri>\n"
+                f"    <renk_isimleri><![CDATA[{color}]]></renk_isimleri>\n"
+                f"{product_images}"
+                f"    <Varyantlar>\n{variants}    </Varyantlar>\n"
+                f"  </Urun>\n"
+            )
+
+
+def generate_feed(path, product_count, seed=42):
+    """Sentetik feed'i path'e yazar (geçici dosya + rename), yolu döndürür"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write('\ufeff<?xml version="1.0" encoding="utf-8"?>\n<Urunler>\n')
+        for chunk in iter_products_xml(product_count, seed):
+            f.write(chunk)
+        f.write('</Urunler>\n')
+    os.replace(tmp_path, path)
+    return path
+
+
+def cached_feed(directory, product_count, seed=42):
+    """Feed'i directory altında üretir; aynı sürüm/boyut/seed daha önce üretildiyse yeniden kullanır"""
+    path = os.path.join(directory, f"feed-v{GENERATOR_VERSION}-{product_count}-s{seed}.xml")
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        generate_feed(path, product_count, seed)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, action='append', help="Ürün sayısı (birden çok verilebilir)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default='.bench-cache', help="Çıktı dizini")
+    args = parser.parse_args()
+
+    for product_count in args.products or [1000, 10000, 100000]:
+        path = cached_feed(args.out, product_count, args.seed)
+        print(f"{product_count:>7} ürün  {os.path.getsize(path) / (1024 * 1024):>8.1f} MB  {path}")
+
+
+if __name__ == "__main__":
+    main()
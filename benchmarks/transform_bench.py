@@ -0,0 +1,49 @@
+"""Çok süreçli feed dönüşümünün çekirdek sayısıyla ölçeklenmesini ölçer.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.transform_bench --products 50000 --workers 1 2 4 8
+
+Sentetik feed bir kez yazılır; her işçi sayısı için feed_transform'un
+kullandığı transform_feed çalıştırılır, çıktı /dev/null'a atılır.
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+
+from feed import transform_feed
+from feed.transform import open_feed
+
+from .analyze_xml_bench import write_synthetic_feed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, default=50000)
+    parser.add_argument('--variants', type=int, default=6)
+    parser.add_argument('--chunk-size', type=int, default=500)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        help="Denenecek işçi sayıları (varsayılan: 1, 2, 4, ... çekirdek sayısına kadar)")
+    args = parser.parse_args()
+
+    cores = multiprocessing.cpu_count()
+    workers = args.workers or sorted({1, *(2 ** n for n in range(1, cores.bit_length()) if 2 ** n <= cores), cores})
+
+    with tempfile.TemporaryDirectory() as workdir:
+        feed_path = os.path.join(workdir, 'feed.xml')
+        write_synthetic_feed(feed_path, args.products, args.variants)
+        size_mb = os.path.getsize(feed_path) / (1024 * 1024)
+        print(f"Feed: {args.products} ürün, {size_mb:.1f} MB, {cores} çekirdek\n")
+
+        print(f"{'süreç':>6} {'süre sn':>9} {'ürün/sn':>10} {'hızlanma':>9}")
+        baseline = None
+        for count in workers:
+            with open_feed(feed_path) as source, open(os.devnull, 'wb') as output:
+                stats = transform_feed(source, output, workers=count, products_per_chunk=args.chunk_size)
+            baseline = baseline or stats['products_per_second']
+            print(f"{count:>6} {stats['seconds']:>9.2f} {stats['products_per_second']:>10.0f} "
+                  f"{stats['products_per_second'] / baseline:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Varyant fiyat/stok yazma yollarını istek/varyant oranı açısından karşılaştırır.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.variant_write_bench --products 100 --variants 10 --bad 3
+
+Modlar (hepsi sahte Shopify'a karşı, aynı değişiklik kümesiyle):
+    rest      updateShopifyProduct'taki gibi varyant başına PUT /variants/{id}.json
+    single    priceUpdateService'teki gibi varyant başına productVariantUpdate (sadece fiyat)
+    batched   VariantBatchWriter: productVariantsBulkUpdate + inventorySetQuantities
+
+--bad ile bazı kalemler bilerek hatalı gönderilir (negatif fiyat, bilinmeyen
+inventory item); toplu yolda bunların sadece kendi kalemlerini düşürdüğü görülür.
+Varsayılan kova değerleri Shopify Plus limitleridir (REST 20/sn, GraphQL 100 puan/sn).
+"""
+import argparse
+import asyncio
+import time
+
+from shopify_tools import MockShopify, ShopifyClient
+from shopify_tools.batch import PriceChange, QuantityChange, VariantBatchWriter
+
+from .bulk_export_bench import seed_store
+
+ACCESS_TOKEN = 'shpat_mock'
+
+SINGLE_MUTATION = """
+mutation productVariantUpdate($input: ProductVariantInput!) {
+  productVariantUpdate(input: $input) {
+    productVariant { id price compareAtPrice }
+    userErrors { field message }
+  }
+}
+"""
+
+
+def build_changes(shop, bad):
+    """Her varyant için fiyat +1 ve stok +1; ilk `bad` ürünün ilk varyantı hatalı"""
+    changes = []
+    for n, product in enumerate(sorted(shop.products.values(), key=lambda p: p['id'])):
+        for v, variant in enumerate(product['variants']):
+            broken = n < bad and v == 0
+            changes.append({
+                'product_id': product['admin_graphql_api_id'],
+                'variant_id': variant['id'],
+                'variant_gid': variant['admin_graphql_api_id'],
+                'inventory_item_id': f"gid://shopify/InventoryItem/{0 if broken else variant['inventory_item_id']}",
+                'sku': variant['sku'],
+                'price': f"{-1 if broken else float(variant['price']) + 1:.2f}",
+                'quantity': variant['inventory_quantity'] + 1,
+            })
+    return changes
+
+
+async def write_rest(client, changes):
+    async def put(client, change):
+        return await client.put(f"variants/{change['variant_id']}.json", json={'variant': {
+            'id': change['variant_id'], 'price': change['price'], 'inventory_quantity': change['quantity']}})
+
+    results = await client.map(put, changes)
+    return sum(1 for result in results if isinstance(result, Exception))
+
+
+async def write_single(client, changes):
+    async def update(client, change):
+        data = await client.graphql(SINGLE_MUTATION, {'input': {'id': change['variant_gid'], 'price': change['price']}})
+        return data['productVariantUpdate']['userErrors']
+
+    results = await client.map(update, changes)
+    return sum(1 for result in results if isinstance(result, Exception) or result)
+
+
+async def write_batched(client, changes):
+    writer = VariantBatchWriter(client)
+    for change in changes:
+        writer.queue_price(PriceChange(change['product_id'], change['variant_gid'], change['sku'], change['price']))
+        writer.queue_quantity(QuantityChange(change['inventory_item_id'], change['sku'], change['quantity']))
+        await writer.flush_if_full()
+    result = await writer.flush()
+    for sku, message in result.failed[:5]:
+        print(f"           hata: {sku}: {message}")
+    return len(result.failed)
+
+
+MODES = {'rest': write_rest, 'single': write_single, 'batched': write_batched}
+
+
+def run(mode, args):
+    with MockShopify(latency=args.latency, rest_leak_rate=args.leak_rate,
+                     graphql_restore_rate=args.restore_rate) as shop:
+        seed_store(shop, args.products, args.variants)
+        changes = build_changes(shop, args.bad)
+        shop.reset_stats()
+
+        async def main():
+            async with ShopifyClient(shop.base_url, ACCESS_TOKEN, leak_rate=args.leak_rate) as client:
+                client.graphql_limiter.restore_rate = args.restore_rate
+                return await MODES[mode](client, changes)
+
+        start = time.perf_counter()
+        failed = asyncio.run(main())
+        elapsed = time.perf_counter() - start
+        stats = shop.stats()
+    requests_made = stats['requests'] - stats['throttled']
+    print(f"{mode:>10} {len(changes):>8} {requests_made:>8} {requests_made / len(changes):>10.3f} "
+          f"{failed:>6} {elapsed:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, default=100, help="Mağazadaki ürün sayısı")
+    parser.add_argument('--variants', type=int, default=10, help="Ürün başına varyant sayısı")
+    parser.add_argument('--bad', type=int, default=3, help="Bilerek hatalı gönderilen kalem sayısı")
+    parser.add_argument('--latency', type=float, default=0.05, help="Sahte Shopify yanıt gecikmesi (sn)")
+    parser.add_argument('--leak-rate', type=float, default=20.0, help="REST kova boşalma hızı (istek/sn)")
+    parser.add_argument('--restore-rate', type=float, default=100.0, help="GraphQL puan yenilenme hızı (puan/sn)")
+    parser.add_argument('--mode', choices=sorted(MODES), action='append', help="Çalıştırılacak mod (varsayılan: hepsi)")
+    args = parser.parse_args()
+
+    print(f"{'mod':>10} {'varyant':>8} {'istek':>8} {'istek/var':>10} {'hata':>6} {'süre sn':>8}")
+    for mode in args.mode or ['rest', 'single', 'batched']:
+        run(mode, args)
+
+
+if __name__ == "__main__":
+    main()
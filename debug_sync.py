@@ -1,110 +1,158 @@
-import requests
+import argparse
+import glob
 import json
+import os
 
-def debug_sync_issue():
-    """Sync sorununu debug eder"""
-    
-    base_url = "https://vervegranxml.netlify.app/.netlify/functions/api"
-    
-    print("=== SYNC DEBUG TEST ===\n")
-    
-    # Test 1: Önce config durumunu kontrol et
-    print("1. Config durumu:")
-    try:
-        response = requests.get(f"{base_url}/config", timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            config = data.get('config', {})
-            print(f"   - Shopify URL: {config.get('shopifyUrl', 'YOK')}")
-            print(f"   - Admin Token: {'VAR' if config.get('shopifyAdminToken') else 'YOK'}")
-            print(f"   - XML URL: {config.get('xmlUrl', 'YOK')}")
+REPORT_DIR = os.environ.get('SYNC_REPORT_DIR', '.sync-reports')
+# src/utils/telemetry.ts LATENCY_BUCKETS_MS; eski raporlarda latencyBucketsMs yoksa kullanılır
+LATENCY_BUCKETS_MS = [25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+def list_reports(report_dir=REPORT_DIR):
+    """Koşu raporlarının yollarını eskiden yeniye sıralı döndürür (runId zaman damgasıyla başlar)"""
+    return sorted(glob.glob(os.path.join(report_dir, '*.json')))
+
+
+def load_report(ref, report_dir=REPORT_DIR):
+    """RUN: dosya yolu, runId (ya da öneki), 'latest' veya 'previous'"""
+    if os.path.isfile(ref):
+        path = ref
+    else:
+        reports = list_reports(report_dir)
+        if ref in ('latest', 'previous'):
+            needed = 1 if ref == 'latest' else 2
+            if len(reports) < needed:
+                raise SystemExit(f"{report_dir} içinde yeterli rapor yok ({len(reports)})")
+            path = reports[-needed]
         else:
-            print(f"   ❌ Config okunamadı: {response.status_code}")
-    except Exception as e:
-        print(f"   ❌ Config hatası: {e}")
-    
-    print()
-    
-    # Test 2: Sync request'in tam detayını gör
-    print("2. Sync request detayı:")
-    sync_data = {
-        "options": {
-            "testMode": True,
-            "maxProducts": 1
+            matches = [p for p in reports if os.path.basename(p).startswith(ref)]
+            if len(matches) != 1:
+                raise SystemExit(f"'{ref}' için {len(matches)} rapor bulundu")
+            path = matches[0]
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def percentile(stats, q, limits):
+    """Histogram kovalarından q yüzdeliğinin üst sınırı (ms); +Inf kovası için None"""
+    if not stats['count']:
+        return 0
+    target = q * stats['count']
+    cumulative = 0
+    for limit, n in zip(limits, stats['buckets']):
+        cumulative += n
+        if cumulative >= target:
+            return limit
+    return None
+
+
+def _fmt_ms(value):
+    if value is None:
+        return '>' + str(LATENCY_BUCKETS_MS[-1])
+    return f"{value:.0f}"
+
+
+def _fmt_delta(a, b):
+    if a is None or b is None:
+        return ''
+    delta = b - a
+    pct = f" ({100 * delta / a:+.0f}%)" if a else ''
+    return f"{delta:+.0f}{pct}"
+
+
+def endpoint_rows(report):
+    limits = report.get('latencyBucketsMs', LATENCY_BUCKETS_MS)
+    rows = {}
+    for endpoint, stats in report['endpoints'].items():
+        rows[endpoint] = {
+            'count': stats['count'],
+            'errors': stats['errors'],
+            'mean': stats['totalMs'] / stats['count'] if stats['count'] else 0,
+            'p50': percentile(stats, 0.5, limits),
+            'p95': percentile(stats, 0.95, limits),
         }
-    }
-    
-    headers = {
-        'Content-Type': 'application/json'
-    }
-    
-    try:
-        print(f"   URL: {base_url}/sync")
-        print(f"   Data: {json.dumps(sync_data, indent=2)}")
-        print(f"   Headers: {headers}")
-        
-        response = requests.post(f"{base_url}/sync", 
-                               json=sync_data,
-                               headers=headers,
-                               timeout=30)
-        
-        print(f"   Response Status: {response.status_code}")
-        print(f"   Response Headers: {dict(response.headers)}")
-        
-        try:
-            response_data = response.json()
-            print(f"   Response JSON:")
-            print(json.dumps(response_data, indent=4, ensure_ascii=False))
-        except:
-            print(f"   Response Text: {response.text}")
-            
-    except Exception as e:
-        print(f"   ❌ Sync request hatası: {e}")
-    
-    print()
-    
-    # Test 3: Basit config test
-    print("3. Minimal config test:")
-    test_config = {
-        "shopifyUrl": "https://test-store.myshopify.com",
-        "shopifyAdminToken": "shpat_test123"
-    }
-    
-    try:
-        # Config kaydet
-        config_response = requests.post(f"{base_url}/config", 
-                                      json=test_config,
-                                      headers={'Content-Type': 'application/json'},
-                                      timeout=10)
-        
-        if config_response.status_code == 200:
-            print("   ✅ Test config kaydedildi")
-            
-            # Hemen sync dene
-            sync_response = requests.post(f"{base_url}/sync", 
-                                        json={"options": {"testMode": True}},
-                                        headers={'Content-Type': 'application/json'},
-                                        timeout=30)
-            
-            print(f"   Sync Status: {sync_response.status_code}")
-            
-            if sync_response.status_code == 400:
-                sync_data = sync_response.json()
-                print(f"   Sync Error: {sync_data.get('message', 'Bilinmeyen hata')}")
-                
-                if 'debug' in sync_data:
-                    debug = sync_data['debug']
-                    print(f"   Debug Info:")
-                    print(f"   - Config Source: {debug.get('configSource', {})}")
-                    print(f"   - Has Store URL: {debug.get('hasStoreUrl', False)}")
-                    print(f"   - Has Token: {debug.get('hasToken', False)}")
-        else:
-            print(f"   ❌ Test config kaydedilemedi: {config_response.status_code}")
-            
-    except Exception as e:
-        print(f"   ❌ Minimal test hatası: {e}")
-    
-    print("\n=== SYNC DEBUG TAMAMLANDI ===")
+    return rows
+
+
+def show_report(report):
+    print(f"Koşu: {report['runId']}  başlangıç: {report['startedAt']}  süre: {report['durationMs'] / 1000:.1f} sn")
+    if report.get('labels'):
+        print("Etiketler: " + ", ".join(f"{k}={v}" for k, v in report['labels'].items()))
+
+    print(f"\n{'aşama':<20} {'adet':>6} {'toplam ms':>11} {'en uzun ms':>11}")
+    for stage, stats in sorted(report['stages'].items(), key=lambda item: -item[1]['totalMs']):
+        print(f"{stage:<20} {stats['count']:>6} {stats['totalMs']:>11.0f} {stats['maxMs']:>11.0f}")
+
+    print(f"\n{'uç nokta':<45} {'istek':>6} {'hata':>5} {'ort ms':>7} {'p50':>6} {'p95':>6}")
+    for endpoint, row in sorted(endpoint_rows(report).items(), key=lambda item: -item[1]['count']):
+        print(f"{endpoint:<45} {row['count']:>6} {row['errors']:>5} {row['mean']:>7.0f} "
+              f"{_fmt_ms(row['p50']):>6} {_fmt_ms(row['p95']):>6}")
+
+    print("\nSayaçlar:")
+    for name, value in sorted(report['counters'].items()):
+        print(f"  {name}: {value}")
+    print(f"Aktarılan bayt: gönderilen {report['bytes']['sent']}, alınan {report['bytes']['received']}")
+
+
+def diff_reports(a, b):
+    """İki koşuyu karşılaştırır; b'nin a'ya göre farkını yazar"""
+    print(f"A: {a['runId']}  ({a['durationMs'] / 1000:.1f} sn)")
+    print(f"B: {b['runId']}  ({b['durationMs'] / 1000:.1f} sn)  fark: {_fmt_delta(a['durationMs'], b['durationMs'])} ms")
+
+    print(f"\n{'aşama ms':<20} {'A':>10} {'B':>10} {'fark':>16}")
+    stages = sorted(set(a['stages']) | set(b['stages']))
+    deltas = []
+    for stage in stages:
+        ms_a = a['stages'].get(stage, {}).get('totalMs', 0)
+        ms_b = b['stages'].get(stage, {}).get('totalMs', 0)
+        deltas.append((ms_b - ms_a, stage))
+        print(f"{stage:<20} {ms_a:>10.0f} {ms_b:>10.0f} {_fmt_delta(ms_a, ms_b):>16}")
+
+    rows_a, rows_b = endpoint_rows(a), endpoint_rows(b)
+    empty = {'count': 0, 'errors': 0, 'mean': 0, 'p50': 0, 'p95': 0}
+    print(f"\n{'uç nokta':<45} {'istek A→B':>13} {'p50 A→B':>13} {'p95 A→B':>13}")
+    for endpoint in sorted(set(rows_a) | set(rows_b)):
+        ra, rb = rows_a.get(endpoint, empty), rows_b.get(endpoint, empty)
+        print(f"{endpoint:<45} {ra['count']:>6}→{rb['count']:<6} "
+              f"{_fmt_ms(ra['p50']):>6}→{_fmt_ms(rb['p50']):<6} {_fmt_ms(ra['p95']):>6}→{_fmt_ms(rb['p95']):<6}")
+
+    print(f"\n{'sayaç':<30} {'A':>8} {'B':>8} {'fark':>8}")
+    for name in sorted(set(a['counters']) | set(b['counters'])):
+        va, vb = a['counters'].get(name, 0), b['counters'].get(name, 0)
+        marker = '' if va == vb else f"{vb - va:+d}"
+        print(f"{name:<30} {va:>8} {vb:>8} {marker:>8}")
+    for direction in ('sent', 'received'):
+        va, vb = a['bytes'][direction], b['bytes'][direction]
+        print(f"{'bytes_' + direction:<30} {va:>8} {vb:>8} {vb - va:>+8d}")
+
+    if deltas:
+        worst, stage = max(deltas)
+        if worst > 0:
+            print(f"\nEn çok yavaşlayan aşama: {stage} ({worst:+.0f} ms)")
+
 
 if __name__ == "__main__":
-    debug_sync_issue()
+    parser = argparse.ArgumentParser(
+        description="Senkronizasyon koşu raporlarını (SYNC_REPORT_DIR, varsayılan .sync-reports) listeler ve karşılaştırır")
+    parser.add_argument('--dir', default=REPORT_DIR, help="Rapor dizini")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('list', help="Kayıtlı koşuları listeler")
+    show = sub.add_parser('show', help="Tek koşunun aşama, uç nokta ve sayaç dökümü")
+    show.add_argument('run', nargs='?', default='latest', help="Yol, runId öneki, latest ya da previous")
+    diff = sub.add_parser('diff', help="İki koşuyu karşılaştırır (varsayılan: previous → latest)")
+    diff.add_argument('run_a', nargs='?', default='previous')
+    diff.add_argument('run_b', nargs='?', default='latest')
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        for path in list_reports(args.dir):
+            with open(path, encoding='utf-8') as f:
+                report = json.load(f)
+            counters = report['counters']
+            status = 'HATA' if counters.get('failed_runs') else ''
+            print(f"{report['runId']}  {report['durationMs'] / 1000:>7.1f} sn  "
+                  f"{counters.get('shopify_requests', 0):>6} istek  {status}")
+    elif args.command == 'show':
+        show_report(load_report(args.run, args.dir))
+    else:
+        diff_reports(load_report(args.run_a, args.dir), load_report(args.run_b, args.dir))
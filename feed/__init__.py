@@ -0,0 +1,40 @@
+"""Sentos XML feed'i için ortak Python model ve yükleyicisi"""
+from .model import FeedProduct, FeedVariant
+from .delta import FeedDelta, build_snapshot, compute_delta, load_snapshot, save_snapshot
+from .fetch import DEFAULT_CACHE_DIR, FeedCache, FetchResult, fetch_feed
+from .loader import (
+    StringPool,
+    iter_product_elements,
+    iter_products,
+    load_products,
+    parse_int,
+    parse_price,
+    product_from_element,
+    variant_from_element,
+)
+from .transform import product_payload, slugify, transform_feed
+
+__all__ = [
+    'DEFAULT_CACHE_DIR',
+    'FeedDelta',
+    'FeedCache',
+    'FetchResult',
+    'fetch_feed',
+    'FeedProduct',
+    'FeedVariant',
+    'StringPool',
+    'build_snapshot',
+    'compute_delta',
+    'iter_product_elements',
+    'iter_products',
+    'load_products',
+    'load_snapshot',
+    'parse_int',
+    'parse_price',
+    'product_from_element',
+    'product_payload',
+    'save_snapshot',
+    'slugify',
+    'transform_feed',
+    'variant_from_element',
+]
@@ -0,0 +1,205 @@
+"""Feed'in sütunlu (NumPy dizileri) gösterimi ve vektörel istatistikleri.
+
+Ürün ve varyant alanları tipli dizilere yazılır: fiyatlar float64 (Türkçe
+ondalık zaten parse_price ile çözülmüş), stoklar int64, kategori/beden/renk
+gibi tekrar eden metinler sözlük kodlu int32. Kategori kırılımları,
+yüzdelikler ve sıfır stok maskeleri Python döngüsü olmadan hesaplanır.
+
+NumPy gerektirir; bu yüzden feed paketinden otomatik içe aktarılmaz.
+"""
+import numpy as np
+
+
+class _Dictionary:
+    """Metinleri sıra numarasına (kod) çeviren sözlük kodlayıcı"""
+
+    __slots__ = ('codes', 'values')
+
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def __call__(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class ColumnBuilder:
+    """FeedProduct'ları tek geçişte sütun listelerine ekler, sonunda dizilere çevirir"""
+
+    def __init__(self):
+        self.categories = _Dictionary()
+        self.brands = _Dictionary()
+        self.sizes = _Dictionary()
+        self.colors = _Dictionary()
+        self._product = {name: [] for name in (
+            'price', 'purchase_price', 'stock', 'category', 'brand', 'variant_count', 'image_count')}
+        self._variant = {name: [] for name in ('product', 'stock', 'size', 'color', 'has_barcode')}
+
+    def add(self, product):
+        index = len(self._product['price'])
+        columns = self._product
+        columns['price'].append(product.price)
+        columns['purchase_price'].append(product.purchase_price)
+        columns['stock'].append(product.stock)
+        columns['category'].append(self.categories(product.category))
+        columns['brand'].append(self.brands(product.brand))
+        columns['variant_count'].append(product.variant_count)
+        columns['image_count'].append(len(product.images) + sum(len(v.images) for v in product.variants))
+
+        variants = self._variant
+        for variant in product.variants:
+            variants['product'].append(index)
+            variants['stock'].append(variant.stock)
+            variants['size'].append(self.sizes(variant.option_value))
+            variants['color'].append(self.colors(variant.color))
+            variants['has_barcode'].append(bool(variant.barcode))
+
+    def build(self):
+        product = self._product
+        variant = self._variant
+        return FeedColumns(
+            price=np.array(product['price'], dtype=np.float64),
+            purchase_price=np.array(product['purchase_price'], dtype=np.float64),
+            stock=np.array(product['stock'], dtype=np.int64),
+            category=np.array(product['category'], dtype=np.int32),
+            brand=np.array(product['brand'], dtype=np.int32),
+            variant_count=np.array(product['variant_count'], dtype=np.int32),
+            image_count=np.array(product['image_count'], dtype=np.int32),
+            variant_product=np.array(variant['product'], dtype=np.int32),
+            variant_stock=np.array(variant['stock'], dtype=np.int64),
+            variant_size=np.array(variant['size'], dtype=np.int32),
+            variant_color=np.array(variant['color'], dtype=np.int32),
+            variant_has_barcode=np.array(variant['has_barcode'], dtype=bool),
+            category_names=list(self.categories.values),
+            brand_names=list(self.brands.values),
+            size_names=list(self.sizes.values),
+            color_names=list(self.colors.values),
+        )
+
+
+class FeedColumns:
+    """Ürün (product_*) ve varyant (variant_*) düzeyinde hizalı diziler"""
+
+    def __init__(self, price, purchase_price, stock, category, brand, variant_count, image_count,
+                 variant_product, variant_stock, variant_size, variant_color, variant_has_barcode,
+                 category_names, brand_names, size_names, color_names):
+        self.price = price
+        self.purchase_price = purchase_price
+        self.stock = stock
+        self.category = category
+        self.brand = brand
+        self.variant_count = variant_count
+        self.image_count = image_count
+        self.variant_product = variant_product
+        self.variant_stock = variant_stock
+        self.variant_size = variant_size
+        self.variant_color = variant_color
+        self.variant_has_barcode = variant_has_barcode
+        self.category_names = category_names
+        self.brand_names = brand_names
+        self.size_names = size_names
+        self.color_names = color_names
+
+    @classmethod
+    def from_products(cls, products):
+        builder = ColumnBuilder()
+        for product in products:
+            builder.add(product)
+        return builder.build()
+
+    def __len__(self):
+        return len(self.price)
+
+    @property
+    def effective_price(self):
+        """Geçerli fiyat; satış/indirimli fiyat 0 ise alış fiyatı (Shopify eşlemesiyle aynı)"""
+        return np.where(self.price > 0, self.price, self.purchase_price)
+
+
+def _group_medians(codes, values, group_count):
+    """Her kod için values medyanı (boş gruplar NaN); tek sıralamayla hesaplanır"""
+    medians = np.full(group_count, np.nan)
+    if len(values) == 0:
+        return medians
+    order = np.lexsort((values, codes))
+    sorted_values = values[order]
+    counts = np.bincount(codes, minlength=group_count)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    present = counts > 0
+    low = starts[present] + (counts[present] - 1) // 2
+    high = starts[present] + counts[present] // 2
+    medians[present] = (sorted_values[low] + sorted_values[high]) / 2
+    return medians
+
+
+def _round(value, digits=2):
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+def feed_analytics(columns, percentiles=(10, 25, 50, 75, 90)):
+    """Sütunlardan xml-analysis.json'a eklenen istatistikleri üretir"""
+    product_total = len(columns)
+    variant_total = len(columns.variant_stock)
+    price = columns.effective_price
+    priced = price[price > 0]
+
+    # Varyantsız ürünlerde stok ürün düzeyindedir
+    no_variants = np.bincount(columns.variant_product, minlength=product_total) == 0
+    stock_per_product = np.bincount(columns.variant_product, weights=columns.variant_stock,
+                                    minlength=product_total).astype(np.int64)
+    stock_per_product[no_variants] = columns.stock[no_variants]
+
+    zero_stock = columns.variant_stock <= 0
+    missing_barcode = ~columns.variant_has_barcode
+
+    group_count = len(columns.category_names)
+    variant_category = columns.category[columns.variant_product]
+    products_by_category = np.bincount(columns.category, minlength=group_count)
+    variants_by_category = np.bincount(columns.category, weights=columns.variant_count, minlength=group_count)
+    stock_by_category = np.bincount(columns.category, weights=stock_per_product, minlength=group_count)
+    zero_by_category = np.bincount(variant_category[zero_stock], minlength=group_count)
+    median_by_category = _group_medians(columns.category, price, group_count)
+
+    by_category = [
+        {
+            'category': columns.category_names[code],
+            'products': int(products_by_category[code]),
+            'variants': int(variants_by_category[code]),
+            'stock': int(stock_by_category[code]),
+            'zero_stock_variants': int(zero_by_category[code]),
+            'median_price': _round(median_by_category[code]),
+        }
+        for code in np.argsort(-products_by_category, kind='stable')
+    ]
+
+    size_counts = np.bincount(columns.variant_size, minlength=len(columns.size_names))
+    return {
+        'products': product_total,
+        'variants': variant_total,
+        'stock_total': int(stock_per_product.sum()),
+        'out_of_stock_products': int((stock_per_product <= 0).sum()),
+        'price': {
+            'priced_products': int(len(priced)),
+            'zero_price_products': int(product_total - len(priced)),
+            'min': _round(priced.min()) if len(priced) else None,
+            'max': _round(priced.max()) if len(priced) else None,
+            'mean': _round(priced.mean()) if len(priced) else None,
+            'percentiles': {
+                f"p{p}": _round(value)
+                for p, value in zip(percentiles, np.percentile(priced, percentiles) if len(priced) else [np.nan] * len(percentiles))
+            },
+        },
+        'zero_stock_variants': int(zero_stock.sum()),
+        'zero_stock_ratio': round(float(zero_stock.mean()), 4) if variant_total else 0.0,
+        'missing_barcode_variants': int(missing_barcode.sum()),
+        'images_per_product': _round(columns.image_count.mean()) if product_total else None,
+        'by_category': by_category,
+        'by_size': {
+            columns.size_names[code]: int(size_counts[code])
+            for code in np.argsort(-size_counts, kind='stable')
+        },
+    }
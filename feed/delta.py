@@ -0,0 +1,138 @@
+"""İki feed sürümü arasındaki SKU bazlı farkları hesaplayan delta motoru.
+
+Snapshot, her ürün için içerik hash'i, fiyat üçlüsü ve varyant stoklarından
+oluşan küçük bir sözlüktür:
+    {"version": 1, "products": {urun_id: {"h": icerik_hash, "p": [satis, indirimli, alis],
+                                          "v": {varyant_anahtari: stok}}}}
+Varyant anahtarı stok_kodu, yoksa barkod, o da yoksa "<urun_id>#<sıra>" olur.
+"""
+import gzip
+import hashlib
+import json
+
+SNAPSHOT_VERSION = 1
+
+
+def variant_key(product, index, variant):
+    """Varyantı feed sürümleri arasında eşlemek için kullanılan anahtar"""
+    return variant.sku or variant.barcode or f"{product.id}#{index}"
+
+
+def content_hash(product):
+    """Fiyat ve stok dışındaki normalize alanların kısa hash'i"""
+    parts = [
+        product.name, product.subtitle, product.description, product.category, product.brand,
+        '\x1e'.join(product.images),
+    ]
+    for variant in product.variants:
+        parts.append('\x1e'.join((
+            variant.sku, variant.barcode, variant.option_name, variant.option_value, variant.color,
+            '\x1d'.join(variant.images),
+        )))
+    return hashlib.blake2b('\x1f'.join(parts).encode('utf-8'), digest_size=8).hexdigest()
+
+
+def build_snapshot(products):
+    """FeedProduct listesinden karşılaştırılabilir snapshot üretir"""
+    entries = {}
+    for product in products:
+        variants = {}
+        if product.variants:
+            for index, variant in enumerate(product.variants):
+                variants[variant_key(product, index, variant)] = variant.stock
+        else:
+            variants[product.sku or product.barcode or f"{product.id}#0"] = product.stock
+
+        entries[product.id] = {
+            'h': content_hash(product),
+            'p': [product.sale_price, product.discount_price, product.purchase_price],
+            'v': variants,
+        }
+    return {'version': SNAPSHOT_VERSION, 'products': entries}
+
+
+def save_snapshot(snapshot, path):
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False, separators=(',', ':'))
+
+
+def load_snapshot(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        snapshot = json.load(f)
+    if snapshot.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(f"Desteklenmeyen snapshot sürümü: {snapshot.get('version')}")
+    return snapshot
+
+
+class FeedDelta:
+    """İki snapshot arasındaki fark kümeleri.
+
+    added/removed/price_changed/stock_changed varyant anahtarlarını,
+    content_changed ve removed_products ürün id'lerini içerir.
+    """
+
+    __slots__ = ('added', 'removed', 'price_changed', 'stock_changed', 'content_changed',
+                 'added_products', 'removed_products')
+
+    def __init__(self):
+        self.added = set()
+        self.removed = set()
+        self.price_changed = set()
+        self.stock_changed = set()
+        self.content_changed = set()
+        self.added_products = set()
+        self.removed_products = set()
+
+    @property
+    def is_empty(self):
+        return not any(getattr(self, name) for name in self.__slots__)
+
+    def changed_products(self, new_snapshot):
+        """Herhangi bir değişiklik içeren (yeni sürümde var olan) ürün id'leri"""
+        changed_keys = self.added | self.price_changed | self.stock_changed
+        product_ids = set(self.content_changed) | self.added_products
+        for product_id, entry in new_snapshot['products'].items():
+            if product_id not in product_ids and not changed_keys.isdisjoint(entry['v']):
+                product_ids.add(product_id)
+        return product_ids
+
+    def summary(self):
+        return {name: len(getattr(self, name)) for name in self.__slots__}
+
+    def to_dict(self):
+        return {name: sorted(getattr(self, name)) for name in self.__slots__}
+
+
+def compute_delta(old_snapshot, new_snapshot):
+    """old -> new geçişindeki eklenen/silinen/fiyatı/stoğu/içeriği değişen kümeleri hesaplar"""
+    delta = FeedDelta()
+    old_products = old_snapshot['products']
+    new_products = new_snapshot['products']
+
+    old_variants = {}
+    for entry in old_products.values():
+        old_variants.update(entry['v'])
+
+    new_keys = set()
+    for product_id, entry in new_products.items():
+        old_entry = old_products.get(product_id)
+        if old_entry is None:
+            delta.added_products.add(product_id)
+        else:
+            if old_entry['h'] != entry['h']:
+                delta.content_changed.add(product_id)
+            price_changed = old_entry['p'] != entry['p']
+
+        for key, stock in entry['v'].items():
+            new_keys.add(key)
+            if key not in old_variants:
+                delta.added.add(key)
+                continue
+            if old_variants[key] != stock:
+                delta.stock_changed.add(key)
+            if old_entry is not None and price_changed and key in old_entry['v']:
+                delta.price_changed.add(key)
+
+    delta.removed = set(old_variants) - new_keys
+    delta.removed_products = set(old_products) - set(new_products)
+    return delta
@@ -0,0 +1,165 @@
+"""Koşullu (ETag / Last-Modified) feed indirme ve disk önbelleği.
+
+Her feed URL'i için önbellek dizininde üç dosya tutulur:
+    <anahtar>.xml.gz         son indirilen gövde (gzip ile sıkıştırılmış)
+    <anahtar>.meta.json      etag, last_modified, sha256
+    <anahtar>.products.pickle  o gövdenin parse edilmiş FeedProduct listesi
+    <anahtar>.snapshot.json.gz Node tarafının (api.js / feedCache.ts) yazdığı parse edilmiş
+                               ürün listesi ve önceden hesaplanmış istatistikler
+
+Sunucu 304 döndürürse ya da yeni gövdenin sha256'sı değişmediyse parse
+atlanır ve önbellekteki ürün listesi döndürülür.
+"""
+import collections
+import gzip
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+import requests
+
+from .loader import load_products
+
+DEFAULT_CACHE_DIR = '.feed-cache'
+SNAPSHOT_VERSION = 1
+
+FetchResult = collections.namedtuple(
+    'FetchResult', ['products', 'status', 'sha256', 'body_path', 'etag', 'last_modified']
+)
+FetchResult.__doc__ = """fetch_feed sonucu.
+
+status: 'not-modified' (304, indirme yok), 'unchanged' (200 ama gövde aynı,
+parse yok) ya da 'updated' (yeni gövde indirildi ve parse edildi).
+"""
+
+
+class FeedCache:
+    """Bir önbellek dizinindeki feed dosyalarını yönetir"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _path(self, url, suffix):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, key + suffix)
+
+    def body_path(self, url):
+        return self._path(url, '.xml.gz')
+
+    def read_meta(self, url):
+        try:
+            with open(self._path(url, '.meta.json'), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def write_meta(self, url, meta):
+        self._atomic_write(self._path(url, '.meta.json'), json.dumps(meta).encode('utf-8'))
+
+    def read_products(self, url, sha256):
+        """Gövde hash'i eşleşiyorsa önbellekteki parse sonucunu döndürür, yoksa None"""
+        try:
+            with open(self._path(url, '.products.pickle'), 'rb') as f:
+                cached_sha256, products = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return None
+        return products if cached_sha256 == sha256 else None
+
+    def snapshot_path(self, url):
+        return self._path(url, '.snapshot.json.gz')
+
+    def read_snapshot(self, url):
+        """Node tarafının yazdığı anlık görüntüyü döndürür; yoksa ya da sürümü farklıysa None.
+
+        Anahtarlar: products (xml2js ile parse edilmiş <Urun> sözlükleri), stats
+        (productCount, variantCount, totalStock, topCategories, samples, ...), sha256, fetchedAt (ms).
+        """
+        try:
+            with gzip.open(self.snapshot_path(url), 'rt', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError, EOFError):
+            return None
+        if snapshot.get('version') != SNAPSHOT_VERSION or snapshot.get('url') != url:
+            return None
+        return snapshot
+
+    def write_products(self, url, sha256, products):
+        self._atomic_write(self._path(url, '.products.pickle'),
+                           pickle.dumps((sha256, products), protocol=pickle.HIGHEST_PROTOCOL))
+
+    def _atomic_write(self, path, data):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+def _download_body(response, cache, chunk_size=1 << 16):
+    """Yanıtı parça parça okuyup sıkıştırılmış olarak diske yazar, sha256 döndürür"""
+    os.makedirs(cache.cache_dir, exist_ok=True)
+    digest = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=cache.cache_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6) as out:
+            # iter_content gzip/deflate aktarım kodlamasını kendisi çözer
+            for chunk in response.iter_content(chunk_size):
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return tmp_path, digest.hexdigest()
+
+
+def fetch_feed(url, cache_dir=DEFAULT_CACHE_DIR, timeout=30, session=None, parse=True):
+    """Feed'i koşullu olarak indirir ve parse edilmiş ürünleri döndürür.
+
+    parse=False verilirse sadece gövde önbelleği güncellenir ve products None
+    döner; gövdeyi başka bir araçla okumak isteyenler body_path'i kullanır.
+    """
+    cache = FeedCache(cache_dir)
+    meta = cache.read_meta(url)
+    body_path = cache.body_path(url)
+    has_body = bool(meta.get('sha256')) and os.path.exists(body_path)
+
+    headers = {'Accept-Encoding': 'gzip, deflate'}
+    if has_body:
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+    http = session or requests
+    with http.get(url, headers=headers, timeout=timeout, stream=True) as response:
+        if response.status_code == 304 and has_body:
+            status = 'not-modified'
+            sha256 = meta['sha256']
+        else:
+            response.raise_for_status()
+            tmp_path, sha256 = _download_body(response, cache)
+            if has_body and sha256 == meta['sha256']:
+                os.unlink(tmp_path)
+                status = 'unchanged'
+            else:
+                os.replace(tmp_path, body_path)
+                status = 'updated'
+            meta = {
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'sha256': sha256,
+            }
+            cache.write_meta(url, meta)
+
+    products = None
+    if parse:
+        products = cache.read_products(url, sha256)
+        if products is None:
+            with gzip.open(body_path, 'rb') as f:
+                products = load_products(f)
+            cache.write_products(url, sha256, products)
+
+    return FetchResult(products, status, sha256, body_path, meta.get('etag'), meta.get('last_modified'))
@@ -0,0 +1,142 @@
+"""Feed resim URL'leri için kalıcı indeks ve eşzamanlı HEAD yoklayıcısı.
+
+URL'ler tüm feed genelinde tekilleştirilir (aynı urunres/... adresi bir
+rengin her varyantında tekrar eder). Her URL'nin ETag / Last-Modified /
+Content-Length bilgisi sınırlı eşzamanlılıkla HEAD istekleriyle toplanır;
+bilinen ETag varsa If-None-Match gönderilir ve 304 değişmemiş sayılır.
+Ürün başına son yüklenen resim listesinin parmak izi tutulur, böylece
+senkronizasyon sadece yeni ya da değişmiş resimleri Shopify'a gönderir.
+TypeScript karşılığı: src/utils/imageIndex.ts
+"""
+import asyncio
+import collections
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import httpx
+
+INDEX_VERSION = 1
+
+ImageRecord = collections.namedtuple('ImageRecord', ['etag', 'last_modified', 'content_length', 'checked_at'])
+ProbeResult = collections.namedtuple('ProbeResult', ['probed', 'changed', 'unchanged', 'failed'])
+
+
+def collect_image_urls(products):
+    """FeedProduct'lardaki (ürün ve varyant) resim URL'lerini ilk görülme sırasıyla tekrarsız döndürür"""
+    urls = {}
+    for product in products:
+        for url in product.images:
+            urls[url] = None
+        for variant in product.variants:
+            for url in variant.images:
+                urls[url] = None
+    return list(urls)
+
+
+def _version(record):
+    return record.etag or record.last_modified or str(record.content_length or '')
+
+
+class ImageIndex:
+    """URL -> ImageRecord ve handle -> yüklenen resimlerin parmak izi"""
+
+    def __init__(self, path):
+        self.path = path
+        self.images = {}
+        self.products = {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path):
+        index = cls(path)
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return index
+        if data.get('version') == INDEX_VERSION:
+            index.images = {url: ImageRecord(**record) for url, record in data['images'].items()}
+            index.products = data['products']
+        return index
+
+    def save(self):
+        if not self._dirty:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        data = {
+            'version': INDEX_VERSION,
+            'images': {url: record._asdict() for url, record in self.images.items()},
+            'products': self.products,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def record(self, url, record):
+        """Kaydı günceller; içerik sürümü değiştiyse True döner"""
+        previous = self.images.get(url)
+        self.images[url] = record
+        self._dirty = True
+        return previous is None or _version(previous) != _version(record)
+
+    def fingerprint(self, urls):
+        digest = hashlib.sha1()
+        for url in urls:
+            record = self.images.get(url)
+            digest.update(f"{url}|{_version(record) if record else '?'}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def needs_upload(self, handle, urls):
+        """Ürünün resimleri son yüklemeden bu yana değiştiyse (ya da hiç yüklenmediyse) True"""
+        return self.products.get(handle) != self.fingerprint(urls)
+
+    def mark_uploaded(self, handle, urls):
+        self.products[handle] = self.fingerprint(urls)
+        self._dirty = True
+
+
+async def probe_images(index, urls, concurrency=16, timeout=10, client=None):
+    """URL'leri en fazla `concurrency` eşzamanlı HEAD isteğiyle yoklar.
+
+    Yoklanamayan URL'lerin eski kaydı korunur; geçici bir hata tüm resimlerin
+    yeniden yüklenmesine yol açmaz.
+    """
+    changed, failed = [], []
+    counts = {'probed': 0, 'unchanged': 0}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def probe(client, url):
+        previous = index.images.get(url)
+        headers = {'If-None-Match': previous.etag} if previous and previous.etag else {}
+        async with semaphore:
+            try:
+                response = await client.head(url, headers=headers)
+            except httpx.HTTPError:
+                failed.append(url)
+                return
+        counts['probed'] += 1
+        if response.status_code == 304 and previous:
+            index.record(url, previous._replace(checked_at=time.time()))
+            counts['unchanged'] += 1
+            return
+        if response.status_code >= 400:
+            failed.append(url)
+            return
+        length = response.headers.get('content-length')
+        record = ImageRecord(response.headers.get('etag'), response.headers.get('last-modified'),
+                             int(length) if length is not None else None, time.time())
+        if index.record(url, record):
+            changed.append(url)
+        else:
+            counts['unchanged'] += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with (client or httpx.AsyncClient(timeout=timeout, limits=limits)) as session:
+        await asyncio.gather(*(probe(session, url) for url in urls))
+    return ProbeResult(counts['probed'], changed, counts['unchanged'], failed)
@@ -0,0 +1,137 @@
+"""Sentos XML feed'ini FeedProduct/FeedVariant nesnelerine dönüştüren yükleyici.
+
+Her Urun düğümü iterparse ile tek seferde okunur, tek/çoklu Varyant ve resim
+farkı burada normalize edilir. Marka, kategori, renk, beden ve resim URL'leri
+gibi tekrar eden değerler StringPool ile tek bir string nesnesine indirgenir.
+"""
+import xml.etree.ElementTree as ET
+
+from .model import FeedProduct, FeedVariant
+
+
+class StringPool:
+    """Tekrar eden stringleri tek nesnede toplayan basit interner"""
+
+    __slots__ = ('_strings',)
+
+    def __init__(self):
+        self._strings = {}
+
+    def __call__(self, value):
+        return self._strings.setdefault(value, value)
+
+    def __len__(self):
+        return len(self._strings)
+
+
+def parse_price(text):
+    """Türkçe fiyat metnini float'a çevirir: '1.190,00' -> 1190.0, '190.00' -> 190.0"""
+    if not text:
+        return 0.0
+    if ',' in text:
+        text = text.replace('.', '').replace(',', '.')
+    try:
+        return float(text)
+    except ValueError:
+        return 0.0
+
+
+def parse_int(text):
+    """Stok gibi tam sayı alanlarını çevirir, geçersiz değerlerde 0 döner"""
+    try:
+        return int(text)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _text(element):
+    return (element.text or '').strip()
+
+
+def _images(resimler_element, pool):
+    return tuple(pool(url) for url in (_text(r) for r in resimler_element.iter('resim')) if url)
+
+
+def variant_from_element(element, pool):
+    """Bir Varyant elementini FeedVariant'a çevirir"""
+    fields = {}
+    images = ()
+    for child in element:
+        if child.tag == 'resimler':
+            images = _images(child, pool)
+        else:
+            fields[child.tag] = _text(child)
+
+    return FeedVariant(
+        option_name=pool(fields.get('Varyant_isim', '')),
+        option_value=pool(fields.get('Varyant_deger', '')),
+        color=pool(fields.get('renk', '')),
+        sku=fields.get('stok_kodu', ''),
+        barcode=fields.get('barkod', ''),
+        stock=parse_int(fields.get('stok')),
+        images=images,
+    )
+
+
+def product_from_element(element, pool):
+    """Bir Urun elementini FeedProduct'a çevirir"""
+    fields = {}
+    images = ()
+    variants = ()
+    for child in element:
+        tag = child.tag
+        if tag == 'Varyantlar':
+            variants = tuple(variant_from_element(v, pool) for v in child.iter('Varyant'))
+        elif tag == 'resimler':
+            images = _images(child, pool)
+        else:
+            fields[tag] = _text(child)
+
+    get = fields.get
+    return FeedProduct(
+        id=get('id', ''),
+        sku=get('stok_kodu', ''),
+        barcode=get('barkod', ''),
+        category_id=pool(get('kategori_id', '')),
+        category=pool(get('kategori_ismi', '')),
+        name=get('urunismi', ''),
+        subtitle=get('alt_baslik', ''),
+        description=get('detayaciklama', ''),
+        stock=parse_int(get('stok')),
+        brand=pool(get('marka', '')),
+        vat=parse_price(get('kdv')),
+        purchase_price=parse_price(get('alis_fiyati')),
+        sale_price=parse_price(get('satis_fiyati')),
+        discount_price=parse_price(get('indirimli_fiyat')),
+        variant_names=pool(get('varyant_isimleri', '')),
+        color_names=pool(get('renk_isimleri', '')),
+        images=images,
+        variants=variants,
+    )
+
+
+def iter_product_elements(source):
+    """Urunler/Urun elementlerini tek tek üretir (iterparse).
+
+    source bir dosya yolu ya da binary dosya benzeri nesne olabilir. Her ürün
+    işlendikten sonra kök elementten temizlenir; böylece bellekte aynı anda
+    sadece o an işlenen ürün bulunur.
+    """
+    context = ET.iterparse(source, events=('start', 'end'))
+    _, root = next(context)
+    for event, element in context:
+        if event == 'end' and element.tag == 'Urun':
+            yield element
+            root.clear()
+
+
+def iter_products(source, pool=None):
+    """Feed'deki ürünleri FeedProduct olarak sırayla üretir"""
+    pool = pool if pool is not None else StringPool()
+    for element in iter_product_elements(source):
+        yield product_from_element(element, pool)
+
+
+def load_products(source, pool=None):
+    """Feed'in tamamını FeedProduct listesine yükler"""
+    return list(iter_products(source, pool))
@@ -0,0 +1,75 @@
+"""Sentos XML feed'i için sıkıştırılmış (__slots__) ürün ve varyant sınıfları.
+
+XML alanlarının karşılıkları:
+    FeedProduct: id, stok_kodu -> sku, barkod -> barcode, kategori_id -> category_id,
+                 kategori_ismi -> category, urunismi -> name, alt_baslik -> subtitle,
+                 detayaciklama -> description, stok -> stock, marka -> brand,
+                 kdv -> vat, alis_fiyati -> purchase_price, satis_fiyati -> sale_price,
+                 indirimli_fiyat -> discount_price, varyant_isimleri -> variant_names,
+                 renk_isimleri -> color_names, resimler/resim -> images
+    FeedVariant: Varyant_isim -> option_name, Varyant_deger -> option_value, renk -> color,
+                 stok_kodu -> sku, barkod -> barcode, stok -> stock, resimler/resim -> images
+"""
+
+
+class FeedVariant:
+    """Bir Urun/Varyantlar/Varyant düğümü"""
+
+    __slots__ = ('option_name', 'option_value', 'color', 'sku', 'barcode', 'stock', 'images')
+
+    def __init__(self, option_name, option_value, color, sku, barcode, stock, images=()):
+        self.option_name = option_name
+        self.option_value = option_value
+        self.color = color
+        self.sku = sku
+        self.barcode = barcode
+        self.stock = stock
+        self.images = images
+
+    def __repr__(self):
+        return f"FeedVariant(sku={self.sku!r}, option_value={self.option_value!r}, stock={self.stock})"
+
+
+class FeedProduct:
+    """Bir Urunler/Urun düğümü; varyantları her zaman tuple olarak tutar"""
+
+    __slots__ = (
+        'id', 'sku', 'barcode', 'category_id', 'category', 'name', 'subtitle', 'description',
+        'stock', 'brand', 'vat', 'purchase_price', 'sale_price', 'discount_price',
+        'variant_names', 'color_names', 'images', 'variants',
+    )
+
+    def __init__(self, id, sku, barcode, category_id, category, name, subtitle, description,
+                 stock, brand, vat, purchase_price, sale_price, discount_price,
+                 variant_names, color_names, images=(), variants=()):
+        self.id = id
+        self.sku = sku
+        self.barcode = barcode
+        self.category_id = category_id
+        self.category = category
+        self.name = name
+        self.subtitle = subtitle
+        self.description = description
+        self.stock = stock
+        self.brand = brand
+        self.vat = vat
+        self.purchase_price = purchase_price
+        self.sale_price = sale_price
+        self.discount_price = discount_price
+        self.variant_names = variant_names
+        self.color_names = color_names
+        self.images = images
+        self.variants = variants
+
+    @property
+    def variant_count(self):
+        """Varyant sayısı; varyantsız ürünler 1 varyant sayılır"""
+        return len(self.variants) or 1
+
+    @property
+    def price(self):
+        """Geçerli satış fiyatı: indirimli fiyat, yoksa satış fiyatı"""
+        return self.discount_price if self.discount_price > 0 else self.sale_price
+
+    def __repr__(self):
+        return f"FeedProduct(id={self.id!r}, name={self.name!r}, variants={len(self.variants)})"
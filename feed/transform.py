@@ -0,0 +1,178 @@
+"""Sentos feed'ini Shopify ürün yüklerine (NDJSON) dönüştüren çok süreçli boru hattı.
+
+Eşleme analyze_shopify.py'daki xml_to_shopify_mapping'dir: handle ürün adından
+slug, etiketler kategori yolunun '>' ile bölünmüş parçaları + marka, fiyat
+indirimli/satış fiyatı (0 ise alış fiyatı), seçenekler Renk ve Beden.
+
+Ana süreç feed'i ayrıştırmadan, sadece <Urun>...</Urun> sınırlarından bayt
+parçalarına böler; her parçayı bir işçi süreç ayrıştırıp dönüştürür ve NDJSON
+satırları olarak geri verir. Parçalar feed sırasıyla yazılır.
+"""
+import gzip
+import json
+import multiprocessing
+import re
+import time
+import unicodedata
+import xml.etree.ElementTree as ET
+
+from .loader import StringPool, product_from_element
+
+PRODUCT_OPEN = b'<Urun>'
+PRODUCT_CLOSE = b'</Urun>'
+
+_TURKISH = str.maketrans({'ı': 'i', 'İ': 'i', 'ş': 's', 'Ş': 's', 'ğ': 'g', 'Ğ': 'g',
+                          'ü': 'u', 'Ü': 'u', 'ö': 'o', 'Ö': 'o', 'ç': 'c', 'Ç': 'c'})
+_NON_SLUG = re.compile(r'[^a-z0-9]+')
+
+
+def slugify(text):
+    """Türkçe karakterleri sadeleştirip URL slug'ı üretir: 'Büyük Beden Şık' -> 'buyuk-beden-sik'"""
+    text = unicodedata.normalize('NFKD', text.translate(_TURKISH)).encode('ascii', 'ignore').decode('ascii')
+    return _NON_SLUG.sub('-', text.lower()).strip('-')
+
+
+def split_category(category):
+    """'Giyim > Büyük Beden > Pantolon' -> ['Giyim', 'Büyük Beden', 'Pantolon']"""
+    return [part.strip() for part in category.split('>') if part.strip()]
+
+
+def _unique(values):
+    return list(dict.fromkeys(value for value in values if value))
+
+
+def product_payload(product):
+    """FeedProduct'ı Shopify REST ürün yüküne çevirir"""
+    categories = split_category(product.category)
+    price = product.price if product.price > 0 else product.purchase_price
+    price_text = f"{price:.2f}"
+
+    variants = [
+        {
+            'title': f"{variant.color or 'Varsayılan'} / {variant.option_value or 'Tek Beden'}",
+            'price': price_text,
+            'sku': variant.sku,
+            'inventory_quantity': variant.stock,
+            'inventory_management': 'shopify',
+            'barcode': variant.barcode,
+            'option1': variant.color or 'Varsayılan',
+            'option2': variant.option_value or 'Tek Beden',
+        }
+        for variant in product.variants
+    ] or [{
+        'title': 'Varsayılan',
+        'price': price_text,
+        'sku': product.sku or product.id,
+        'inventory_quantity': product.stock,
+        'inventory_management': 'shopify',
+        'barcode': product.barcode,
+        'option1': 'Varsayılan',
+    }]
+
+    options = [{'name': 'Renk', 'values': _unique(v['option1'] for v in variants)}]
+    sizes = _unique(v.get('option2') for v in variants)
+    if sizes:
+        options.append({'name': 'Beden', 'values': sizes})
+
+    image_urls = _unique([*product.images, *(url for variant in product.variants for url in variant.images)])
+    return {
+        'title': product.name,
+        'body_html': product.description,
+        'vendor': product.brand,
+        'product_type': categories[-1] if categories else '',
+        'status': 'active',
+        'tags': ','.join(_unique([*categories, product.brand])),
+        'handle': slugify(product.name),
+        'variants': variants,
+        'options': options,
+        'images': [{'src': url, 'alt': product.name, 'position': n} for n, url in enumerate(image_urls, 1)],
+    }
+
+
+def iter_chunks(stream, products_per_chunk=500, read_size=1 << 20):
+    """Binary akıştan products_per_chunk ürünlük ham <Urun> bayt parçaları üretir.
+
+    Ürünler XML olarak ayrıştırılmaz; sadece açılış/kapanış etiketleri aranır.
+    Dönen her parça (ürün sayısı, bayt) çiftidir.
+    """
+    buffer = b''
+    pending = []
+    while True:
+        block = stream.read(read_size)
+        buffer += block
+        position = 0
+        while True:
+            start = buffer.find(PRODUCT_OPEN, position)
+            if start < 0:
+                break
+            end = buffer.find(PRODUCT_CLOSE, start)
+            if end < 0:
+                break
+            end += len(PRODUCT_CLOSE)
+            pending.append(buffer[start:end])
+            position = end
+            if len(pending) >= products_per_chunk:
+                yield len(pending), b''.join(pending)
+                pending = []
+        buffer = buffer[position:]
+        if not block:
+            break
+    if pending:
+        yield len(pending), b''.join(pending)
+
+
+def transform_chunk(chunk):
+    """İşçi süreçte çalışır: bir bayt parçasını NDJSON satırlarına çevirir"""
+    count, data = chunk
+    root = ET.fromstring(b'<Urunler>' + data + b'</Urunler>')
+    pool = StringPool()
+    lines = []
+    variants = 0
+    for element in root.iter('Urun'):
+        payload = product_payload(product_from_element(element, pool))
+        variants += len(payload['variants'])
+        lines.append(json.dumps(payload, ensure_ascii=False))
+    return count, variants, ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def open_feed(path):
+    """Düz ya da .gz sıkıştırılmış feed dosyasını binary açar"""
+    return gzip.open(path, 'rb') if path.endswith('.gz') else open(path, 'rb')
+
+
+def transform_feed(source, output, workers=None, products_per_chunk=500):
+    """Feed'i dönüştürüp NDJSON olarak output'a (binary akış) yazar.
+
+    workers=1 ise havuz kurulmadan aynı süreçte çalışır. Dönen sözlükte
+    ürün/varyant sayısı, süre ve saniyedeki ürün sayısı bulunur.
+    """
+    workers = workers or multiprocessing.cpu_count()
+    start = time.perf_counter()
+    products = variants = 0
+    chunks = iter_chunks(source, products_per_chunk)
+
+    if workers == 1:
+        results = map(transform_chunk, chunks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers)
+        # imap sırayı korur; sonuçlar hazır oldukça yazılır
+        results = pool.imap(transform_chunk, chunks)
+    try:
+        for count, variant_count, data in results:
+            output.write(data)
+            products += count
+            variants += variant_count
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    elapsed = time.perf_counter() - start
+    return {
+        'products': products,
+        'variants': variants,
+        'workers': workers,
+        'seconds': round(elapsed, 3),
+        'products_per_second': round(products / elapsed, 1) if elapsed else 0.0,
+    }
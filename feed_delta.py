@@ -0,0 +1,64 @@
+import argparse
+import json
+import os
+
+from feed import DEFAULT_CACHE_DIR, build_snapshot, compute_delta, fetch_feed, load_products, load_snapshot, save_snapshot
+
+FEED_URL = 'https://stildiva.sentos.com.tr/xml-sentos-out/1'
+
+
+def run_delta(url=FEED_URL, feed_file=None, snapshot_path='feed-snapshot.json.gz',
+              output_path='feed-delta.json', save=True):
+    """Feed'i önceki snapshot ile karşılaştırır, farkları JSON olarak kaydeder"""
+    print("Feed delta hesaplanıyor...")
+
+    if feed_file:
+        products = load_products(feed_file)
+    else:
+        result = fetch_feed(url, cache_dir=DEFAULT_CACHE_DIR)
+        print(f"Feed önbelleği: {result.status}")
+        products = result.products
+
+    new_snapshot = build_snapshot(products)
+    print(f"Yeni snapshot: {len(new_snapshot['products'])} ürün")
+
+    if os.path.exists(snapshot_path):
+        old_snapshot = load_snapshot(snapshot_path)
+    else:
+        print(f"{snapshot_path} bulunamadı, tüm ürünler yeni kabul ediliyor.")
+        old_snapshot = {'version': new_snapshot['version'], 'products': {}}
+
+    delta = compute_delta(old_snapshot, new_snapshot)
+
+    print("\n=== DELTA ÖZETİ ===")
+    print(f"Eklenen varyant: {len(delta.added)} ({len(delta.added_products)} ürün)")
+    print(f"Silinen varyant: {len(delta.removed)} ({len(delta.removed_products)} ürün)")
+    print(f"Fiyatı değişen varyant: {len(delta.price_changed)}")
+    print(f"Stoğu değişen varyant: {len(delta.stock_changed)}")
+    print(f"İçeriği değişen ürün: {len(delta.content_changed)}")
+    print(f"Gönderilmesi gereken ürün: {len(delta.changed_products(new_snapshot))}")
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            "summary": delta.summary(),
+            "changed_products": sorted(delta.changed_products(new_snapshot)),
+            **delta.to_dict()
+        }, f, ensure_ascii=False, indent=2)
+    print(f"\nFarklar {output_path} dosyasına kaydedildi.")
+
+    if save:
+        save_snapshot(new_snapshot, snapshot_path)
+        print(f"Snapshot {snapshot_path} dosyasına kaydedildi.")
+
+    return delta
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sentos feed'inin iki sürümü arasındaki SKU bazlı farkları hesaplar")
+    parser.add_argument('--url', default=FEED_URL, help="Feed URL'i")
+    parser.add_argument('--file', help="URL yerine yerel bir XML dosyası kullan")
+    parser.add_argument('--snapshot', default='feed-snapshot.json.gz', help="Karşılaştırılacak/güncellenecek snapshot")
+    parser.add_argument('--output', default='feed-delta.json', help="Fark çıktısı")
+    parser.add_argument('--no-save', action='store_true', help="Snapshot'ı güncelleme")
+    args = parser.parse_args()
+    run_delta(args.url, args.file, args.snapshot, args.output, save=not args.no_save)
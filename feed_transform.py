@@ -0,0 +1,41 @@
+import argparse
+import sys
+
+from feed import DEFAULT_CACHE_DIR, fetch_feed, transform_feed
+from feed.transform import open_feed
+
+FEED_URL = 'https://stildiva.sentos.com.tr/xml-sentos-out/1'
+
+
+def run_transform(url=FEED_URL, feed_file=None, output_path='-', workers=None, chunk_size=500):
+    """Feed'i Shopify ürün yüklerine çevirip NDJSON olarak dosyaya ya da stdout'a yazar"""
+    if feed_file:
+        path = feed_file
+    else:
+        result = fetch_feed(url, cache_dir=DEFAULT_CACHE_DIR, parse=False)
+        print(f"Feed önbelleği: {result.status}", file=sys.stderr)
+        path = result.body_path
+
+    output = sys.stdout.buffer if output_path == '-' else open(output_path, 'wb')
+    try:
+        with open_feed(path) as source:
+            stats = transform_feed(source, output, workers=workers, products_per_chunk=chunk_size)
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
+
+    print(f"{stats['products']} ürün, {stats['variants']} varyant dönüştürüldü: "
+          f"{stats['seconds']} sn, {stats['products_per_second']} ürün/sn ({stats['workers']} süreç)",
+          file=sys.stderr)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sentos feed'ini Shopify ürün yüklerine (NDJSON) dönüştürür")
+    parser.add_argument('--url', default=FEED_URL, help="Feed URL'i")
+    parser.add_argument('--file', help="URL yerine yerel bir XML (ya da .xml.gz) dosyası kullan")
+    parser.add_argument('--output', default='-', help="NDJSON çıktısı ('-' = stdout)")
+    parser.add_argument('--workers', type=int, help="İşçi süreç sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument('--chunk-size', type=int, default=500, help="Parça başına ürün sayısı")
+    args = parser.parse_args()
+    run_transform(args.url, args.file, args.output, args.workers, args.chunk_size)
@@ -0,0 +1,7 @@
+// Fan-out rotası ayrı function olarak: /api/sync/fanout buraya yönlendirilir (netlify.toml).
+// Sadece routes/fanout.js yüklenir; config, Shopify kontrol ve XML rotaları pakete girmez.
+const { createRouter } = require('../lib/router');
+
+exports.handler = createRouter([
+  ['POST', '/sync/fanout', () => require('../lib/routes/fanout').syncFanout]
+], { basePath: '/sync/fanout' });
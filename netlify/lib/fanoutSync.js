@@ -0,0 +1,250 @@
+// Çoklu feed -> çoklu mağaza senkronizasyonu (POST /sync/fanout).
+// Her feed bir kez indirilip parse edilir (paylaşılan anlık görüntü, feedSnapshot.js); ürünler her
+// mağaza için ayrı dönüştürülüp yazılır. Her mağazanın kendi çağrı limiti bütçesi (limiter) ve
+// parmak izi taraması vardır, mağazalar eşzamanlı ilerler: toplam süre tüm (feed, mağaza)
+// çiftlerinin toplamını değil en yavaş mağazayı izler. Bir mağazanın feed'leri sırayla işlenir.
+// Her çift ayrı bir devam ettirilebilir iştir (syncJobs.js); çiftlerin iş kimlikleri bir fan-out
+// kaydında (SYNC_JOB_DIR/fanout) tutulur. Kayıt ve çiftlerin iş durumları yanıtta resumeToken olarak
+// da döner; Lambda'da sonraki çağrı başka kapsayıcıya düşerse devam token'dan yapılır.
+// Erişim anahtarları diske ve token'a yazılmaz, her çağrıda gönderilir.
+const crypto = require('crypto');
+const fs = require('fs/promises');
+const path = require('path');
+const { createShopifyLimiter } = require('./shopifyRateLimit');
+const { shopifyBaseUrl } = require('./shopUrl');
+const { getFeedSnapshot } = require('./feedSnapshot');
+const { FINGERPRINT_FALLBACKS, createProductSyncer, loadRemoteProducts, productKey } = require('./productSync');
+const {
+  alignJob,
+  createJob,
+  decodeState,
+  encodeState,
+  jobDir,
+  jobState,
+  jobSummary,
+  resumeJob,
+  runJobSlice,
+  saveJob
+} = require('./syncJobs');
+
+const FANOUT_VERSION = 1;
+
+const fanoutDir = () => path.join(jobDir(), 'fanout');
+const fanoutPath = id => path.join(fanoutDir(), `${id}.json`);
+
+/**
+ * İstek gövdesini doğrular: { feeds: [url], stores: [{ shopUrl, accessToken, feeds?: [url] }] }.
+ * Mağazada feeds verilmezse tüm feed'ler o mağazaya yazılır. Geçersizse Error fırlatır.
+ */
+function normalizePlan({ feeds, stores } = {}) {
+  if (!Array.isArray(feeds) || feeds.length === 0 || !feeds.every(url => typeof url === 'string' && url)) {
+    throw new Error('feeds en az bir feed URL\'i içeren bir liste olmalı');
+  }
+  if (!Array.isArray(stores) || stores.length === 0) {
+    throw new Error('stores en az bir mağaza içeren bir liste olmalı');
+  }
+  const uniqueFeeds = Array.from(new Set(feeds));
+  const seen = new Set();
+  const normalizedStores = stores.map((store, index) => {
+    if (!store || !store.shopUrl || !store.accessToken) {
+      throw new Error(`stores[${index}]: shopUrl ve accessToken gerekli`);
+    }
+    const shop = shopifyBaseUrl(store.shopUrl);
+    if (seen.has(shop)) throw new Error(`Mağaza iki kez tanımlanmış: ${shop}`);
+    seen.add(shop);
+    const storeFeeds = store.feeds === undefined ? uniqueFeeds : Array.from(new Set(store.feeds));
+    const unknown = storeFeeds.filter(url => !uniqueFeeds.includes(url));
+    if (unknown.length) throw new Error(`stores[${index}]: feeds listesinde olmayan feed: ${unknown.join(', ')}`);
+    return { shop, accessToken: store.accessToken, feeds: storeFeeds };
+  });
+  return { feeds: uniqueFeeds, stores: normalizedStores };
+}
+
+// Aynı plan (feed'ler ve mağaza -> feed eşlemesi) aynı fan-out kaydına devam eder
+function planHash(plan) {
+  const shape = plan.stores.map(store => [store.shop, store.feeds]);
+  return crypto.createHash('sha1').update(JSON.stringify([plan.feeds, shape])).digest('hex');
+}
+
+async function loadFanout(id) {
+  if (!/^[0-9a-f]{16}$/.test(String(id))) return null;
+  try {
+    const record = JSON.parse(await fs.readFile(fanoutPath(id), 'utf-8'));
+    return record.version === FANOUT_VERSION ? record : null;
+  } catch {
+    return null;
+  }
+}
+
+async function saveFanout(record) {
+  record.updatedAt = new Date().toISOString();
+  await fs.mkdir(fanoutDir(), { recursive: true });
+  const tmpPath = `${fanoutPath(record.id)}.${process.pid}.tmp`;
+  await fs.writeFile(tmpPath, JSON.stringify(record));
+  await fs.rename(tmpPath, fanoutPath(record.id));
+}
+
+// Diskteki kayıt ile token'daki kayıttan daha çok ilerlemiş olanı
+async function resumeFanout(id, carried) {
+  const stored = await loadFanout(id);
+  const valid = carried && carried.version === FANOUT_VERSION && carried.id === id ? carried : null;
+  if (!valid) return stored;
+  return stored && stored.invocations >= valid.invocations ? stored : valid;
+}
+
+// Aynı plan için yarım kalmış en son fan-out kaydı
+async function findResumableFanout(hash) {
+  let names;
+  try {
+    names = await fs.readdir(fanoutDir());
+  } catch {
+    return null;
+  }
+  const records = await Promise.all(names.filter(name => name.endsWith('.json')).map(name => loadFanout(name.slice(0, -5))));
+  return records
+    .filter(record => record && record.status === 'running' && record.planHash === hash)
+    .sort((a, b) => b.updatedAt.localeCompare(a.updatedAt))[0] || null;
+}
+
+async function syncStore(record, store, snapshots, { deadline, onFingerprintsUnavailable, jobs }) {
+  const started = Date.now();
+  const limiter = createShopifyLimiter();
+  const pairs = record.pairs[store.shop] || (record.pairs[store.shop] = {});
+  const feeds = [];
+  let syncProduct = null;
+  let fingerprints = null;
+
+  for (const feedUrl of store.feeds) {
+    let job = pairs[feedUrl] ? await resumeJob(pairs[feedUrl], { state: jobs[pairs[feedUrl]] }) : null;
+    // Kayıt başka mağazanın işini gösteriyorsa yok sayılır, çift için yeni iş açılır
+    if (job && job.shop !== store.shop) job = null;
+    if (job) jobs[job.id] = jobState(job);
+    if (job && job.status === 'done') {
+      feeds.push(jobSummary(job));
+      continue;
+    }
+    if (Date.now() >= deadline) {
+      feeds.push(job ? jobSummary(job) : { feedUrl, status: 'pending', done: false });
+      continue;
+    }
+    // Parmak izleri ve ürün adımı mağaza başına bir kez hazırlanır, feed'ler arasında paylaşılır
+    if (!syncProduct) {
+      const remoteProducts = await loadRemoteProducts({
+        limiter,
+        shopifyBase: store.shop,
+        accessToken: store.accessToken,
+        onUnavailable: onFingerprintsUnavailable
+      });
+      fingerprints = remoteProducts ? 'ok' : 'unavailable';
+      syncProduct = createProductSyncer({ limiter, shopifyBase: store.shop, accessToken: store.accessToken, remoteProducts });
+    }
+
+    const { products } = snapshots.get(feedUrl);
+    const keys = products.map(productKey);
+    if (job) {
+      alignJob(job, keys);
+    } else {
+      job = createJob({ shop: store.shop, feedUrl, keys });
+      pairs[feedUrl] = job.id;
+      await saveJob(job);
+    }
+    await runJobSlice(job, products, { keyOf: productKey, worker: syncProduct, limiter, deadline });
+    jobs[job.id] = jobState(job);
+    feeds.push(jobSummary(job));
+  }
+
+  return {
+    shop: store.shop,
+    done: feeds.every(feed => feed.done),
+    // null: bu çağrıda yazılacak feed kalmadı, parmak izleri okunmadı
+    fingerprints,
+    feeds,
+    elapsedMs: Date.now() - started,
+    rateLimit: limiter.stats()
+  };
+}
+
+/**
+ * Planı süre bütçesi içinde ilerletir. fanoutId verilirse o kayıt, verilmezse aynı plan için
+ * yarım kalmış son kayıt devam ettirilir (restart: true ile yeni kayıt açılır). Sonuçtaki done
+ * false ise aynı gövdeyle (fanoutId ve resumeToken ile) tekrar çağrılmalıdır. Bir mağazanın parmak izleri
+ * okunamazsa o mağaza hata ile durur; onFingerprintsUnavailable: 'rewrite' ürünlerini yeniden yazar.
+ */
+async function runFanoutSync(body, { deadline = Infinity } = {}) {
+  const started = Date.now();
+  const plan = normalizePlan(body);
+  const onFingerprintsUnavailable = body.onFingerprintsUnavailable || 'fail';
+  if (!FINGERPRINT_FALLBACKS.includes(onFingerprintsUnavailable)) {
+    throw new Error('onFingerprintsUnavailable \'fail\' ya da \'rewrite\' olmalı');
+  }
+  const hash = planHash(plan);
+
+  // Token: { record, jobs: { işKimliği: iş durumu } }
+  const carried = decodeState(body.resumeToken) || {};
+  const jobs = carried.jobs && typeof carried.jobs === 'object' ? carried.jobs : {};
+  const fanoutId = body.fanoutId || (carried.record && carried.record.id);
+
+  let record = null;
+  if (fanoutId) {
+    record = await resumeFanout(fanoutId, carried.record);
+    if (!record) throw new Error(`Fan-out işi bulunamadı: ${fanoutId}`);
+    if (record.planHash !== hash) throw new Error('Fan-out işi farklı bir feed/mağaza planıyla başlatılmış');
+  } else if (!body.restart) {
+    record = await findResumableFanout(hash);
+  }
+  if (!record) {
+    const now = new Date().toISOString();
+    record = {
+      version: FANOUT_VERSION,
+      id: crypto.randomBytes(8).toString('hex'),
+      planHash: hash,
+      status: 'running',
+      createdAt: now,
+      updatedAt: now,
+      invocations: 0,
+      feeds: plan.feeds,
+      stores: plan.stores.map(store => ({ shop: store.shop, feeds: store.feeds })),
+      // mağaza -> feed URL -> syncJobs iş kimliği
+      pairs: {}
+    };
+  }
+  record.invocations++;
+
+  // Feed'ler eşzamanlı indirilir, her biri bir kez parse edilir ve tüm mağazalarca paylaşılır
+  const snapshots = new Map();
+  const feedInfo = await Promise.all(plan.feeds.map(async url => {
+    const snapshot = await getFeedSnapshot(url);
+    snapshots.set(url, snapshot);
+    return { url, productCount: snapshot.products.length, source: snapshot.source };
+  }));
+
+  const stores = await Promise.all(plan.stores.map(store =>
+    syncStore(record, store, snapshots, { deadline, onFingerprintsUnavailable, jobs }).catch(error => ({
+      shop: store.shop,
+      done: false,
+      ...(error.code === 'FINGERPRINTS_UNAVAILABLE' ? { fingerprints: 'unavailable' } : {}),
+      error: error.message
+    }))
+  ));
+
+  record.status = stores.every(store => store.done) ? 'done' : 'running';
+  await saveFanout(record);
+  // Sadece bu kaydın çiftlerinin işleri token'a girer
+  const pairIds = new Set(Object.values(record.pairs).flatMap(pairs => Object.values(pairs)));
+  const pairJobs = Object.fromEntries(Object.entries(jobs).filter(([id]) => pairIds.has(id)));
+  return {
+    fanoutId: record.id,
+    resumeToken: encodeState({ record, jobs: pairJobs }),
+    done: record.status === 'done',
+    invocations: record.invocations,
+    elapsedMs: Date.now() - started,
+    feeds: feedInfo,
+    stores
+  };
+}
+
+module.exports = {
+  loadFanout,
+  normalizePlan,
+  runFanoutSync
+};
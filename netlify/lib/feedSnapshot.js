@@ -0,0 +1,191 @@
+// /xml/stats, /xml/analyze, /sync ve /sync/start'ın paylaştığı parse edilmiş feed önbelleği.
+// Feed bir kez indirilip xml2js ile parse edilir; ürün listesi ve önceden hesaplanmış
+// istatistikler bellekte (sıcak function örneği) ve diskte (<anahtar>.snapshot.json.gz) tutulur.
+// TTL (FEED_CACHE_TTL_MS, varsayılan 5 dk) içinde feed'e hiç gidilmez; TTL dolunca koşullu
+// istek (ETag / Last-Modified) atılır, gövde değişmediyse yeniden parse edilmez.
+// Anlık görüntü düzeni src/utils/feedCache.ts ile aynıdır; analyze_xml.py --snapshot aynı
+// dosyayı indirme yapmadan okur.
+// axios ve xml2js ilk indirmede/parse'ta yüklenir: anlık görüntü bellekten ya da diskten
+// okunduğunda function soğuk başlangıcı bu modülleri hiç yüklemez.
+const crypto = require('crypto');
+const fs = require('fs/promises');
+const os = require('os');
+const path = require('path');
+const zlib = require('zlib');
+const { promisify } = require('util');
+
+const gzip = promisify(zlib.gzip);
+const gunzip = promisify(zlib.gunzip);
+
+const SNAPSHOT_VERSION = 1;
+const DEFAULT_TTL_MS = 5 * 60 * 1000;
+
+// Lambda'da sadece tmp yazılabilir; yerelde Python araçlarıyla aynı .feed-cache dizini
+const cacheDir = () => path.resolve(process.env.FEED_CACHE_DIR ||
+  (process.env.AWS_LAMBDA_FUNCTION_NAME ? path.join(os.tmpdir(), 'feed-cache') : '.feed-cache'));
+const snapshotPath = url => path.join(cacheDir(), `${crypto.createHash('sha1').update(url).digest('hex').slice(0, 16)}.snapshot.json.gz`);
+
+// url -> anlık görüntü (bellekte) ve devam eden yüklemeler (aynı anda gelen istekler paylaşır)
+const memory = new Map();
+const pending = new Map();
+
+const asArray = value => (value === undefined || value === null || value === '' ? [] : Array.isArray(value) ? value : [value]);
+
+function computeFeedStats(products) {
+  let variantCount = 0;
+  let totalStock = 0;
+  const categories = {};
+  for (const product of products) {
+    const variants = asArray(product.Varyantlar && product.Varyantlar.Varyant);
+    // Varyantı olmayan ürün kendisi bir varyant sayılır
+    variantCount += variants.length || 1;
+    for (const variant of variants.length ? variants : [product]) totalStock += parseInt(variant.stok, 10) || 0;
+    const category = product.kategori_ismi || '';
+    categories[category] = (categories[category] || 0) + 1;
+  }
+
+  const sample = products[0] || null;
+  return {
+    productCount: products.length,
+    variantCount,
+    totalStock,
+    categoryCount: Object.keys(categories).length,
+    topCategories: Object.entries(categories).sort((a, b) => b[1] - a[1]).slice(0, 10)
+      .map(([name, count]) => ({ name, products: count })),
+    samples: products.slice(0, 5).map(p => ({
+      id: p.id,
+      name: p.urunismi,
+      price: p.satis_fiyati || p.alis_fiyati,
+      variants: asArray(p.Varyantlar && p.Varyantlar.Varyant).length || 1
+    })),
+    sampleProductKeys: sample ? Object.keys(sample) : [],
+    productAnalysis: sample ? {
+      totalFields: Object.keys(sample).length,
+      fieldNames: Object.keys(sample).slice(0, 10),
+      hasId: !!sample.id,
+      hasName: !!sample.urunismi,
+      hasPrice: !!(sample.alis_fiyati || sample.satis_fiyati),
+      hasStock: !!sample.stok,
+      hasCategory: !!sample.kategori_ismi,
+      hasImage: !!sample.resimler,
+      hasVariants: !!sample.Varyantlar,
+      xmlFormat: 'Sentos XML Format',
+      variantStructure: 'Nested Varyantlar/Varyant'
+    } : {}
+  };
+}
+
+async function readSnapshot(url) {
+  try {
+    const snapshot = JSON.parse((await gunzip(await fs.readFile(snapshotPath(url)))).toString('utf-8'));
+    return snapshot.version === SNAPSHOT_VERSION && snapshot.url === url ? snapshot : null;
+  } catch {
+    return null;
+  }
+}
+
+async function writeSnapshot(snapshot) {
+  try {
+    await fs.mkdir(cacheDir(), { recursive: true });
+    const filePath = snapshotPath(snapshot.url);
+    const tmpPath = `${filePath}.${process.pid}.tmp`;
+    await fs.writeFile(tmpPath, await gzip(JSON.stringify(snapshot)));
+    await fs.rename(tmpPath, filePath);
+  } catch (error) {
+    // Disk yazılamıyorsa bellek önbelleği yine çalışır
+    console.warn('Feed anlık görüntüsü diske yazılamadı:', error.message);
+  }
+}
+
+async function loadSnapshot(url, { force, timeout }) {
+  const previous = memory.get(url) || await readSnapshot(url);
+  const headers = {
+    'User-Agent': 'Mozilla/5.0 (compatible; ShopifyXMLSync/1.0)',
+    'Accept': 'application/xml, text/xml, */*'
+  };
+  if (previous && !force) {
+    if (previous.etag) headers['If-None-Match'] = previous.etag;
+    if (previous.lastModified) headers['If-Modified-Since'] = previous.lastModified;
+  }
+
+  const response = await require('axios').get(url, {
+    timeout,
+    headers,
+    responseType: 'arraybuffer',
+    validateStatus: status => (status >= 200 && status < 300) || status === 304
+  });
+
+  let snapshot;
+  if (response.status === 304 && previous) {
+    snapshot = { ...previous, fetchedAt: Date.now(), source: 'not-modified' };
+  } else {
+    const body = Buffer.from(response.data);
+    const sha256 = crypto.createHash('sha256').update(body).digest('hex');
+    const meta = {
+      etag: response.headers['etag'] || null,
+      lastModified: response.headers['last-modified'] || null,
+      fetchedAt: Date.now(),
+      dataLength: body.length
+    };
+    if (previous && previous.sha256 === sha256 && !force) {
+      snapshot = { ...previous, ...meta, source: 'unchanged' };
+    } else {
+      const parsed = await require('xml2js').parseStringPromise(body.toString('utf-8'), { explicitArray: false, trim: true });
+      const products = asArray(parsed && parsed.Urunler && parsed.Urunler.Urun);
+      snapshot = {
+        version: SNAPSHOT_VERSION,
+        url,
+        sha256,
+        ...meta,
+        parsedAt: Date.now(),
+        stats: computeFeedStats(products),
+        products,
+        source: 'updated'
+      };
+    }
+  }
+  await writeSnapshot(snapshot);
+  memory.set(url, snapshot);
+  return snapshot;
+}
+
+/**
+ * Feed'in parse edilmiş anlık görüntüsü: { products, stats, sha256, fetchedAt, source, ... }.
+ * ttlMs içinde alınmış bir görüntü (bellek ya da disk) varsa feed'e gidilmez.
+ * source: 'memory' | 'disk' | 'not-modified' | 'unchanged' | 'updated'
+ */
+async function getFeedSnapshot(url, { ttlMs, force = false, timeout = 25000 } = {}) {
+  const ttl = ttlMs === undefined ? Number(process.env.FEED_CACHE_TTL_MS) || DEFAULT_TTL_MS : ttlMs;
+  if (!force) {
+    const cached = memory.get(url);
+    if (cached && Date.now() - cached.fetchedAt < ttl) return { ...cached, source: 'memory' };
+    if (!cached) {
+      const disk = await readSnapshot(url);
+      if (disk) {
+        memory.set(url, disk);
+        if (Date.now() - disk.fetchedAt < ttl) return { ...disk, source: 'disk' };
+      }
+    }
+  }
+  if (!pending.has(url)) {
+    pending.set(url, loadSnapshot(url, { force, timeout }).finally(() => pending.delete(url)));
+  }
+  return pending.get(url);
+}
+
+// Önbelleği boşaltır; url verilmezse bellekteki tüm feed'ler (disk sadece bilinen url'ler için)
+async function invalidateFeedSnapshot(url) {
+  const urls = url ? [url] : Array.from(memory.keys());
+  for (const item of urls) {
+    memory.delete(item);
+    await fs.rm(snapshotPath(item), { force: true });
+  }
+  return urls.length;
+}
+
+module.exports = {
+  computeFeedStats,
+  getFeedSnapshot,
+  invalidateFeedSnapshot,
+  snapshotPath
+};
@@ -0,0 +1,162 @@
+// Ürün içerik parmak izleri: durumsuz function'larda değişmeyen ürünleri yazmadan atlamak için.
+// Feed ürününün normalize edilmiş alanlarının (başlık, detayaciklama, fiyatlar, kategori,
+// varyant stok/fiyat demetleri, resim URL kümesi) özeti ürün yazılırken bir metafield'a
+// (xml_sync.fingerprint) yazılır. Senkronizasyon başında tüm ürünlerin parmak izleri sayfalı
+// tek bir GraphQL taramasıyla okunur; özeti aynı olan ürünler için hiçbir yazma isteği atılmaz.
+const crypto = require('crypto');
+
+// Normalizasyon kuralları ya da alan listesi değişirse artırılmalı (tüm ürünler bir kez yeniden yazılır)
+const FINGERPRINT_VERSION = 1;
+const FINGERPRINT_NAMESPACE = 'xml_sync';
+const FINGERPRINT_KEY = 'fingerprint';
+const PAGE_SIZE = 100;
+
+const asArray = value => (value === undefined || value === null || value === '' ? [] : Array.isArray(value) ? value : [value]);
+const text = value => String(value === undefined || value === null ? '' : value).replace(/\s+/g, ' ').trim();
+
+// "1.250,00" / "1250.00" / "1250" -> "1250.00"; boş ya da geçersizse ''
+function normalizePrice(value) {
+  let clean = text(value);
+  if (clean.includes(',')) clean = clean.replace(/\./g, '').replace(',', '.');
+  const price = parseFloat(clean);
+  return Number.isFinite(price) ? price.toFixed(2) : '';
+}
+
+function imageUrls(item) {
+  return asArray(item && item.resimler && item.resimler.resim).map(text).filter(Boolean);
+}
+
+/** Feed ürününün (xml2js çıktısı) içerik özeti: "v1:<sha256>" */
+function productFingerprint(xmlProduct) {
+  const variants = asArray(xmlProduct.Varyantlar && xmlProduct.Varyantlar.Varyant);
+  const images = new Set(imageUrls(xmlProduct));
+  const tuples = (variants.length ? variants : [xmlProduct]).map(variant => {
+    imageUrls(variant).forEach(url => images.add(url));
+    return [
+      text(variant.stok_kodu),
+      text(variant.barkod),
+      String(parseInt(variant.stok, 10) || 0),
+      normalizePrice(variant.satis_fiyati),
+      text(variant.renk),
+      text(variant.Varyant_deger)
+    ].join('\u0001');
+  }).sort();
+
+  const normalized = JSON.stringify([
+    text(xmlProduct.urunismi),
+    text(xmlProduct.detayaciklama),
+    text(xmlProduct.aciklama),
+    text(xmlProduct.kategori_ismi),
+    text(xmlProduct.marka),
+    normalizePrice(xmlProduct.alis_fiyati),
+    normalizePrice(xmlProduct.satis_fiyati),
+    normalizePrice(xmlProduct.indirimli_fiyat),
+    tuples,
+    Array.from(images).sort()
+  ]);
+  return `v${FINGERPRINT_VERSION}:${crypto.createHash('sha256').update(normalized).digest('hex')}`;
+}
+
+/**
+ * REST ürün gövdesine eklenecek metafield. Mevcut metafield'ın ID'si biliniyorsa o güncellenir,
+ * bilinmiyorsa namespace/key ile yazılır.
+ */
+function fingerprintMetafield(fingerprint, metafieldId = null) {
+  return metafieldId
+    ? { id: metafieldId, value: fingerprint, type: 'single_line_text_field' }
+    : { namespace: FINGERPRINT_NAMESPACE, key: FINGERPRINT_KEY, value: fingerprint, type: 'single_line_text_field' };
+}
+
+const PRODUCT_FIELDS = `
+      legacyResourceId
+      title
+      metafield(namespace: "${FINGERPRINT_NAMESPACE}", key: "${FINGERPRINT_KEY}") { legacyResourceId value }
+      variants(first: 1) { nodes { legacyResourceId sku } }`;
+
+const FINGERPRINTS_QUERY = `
+query fingerprints($after: String) {
+  products(first: ${PAGE_SIZE}, after: $after) {
+    pageInfo { hasNextPage endCursor }
+    nodes {${PRODUCT_FIELDS}
+    }
+  }
+}`;
+
+// Tek başlık için: Shopify araması kelime bazlıdır, tam eşleşme sonuçlar arasında aranır
+const FINGERPRINT_BY_TITLE_QUERY = `
+query fingerprintByTitle($query: String) {
+  products(first: 10, query: $query) {
+    nodes {${PRODUCT_FIELDS}
+    }
+  }
+}`;
+
+function remoteEntry(product) {
+  const variant = product.variants.nodes[0] || null;
+  return {
+    id: Number(product.legacyResourceId),
+    fingerprint: product.metafield ? product.metafield.value : null,
+    metafieldId: product.metafield ? Number(product.metafield.legacyResourceId) : null,
+    variantId: variant ? Number(variant.legacyResourceId) : null,
+    sku: variant ? variant.sku : null
+  };
+}
+
+/**
+ * Mağazadaki tüm ürünleri sayfalı tek bir taramayla okur.
+ * Döner: { size, bySku: SKU -> kayıt, byTitle: başlık -> kayıtlar }; kayıt
+ * { id, fingerprint, metafieldId, variantId, sku }. Ürünler ilk varyantın SKU'suyla eşlenir
+ * (aynı SKU'da birden çok ürün varsa ilki geçerlidir); eşleme için findRemoteProduct kullanılır.
+ * graphql(query, variables) GraphQL data alanını döndürmelidir (stockSync.shopifyGraphql).
+ */
+async function fetchRemoteFingerprints(graphql) {
+  const remoteProducts = { size: 0, bySku: new Map(), byTitle: new Map() };
+  let after = null;
+  do {
+    const data = await graphql(FINGERPRINTS_QUERY, { after });
+    for (const product of data.products.nodes) {
+      const entry = remoteEntry(product);
+      const title = text(product.title);
+      const sku = text(entry.sku);
+      if (sku && !remoteProducts.bySku.has(sku)) remoteProducts.bySku.set(sku, entry);
+      if (remoteProducts.byTitle.has(title)) remoteProducts.byTitle.get(title).push(entry);
+      else remoteProducts.byTitle.set(title, [entry]);
+      remoteProducts.size++;
+    }
+    after = data.products.pageInfo.hasNextPage ? data.products.pageInfo.endCursor : null;
+  } while (after);
+  return remoteProducts;
+}
+
+/**
+ * Feed ürününün mağazadaki karşılığı; yoksa undefined. Önce SKU ile aranır. Aynı başlıktaki
+ * SKU'lu ürünler başka feed kalemlerine aittir (aynı adlı renkler birbirinin üzerine yazılmaz);
+ * SKU'suz eski ürünler başlıkla bir kez sahiplenilir. SKU'su olmayan feed ürünü başlıkla eşlenir.
+ */
+function findRemoteProduct(remoteProducts, { sku, title }) {
+  const wantedSku = text(sku);
+  if (wantedSku && remoteProducts.bySku.has(wantedSku)) return remoteProducts.bySku.get(wantedSku);
+  const sameTitle = remoteProducts.byTitle.get(text(title)) || [];
+  if (!wantedSku) return sameTitle[0];
+  const index = sameTitle.findIndex(entry => !text(entry.sku));
+  return index === -1 ? undefined : sameTitle.splice(index, 1)[0];
+}
+
+/** Tek ürünün kaydı (başlıkla); tüm mağazayı taramadan, yoksa null */
+async function fetchRemoteFingerprint(graphql, title) {
+  const wanted = text(title);
+  const escaped = wanted.replace(/\\/g, '\\\\').replace(/"/g, '\\"');
+  const data = await graphql(FINGERPRINT_BY_TITLE_QUERY, { query: `title:"${escaped}"` });
+  const product = data.products.nodes.find(node => text(node.title) === wanted);
+  return product ? remoteEntry(product) : null;
+}
+
+module.exports = {
+  FINGERPRINT_KEY,
+  FINGERPRINT_NAMESPACE,
+  fetchRemoteFingerprint,
+  fetchRemoteFingerprints,
+  findRemoteProduct,
+  fingerprintMetafield,
+  productFingerprint
+};
@@ -0,0 +1,172 @@
+// Tek mağaza için ürün yazma adımı (/sync/start ve /sync/fanout ortak kullanır).
+// Feed ürünü mağazaya göre dönüştürülür; ürün SKU'suyla (stok_kodu yoksa başlıkla) eşlenir,
+// varsa güncellenir, yoksa oluşturulur. Parmak izi mağazadakiyle aynı olan ürün için hiçbir istek atılmaz.
+const { shopifyGraphql } = require('./stockSync');
+const {
+  fetchRemoteFingerprints,
+  findRemoteProduct,
+  fingerprintMetafield,
+  productFingerprint
+} = require('./productFingerprint');
+
+const API_VERSION = '2024-07';
+
+// İş kayıtlarındaki ürün anahtarı (tamamlanan ürünler bununla atlanır)
+const productKey = (product, index) => String(product.stok_kodu || product.urunismi || `#${index}`);
+
+// Parmak izleri okunamadığında: 'fail' senkronizasyonu durdurur, 'rewrite' her ürünü
+// başlıkla arayıp (SKU'su eşleşeni seçerek) yeniden yazar (değişmeyen ürünler de yazılır)
+const FINGERPRINT_FALLBACKS = ['fail', 'rewrite'];
+
+/**
+ * Mağazadaki ürünlerin parmak izlerini tek taramada okur.
+ * Okunamazsa (ör. yetki) onUnavailable 'fail' (varsayılan) ise code'u FINGERPRINTS_UNAVAILABLE
+ * olan bir Error fırlatır; 'rewrite' ise null döner ve her ürün eskisi gibi başlıkla aranıp yazılır.
+ * graphql verilirse sorgular onunla atılır (planlayıcı maliyeti ölçmek için kullanır).
+ */
+async function loadRemoteProducts({ limiter, shopifyBase, accessToken, onUnavailable = 'fail', graphql = null }) {
+  if (!FINGERPRINT_FALLBACKS.includes(onUnavailable)) {
+    throw new Error(`onFingerprintsUnavailable 'fail' ya da 'rewrite' olmalı: ${onUnavailable}`);
+  }
+  try {
+    const remoteProducts = await fetchRemoteFingerprints(graphql || ((query, variables) =>
+      shopifyGraphql(limiter, shopifyBase, accessToken, query, variables)));
+    console.log(`Shopify parmak izleri okundu (${shopifyBase}): ${remoteProducts.size} ürün`);
+    return remoteProducts;
+  } catch (error) {
+    if (onUnavailable === 'rewrite') {
+      console.log(`Parmak izleri okunamadı (${shopifyBase}), tüm ürünler yazılacak:`, error.message);
+      return null;
+    }
+    const unavailable = new Error(`Shopify parmak izleri okunamadı (${shopifyBase}): ${error.message}. ` +
+      'Tüm ürünleri yeniden yazmak için onFingerprintsUnavailable: \'rewrite\' gönderin');
+    unavailable.code = 'FINGERPRINTS_UNAVAILABLE';
+    throw unavailable;
+  }
+}
+
+/**
+ * runJobSlice için ürün adımı: (product, index) -> { action, productId }.
+ * Adım idempotenttir; kayıttan önce kesilen bir parça tekrar çalışırsa oluşturulan ürün
+ * bulunup güncellenir. onWritten({ title, action, productId, price, stock }) yazılan her ürün için çağrılır.
+ * log: ürün başına mesajlar (kuru çalıştırmada susturulur).
+ */
+function createProductSyncer({ limiter, shopifyBase, accessToken, remoteProducts = null, onWritten = null, log = console.log }) {
+  const requestHeaders = { 'X-Shopify-Access-Token': accessToken, 'Content-Type': 'application/json' };
+
+  return async (product, index) => {
+    // Fiyatı düzelt (Türkçe format: "1.250,00" -> "1250.00")
+    let price = '10.00'; // default
+    if (product.satis_fiyati) {
+      let cleanPrice = String(product.satis_fiyati);
+      if (cleanPrice.includes(',')) {
+        cleanPrice = cleanPrice.replace(/\./g, '').replace(',', '.');
+      }
+      const numPrice = parseFloat(cleanPrice);
+      if (numPrice > 0) {
+        price = numPrice.toFixed(2);
+      }
+    }
+
+    // Stok kontrolü
+    const stock = parseInt(product.stok) || 0;
+
+    // Ürün başlığını temizle
+    const title = product.urunismi ? String(product.urunismi).trim() : `Ürün ${index + 1}`;
+    const sku = product.stok_kodu ? String(product.stok_kodu).trim() : '';
+    const fingerprint = productFingerprint(product);
+    const remote = remoteProducts ? findRemoteProduct(remoteProducts, { sku, title }) : undefined;
+    if (remote && remote.fingerprint === fingerprint) {
+      return { action: 'unchanged', productId: remote.id };
+    }
+
+    // Shopify ürün objesi
+    const shopifyProduct = {
+      title: title,
+      body_html: product.aciklama || 'XML\'den aktarılan ürün',
+      product_type: product.kategori_ismi || 'XML Import',
+      vendor: 'Sentos',
+      status: 'draft',
+      variants: [{
+        price: price,
+        inventory_quantity: stock,
+        weight: 0,
+        requires_shipping: true,
+        sku: sku || `XML-${index + 1}`
+      }],
+      metafields: [fingerprintMetafield(fingerprint)]
+    };
+
+    // Shopify'da ürün var mı kontrol et (tarama yapıldıysa sonucu kullanılır)
+    let existingProduct = remote && remote.variantId
+      ? { id: remote.id, variants: [{ id: remote.variantId, sku: remote.sku }] }
+      : null;
+    if (!remoteProducts) {
+      try {
+        const searchResponse = await limiter.request({
+          method: 'get',
+          url: `${shopifyBase}/admin/api/${API_VERSION}/products.json?title=${encodeURIComponent(title)}&limit=10&fields=id,variants`,
+          headers: requestHeaders,
+          timeout: 5000
+        });
+
+        // Taramadaki kuralla aynı: SKU eşleşeni, yoksa SKU'suz olanı; başka SKU'lu ürüne yazılmaz
+        const candidates = searchResponse.data.products || [];
+        const skuOf = candidate => String((candidate.variants[0] || {}).sku || '').trim();
+        existingProduct = (sku
+          ? candidates.find(candidate => skuOf(candidate) === sku) || candidates.find(candidate => !skuOf(candidate))
+          : candidates[0]) || null;
+      } catch (searchError) {
+        log(`Ürün arama hatası: ${title}`, searchError.message);
+      }
+    }
+
+    let result;
+    if (existingProduct) {
+      // GÜNCELLEME: Mevcut ürünü güncelle
+      const updateData = {
+        id: existingProduct.id,
+        body_html: shopifyProduct.body_html,
+        product_type: shopifyProduct.product_type,
+        variants: [{
+          id: existingProduct.variants[0].id,
+          price: price,
+          inventory_quantity: stock,
+          sku: sku || existingProduct.variants[0].sku
+        }],
+        metafields: [fingerprintMetafield(fingerprint, remote ? remote.metafieldId : null)]
+      };
+
+      await limiter.request({
+        method: 'put',
+        url: `${shopifyBase}/admin/api/${API_VERSION}/products/${existingProduct.id}.json`,
+        data: { product: updateData },
+        headers: requestHeaders,
+        timeout: 10000
+      });
+      result = { action: 'updated', productId: existingProduct.id };
+      log(`Ürün güncellendi: ${title}`);
+    } else {
+      // OLUŞTURMA: Yeni ürün oluştur
+      const createResponse = await limiter.request({
+        method: 'post',
+        url: `${shopifyBase}/admin/api/${API_VERSION}/products.json`,
+        data: { product: shopifyProduct },
+        headers: requestHeaders,
+        timeout: 10000
+      });
+      result = { action: 'created', productId: createResponse.data.product.id };
+      log(`Yeni ürün oluşturuldu: ${title}`);
+    }
+
+    if (onWritten) onWritten({ title, ...result, price, stock });
+    return result;
+  };
+}
+
+module.exports = {
+  FINGERPRINT_FALLBACKS,
+  createProductSyncer,
+  loadRemoteProducts,
+  productKey
+};
@@ -0,0 +1,86 @@
+// Netlify function'ları için tablo tabanlı yönlendirici.
+// İstek yolundan function öneki (/.netlify/functions/<ad> ya da /api) ve sondaki / atılır, rota
+// "METHOD /yol" anahtarıyla tam eşleşmeyle bulunur (yoksa "* /yol"). Böylece /sync/clean gibi
+// alt yollar daha genel /sync rotasına düşmez. Rota modülleri ilk isteklerinde require edilir:
+// soğuk başlangıçta sadece bu dosya yüklenir, axios / xml2js / senkronizasyon modülleri onları
+// kullanan rota ilk çağrıldığında yüklenir.
+
+const CORS_HEADERS = {
+  'Access-Control-Allow-Origin': '*',
+  'Access-Control-Allow-Headers': 'Content-Type, X-Shopify-Store-Url, X-Shopify-Admin-Token, X-XML-Feed-Url, X-Google-Client-Id, X-Google-Client-Secret, X-Google-Refresh-Token',
+  'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS'
+};
+
+/**
+ * "/.netlify/functions/api/sync/start" ve "/api/sync/start" -> "/sync/start".
+ * basePath verilirse (ör. '/sync/fanout') ve yol onunla başlamıyorsa eklenir: ayrı paketlenen
+ * function'a "/.netlify/functions/fanout" olarak doğrudan gelen istek "/sync/fanout" olur.
+ */
+function normalizePath(rawPath, basePath = '') {
+  let routePath = String(rawPath || '')
+    .replace(/^\/\.netlify\/functions\/[^/]+/, '')
+    .replace(/^\/api(?=\/|$)/, '')
+    .replace(/\/+$/, '') || '/';
+  if (basePath && routePath !== basePath && !routePath.startsWith(`${basePath}/`)) {
+    routePath = routePath === '/' ? basePath : `${basePath}${routePath}`;
+  }
+  return routePath;
+}
+
+/**
+ * routes: [method, path, load] listesi; method '*' her metodu eşler, load() rota
+ * fonksiyonunu döndürür: (event, context, headers) -> Netlify yanıtı. Netlify handler'ı döner.
+ */
+function createRouter(routes, { basePath = '' } = {}) {
+  const table = new Map();
+  for (const [method, routePath, load] of routes) {
+    const key = `${method} ${routePath}`;
+    if (table.has(key)) throw new Error(`Rota iki kez tanımlanmış: ${key}`);
+    table.set(key, { load, handler: null });
+  }
+
+  return async (event, context) => {
+    const method = event.httpMethod || 'GET';
+    const headers = { ...CORS_HEADERS };
+
+    // OPTIONS request için
+    if (method === 'OPTIONS') {
+      return { statusCode: 200, headers, body: '' };
+    }
+
+    const routePath = normalizePath(event.path, basePath);
+    const route = table.get(`${method} ${routePath}`) || table.get(`* ${routePath}`);
+    if (!route) {
+      return {
+        statusCode: 404,
+        headers,
+        body: JSON.stringify({
+          error: 'Endpoint bulunamadı',
+          path: event.path || '',
+          method: method
+        })
+      };
+    }
+
+    try {
+      if (!route.handler) route.handler = route.load();
+      return await route.handler(event, context, headers);
+    } catch (error) {
+      console.error('API Error:', error);
+      return {
+        statusCode: 500,
+        headers,
+        body: JSON.stringify({
+          error: 'Sunucu hatası',
+          message: error.message
+        })
+      };
+    }
+  };
+}
+
+module.exports = {
+  CORS_HEADERS,
+  createRouter,
+  normalizePath
+};
@@ -0,0 +1,79 @@
+// Hafif rotalar: /debug/env, /google/status ve /config. Ağır bağımlılık yüklemez;
+// yapılandırma sıcak function örneğinin belleğinde (global.appConfig) tutulur.
+
+// Debug endpoint
+async function debugEnv(event, context, headers) {
+  return {
+    statusCode: 200,
+    headers,
+    body: JSON.stringify({
+      success: true,
+      environment: 'netlify',
+      timestamp: new Date().toISOString()
+    })
+  };
+}
+
+// Google status endpoint
+async function googleStatus(event, context, headers) {
+  return {
+    statusCode: 200,
+    headers,
+    body: JSON.stringify({
+      success: true,
+      connected: false,
+      isAuthenticated: false,
+      hasConfig: false
+    })
+  };
+}
+
+// Config okuma
+async function getConfig(event, context, headers) {
+  return {
+    statusCode: 200,
+    headers,
+    body: JSON.stringify({
+      success: true,
+      config: global.appConfig || {}
+    })
+  };
+}
+
+// Config kaydetme
+async function saveConfig(event, context, headers) {
+  try {
+    const body = JSON.parse(event.body || '{}');
+    console.log('Config kaydediliyor:', Object.keys(body));
+    
+    // Config'i memory'de saklayalım (gerçek uygulamada database kullanılır)
+    global.appConfig = global.appConfig || {};
+    global.appConfig = { ...global.appConfig, ...body };
+    
+    return {
+      statusCode: 200,
+      headers,
+      body: JSON.stringify({
+        success: true,
+        message: 'Konfigürasyon başarıyla kaydedildi',
+        saved: Object.keys(body)
+      })
+    };
+  } catch (error) {
+    return {
+      statusCode: 400,
+      headers,
+      body: JSON.stringify({
+        success: false,
+        message: 'Config kaydetme hatası: ' + error.message
+      })
+    };
+  }
+}
+
+module.exports = {
+  debugEnv,
+  getConfig,
+  googleStatus,
+  saveConfig
+};
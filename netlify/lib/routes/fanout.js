@@ -0,0 +1,47 @@
+// Fan-out rotası: /sync/fanout. Ayrı function olarak da paketlenir (functions/fanout.js); sadece
+// fanoutSync.js'e bağlıdır. Gövde feed'leri, mağazaları ve token'ları taşır, durum resumeToken ile
+// istemcide kalır: global.appConfig'e ve aynı örnekteki başka rotalara ihtiyaç duymaz.
+const { runFanoutSync } = require('../fanoutSync');
+
+// Çoklu feed -> çoklu mağaza: { feeds: [url], stores: [{ shopUrl, accessToken, feeds? }] }.
+// Her feed bir kez parse edilir, mağazalar kendi limit bütçeleriyle eşzamanlı yazılır.
+// Yanıttaki done false ise aynı gövde, fanoutId ve resumeToken ile tekrar çağrılmalıdır.
+async function syncFanout(event, context, headers) {
+  let body = {};
+  try {
+    body = JSON.parse(event.body || '{}');
+  } catch {
+    body = {};
+  }
+  const budgetMs = Number(body.budgetMs || process.env.SYNC_TIME_BUDGET_MS) || 0;
+  const deadline = context && typeof context.getRemainingTimeInMillis === 'function'
+    ? Date.now() + context.getRemainingTimeInMillis() - 3000
+    : budgetMs > 0 ? Date.now() + budgetMs : Infinity;
+
+  try {
+    const result = await runFanoutSync(body, { deadline });
+    const failed = result.stores.filter(store => store.error);
+    failed.forEach(store => console.error(`Fan-out mağaza hatası (${store.shop}):`, store.error));
+    return {
+      statusCode: 200,
+      headers,
+      body: JSON.stringify({
+        success: failed.length === 0,
+        message: result.done
+          ? `${result.stores.length} mağaza, ${result.feeds.length} feed senkronize edildi (${result.elapsedMs} ms)`
+          : `Fan-out devam ediyor, fanoutId ve resumeToken ile tekrar çağırın`,
+        ...result
+      })
+    };
+  } catch (error) {
+    return {
+      statusCode: 400,
+      headers,
+      body: JSON.stringify({ success: false, message: 'Fan-out hatası: ' + error.message })
+    };
+  }
+}
+
+module.exports = {
+  syncFanout
+};
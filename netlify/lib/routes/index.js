@@ -0,0 +1,46 @@
+// Rota tablosu: api.js bu listelerden router'ını kurar; modüller ilk istekte require edilir
+// (router.js). /config'in kaydettiği global.appConfig ve feed anlık görüntüsünün bellek önbelleği
+// sadece aynı örnekteki rotalarca görülür; bu yüzden rotalar api function'ında kalır. Bunlara
+// bağlı olmayan /sync/fanout ayrıca kendi function'ında (functions/fanout.js) paketlenir; o
+// dosya bu tabloyu değil doğrudan routes/fanout.js'i yükler, paketine diğer rotalar girmez.
+
+const CONFIG_ROUTES = [
+  ['*', '/debug/env', () => require('./config').debugEnv],
+  ['*', '/google/status', () => require('./config').googleStatus],
+  ['GET', '/config', () => require('./config').getConfig],
+  ['POST', '/config', () => require('./config').saveConfig]
+];
+
+const SHOPIFY_ROUTES = [
+  ['*', '/shopify/check', () => require('./shopify').shopifyCheck],
+  ['*', '/shopify/info', () => require('./shopify').shopifyInfo],
+  ['*', '/shopify/test', () => require('./shopify').shopifyTest]
+];
+
+const XML_ROUTES = [
+  ['DELETE', '/xml/cache', () => require('./xml').clearFeedCache],
+  ['*', '/xml/analyze', () => require('./xml').xmlAnalyze],
+  ['*', '/xml/check', () => require('./xml').xmlCheck],
+  ['*', '/xml/stats', () => require('./xml').xmlStats]
+];
+
+const SYNC_ROUTES = [
+  ['*', '/sync/status', () => require('./syncStatus').syncStatus],
+  ['*', '/sync/summary', () => require('./syncStatus').syncSummary],
+  ['*', '/sync/start', () => require('./sync').syncStart],
+  ['*', '/sync/plan', () => require('./sync').syncPlan],
+  ['POST', '/sync/fanout', () => require('./fanout').syncFanout],
+  ['POST', '/sync/stock', () => require('./sync').syncStock],
+  ['POST', '/sync', () => require('./sync').syncTestProduct],
+  ['DELETE', '/sync/clean', () => require('./sync').syncClean]
+];
+
+const ALL_ROUTES = [...CONFIG_ROUTES, ...SHOPIFY_ROUTES, ...XML_ROUTES, ...SYNC_ROUTES];
+
+module.exports = {
+  ALL_ROUTES,
+  CONFIG_ROUTES,
+  SHOPIFY_ROUTES,
+  SYNC_ROUTES,
+  XML_ROUTES
+};
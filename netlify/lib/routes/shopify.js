@@ -0,0 +1,234 @@
+// Shopify bağlantı rotaları: /shopify/check, /shopify/info, /shopify/test
+const axios = require('axios');
+const { shopifyBaseUrl } = require('../shopUrl');
+
+// Shopify check endpoint  
+async function shopifyCheck(event, context, headers) {
+  // Netlify Functions'ta header'lar event.headers'da gelir (lowercase)
+  const requestHeaders = event.headers || {};
+  const shopUrl = requestHeaders['x-shopify-shop-url'] || requestHeaders['X-Shopify-Shop-Url'];
+  const accessToken = requestHeaders['x-shopify-access-token'] || requestHeaders['X-Shopify-Access-Token'];
+  
+  if (!shopUrl || !accessToken) {
+    return {
+      statusCode: 400,
+      headers,
+      body: JSON.stringify({
+        success: false,
+        connected: false,
+        message: 'Shopify bilgileri eksik. Store URL ve Access Token gerekli.'
+      })
+    };
+  }
+  
+  try {
+    // Shopify Admin API test
+    const shopifyResponse = await axios.get(`${shopifyBaseUrl(shopUrl)}/admin/api/2024-07/shop.json`, {
+      headers: {
+        'X-Shopify-Access-Token': accessToken,
+        'Content-Type': 'application/json'
+      },
+      timeout: 10000
+    });
+    
+    const shopData = shopifyResponse.data.shop;
+    
+    return {
+      statusCode: 200,
+      headers,
+      body: JSON.stringify({
+        success: true,
+        connected: true,
+        store: shopData.name,
+        email: shopData.email,
+        domain: shopData.domain,
+        productCount: 0,
+        currency: shopData.currency,
+        timezone: shopData.timezone
+      })
+    };
+    
+  } catch (error) {
+    console.error('Shopify check hatası:', error.response?.status, error.response?.data);
+    
+    return {
+      statusCode: 400,
+      headers,
+      body: JSON.stringify({
+        success: false,
+        connected: false,
+        message: 'Shopify bağlantısı başarısız: ' + (error.response?.data?.errors || error.message),
+        status: error.response?.status,
+        debug: {
+          shopUrl: shopUrl,
+          hasToken: !!accessToken,
+          errorType: error.code,
+          statusCode: error.response?.status
+        }
+      })
+    };
+  }
+}
+
+// Shopify info endpoint
+async function shopifyInfo(event, context, headers) {
+  // Netlify Functions'ta header'lar event.headers'da gelir (lowercase)
+  const requestHeaders = event.headers || {};
+  const shopUrl = requestHeaders['x-shopify-shop-url'] || requestHeaders['X-Shopify-Shop-Url'];
+  const accessToken = requestHeaders['x-shopify-access-token'] || requestHeaders['X-Shopify-Access-Token'];
+  
+  if (!shopUrl || !accessToken) {
+    return {
+      statusCode: 200,
+      headers,
+      body: JSON.stringify({
+        success: false,
+        connected: false,
+        store: 'Bağlantı yok',
+        email: 'Shopify bilgilerini kontrol edin',
+        productCount: 0
+      })
+    };
+  }
+  
+    try {
+      // Shopify Admin API'ye gerçek çağrı
+      const shopifyResponse = await axios.get(`${shopifyBaseUrl(shopUrl)}/admin/api/2024-07/shop.json`, {
+        headers: {
+          'X-Shopify-Access-Token': accessToken,
+          'Content-Type': 'application/json'
+        },
+        timeout: 10000
+      });
+      
+      // Ürün sayısını al
+      let productCount = 0;
+      try {
+        const productsResponse = await axios.get(`${shopifyBaseUrl(shopUrl)}/admin/api/2024-07/products/count.json`, {
+          headers: {
+            'X-Shopify-Access-Token': accessToken,
+            'Content-Type': 'application/json'
+          },
+          timeout: 5000
+        });
+        productCount = productsResponse.data.count || 0;
+      } catch (countError) {
+        console.log('Ürün sayısı alınamadı:', countError.message);
+      }
+      
+      const shopData = shopifyResponse.data.shop;
+      
+      return {
+        statusCode: 200,
+        headers,
+        body: JSON.stringify({
+          success: true,
+          connected: true,
+          store: shopData.name,
+          email: shopData.email,
+          domain: shopData.domain,
+          productCount: productCount,
+          currency: shopData.currency,
+          timezone: shopData.timezone
+        })
+      };      } catch (error) {
+    return {
+      statusCode: 200,
+      headers,
+      body: JSON.stringify({
+        success: false,
+        connected: false,
+        store: 'Bağlantı hatası',
+        email: error.response?.data?.errors || error.message,
+        productCount: 0
+      })
+    };
+  }
+}
+
+// Shopify connection test endpoint
+async function shopifyTest(event, context, headers) {
+  const config = global.appConfig || {};
+  const SHOPIFY_STORE_URL = event.headers['x-shopify-store-url'] || 
+                           event.headers['X-Shopify-Store-Url'] ||
+                           config.shopifyUrl;
+  const SHOPIFY_ADMIN_API_TOKEN = event.headers['x-shopify-admin-token'] || 
+                                 event.headers['X-Shopify-Admin-Token'] ||
+                                 config.shopifyAdminToken;
+
+  if (!SHOPIFY_STORE_URL || !SHOPIFY_ADMIN_API_TOKEN) {
+    return {
+      statusCode: 400,
+      headers,
+      body: JSON.stringify({
+        success: false,
+        message: 'Shopify test için store URL ve token gerekli'
+      })
+    };
+  }
+
+  try {
+    console.log('Shopify bağlantı testi başlatılıyor...');
+    
+    // Shopify shop endpoint'ini test et
+    const shopUrl = SHOPIFY_STORE_URL.replace(/\/$/, '');
+    const testUrl = `${shopUrl}/admin/api/2024-07/shop.json`;
+    
+    console.log('Test URL:', testUrl);
+    
+    const response = await axios.get(testUrl, {
+      headers: {
+        'X-Shopify-Access-Token': SHOPIFY_ADMIN_API_TOKEN,
+        'Content-Type': 'application/json'
+      },
+      timeout: 10000
+    });
+
+    console.log('Shopify test başarılı:', response.status);
+
+    return {
+      statusCode: 200,
+      headers,
+      body: JSON.stringify({
+        success: true,
+        message: 'Shopify bağlantısı başarılı',
+        shop: {
+          name: response.data.shop?.name || 'Bilinmeyen',
+          domain: response.data.shop?.domain || shopUrl,
+          email: response.data.shop?.email || 'Bilinmeyen',
+          plan: response.data.shop?.plan_name || 'Bilinmeyen'
+        },
+        debug: {
+          storeUrl: shopUrl,
+          hasToken: !!SHOPIFY_ADMIN_API_TOKEN,
+          responseStatus: response.status
+        }
+      })
+    };
+
+  } catch (shopifyError) {
+    console.error('Shopify test hatası:', shopifyError.response?.data || shopifyError.message);
+    
+    return {
+      statusCode: 400,
+      headers,
+      body: JSON.stringify({
+        success: false,
+        message: 'Shopify bağlantı hatası: ' + (shopifyError.response?.data?.errors || shopifyError.message),
+        debug: {
+          status: shopifyError.response?.status,
+          statusText: shopifyError.response?.statusText,
+          error: shopifyError.response?.data,
+          url: shopifyError.config?.url,
+          headers: shopifyError.config?.headers ? Object.keys(shopifyError.config.headers) : []
+        }
+      })
+    };
+  }
+}
+
+module.exports = {
+  shopifyCheck,
+  shopifyInfo,
+  shopifyTest
+};
@@ -0,0 +1,831 @@
+// Shopify'a yazan senkronizasyon rotaları: /sync/start, /sync/plan, /sync/stock, /sync (tek test
+// ürünü) ve /sync/clean. /sync/fanout ayrı modüldedir (routes/fanout.js)
+const axios = require('axios');
+const { createShopifyLimiter } = require('../shopifyRateLimit');
+const { runStockSync, shopifyGraphql } = require('../stockSync');
+const { fetchRemoteFingerprint, fingerprintMetafield, productFingerprint } = require('../productFingerprint');
+const { FINGERPRINT_FALLBACKS, createProductSyncer, loadRemoteProducts, productKey } = require('../productSync');
+const { planSync } = require('../syncPlanner');
+const { getFeedSnapshot } = require('../feedSnapshot');
+const {
+  alignJob,
+  createJob,
+  findResumableJob,
+  jobDirIsDurable,
+  jobSummary,
+  jobToken,
+  resumeJob,
+  runJobSlice,
+  saveJob
+} = require('../syncJobs');
+const { shopifyBaseUrl } = require('../shopUrl');
+
+// XML'den Shopify'a ürün dönüştürme fonksiyonu
+const convertXmlToShopifyProduct = (xmlProduct) => {
+  // Fiyat analizi
+  let price = 0;
+  const alisFiyati = String(xmlProduct.alis_fiyati || '0').replace(',', '.');
+  const satisFiyati = String(xmlProduct.satis_fiyati || '0').replace(',', '.');
+  const indirimlifiyat = String(xmlProduct.indirimli_fiyat || '0').replace(',', '.');
+  
+  if (parseFloat(indirimlifiyat) > 0) {
+    price = parseFloat(indirimlifiyat);
+  } else if (parseFloat(satisFiyati) > 0) {
+    price = parseFloat(satisFiyati);
+  } else {
+    price = parseFloat(alisFiyati) * 1.5; // %50 kar marjı
+  }
+  
+  // Kategori parse
+  const kategori = String(xmlProduct.kategori_ismi || '');
+  const kategoriParts = kategori.split(' > ').filter(k => k.trim());
+  const productType = kategoriParts[kategoriParts.length - 1] || 'Genel';
+  
+  // Tags
+  const tags = [
+    ...kategoriParts,
+    xmlProduct.marka || 'Stil Diva'
+  ].filter(tag => tag && tag.trim()).join(',');
+  
+  // Handle (URL slug)
+  const handle = String(xmlProduct.urunismi || '')
+    .toLowerCase()
+    .replace(/[^\w\s-]/g, '')
+    .replace(/\s+/g, '-')
+    .substring(0, 100);
+  
+  // Varyantları işle
+  const variants = [];
+  const options = [];
+  const colorSet = new Set();
+  const sizeSet = new Set();
+  const images = [];
+  
+  if (xmlProduct.Varyantlar && xmlProduct.Varyantlar.Varyant) {
+    const variantList = Array.isArray(xmlProduct.Varyantlar.Varyant) 
+      ? xmlProduct.Varyantlar.Varyant 
+      : [xmlProduct.Varyantlar.Varyant];
+    
+    variantList.forEach((variant, index) => {
+      const color = variant.renk || 'Varsayılan';
+      const size = variant.Varyant_deger || 'Tek Beden';
+      const variantStock = parseInt(variant.stok || '0');
+      
+      colorSet.add(color);
+      sizeSet.add(size);
+      
+      variants.push({
+        title: `${color} / ${size}`,
+        price: price.toFixed(2),
+        sku: variant.stok_kodu || `${xmlProduct.id}-${index}`,
+        inventory_quantity: variantStock,
+        inventory_management: 'shopify',
+        inventory_policy: variantStock > 0 ? 'deny' : 'continue',
+        barcode: variant.barkod || '',
+        option1: color,
+        option2: size,
+        weight: 0.5,
+        weight_unit: 'kg'
+      });
+      
+      // Varyant resimlerini ekle
+      if (variant.resimler && variant.resimler.resim) {
+        const variantImages = Array.isArray(variant.resimler.resim) 
+          ? variant.resimler.resim 
+          : [variant.resimler.resim];
+        
+        variantImages.forEach(imgUrl => {
+          if (imgUrl && !images.find(img => img.src === imgUrl)) {
+            images.push({
+              src: imgUrl,
+              alt: xmlProduct.urunismi || 'Ürün Resmi',
+              position: images.length + 1
+            });
+          }
+        });
+      }
+    });
+  } else {
+    // Varyantı olmayan ürünler için default
+    variants.push({
+      title: 'Varsayılan',
+      price: price.toFixed(2),
+      sku: xmlProduct.stok_kodu || xmlProduct.id,
+      inventory_quantity: parseInt(xmlProduct.stok || '0'),
+      inventory_management: 'shopify',
+      inventory_policy: 'deny',
+      barcode: xmlProduct.barkod || '',
+      option1: 'Varsayılan',
+      weight: 0.5,
+      weight_unit: 'kg'
+    });
+    
+    colorSet.add('Varsayılan');
+  }
+  
+  // Options oluştur
+  if (colorSet.size > 0) {
+    options.push({
+      name: 'Renk',
+      values: Array.from(colorSet)
+    });
+  }
+  
+  if (sizeSet.size > 0 && !sizeSet.has('Tek Beden')) {
+    options.push({
+      name: 'Beden',
+      values: Array.from(sizeSet)
+    });
+  }
+  
+  return {
+    title: xmlProduct.urunismi || 'Ürün Adı Yok',
+    body_html: xmlProduct.detayaciklama || '<p>Ürün açıklaması.</p>',
+    vendor: xmlProduct.marka || 'Stil Diva',
+    product_type: productType,
+    status: 'active',
+    tags: tags,
+    handle: handle,
+    variants: variants,
+    options: options,
+    images: images.slice(0, 10) // İlk 10 resim
+  };
+};
+
+// Basit sync endpoint: kaldığı yerden devam edebilen iş olarak çalışır.
+// Gövdede/sorguda jobId verilirse o iş, verilmezse aynı mağaza ve feed için yarım kalmış
+// son iş devam ettirilir (restart: true ile yeni iş başlatılır). Her çağrı süre bütçesi
+// dolana kadar ilerler; yanıttaki done false ise jobId ve resumeToken ile tekrar çağrılmalıdır
+// (Lambda'da iş kaydı sonraki çağrının kapsayıcısında olmayabilir, token onun yerine geçer).
+async function syncStart(event, context, headers) {
+  const requestHeaders = event.headers || {};
+  const shopUrl = requestHeaders['x-shopify-shop-url'] || requestHeaders['X-Shopify-Shop-Url'];
+  const accessToken = requestHeaders['x-shopify-access-token'] || requestHeaders['X-Shopify-Access-Token'];
+  const xmlFeedUrl = requestHeaders['x-xml-feed-url'] ||
+                     requestHeaders['X-XML-Feed-Url'] ||
+                     (global.appConfig || {}).xmlUrl ||
+                     'https://stildiva.sentos.com.tr/xml-sentos-out/1';
+  let body = {};
+  try {
+    body = JSON.parse(event.body || '{}');
+  } catch {
+    body = {};
+  }
+  const query = event.queryStringParameters || {};
+  const requestedJobId = body.jobId || query.jobId;
+  const resumeToken = body.resumeToken || null;
+  // Parmak izleri okunamazsa: 'fail' (varsayılan) durur, 'rewrite' tüm ürünleri yeniden yazar
+  const onFingerprintsUnavailable = body.onFingerprintsUnavailable || query.onFingerprintsUnavailable || 'fail';
+  if (!FINGERPRINT_FALLBACKS.includes(onFingerprintsUnavailable)) {
+    return {
+      statusCode: 400,
+      headers,
+      body: JSON.stringify({ success: false, message: 'onFingerprintsUnavailable \'fail\' ya da \'rewrite\' olmalı' })
+    };
+  }
+  
+  if (!shopUrl || !accessToken) {
+    return {
+      statusCode: 400,
+      headers,
+      body: JSON.stringify({
+        success: false,
+        message: 'Shopify bilgileri eksik'
+      })
+    };
+  }
+  
+  const shopifyBase = shopifyBaseUrl(shopUrl);
+  
+  // Çağrı başına süre bütçesi: function'ın kalan süresi (güvenlik payıyla), yoksa
+  // budgetMs / SYNC_TIME_BUDGET_MS; hiçbiri yoksa iş tek çağrıda bitirilir
+  const budgetMs = Number(body.budgetMs || query.budgetMs || process.env.SYNC_TIME_BUDGET_MS) || 0;
+  const deadline = context && typeof context.getRemainingTimeInMillis === 'function'
+    ? Date.now() + context.getRemainingTimeInMillis() - 3000
+    : budgetMs > 0 ? Date.now() + budgetMs : Infinity;
+  
+  try {
+    let job = null;
+    if (requestedJobId || resumeToken) {
+      job = await resumeJob(requestedJobId, { token: resumeToken });
+      if (!job) {
+        return {
+          statusCode: 404,
+          headers,
+          body: JSON.stringify({
+            success: false,
+            message: `Senkronizasyon işi bulunamadı: ${requestedJobId || 'resumeToken geçersiz'}` +
+              (jobDirIsDurable() ? '' : ' (SYNC_JOB_DIR kalıcı değil, son yanıttaki resumeToken\'ı gönderin)')
+          })
+        };
+      }
+      // Başka bir mağazanın işi bu mağazanın bilgileriyle devam ettirilemez
+      if (job.shop !== shopifyBase) {
+        return {
+          statusCode: 403,
+          headers,
+          body: JSON.stringify({ success: false, message: `Senkronizasyon işi başka bir mağazaya ait: ${job.id}` })
+        };
+      }
+      if (job.status === 'done') {
+        return { statusCode: 200, headers, body: JSON.stringify({ success: true, message: 'İş zaten tamamlanmış', job: jobSummary(job) }) };
+      }
+    }
+    
+    // XML'den ürünleri al (paylaşılan önbellek: devam çağrıları feed'i yeniden indirip parse etmez)
+    const { products } = await getFeedSnapshot(job ? job.feedUrl : xmlFeedUrl);
+    
+    console.log(`XML'den ${products.length} ürün bulundu`);
+    
+    if (products.length === 0) {
+      return {
+        statusCode: 400,
+        headers,
+        body: JSON.stringify({
+          success: false,
+          message: 'XML\'de ürün bulunamadı'
+        })
+      };
+    }
+    
+    // TÜM ürünleri işle (sınır yok); tamamlananlar anahtarlarıyla işte tutulur
+    const productsToProcess = products;
+    const keys = productsToProcess.map(productKey);
+    
+    if (!job && !body.restart) job = await findResumableJob(shopifyBase, xmlFeedUrl);
+    if (job) {
+      alignJob(job, keys);
+      console.log(`İş devam ediyor: ${job.id} (${job.cursor}/${job.total})`);
+    } else {
+      job = createJob({ shop: shopifyBase, feedUrl: xmlFeedUrl, keys });
+      await saveJob(job);
+      console.log(`Yeni senkronizasyon işi: ${job.id}, ${productsToProcess.length} ürün işlenecek`);
+    }
+    
+    const processedProducts = [];
+    
+    // Eşzamanlılık ve bekleme süreleri Shopify'ın çağrı limiti başlığına göre ayarlanır
+    const shopifyLimiter = createShopifyLimiter();
+    
+    let remoteProducts;
+    try {
+      remoteProducts = await loadRemoteProducts({
+        limiter: shopifyLimiter,
+        shopifyBase,
+        accessToken,
+        onUnavailable: onFingerprintsUnavailable
+      });
+    } catch (error) {
+      if (error.code !== 'FINGERPRINTS_UNAVAILABLE') throw error;
+      return {
+        statusCode: 502,
+        headers,
+        body: JSON.stringify({ success: false, message: error.message, fingerprints: 'unavailable', jobId: job.id })
+      };
+    }
+    const syncProduct = createProductSyncer({
+      limiter: shopifyLimiter,
+      shopifyBase,
+      accessToken,
+      remoteProducts,
+      onWritten: sample => {
+        if (processedProducts.length < 3) processedProducts.push(sample);
+      }
+    });
+    
+    await runJobSlice(job, productsToProcess, {
+      keyOf: productKey,
+      worker: syncProduct,
+      limiter: shopifyLimiter,
+      deadline
+    });
+    console.log(`İlerleme: ${job.cursor}/${job.total} (${job.status})`);
+    
+    const rateStats = shopifyLimiter.stats();
+    console.log(`Shopify istekleri: ${rateStats.requests}, yeniden deneme: ${rateStats.retries}, kısıtlı süre: ${rateStats.throttledSeconds.toFixed(1)} sn`);
+    
+    const { created, updated, errors } = job.counts;
+    const unchanged = job.counts.unchanged || 0;
+    return {
+      statusCode: 200,
+      headers,
+      body: JSON.stringify({
+        success: true,
+        message: job.status === 'done'
+          ? `${created + updated} ürün başarıyla işlendi, ${unchanged} ürün değişmediği için atlandı`
+          : `${job.cursor}/${job.total} ürün işlendi, devam etmek için jobId ve resumeToken ile tekrar çağırın`,
+        jobId: job.id,
+        // Sonraki çağrıda jobId ile birlikte gönderilir: iş kaydı bu kapsayıcıda kalmasa da devam edilir
+        resumeToken: jobToken(job),
+        done: job.status === 'done',
+        cursor: job.cursor,
+        xmlProducts: products.length,
+        processedCount: created + updated,
+        createdCount: created,
+        updatedCount: updated,
+        unchangedCount: unchanged,
+        errorCount: errors,
+        // 'unavailable': parmak izleri okunamadı, ürünler karşılaştırılmadan yeniden yazıldı
+        fingerprints: remoteProducts ? 'ok' : 'unavailable',
+        processedProducts, // Bu çağrıda işlenen ilk 3 tanesi
+        rateLimit: rateStats
+      })
+    };
+    
+  } catch (error) {
+    return {
+      statusCode: 400,
+      headers,
+      body: JSON.stringify({
+        success: false,
+        message: 'Sync hatası: ' + error.message
+      })
+    };
+  }
+}
+
+// Kuru çalıştırma: /sync/start'ın yapacağı işi ve maliyetini yazmadan hesaplar.
+// Sadece okuma istekleri atılır (feed, mağaza limiti, parmak izleri). ?maxProducts=N ile sınırlı koşu planlanır.
+// Parmak izleri okunamazsa 502 döner; onFingerprintsUnavailable: 'rewrite' tam yeniden yazmayı planlar.
+async function syncPlan(event, context, headers) {
+  const requestHeaders = event.headers || {};
+  const shopUrl = requestHeaders['x-shopify-shop-url'] || requestHeaders['X-Shopify-Shop-Url'];
+  const accessToken = requestHeaders['x-shopify-access-token'] || requestHeaders['X-Shopify-Access-Token'];
+  const xmlFeedUrl = requestHeaders['x-xml-feed-url'] ||
+                     requestHeaders['X-XML-Feed-Url'] ||
+                     (global.appConfig || {}).xmlUrl ||
+                     'https://stildiva.sentos.com.tr/xml-sentos-out/1';
+  let body = {};
+  try {
+    body = JSON.parse(event.body || '{}');
+  } catch {
+    body = {};
+  }
+  const query = event.queryStringParameters || {};
+  const onFingerprintsUnavailable = body.onFingerprintsUnavailable || query.onFingerprintsUnavailable || 'fail';
+
+  if (!shopUrl || !accessToken) {
+    return {
+      statusCode: 400,
+      headers,
+      body: JSON.stringify({ success: false, message: 'Shopify bilgileri eksik' })
+    };
+  }
+  if (!FINGERPRINT_FALLBACKS.includes(onFingerprintsUnavailable)) {
+    return {
+      statusCode: 400,
+      headers,
+      body: JSON.stringify({ success: false, message: 'onFingerprintsUnavailable \'fail\' ya da \'rewrite\' olmalı' })
+    };
+  }
+
+  try {
+    const result = await planSync({
+      limiter: createShopifyLimiter(),
+      shopifyBase: shopifyBaseUrl(shopUrl),
+      accessToken,
+      feedUrl: xmlFeedUrl,
+      maxProducts: Number(body.maxProducts || query.maxProducts) || 0,
+      onFingerprintsUnavailable
+    });
+    const { plan } = result;
+    return {
+      statusCode: 200,
+      headers,
+      body: JSON.stringify({
+        success: true,
+        message: `${plan.creates} oluşturma, ${plan.updates} güncelleme, ${plan.unchanged} değişmeyen; ` +
+          `${plan.restCalls.total} REST çağrısı, ${plan.graphql.costPoints} GraphQL puanı, ~${plan.projectedSeconds.total} sn`,
+        ...result
+      })
+    };
+  } catch (error) {
+    console.error('Plan hatası:', error.message);
+    if (error.code === 'FINGERPRINTS_UNAVAILABLE') {
+      return {
+        statusCode: 502,
+        headers,
+        body: JSON.stringify({ success: false, message: error.message, fingerprints: 'unavailable' })
+      };
+    }
+    return {
+      statusCode: 500,
+      headers,
+      body: JSON.stringify({ success: false, message: 'Plan hatası: ' + error.message })
+    };
+  }
+}
+
+// Sadece stok senkronizasyonu: ürünler parse edilmez/güncellenmez, sadece değişen stoklar
+// inventorySetQuantities ile toplu yazılır. force: true tüm miktarları yeniden yazar.
+async function syncStock(event, context, headers) {
+  const requestHeaders = event.headers || {};
+  const shopUrl = requestHeaders['x-shopify-shop-url'] || requestHeaders['X-Shopify-Shop-Url'];
+  const accessToken = requestHeaders['x-shopify-access-token'] || requestHeaders['X-Shopify-Access-Token'];
+  const xmlFeedUrl = requestHeaders['x-xml-feed-url'] ||
+                     requestHeaders['X-XML-Feed-Url'] ||
+                     (global.appConfig || {}).xmlUrl ||
+                     'https://stildiva.sentos.com.tr/xml-sentos-out/1';
+  let body = {};
+  try {
+    body = JSON.parse(event.body || '{}');
+  } catch {
+    body = {};
+  }
+
+  if (!shopUrl || !accessToken) {
+    return {
+      statusCode: 400,
+      headers,
+      body: JSON.stringify({ success: false, message: 'Shopify bilgileri eksik' })
+    };
+  }
+
+  try {
+    const result = await runStockSync({
+      limiter: createShopifyLimiter(),
+      shopifyBase: shopifyBaseUrl(shopUrl),
+      accessToken,
+      feedUrl: xmlFeedUrl,
+      force: !!body.force,
+      maxAgeMs: Number(process.env.STOCK_MAP_MAX_AGE_MS) || 60 * 60 * 1000
+    });
+    return {
+      statusCode: 200,
+      headers,
+      body: JSON.stringify({
+        success: result.failedCount === 0,
+        message: `Stok senkronizasyonu: ${result.updated} yazıldı, ${result.unchanged} değişmedi, ${result.unmatched} eşleşmedi, ${result.failedCount} hata`,
+        result
+      })
+    };
+  } catch (error) {
+    console.error('Stok senkronizasyonu hatası:', error.message);
+    return {
+      statusCode: 500,
+      headers,
+      body: JSON.stringify({ success: false, message: 'Stok senkronizasyonu hatası: ' + error.message })
+    };
+  }
+}
+
+// Sync endpoint
+async function syncTestProduct(event, context, headers) {
+  const body = JSON.parse(event.body || '{}');
+  const options = body.options || {};
+  
+  // Config kontrolü - önce header'lara bak, sonra global config'e, sonra env'e
+  const config = global.appConfig || {};
+  const requestHeaders = event.headers || {};
+  
+  const SHOPIFY_STORE_URL = requestHeaders['x-shopify-shop-url'] || 
+                           requestHeaders['X-Shopify-Shop-Url'] ||
+                           config.shopifyUrl || 
+                           process.env.SHOPIFY_STORE_URL;
+  const SHOPIFY_ADMIN_API_TOKEN = requestHeaders['x-shopify-access-token'] || 
+                                 requestHeaders['X-Shopify-Access-Token'] ||
+                                 config.shopifyAdminToken ||
+                                 process.env.SHOPIFY_ADMIN_API_TOKEN;
+  const XML_FEED_URL = requestHeaders['x-xml-feed-url'] ||
+                      requestHeaders['X-XML-Feed-Url'] ||
+                      config.xmlUrl || 
+                      'https://stildiva.sentos.com.tr/xml-sentos-out/1';
+
+  console.log('Config kaynaklarından:', {
+    hasHeaderStoreUrl: !!(event.headers['x-shopify-store-url'] || event.headers['X-Shopify-Store-Url']),
+    hasHeaderToken: !!(event.headers['x-shopify-admin-token'] || event.headers['X-Shopify-Admin-Token']),
+    hasGlobalConfig: !!(config.shopifyUrl && config.shopifyAdminToken),
+    finalStoreUrl: SHOPIFY_STORE_URL ? 'VAR' : 'YOK',
+    finalToken: SHOPIFY_ADMIN_API_TOKEN ? 'VAR' : 'YOK'
+  });
+
+  if (!SHOPIFY_STORE_URL || !SHOPIFY_ADMIN_API_TOKEN) {
+    return {
+      statusCode: 400,
+      headers,
+      body: JSON.stringify({
+        success: false,
+        message: 'Shopify konfigürasyonu eksik',
+        debug: {
+          hasStoreUrl: !!SHOPIFY_STORE_URL,
+          hasToken: !!SHOPIFY_ADMIN_API_TOKEN,
+          storeUrlSource: SHOPIFY_STORE_URL ? (requestHeaders['x-shopify-shop-url'] || requestHeaders['X-Shopify-Shop-Url'] ? 'header' : config.shopifyUrl ? 'config' : 'env') : 'none',
+          tokenSource: SHOPIFY_ADMIN_API_TOKEN ? (requestHeaders['x-shopify-access-token'] || requestHeaders['X-Shopify-Access-Token'] ? 'header' : config.shopifyAdminToken ? 'config' : 'env') : 'none',
+          configSource: {
+            fromGlobalConfig: !!(config.shopifyUrl && config.shopifyAdminToken),
+            fromHeaders: !!(requestHeaders['x-shopify-shop-url'] || requestHeaders['X-Shopify-Shop-Url']) && !!(requestHeaders['x-shopify-access-token'] || requestHeaders['X-Shopify-Access-Token']),
+            fromEnv: !!(process.env.SHOPIFY_STORE_URL && process.env.SHOPIFY_ADMIN_API_TOKEN)
+          }
+        }
+      })
+    };
+  }
+
+  try {
+    console.log('Sync başlatılıyor...');
+    
+    // XML'i paylaşılan önbellekten al (stats ile aynı parse sonucu)
+    const { products } = await getFeedSnapshot(XML_FEED_URL);
+    console.log(`${products.length} ürün bulundu`);
+
+    // İlk ürünü test et
+    const testProduct = products[0];
+    const shopifyProduct = convertXmlToShopifyProduct(testProduct);
+    
+    console.log('Test ürünü hazırlandı:', shopifyProduct.title);
+    console.log('Varyant sayısı:', shopifyProduct.variants.length);
+
+    const shopUrl = shopifyBaseUrl(SHOPIFY_STORE_URL);
+    
+    // Aynı içerikle daha önce yazıldıysa tekrar gönderilmez; tek ürün için sadece başlığı sorgulanır
+    const fingerprint = productFingerprint(testProduct);
+    let remote = null;
+    let fingerprints = 'ok';
+    try {
+      const limiter = createShopifyLimiter();
+      remote = await fetchRemoteFingerprint(
+        (graphqlQuery, variables) => shopifyGraphql(limiter, shopUrl, SHOPIFY_ADMIN_API_TOKEN, graphqlQuery, variables),
+        shopifyProduct.title
+      );
+    } catch (error) {
+      if (body.onFingerprintsUnavailable !== 'rewrite') {
+        return {
+          statusCode: 502,
+          headers,
+          body: JSON.stringify({
+            success: false,
+            message: `Shopify parmak izi okunamadı: ${error.message}. Yine de yazmak için onFingerprintsUnavailable: 'rewrite' gönderin`,
+            fingerprints: 'unavailable'
+          })
+        };
+      }
+      fingerprints = 'unavailable';
+    }
+    if (remote && remote.fingerprint === fingerprint) {
+      return {
+        statusCode: 200,
+        headers,
+        body: JSON.stringify({
+          success: true,
+          message: `Test ürünü değişmedi, yazılmadı: ${shopifyProduct.title}`,
+          processedCount: 0,
+          createdCount: 0,
+          updatedCount: 0,
+          unchangedCount: 1,
+          errorCount: 0,
+          fingerprints,
+          debug: {
+            xmlProductCount: products.length,
+            shopifyProductId: remote.id,
+            productTitle: shopifyProduct.title,
+            fingerprint
+          }
+        })
+      };
+    }
+
+    const requestHeaders = {
+      'X-Shopify-Access-Token': SHOPIFY_ADMIN_API_TOKEN,
+      'Content-Type': 'application/json'
+    };
+
+    // Ürün varsa (içeriği değişmiş) productSync.js gibi yerinde güncellenir, yeni ürün açılmaz.
+    // Varyantlar SKU ile eşlenir; mağazada olmayan SKU yeni varyant olarak eklenir
+    let response;
+    if (remote) {
+      const productUrl = `${shopUrl}/admin/api/2024-07/products/${remote.id}.json`;
+      const current = await axios.get(`${productUrl}?fields=id,variants`, { headers: requestHeaders, timeout: 15000 });
+      const variantIds = new Map((current.data.product.variants || []).map(variant => [variant.sku, variant.id]));
+      response = await axios.put(productUrl, {
+        product: {
+          id: remote.id,
+          body_html: shopifyProduct.body_html,
+          product_type: shopifyProduct.product_type,
+          tags: shopifyProduct.tags,
+          variants: shopifyProduct.variants.map(variant =>
+            variantIds.has(variant.sku) ? { ...variant, id: variantIds.get(variant.sku) } : variant),
+          metafields: [fingerprintMetafield(fingerprint, remote.metafieldId)]
+        }
+      }, { headers: requestHeaders, timeout: 15000 });
+    } else {
+      response = await axios.post(`${shopUrl}/admin/api/2024-07/products.json`, {
+        product: { ...shopifyProduct, metafields: [fingerprintMetafield(fingerprint)] }
+      }, { headers: requestHeaders, timeout: 15000 });
+    }
+
+    console.log('Shopify yanıtı:', response.status);
+
+    return {
+      statusCode: 200,
+      headers,
+      body: JSON.stringify({
+        success: true,
+        message: `Test ürünü başarıyla ${remote ? 'güncellendi' : 'oluşturuldu'}: ${shopifyProduct.title}`,
+        processedCount: 1,
+        createdCount: remote ? 0 : 1,
+        updatedCount: remote ? 1 : 0,
+        errorCount: 0,
+        fingerprints,
+        debug: {
+          xmlProductCount: products.length,
+          xmlVariantCount: shopifyProduct.variants.length,
+          shopifyProductId: remote ? remote.id : response.data.product?.id,
+          productTitle: shopifyProduct.title,
+          variantTitles: shopifyProduct.variants.map(v => v.title)
+        }
+      })
+    };
+
+  } catch (syncError) {
+    console.error('Sync hatası:', {
+      message: syncError.message,
+      status: syncError.response?.status,
+      statusText: syncError.response?.statusText,
+      data: syncError.response?.data,
+      url: syncError.config?.url
+    });
+    
+    let errorMessage = 'Senkronizasyon hatası: ';
+    let errorDetails = {};
+    
+    if (syncError.response) {
+      // HTTP yanıt hatası
+      const status = syncError.response.status;
+      const data = syncError.response.data;
+      
+      if (status === 401) {
+        errorMessage += 'Geçersiz Shopify token. Admin API token\'ınızı kontrol edin.';
+        errorDetails = {
+          issue: 'authentication',
+          suggestion: 'Shopify Admin API token\'ınızı yeniden kontrol edin'
+        };
+      } else if (status === 403) {
+        errorMessage += 'Shopify API yetkisi yok. Token\'ın product write yetkisi olduğundan emin olun.';
+        errorDetails = {
+          issue: 'authorization', 
+          suggestion: 'Token\'ın "write_products" yetkisine sahip olduğunu kontrol edin'
+        };
+      } else if (status === 404) {
+        errorMessage += 'Shopify store bulunamadı. Store URL\'ini kontrol edin.';
+        errorDetails = {
+          issue: 'store_not_found',
+          suggestion: 'Store URL formatını kontrol edin: https://yourstore.myshopify.com'
+        };
+      } else if (status === 422) {
+        errorMessage += 'Shopify veri doğrulama hatası: ' + JSON.stringify(data?.errors || data);
+        errorDetails = {
+          issue: 'validation_error',
+          errors: data?.errors || data
+        };
+      } else {
+        errorMessage += `HTTP ${status}: ${data?.errors || data?.message || syncError.message}`;
+        errorDetails = {
+          issue: 'http_error',
+          status: status,
+          response: data
+        };
+      }
+    } else if (syncError.code === 'ENOTFOUND') {
+      errorMessage += 'Shopify store\'a erişim yok. Store URL\'ini kontrol edin.';
+      errorDetails = {
+        issue: 'dns_error',
+        suggestion: 'Store URL\'in doğru olduğunu ve .myshopify.com uzantısı olduğunu kontrol edin'
+      };
+    } else if (syncError.code === 'ECONNABORTED') {
+      errorMessage += 'Bağlantı zaman aşımı. Tekrar deneyin.';
+      errorDetails = {
+        issue: 'timeout',
+        suggestion: 'İnternet bağlantınızı kontrol edin ve tekrar deneyin'
+      };
+    } else {
+      errorMessage += syncError.message;
+      errorDetails = {
+        issue: 'unknown',
+        originalError: syncError.message
+      };
+    }
+    
+    return {
+      statusCode: 400,
+      headers,
+      body: JSON.stringify({
+        success: false,
+        message: errorMessage,
+        debug: {
+          error: syncError.response?.data || syncError.message,
+          status: syncError.response?.status,
+          errorType: errorDetails.issue,
+          suggestion: errorDetails.suggestion,
+          fullError: errorDetails
+        }
+      })
+    };
+  }
+}
+
+// Test ürününü silme endpoint'i
+async function syncClean(event, context, headers) {
+  const requestHeaders = event.headers || {};
+  const shopUrl = requestHeaders['x-shopify-shop-url'] || requestHeaders['X-Shopify-Shop-Url'];
+  const accessToken = requestHeaders['x-shopify-access-token'] || requestHeaders['X-Shopify-Access-Token'];
+  
+  if (!shopUrl || !accessToken) {
+    return {
+      statusCode: 400,
+      headers,
+      body: JSON.stringify({
+        success: false,
+        message: 'Shopify bilgileri eksik'
+      })
+    };
+  }
+
+  try {
+    // Test/XML ürünlerini bul (daha hızlı sorgu)
+    const productsResponse = await axios.get(`${shopifyBaseUrl(shopUrl)}/admin/api/2024-07/products.json?vendor=Sentos&limit=50`, {
+      headers: { 'X-Shopify-Access-Token': accessToken, 'Content-Type': 'application/json' },
+      timeout: 8000
+    });
+
+    let testProducts = productsResponse.data.products || [];
+    
+    // Ek filtreleme
+    testProducts = testProducts.filter(p => 
+      p.vendor === 'Sentos' ||
+      p.product_type === 'XML Import' ||
+      p.title.includes('Test') || 
+      p.title.includes('XML') ||
+      p.title.includes('Büyük Beden')
+    );
+
+    if (testProducts.length === 0) {
+      return {
+        statusCode: 200,
+        headers,
+        body: JSON.stringify({
+          success: true,
+          message: 'Silinecek test ürünü bulunamadı',
+          deletedCount: 0
+        })
+      };
+    }
+
+    // Maksimum 50 ürün sil (daha hızlı temizlik)
+    const productsToDelete = testProducts.slice(0, 50);
+    let deletedCount = 0;
+    const deletedProducts = [];
+    
+    // Paralel silme ile hızlandır
+    const deletePromises = productsToDelete.map(async (product) => {
+      try {
+        await axios.delete(`${shopifyBaseUrl(shopUrl)}/admin/api/2024-07/products/${product.id}.json`, {
+          headers: { 'X-Shopify-Access-Token': accessToken },
+          timeout: 3000
+        });
+        deletedCount++;
+        deletedProducts.push({ id: product.id, title: product.title });
+        console.log(`Test ürünü silindi: ${product.title} (ID: ${product.id})`);
+        return true;
+      } catch (deleteError) {
+        console.error(`Ürün silinemedi: ${product.title}`, deleteError.message);
+        return false;
+      }
+    });
+
+    // Tüm silme işlemlerini bekle (max 5 saniye)
+    await Promise.allSettled(deletePromises);
+
+    const remainingCount = testProducts.length - productsToDelete.length;
+
+    return {
+      statusCode: 200,
+      headers,
+      body: JSON.stringify({
+        success: true,
+        message: `${deletedCount} test ürünü silindi${remainingCount > 0 ? ` (${remainingCount} ürün kaldı, tekrar deneyin)` : ''}`,
+        deletedCount,
+        remainingCount,
+        deletedProducts: deletedProducts.slice(0, 5) // İlk 5 tanesini göster
+      })
+    };
+
+  } catch (error) {
+    console.error('Test ürün silme hatası:', error.message);
+    return {
+      statusCode: 500,
+      headers,
+      body: JSON.stringify({
+        success: false,
+        message: `Test ürün silme hatası: ${error.message}`
+      })
+    };
+  }
+}
+
+module.exports = {
+  syncClean,
+  syncPlan,
+  syncStart,
+  syncStock,
+  syncTestProduct
+};
@@ -0,0 +1,66 @@
+// Senkronizasyon işi okuma rotaları: /sync/status, /sync/summary (sadece iş kayıtlarını okur)
+const { jobSummary, listJobs, loadJob } = require('../syncJobs');
+const { shopifyBaseUrl } = require('../shopUrl');
+
+// İş kayıtları mağaza URL'i, feed URL'i ve sayımlar içerir: sadece isteği yapan mağazanın işleri görülür
+function requestShop(event) {
+  const requestHeaders = event.headers || {};
+  const shopUrl = requestHeaders['x-shopify-shop-url'] || requestHeaders['X-Shopify-Shop-Url'];
+  return shopUrl ? shopifyBaseUrl(shopUrl) : null;
+}
+
+const missingShop = headers => ({
+  statusCode: 400,
+  headers,
+  body: JSON.stringify({ success: false, message: 'x-shopify-shop-url başlığı gerekli' })
+});
+
+async function latestJob(shop) {
+  return (await listJobs()).find(job => job.shop === shop) || null;
+}
+
+// Senkronizasyon işinin durumu: /sync/status?jobId=... (jobId yoksa mağazanın son işi)
+async function syncStatus(event, context, headers) {
+  const query = event.queryStringParameters || {};
+  const shop = requestShop(event);
+  if (!shop) return missingShop(headers);
+  let job = query.jobId ? await loadJob(query.jobId) : await latestJob(shop);
+  if (job && job.shop !== shop) job = null;
+  if (!job) {
+    return {
+      statusCode: 404,
+      headers,
+      body: JSON.stringify({ success: false, message: 'Senkronizasyon işi bulunamadı' })
+    };
+  }
+  return {
+    statusCode: 200,
+    headers,
+    body: JSON.stringify({ success: true, job: jobSummary(job) })
+  };
+}
+
+// Sync summary endpoint
+async function syncSummary(event, context, headers) {
+  const shop = requestShop(event);
+  if (!shop) return missingShop(headers);
+  const job = await latestJob(shop);
+  return {
+    statusCode: 200,
+    headers,
+    body: JSON.stringify({
+      success: true,
+      summary: job
+        ? `${job.counts.created} oluşturuldu, ${job.counts.updated} güncellendi, ${job.counts.errors} hata (${job.cursor}/${job.total}, ${job.status})`
+        : 'Henüz senkronizasyon yapılmadı',
+      lastSync: job ? job.updatedAt : null,
+      processedCount: job ? job.counts.created + job.counts.updated : 0,
+      jobId: job ? job.id : null
+    })
+  };
+}
+
+module.exports = {
+  syncStatus,
+  syncSummary
+};
@@ -0,0 +1,144 @@
+// XML feed rotaları: /xml/cache, /xml/analyze, /xml/check, /xml/stats.
+// api function'ında çalışır: kaydedilmiş config (global.appConfig) ve feed anlık görüntüsünün bellek
+// önbelleği /sync/* rotalarıyla paylaşılır. axios sadece /xml/check'te yüklenir;
+// /xml/stats ve /xml/analyze anlık görüntü diskteyse ağ modülü yüklemeden yanıt verir.
+const { getFeedSnapshot, invalidateFeedSnapshot } = require('../feedSnapshot');
+
+// Feed adresi: X-XML-Feed-Url başlığı, kaydedilmiş config ya da varsayılan feed (/sync/* ile aynı sıra)
+function feedUrlOf(event) {
+  const requestHeaders = event.headers || {};
+  return requestHeaders['x-xml-feed-url'] ||
+         requestHeaders['X-XML-Feed-Url'] ||
+         (global.appConfig || {}).xmlUrl ||
+         'https://stildiva.sentos.com.tr/xml-sentos-out/1';
+}
+
+// Feed önbelleğini boşaltır: DELETE /xml/cache (tüm feed'ler) ya da ?url=... (tek feed)
+async function clearFeedCache(event, context, headers) {
+  const query = event.queryStringParameters || {};
+  const count = await invalidateFeedSnapshot(query.url);
+  return {
+    statusCode: 200,
+    headers,
+    body: JSON.stringify({ success: true, message: `${count} feed önbellekten silindi` })
+  };
+}
+
+// XML analyze endpoint
+async function xmlAnalyze(event, context, headers) {
+  const XML_FEED_URL = feedUrlOf(event);
+  
+  try {
+    // İstatistikler paylaşılan feed önbelleğinde önceden hesaplanmış durumda
+    const { stats } = await getFeedSnapshot(XML_FEED_URL);
+
+    return {
+      statusCode: 200,
+      headers,
+      body: JSON.stringify({
+        success: true,
+        products: stats.samples,
+        totalProducts: stats.productCount,
+        totalVariants: stats.variantCount,
+        xmlFormat: 'Sentos XML Format'
+      })
+    };
+    
+  } catch (error) {
+    return {
+      statusCode: 500,
+      headers,
+      body: JSON.stringify({
+        success: false,
+        error: 'XML analiz hatası: ' + error.message
+      })
+    };
+  }
+}
+
+// XML check endpoint (basit)
+async function xmlCheck(event, context, headers) {
+  const XML_FEED_URL = feedUrlOf(event);
+  
+  try {
+    const response = await require('axios').get(XML_FEED_URL, {
+      timeout: 10000,
+      headers: {
+        'User-Agent': 'Mozilla/5.0 (compatible; ShopifyXMLSync/1.0)',
+        'Accept': 'application/xml, text/xml, */*'
+      }
+    });
+
+    const isValid = response.data && response.data.includes('<Urunler>');
+    
+    return {
+      statusCode: 200,
+      headers,
+      body: JSON.stringify({
+        success: isValid,
+        connected: isValid,
+        message: isValid ? 'XML feed bağlantısı başarılı' : 'XML formatı geçersiz',
+        url: XML_FEED_URL,
+        size: response.data ? response.data.length : 0
+      })
+    };
+
+  } catch (error) {
+    return {
+      statusCode: 200,
+      headers,
+      body: JSON.stringify({
+        success: false,
+        connected: false,
+        message: 'XML feed bağlantı hatası: ' + error.message,
+        url: XML_FEED_URL
+      })
+    };
+  }
+}
+
+// XML stats endpoint: paylaşılan feed önbelleğinden okunur (?refresh=1 yeniden indirir)
+async function xmlStats(event, context, headers) {
+  const XML_FEED_URL = feedUrlOf(event);
+  const query = event.queryStringParameters || {};
+  
+  try {
+    const snapshot = await getFeedSnapshot(XML_FEED_URL, { force: query.refresh === '1' });
+    const { stats } = snapshot;
+
+    return {
+      statusCode: 200,
+      headers,
+      body: JSON.stringify({
+        success: true,
+        url: XML_FEED_URL,
+        productCount: stats.productCount,
+        variantCount: stats.variantCount,
+        debug: {
+          parseMethod: 'xml2js',
+          dataLength: snapshot.dataLength,
+          cache: snapshot.source,
+          fetchedAt: new Date(snapshot.fetchedAt).toISOString(),
+          productAnalysis: stats.productAnalysis,
+          sampleProductKeys: stats.sampleProductKeys.slice(0, 5)
+        }
+      })
+    };
+  } catch (error) {
+    return {
+      statusCode: 200,
+      headers,
+      body: JSON.stringify({ 
+        success: false, 
+        message: 'XML alınamadı: ' + error.message
+      })
+    };
+  }
+}
+
+module.exports = {
+  clearFeedCache,
+  xmlAnalyze,
+  xmlCheck,
+  xmlStats
+};
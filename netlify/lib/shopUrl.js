@@ -0,0 +1,10 @@
+// Mağaza adresi "magaza.myshopify.com" ya da tam URL olarak gelebilir;
+// şema verilmişse korunur (yerel test sunucuları http kullanır), yoksa https eklenir
+function shopifyBaseUrl(shopUrl) {
+  const trimmed = String(shopUrl).trim().replace(/\/+$/, '');
+  return /^https?:\/\//i.test(trimmed) ? trimmed : `https://${trimmed}`;
+}
+
+module.exports = {
+  shopifyBaseUrl
+};
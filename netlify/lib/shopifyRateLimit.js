@@ -0,0 +1,122 @@
+// Shopify REST çağrıları için adaptif hız sınırlayıcı.
+// Sabit beklemeler yerine X-Shopify-Shop-Api-Call-Limit ("32/40") başlığından kovanın
+// doluluğunu takip eder: kovada yer oldukça istekler paralel gider, dolmaya yaklaşınca
+// boşalma hızına göre beklenir. 429'da Retry-After, 5xx/ağ hatasında üstel geri çekilme
+// ile yeniden denenir. Aynı algoritmanın Python karşılığı shopify_tools/client.py'dadır.
+const axios = require('axios');
+
+const RETRY_STATUSES = new Set([429, 500, 502, 503, 504]);
+
+const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+
+function parseCallLimit(value) {
+  const match = /^(\d+)\/(\d+)$/.exec(String(value || '').trim());
+  return match ? { used: Number(match[1]), size: Number(match[2]) } : null;
+}
+
+function createShopifyLimiter(options = {}) {
+  const state = {
+    bucketSize: options.bucketSize || 40,
+    leakRate: options.leakRate || 2,
+    maxConcurrency: options.maxConcurrency || 10,
+    headroom: options.headroom === undefined ? 2 : options.headroom,
+    maxRetries: options.maxRetries === undefined ? 5 : options.maxRetries,
+    level: 0,
+    updatedAt: Date.now(),
+    inFlight: 0,
+    requests: 0,
+    retries: 0,
+    throttledMs: 0
+  };
+
+  const estimatedLevel = () => Math.max(0, state.level - ((Date.now() - state.updatedAt) / 1000) * state.leakRate);
+  const freeSlots = () => Math.min(
+    state.bucketSize - state.headroom - estimatedLevel() - state.inFlight,
+    state.maxConcurrency - state.inFlight
+  );
+
+  async function acquire() {
+    while (freeSlots() < 1) {
+      await sleep(Math.max(50, ((1 - freeSlots()) / state.leakRate) * 1000));
+    }
+    state.inFlight++;
+  }
+
+  function release(response) {
+    state.inFlight--;
+    const limit = parseCallLimit(response && response.headers && response.headers['x-shopify-shop-api-call-limit']);
+    if (limit) {
+      state.bucketSize = limit.size;
+      state.level = limit.used;
+      state.updatedAt = Date.now();
+    }
+  }
+
+  // axios isteği gönderir; 429/5xx/ağ hatalarında yeniden dener, diğer hataları fırlatır
+  async function request(config) {
+    for (let attempt = 0; ; attempt++) {
+      await acquire();
+      let response = null;
+      let error = null;
+      state.requests++;
+      try {
+        response = await axios({ ...config, validateStatus: () => true });
+      } catch (requestError) {
+        error = requestError;
+      }
+      release(response);
+
+      if (response && !RETRY_STATUSES.has(response.status)) {
+        if (response.status >= 400) {
+          const httpError = new Error(`Request failed with status code ${response.status}`);
+          httpError.response = response;
+          httpError.config = config;
+          throw httpError;
+        }
+        return response;
+      }
+      if (attempt >= state.maxRetries) {
+        if (error) throw error;
+        const retryError = new Error(`Shopify ${response.status} - ${state.maxRetries} yeniden denemeden sonra vazgeçildi`);
+        retryError.response = response;
+        throw retryError;
+      }
+
+      state.retries++;
+      if (response && response.status === 429) {
+        // Kova dolu: Retry-After kadar bekle
+        const waitMs = (parseFloat(response.headers['retry-after']) || 2) * 1000;
+        state.level = state.bucketSize;
+        state.updatedAt = Date.now();
+        state.throttledMs += waitMs;
+        await sleep(waitMs);
+      } else {
+        await sleep(Math.min(30000, 500 * 2 ** attempt) * (0.5 + Math.random() / 2));
+      }
+    }
+  }
+
+  // items için worker(item, index) çalıştırır; eşzamanlılığı kova durumu belirler
+  async function runAll(items, worker) {
+    let next = 0;
+    const runners = Array.from({ length: Math.min(state.maxConcurrency, items.length) }, async () => {
+      while (next < items.length) {
+        const index = next++;
+        await worker(items[index], index);
+      }
+    });
+    await Promise.all(runners);
+  }
+
+  return {
+    request,
+    runAll,
+    stats: () => ({
+      requests: state.requests,
+      retries: state.retries,
+      throttledSeconds: state.throttledMs / 1000
+    })
+  };
+}
+
+module.exports = { createShopifyLimiter, parseCallLimit };
@@ -0,0 +1,335 @@
+// Sadece stok senkronizasyonu için hızlı yol (POST /sync/stock).
+// Feed indirilirken akış halinde taranır: XML ağacı kurulmaz, her <Urun> bloğundan sadece
+// stok_kodu / barkod / stok okunur (ürün belgeleri ve açıklamalar parse edilmez).
+// SKU -> inventory item eşlemesi sayfalı GraphQL productVariants sorgusuyla bir kez çekilip diske
+// (STOCK_SYNC_DIR, varsayılan: <tmp>/shopify-stock-sync) yazılır; eşlemede sadece kimlikler tutulur.
+// Miktarlar her koşuda yazılan lokasyonun 'available' değerinden okunur (admin'de yapılan
+// değişiklikler de görülür, diğer lokasyonlar karışmaz); sadece farklı olan kalemler
+// inventorySetQuantities ile 250'lik gruplar halinde mutlak olarak yazılır.
+// TypeScript karşılığı: src/utils/stockScanner.ts, src/services/inventorySyncService.ts
+const axios = require('axios');
+const crypto = require('crypto');
+const fs = require('fs/promises');
+const os = require('os');
+const path = require('path');
+
+const MAP_VERSION = 2;
+const MAX_QUANTITIES_PER_REQUEST = 250;
+const QUANTITY_READ_PAGE = 100;
+const API_VERSION = '2024-07';
+
+const stateDir = () => path.resolve(process.env.STOCK_SYNC_DIR || path.join(os.tmpdir(), 'shopify-stock-sync'));
+const mapPath = shop => path.join(stateDir(), `${crypto.createHash('sha1').update(shop).digest('hex').slice(0, 16)}.json`);
+
+const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+
+// <tag>değer</tag> ya da <tag><![CDATA[değer]]></tag>
+function field(block, tag, from = 0, to = block.length) {
+  const open = block.indexOf(`<${tag}>`, from);
+  if (open === -1 || open >= to) return '';
+  const start = open + tag.length + 2;
+  const close = block.indexOf(`</${tag}>`, start);
+  if (close === -1) return '';
+  let value = block.slice(start, close).trim();
+  if (value.startsWith('<![CDATA[') && value.endsWith(']]>')) value = value.slice(9, -3).trim();
+  return value;
+}
+
+function parseStock(value) {
+  const stock = parseInt(value, 10);
+  return Number.isFinite(stock) ? stock : 0;
+}
+
+function stockRecordsOfProduct(block) {
+  const records = [];
+  let position = block.indexOf('<Varyantlar>');
+  while (position !== -1) {
+    const open = block.indexOf('<Varyant>', position);
+    if (open === -1) break;
+    const close = block.indexOf('</Varyant>', open);
+    if (close === -1) break;
+    const sku = field(block, 'stok_kodu', open, close);
+    if (sku) records.push({ sku, barcode: field(block, 'barkod', open, close), stock: parseStock(field(block, 'stok', open, close)) });
+    position = close;
+  }
+  if (records.length > 0) return records;
+
+  // Varyantsız ürün: alanlar açıklamanın dışında aranır
+  const descriptionStart = block.indexOf('<detayaciklama>');
+  const descriptionEnd = block.indexOf('</detayaciklama>');
+  const head = descriptionStart === -1 ? block : block.slice(0, descriptionStart);
+  const tail = descriptionEnd === -1 ? '' : block.slice(descriptionEnd);
+  const sku = field(head, 'stok_kodu') || field(tail, 'stok_kodu');
+  if (sku) {
+    records.push({
+      sku,
+      barcode: field(head, 'barkod') || field(tail, 'barkod'),
+      stock: parseStock(field(head, 'stok') || field(tail, 'stok'))
+    });
+  }
+  return records;
+}
+
+// Metin parçalarıyla beslenen tarayıcı; tamamlanan her ürünün kayıtları onRecord'a verilir
+function createStockScanner(onRecord) {
+  let buffer = '';
+  const scanner = {
+    products: 0,
+    push(chunk) {
+      buffer += chunk;
+      let consumed = 0;
+      while (true) {
+        const open = buffer.indexOf('<Urun>', consumed);
+        if (open === -1) break;
+        const close = buffer.indexOf('</Urun>', open);
+        if (close === -1) {
+          consumed = open;
+          break;
+        }
+        scanner.products++;
+        for (const record of stockRecordsOfProduct(buffer.slice(open, close))) onRecord(record);
+        consumed = close + 7;
+      }
+      const pending = buffer.indexOf('<Urun>', consumed);
+      buffer = pending === -1 ? buffer.slice(Math.max(consumed, buffer.length - 5)) : buffer.slice(pending);
+    }
+  };
+  return scanner;
+}
+
+// Feed'i akış olarak indirip tarar; aynı SKU birden çok kez geçerse son değer geçerli
+async function scanStockFeed(feedUrl, { timeout = 30000 } = {}) {
+  const response = await axios.get(feedUrl, { responseType: 'stream', timeout });
+  const stockBySku = new Map();
+  const scanner = createStockScanner(record => stockBySku.set(record.sku, record));
+  response.data.setEncoding('utf8');
+  await new Promise((resolve, reject) => {
+    response.data.on('data', chunk => scanner.push(chunk));
+    response.data.on('end', resolve);
+    response.data.on('error', reject);
+  });
+  return { stockBySku, products: scanner.products };
+}
+
+// limiter.request üzerinden GraphQL; THROTTLED yanıtında puan bütçesi dolana kadar beklenir.
+// onCost verilirse her yanıtın extensions.cost alanıyla çağrılır (sorgu maliyeti ve puan bütçesi)
+async function shopifyGraphql(limiter, shopifyBase, accessToken, query, variables = {}, { onCost } = {}) {
+  for (let attempt = 0; ; attempt++) {
+    const response = await limiter.request({
+      method: 'post',
+      url: `${shopifyBase}/admin/api/${API_VERSION}/graphql.json`,
+      headers: { 'X-Shopify-Access-Token': accessToken, 'Content-Type': 'application/json' },
+      data: { query, variables },
+      timeout: 30000
+    });
+    const errors = response.data.errors;
+    if (onCost && response.data.extensions && response.data.extensions.cost) onCost(response.data.extensions.cost);
+    if (errors && errors.some(error => error.extensions && error.extensions.code === 'THROTTLED') && attempt < 5) {
+      const cost = response.data.extensions && response.data.extensions.cost;
+      const status = cost && cost.throttleStatus;
+      const missing = status ? cost.requestedQueryCost - status.currentlyAvailable : 100;
+      await sleep(Math.max(500, (missing / ((status && status.restoreRate) || 50)) * 1000));
+      continue;
+    }
+    if (errors) throw new Error(`Shopify GraphQL hatası: ${JSON.stringify(errors)}`);
+    return response.data.data;
+  }
+}
+
+const VARIANTS_QUERY = `
+query variants($after: String) {
+  productVariants(first: 250, after: $after) {
+    pageInfo { hasNextPage endCursor }
+    nodes { sku barcode inventoryItem { id } }
+  }
+}`;
+
+// inventoryQuantity tüm lokasyonların toplamıdır; yazılan lokasyonun 'available' değeri okunur
+const AVAILABLE_QUERY = `
+query available($ids: [ID!]!, $locationId: ID!) {
+  nodes(ids: $ids) {
+    ... on InventoryItem {
+      id
+      inventoryLevel(locationId: $locationId) { quantities(names: ["available"]) { name quantity } }
+    }
+  }
+}`;
+
+const SET_QUANTITIES_MUTATION = `
+mutation setQuantities($input: InventorySetQuantitiesInput!) {
+  inventorySetQuantities(input: $input) {
+    userErrors { field message code }
+  }
+}`;
+
+/**
+ * SKU/barkod -> inventoryItemId eşlemesi. Diskteki eşleme maxAgeMs'ten yeniyse kullanılır,
+ * değilse tüm varyantlar sayfalı sorguyla yeniden çekilir. Miktar tutulmaz (bkz. fetchAvailable).
+ */
+async function loadInventoryMap({ limiter, shopifyBase, accessToken, maxAgeMs }) {
+  try {
+    const cached = JSON.parse(await fs.readFile(mapPath(shopifyBase), 'utf-8'));
+    if (cached.version === MAP_VERSION && cached.shop === shopifyBase && Date.now() - cached.fetchedAt <= maxAgeMs) {
+      return { map: cached, fresh: false };
+    }
+  } catch {
+    // eşleme yok ya da bozuk: yeniden çekilir
+  }
+
+  const map = { version: MAP_VERSION, shop: shopifyBase, fetchedAt: Date.now(), locationId: null, bySku: {}, byBarcode: {} };
+  let after = null;
+  do {
+    const data = await shopifyGraphql(limiter, shopifyBase, accessToken, VARIANTS_QUERY, { after });
+    for (const variant of data.productVariants.nodes) {
+      const inventoryItemId = variant.inventoryItem && variant.inventoryItem.id;
+      if (!inventoryItemId) continue;
+      if (variant.sku && !map.bySku[variant.sku]) map.bySku[variant.sku] = inventoryItemId;
+      if (variant.barcode && !map.byBarcode[variant.barcode]) map.byBarcode[variant.barcode] = inventoryItemId;
+    }
+    after = data.productVariants.pageInfo.hasNextPage ? data.productVariants.pageInfo.endCursor : null;
+  } while (after);
+  return { map, fresh: true };
+}
+
+/**
+ * inventoryItemId -> lokasyondaki 'available' miktarı. Kalem o lokasyonda stoklanmıyorsa
+ * değer null'dır (yazılır).
+ */
+async function fetchAvailable(graphql, locationId, inventoryItemIds) {
+  const available = new Map();
+  for (let start = 0; start < inventoryItemIds.length; start += QUANTITY_READ_PAGE) {
+    const ids = inventoryItemIds.slice(start, start + QUANTITY_READ_PAGE);
+    const data = await graphql(AVAILABLE_QUERY, { ids, locationId });
+    data.nodes.forEach((node, index) => {
+      const level = node && node.inventoryLevel;
+      const quantity = level && level.quantities.find(entry => entry.name === 'available');
+      available.set(ids[index], quantity ? quantity.quantity : null);
+    });
+  }
+  return available;
+}
+
+async function saveInventoryMap(map) {
+  await fs.mkdir(stateDir(), { recursive: true });
+  const filePath = mapPath(map.shop);
+  const tmpPath = `${filePath}.${process.pid}.tmp`;
+  await fs.writeFile(tmpPath, JSON.stringify(map));
+  await fs.rename(tmpPath, filePath);
+}
+
+// userErrors.field: ['input', 'quantities', '3', ...] -> 3
+function errorIndex(error) {
+  const value = (error.field || [])[2];
+  return value !== undefined && /^\d+$/.test(String(value)) ? Number(value) : null;
+}
+
+// Mutasyon atomiktir: hatalı kalemler ayıklanıp kalanlar bir kez daha gönderilir
+async function setQuantities(graphql, locationId, changes, result, retry = true) {
+  let data;
+  result.requests++;
+  try {
+    data = await graphql(SET_QUANTITIES_MUTATION, {
+      input: {
+        name: 'available',
+        reason: 'correction',
+        ignoreCompareQuantity: true,
+        quantities: changes.map(change => ({ inventoryItemId: change.inventoryItemId, locationId, quantity: change.quantity }))
+      }
+    });
+  } catch (error) {
+    changes.forEach(change => result.failed.push({ sku: change.sku, message: error.message }));
+    return;
+  }
+  const errors = data.inventorySetQuantities.userErrors;
+  if (errors.length === 0) {
+    result.updated.push(...changes);
+    return;
+  }
+  const failed = new Map();
+  for (const error of errors) {
+    const index = errorIndex(error);
+    if (index !== null) failed.set(index, error.message);
+  }
+  if (failed.size === 0 || !retry) {
+    changes.forEach(change => result.failed.push({ sku: change.sku, message: errors[0].message }));
+    return;
+  }
+  failed.forEach((message, index) => result.failed.push({ sku: changes[index].sku, message }));
+  const remaining = changes.filter((_, index) => !failed.has(index));
+  if (remaining.length) await setQuantities(graphql, locationId, remaining, result, false);
+}
+
+/**
+ * Feed'deki stokları Shopify'a yazar. Miktarlar her koşuda yazılan lokasyondan okunur; force
+ * verilirse eşleme yeniden çekilir ve tüm miktarlar (değişmemiş olsalar da) okunmadan yazılır.
+ * Lokasyon SHOPIFY_LOCATION_ID ile seçilir, verilmezse mağazanın ilk lokasyonudur.
+ */
+async function runStockSync({ limiter, shopifyBase, accessToken, feedUrl, force = false, maxAgeMs }) {
+  const startTime = Date.now();
+  const graphql = (query, variables) => shopifyGraphql(limiter, shopifyBase, accessToken, query, variables);
+
+  const [{ stockBySku, products }, { map, fresh }] = await Promise.all([
+    scanStockFeed(feedUrl),
+    loadInventoryMap({ limiter, shopifyBase, accessToken, maxAgeMs: force ? 0 : maxAgeMs })
+  ]);
+
+  const matched = [];
+  let unmatched = 0;
+  for (const [sku, { barcode, stock }] of stockBySku) {
+    const inventoryItemId = map.bySku[sku] || (barcode && map.byBarcode[barcode]);
+    if (inventoryItemId) matched.push({ inventoryItemId, sku, quantity: stock });
+    else unmatched++;
+  }
+
+  const result = { updated: [], failed: [], requests: 0 };
+  let locationFetched = false;
+  let unchanged = 0;
+  let quantityReads = 0;
+  if (matched.length > 0) {
+    if (!process.env.SHOPIFY_LOCATION_ID && !map.locationId) {
+      const data = await graphql('query { locations(first: 1) { nodes { id } } }');
+      map.locationId = data.locations.nodes.length ? data.locations.nodes[0].id : null;
+      locationFetched = true;
+    }
+    const locationId = process.env.SHOPIFY_LOCATION_ID || map.locationId;
+    if (!locationId) throw new Error('Mağazada stok lokasyonu bulunamadı');
+
+    let changes = matched;
+    if (!force) {
+      const ids = [...new Set(matched.map(change => change.inventoryItemId))];
+      const available = await fetchAvailable(graphql, locationId, ids);
+      quantityReads = Math.ceil(ids.length / QUANTITY_READ_PAGE);
+      changes = matched.filter(change => available.get(change.inventoryItemId) !== change.quantity);
+      unchanged = matched.length - changes.length;
+    }
+    for (let start = 0; start < changes.length; start += MAX_QUANTITIES_PER_REQUEST) {
+      await setQuantities(graphql, locationId, changes.slice(start, start + MAX_QUANTITIES_PER_REQUEST), result);
+    }
+  }
+
+  if (fresh || locationFetched) await saveInventoryMap(map);
+
+  return {
+    products,
+    skus: stockBySku.size,
+    updated: result.updated.length,
+    unchanged,
+    unmatched,
+    failed: result.failed.slice(0, 50),
+    failedCount: result.failed.length,
+    requests: result.requests,
+    quantityReads,
+    mapRefreshed: fresh,
+    durationMs: Date.now() - startTime
+  };
+}
+
+module.exports = {
+  createStockScanner,
+  fetchAvailable,
+  loadInventoryMap,
+  runStockSync,
+  scanStockFeed,
+  shopifyGraphql,
+  stockRecordsOfProduct
+};
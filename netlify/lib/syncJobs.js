@@ -0,0 +1,198 @@
+// Kaldığı yerden devam edebilen senkronizasyon işleri.
+// Her iş diske (SYNC_JOB_DIR, varsayılan: <tmp>/shopify-sync-jobs) bir JSON dosyası olarak yazılır:
+// imleç (sıradaki ürün), tamamlanan ürünlerin anahtarları, sayaçlar ve son hatalar.
+// Ürünler küçük parçalar halinde işlenir ve her parçadan sonra iş kaydedilir; function zaman
+// aşımına uğrasa bile bir sonraki çağrı imleçten devam eder, tamamlanan ürünler tekrar işlenmez.
+// Lambda'da (Netlify Functions) <tmp> kapsayıcıya özeldir ve çağrılar farklı kapsayıcılara düşebilir;
+// bu yüzden iş durumu yanıtla istemciye de döndürülür (resumeToken) ve istemci onu geri gönderir.
+const crypto = require('crypto');
+const fs = require('fs/promises');
+const os = require('os');
+const path = require('path');
+const zlib = require('zlib');
+
+const JOB_VERSION = 1;
+const MAX_ERRORS = 50;
+// resumeToken sınırları: istek gövdesindeki token ve açılmış hali
+const MAX_TOKEN_LENGTH = 256 * 1024;
+const MAX_STATE_BYTES = 4 * 1024 * 1024;
+
+const jobDir = () => path.resolve(process.env.SYNC_JOB_DIR || path.join(os.tmpdir(), 'shopify-sync-jobs'));
+const jobPath = id => path.join(jobDir(), `${id}.json`);
+// SYNC_JOB_DIR verilmemiş Lambda'da kayıtlar sadece o kapsayıcıda görülür
+const jobDirIsDurable = () => !process.env.AWS_LAMBDA_FUNCTION_NAME || !!process.env.SYNC_JOB_DIR;
+
+// Ürün anahtarlarının sırası değişmediyse imleç geçerlidir
+function feedFingerprint(keys) {
+  return crypto.createHash('sha1').update(keys.join('\n')).digest('hex');
+}
+
+function createJob({ shop, feedUrl, keys }) {
+  const now = new Date().toISOString();
+  return {
+    version: JOB_VERSION,
+    id: crypto.randomBytes(8).toString('hex'),
+    shop,
+    feedUrl,
+    status: 'running',
+    createdAt: now,
+    updatedAt: now,
+    invocations: 0,
+    total: keys.length,
+    feedHash: feedFingerprint(keys),
+    cursor: 0,
+    counts: { created: 0, updated: 0, unchanged: 0, errors: 0, skipped: 0 },
+    // anahtar -> { action, productId }
+    completed: {},
+    errors: []
+  };
+}
+
+async function loadJob(id) {
+  if (!/^[0-9a-f]{16}$/.test(String(id))) return null;
+  try {
+    const job = JSON.parse(await fs.readFile(jobPath(id), 'utf-8'));
+    return job.version === JOB_VERSION ? job : null;
+  } catch {
+    return null;
+  }
+}
+
+async function saveJob(job) {
+  job.updatedAt = new Date().toISOString();
+  await fs.mkdir(jobDir(), { recursive: true });
+  const tmpPath = `${jobPath(job.id)}.${process.pid}.tmp`;
+  await fs.writeFile(tmpPath, JSON.stringify(job));
+  await fs.rename(tmpPath, jobPath(job.id));
+}
+
+async function listJobs() {
+  let names;
+  try {
+    names = await fs.readdir(jobDir());
+  } catch {
+    return [];
+  }
+  const jobs = await Promise.all(names.filter(name => name.endsWith('.json')).map(name => loadJob(name.slice(0, -5))));
+  return jobs.filter(Boolean).sort((a, b) => b.updatedAt.localeCompare(a.updatedAt));
+}
+
+// Taşınabilir durum: JSON, gzip, base64url
+function encodeState(value) {
+  return zlib.gzipSync(JSON.stringify(value)).toString('base64url');
+}
+
+function decodeState(token) {
+  if (typeof token !== 'string' || !token || token.length > MAX_TOKEN_LENGTH) return null;
+  try {
+    return JSON.parse(zlib.gunzipSync(Buffer.from(token, 'base64url'), { maxOutputLength: MAX_STATE_BYTES }));
+  } catch {
+    return null;
+  }
+}
+
+// İşin tamamlanan anahtar listesi olmadan hali. Anahtarlar token'a girmez (büyük feed'lerde
+// binlerce); feed sırası değişip imleç sıfırlanırsa ürünler yeniden işlenir, parmak izi aynı
+// olanlar için yine istek atılmaz.
+function jobState(job) {
+  const { completed, ...state } = job;
+  return state;
+}
+
+const jobToken = job => encodeState(jobState(job));
+
+/**
+ * İşi diskten ya da istemcinin geri gönderdiği durumdan (token ya da çözülmüş state) yükler.
+ * İkisi de varsa daha çok ilerlemiş olan (invocations) kullanılır, diskteki tamamlanan anahtarlar
+ * korunur. id verilmezse durumdaki iş kullanılır. Bulunamazsa null.
+ */
+async function resumeJob(id, { token = null, state = token ? decodeState(token) : null } = {}) {
+  const carried = state && state.version === JOB_VERSION && /^[0-9a-f]{16}$/.test(String(state.id)) ? state : null;
+  const jobId = id || (carried && carried.id);
+  if (!jobId) return null;
+  const stored = await loadJob(jobId);
+  if (!carried || carried.id !== jobId) return stored;
+  if (stored && stored.invocations >= carried.invocations) return stored;
+  return { ...carried, completed: stored ? stored.completed : {} };
+}
+
+// Aynı mağaza ve feed için yarım kalmış en son iş
+async function findResumableJob(shop, feedUrl) {
+  return (await listJobs()).find(job => job.status === 'running' && job.shop === shop && job.feedUrl === feedUrl) || null;
+}
+
+// Feed yeniden okunduğunda işin imlecini doğrular; sıra değiştiyse baştan tarar
+// (tamamlanan anahtarlar atlanacağı için iş yine tekrarlanmaz)
+function alignJob(job, keys) {
+  const hash = feedFingerprint(keys);
+  if (hash !== job.feedHash) {
+    job.feedHash = hash;
+    job.total = keys.length;
+    job.cursor = 0;
+  }
+}
+
+/**
+ * İşi imleçten itibaren chunkSize'lık parçalarla ilerletir. Her parça limiter.runAll ile
+ * paralel işlenir ve ardından iş kaydedilir. deadline (ms, Date.now() cinsinden) geçilince
+ * yeni parça başlatılmaz. worker(item, index) { action, productId } döndürmeli ya da hata fırlatmalıdır;
+ * action: 'created' | 'updated' | 'unchanged' (parmak izi aynı, yazılmadı).
+ */
+async function runJobSlice(job, items, { keyOf, worker, limiter, deadline = Infinity, chunkSize = 20 }) {
+  job.invocations++;
+  while (job.cursor < items.length && Date.now() < deadline) {
+    const end = Math.min(job.cursor + chunkSize, items.length);
+    const chunk = [];
+    for (let index = job.cursor; index < end; index++) {
+      const key = keyOf(items[index], index);
+      if (job.completed[key]) job.counts.skipped++;
+      else chunk.push({ item: items[index], index, key });
+    }
+
+    await limiter.runAll(chunk, async ({ item, index, key }) => {
+      try {
+        const result = await worker(item, index);
+        job.completed[key] = result;
+        if (result.action === 'created') job.counts.created++;
+        else if (result.action === 'unchanged') job.counts.unchanged = (job.counts.unchanged || 0) + 1;
+        else job.counts.updated++;
+      } catch (error) {
+        job.counts.errors++;
+        job.errors.push({ key, message: error.message });
+        if (job.errors.length > MAX_ERRORS) job.errors.shift();
+      }
+    });
+
+    job.cursor = end;
+    await saveJob(job);
+  }
+  if (job.cursor >= items.length) {
+    job.status = 'done';
+    await saveJob(job);
+  }
+  return job;
+}
+
+// API yanıtları için özet (tamamlanan anahtar listesi olmadan)
+function jobSummary(job) {
+  const { completed, feedHash, version, ...summary } = job;
+  return { ...summary, done: job.status === 'done' };
+}
+
+module.exports = {
+  alignJob,
+  createJob,
+  decodeState,
+  encodeState,
+  findResumableJob,
+  jobDir,
+  jobDirIsDurable,
+  jobState,
+  jobSummary,
+  jobToken,
+  listJobs,
+  loadJob,
+  resumeJob,
+  runJobSlice,
+  saveJob
+};
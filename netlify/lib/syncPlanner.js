@@ -0,0 +1,210 @@
+// Kuru çalıştırma planlayıcısı (POST /sync/plan): senkronizasyon çalıştırılmadan önce kaç ürünün
+// oluşturulacağını/güncelleneceğini, kaç REST çağrısı ve GraphQL puanı harcanacağını ve mağazanın
+// limitleri altında ne kadar süreceğini hesaplar. Feed anlık görüntüsü ve parmak izi taraması gerçek
+// senkronizasyondakiyle aynıdır; ürün adımı (productSync.js) istek göndermeyen, sadece kaydeden bir
+// limiter ile çalıştırılır. Ürün adımına eklenen her yeni çağrı böylece plana da yansır.
+// Parmak izleri okunamazsa plan da senkronizasyon gibi durur ya da ('rewrite') tam yeniden yazmayı
+// planlar; bu durumda ürün adımının başlık aramaları (GET) mağazaya gerçekten gönderilir, böylece
+// mevcut ürünler oluşturma değil güncelleme olarak planlanır.
+const { parseCallLimit } = require('./shopifyRateLimit');
+const { shopifyGraphql } = require('./stockSync');
+const { getFeedSnapshot } = require('./feedSnapshot');
+const { createProductSyncer, loadRemoteProducts, productKey } = require('./productSync');
+
+const API_VERSION = '2024-07';
+// shopifyRateLimit.js varsayılanları: eşzamanlı istek ve kovada bırakılan pay
+const MAX_CONCURRENCY = 10;
+const HEADROOM = 2;
+const SAMPLE_LIMIT = 10;
+
+const asArray = value => (value === undefined || value === null || value === '' ? [] : Array.isArray(value) ? value : [value]);
+
+// Yazma isteklerini göndermeyip yanıt uyduran limiter: her istek kaydedilir. readLimiter verilirse
+// okuma istekleri (GET) onunla gerçekten gönderilir, verilmezse ürün bulunamamış gibi davranılır.
+// Başarısız okumalar failedReads'te sayılır (ürün adımı bunları oluşturma olarak planlar).
+function createRecordingLimiter(readLimiter = null) {
+  const calls = [];
+  const recorder = {
+    calls,
+    failedReads: 0,
+    async request(config) {
+      calls.push(config);
+      const method = String(config.method).toUpperCase();
+      if (method === 'GET') {
+        if (!readLimiter) return { status: 200, headers: {}, data: { products: [] } };
+        try {
+          return await readLimiter.request(config);
+        } catch (error) {
+          recorder.failedReads++;
+          throw error;
+        }
+      }
+      if (method === 'POST') return { status: 201, headers: {}, data: { product: { id: null } } };
+      return { status: 200, headers: {}, data: { product: {} } };
+    },
+    async runAll(items, worker) {
+      for (let index = 0; index < items.length; index++) await worker(items[index], index);
+    },
+    stats: () => ({ requests: calls.length, retries: 0, throttledSeconds: 0 })
+  };
+  return recorder;
+}
+
+// Mağazanın REST kovası (X-Shopify-Shop-Api-Call-Limit) ve tek istek gecikmesi
+async function probeStore({ limiter, shopifyBase, accessToken }) {
+  const started = Date.now();
+  const response = await limiter.request({
+    method: 'get',
+    url: `${shopifyBase}/admin/api/${API_VERSION}/shop.json?fields=id`,
+    headers: { 'X-Shopify-Access-Token': accessToken, 'Content-Type': 'application/json' },
+    timeout: 10000
+  });
+  const limit = parseCallLimit(response.headers['x-shopify-shop-api-call-limit']) || { used: 0, size: 40 };
+  // Standart planda 40 kova / 2 istek/sn, Plus'ta 400 / 20: boşalma hızı kovanın 1/20'si
+  return { latencyMs: Date.now() - started, bucketSize: limit.size, bucketUsed: limit.used, leakRate: limit.size / 20 };
+}
+
+/** REST çağrılarının süresi: kova dolana kadar eşzamanlı, sonra boşalma hızında */
+function projectRestSeconds(calls, { bucketSize, leakRate, latencyMs }) {
+  if (calls === 0) return 0;
+  const bucketSeconds = Math.max(0, calls - (bucketSize - HEADROOM)) / leakRate;
+  const latencySeconds = (calls / MAX_CONCURRENCY) * (latencyMs / 1000);
+  return Math.max(bucketSeconds, latencySeconds);
+}
+
+/** GraphQL sorgularının süresi: puan bütçesini aşan kısım yenilenme hızında beklenir */
+function projectGraphqlSeconds(queries, points, { maximumAvailable, restoreRate, latencyMs }) {
+  if (queries === 0) return 0;
+  return Math.max(0, points - maximumAvailable) / restoreRate + queries * (latencyMs / 1000);
+}
+
+/**
+ * Tek mağaza için plan. feedUrl'in anlık görüntüsü ve mağazanın parmak izleri okunur (sadece okuma
+ * istekleri atılır); maxProducts verilirse feed'in ilk maxProducts ürünü planlanır.
+ * onFingerprintsUnavailable /sync/start'takiyle aynıdır: 'fail' parmak izleri okunamazsa
+ * FINGERPRINTS_UNAVAILABLE hatası fırlatır, 'rewrite' tam yeniden yazmayı planlar.
+ */
+async function planSync({ limiter, shopifyBase, accessToken, feedUrl, maxProducts = 0, onFingerprintsUnavailable = 'fail' }) {
+  const started = Date.now();
+  const snapshot = await getFeedSnapshot(feedUrl);
+  const products = maxProducts > 0 ? snapshot.products.slice(0, maxProducts) : snapshot.products;
+
+  const store = await probeStore({ limiter, shopifyBase, accessToken });
+
+  // Parmak izi taraması gerçek senkronizasyonun ilk adımıyla aynıdır; maliyeti ölçülür
+  const graphql = { queries: 0, costPoints: 0, maximumAvailable: 1000, restoreRate: 50, latencyMs: 0 };
+  const remoteProducts = await loadRemoteProducts({
+    limiter,
+    shopifyBase,
+    accessToken,
+    onUnavailable: onFingerprintsUnavailable,
+    graphql: async (query, variables) => {
+      const queryStarted = Date.now();
+      const data = await shopifyGraphql(limiter, shopifyBase, accessToken, query, variables, {
+        onCost: cost => {
+          graphql.costPoints += cost.actualQueryCost || cost.requestedQueryCost || 0;
+          if (cost.throttleStatus) {
+            graphql.maximumAvailable = cost.throttleStatus.maximumAvailable;
+            graphql.restoreRate = cost.throttleStatus.restoreRate;
+          }
+        }
+      });
+      graphql.queries++;
+      graphql.latencyMs += Date.now() - queryStarted;
+      return data;
+    }
+  });
+  if (graphql.queries) graphql.latencyMs /= graphql.queries;
+
+  // Ürün adımı kaydedici limiter ile çalıştırılır; tamamlanan iş anahtarları gibi aynı anahtarlı
+  // ürünler bir kez işlenir
+  const recorder = createRecordingLimiter(remoteProducts ? null : limiter);
+  const syncProduct = createProductSyncer({ limiter: recorder, shopifyBase, accessToken, remoteProducts, log: () => {} });
+  const counts = { created: 0, updated: 0, unchanged: 0, duplicateKeys: 0 };
+  const samples = [];
+  const seenKeys = new Set();
+  for (let index = 0; index < products.length; index++) {
+    const key = productKey(products[index], index);
+    if (seenKeys.has(key)) {
+      counts.duplicateKeys++;
+      continue;
+    }
+    seenKeys.add(key);
+    const result = await syncProduct(products[index], index);
+    counts[result.action]++;
+    if (result.action !== 'unchanged' && samples.length < SAMPLE_LIMIT) {
+      samples.push({ key, title: String(products[index].urunismi || ''), action: result.action });
+    }
+  }
+
+  const restCalls = { GET: 0, POST: 0, PUT: 0, DELETE: 0 };
+  let variantWrites = 0;
+  let imageUploads = 0;
+  let metafieldWrites = 0;
+  for (const call of recorder.calls) {
+    const method = String(call.method).toUpperCase();
+    restCalls[method] = (restCalls[method] || 0) + 1;
+    const product = call.data && call.data.product;
+    if (!product) continue;
+    variantWrites += asArray(product.variants).length;
+    imageUploads += asArray(product.images).length;
+    metafieldWrites += asArray(product.metafields).length;
+  }
+  const restTotal = recorder.calls.length;
+
+  const restSeconds = projectRestSeconds(restTotal, store);
+  const graphqlSeconds = projectGraphqlSeconds(graphql.queries, graphql.costPoints, graphql);
+  let feedVariants = 0;
+  let feedImages = 0;
+  for (const product of products) {
+    const variants = asArray(product.Varyantlar && product.Varyantlar.Varyant);
+    feedVariants += variants.length || 1;
+    const images = new Set(asArray(product.resimler && product.resimler.resim));
+    variants.forEach(variant => asArray(variant.resimler && variant.resimler.resim).forEach(url => images.add(url)));
+    feedImages += images.size;
+  }
+
+  return {
+    feed: {
+      url: feedUrl,
+      products: products.length,
+      variants: feedVariants,
+      images: feedImages,
+      snapshotSource: snapshot.source
+    },
+    store: {
+      shop: shopifyBase,
+      remoteProducts: remoteProducts ? remoteProducts.size : null,
+      fingerprints: remoteProducts ? 'ok' : 'unavailable',
+      rest: { bucketSize: store.bucketSize, leakRate: store.leakRate, latencyMs: store.latencyMs },
+      graphql: { maximumAvailable: graphql.maximumAvailable, restoreRate: graphql.restoreRate }
+    },
+    plan: {
+      creates: counts.created,
+      updates: counts.updated,
+      unchanged: counts.unchanged,
+      duplicateKeys: counts.duplicateKeys,
+      // Parmak izsiz planda başlık araması başarısız olan ürünler: oluşturma mı güncelleme mi belirsiz
+      unresolvedLookups: recorder.failedReads,
+      variantWrites,
+      imageUploads,
+      metafieldWrites,
+      restCalls: { ...restCalls, total: restTotal },
+      graphql: { queries: graphql.queries, costPoints: graphql.costPoints },
+      projectedSeconds: {
+        graphql: Math.round(graphqlSeconds * 10) / 10,
+        rest: Math.round(restSeconds * 10) / 10,
+        total: Math.round((graphqlSeconds + restSeconds) * 10) / 10
+      }
+    },
+    samples,
+    plannedInMs: Date.now() - started
+  };
+}
+
+module.exports = {
+  createRecordingLimiter,
+  planSync,
+  projectGraphqlSeconds,
+  projectRestSeconds
+};
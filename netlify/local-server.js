@@ -0,0 +1,37 @@
+// Netlify function'ını (functions/api.js) netlify-cli olmadan yerelde çalıştıran küçük HTTP sarmalayıcı.
+// Yük testleri ve benchmark'lar bu süreci başlatıp /api/... yollarına istek atar.
+//
+// Kullanım: node netlify/local-server.js [port]   (varsayılan: PORT ya da 8888)
+const http = require('http');
+const { URL } = require('url');
+const { handler } = require('./functions/api');
+
+const port = Number(process.argv[2] || process.env.PORT || 8888);
+
+const server = http.createServer((req, res) => {
+  const chunks = [];
+  req.on('data', chunk => chunks.push(chunk));
+  req.on('end', async () => {
+    const url = new URL(req.url, `http://${req.headers.host || 'localhost'}`);
+    const event = {
+      path: url.pathname,
+      httpMethod: req.method,
+      headers: req.headers, // Node başlık adlarını zaten küçük harfe çevirir
+      queryStringParameters: Object.fromEntries(url.searchParams),
+      body: chunks.length ? Buffer.concat(chunks).toString('utf-8') : null
+    };
+
+    try {
+      const result = await handler(event, {});
+      res.writeHead(result.statusCode || 200, result.headers || {});
+      res.end(result.body || '');
+    } catch (error) {
+      res.writeHead(500, { 'Content-Type': 'application/json' });
+      res.end(JSON.stringify({ success: false, message: error.message }));
+    }
+  });
+});
+
+server.listen(port, '127.0.0.1', () => {
+  console.log(`Yerel function sunucusu: http://127.0.0.1:${port}`);
+});
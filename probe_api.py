@@ -0,0 +1,277 @@
+"""API rotalarını eşzamanlı yoklayıp gecikme SLO'larına göre değerlendirir.
+
+Kullanım:
+    python probe_api.py --local --duration 20 --rate 5
+    python probe_api.py --base-url https://.../.netlify/functions/api --json probe.json
+
+Her rota, süre boyunca sabit hızda (rota başına istek/sn) ve birbirinden
+bağımsız yoklanır; istekler yanıt beklenmeden planlanan zamanda atılır, gecikme
+planlanan zamandan ölçülür (yavaş yanıtlar sonraki istekleri gizlemez). Rota
+başına p50/p95/p99 gecikme, hata oranı ve yanıt boyutu raporlanır ve SLO
+eşikleriyle karşılaştırılır; eşik aşılırsa 2 ile çıkılır.
+
+--local: netlify/local-server.js, sentetik bir feed ve sahte Shopify
+(shopify_tools.MockShopify) başlatılır; ağ gerekmez. Yazan rotalar
+(/sync, /sync/start, /sync/clean ...) sadece --include-writes ile yoklanır.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from collections import Counter, namedtuple
+from datetime import datetime, timezone
+
+import httpx
+
+BASE_URL = "https://vervegranxml.netlify.app/.netlify/functions/api"
+ACCESS_TOKEN = 'shpat_mock'
+
+# Rota başına eşikler; --slo dosyası rota ("GET /xml/stats") ya da "*" anahtarıyla ezer
+DEFAULT_SLO = {'p95_ms': 1000, 'p99_ms': 2000, 'max_error_rate': 0.01}
+FAST_SLO = {'p95_ms': 100, 'p99_ms': 250}
+SHOPIFY_SLO = {'p95_ms': 1500, 'p99_ms': 3000}
+
+# max_rate: ağır rotalar --rate'ten bağımsız olarak en fazla bu hızda yoklanır (istek/sn)
+Route = namedtuple('Route', 'method path body expected slo max_rate', defaults=(None, (200,), {}, None))
+
+READ_ROUTES = [
+    Route('GET', '/debug/env', slo=FAST_SLO),
+    Route('GET', '/google/status', slo=FAST_SLO),
+    Route('GET', '/config', slo=FAST_SLO),
+    Route('GET', '/xml/stats', slo={'p95_ms': 500, 'p99_ms': 1500}),
+    Route('GET', '/xml/analyze', slo={'p95_ms': 500, 'p99_ms': 1500}),
+    # /xml/check her çağrıda feed'i baştan indirir
+    Route('GET', '/xml/check', slo={'p95_ms': 3000, 'p99_ms': 5000}, max_rate=1),
+    Route('GET', '/shopify/check', slo=SHOPIFY_SLO),
+    Route('GET', '/shopify/info', slo=SHOPIFY_SLO),
+    Route('GET', '/sync/status', expected=(200, 404), slo=FAST_SLO),
+    Route('GET', '/sync/summary', slo=FAST_SLO),
+    # Her plan mağazanın tüm parmak izlerini GraphQL ile tarar
+    Route('POST', '/sync/plan', body={'maxProducts': 50}, slo={'p95_ms': 10000, 'p99_ms': 20000}, max_rate=0.2),
+]
+WRITE_ROUTES = [
+    Route('POST', '/sync', body={'options': {'testMode': True, 'maxProducts': 1}},
+          slo={'p95_ms': 5000, 'p99_ms': 10000}, max_rate=0.5),
+    Route('DELETE', '/sync/clean', slo={'p95_ms': 5000, 'p99_ms': 10000}, max_rate=0.5),
+    Route('POST', '/sync/start', body={'budgetMs': 5000}, slo={'p95_ms': 8000, 'p99_ms': 12000}, max_rate=0.2),
+    Route('POST', '/sync/stock', body={}, slo={'p95_ms': 10000, 'p99_ms': 20000}, max_rate=0.2),
+]
+
+
+def route_name(method, path):
+    return f"{method} {path}"
+
+
+def percentile(sorted_values, q):
+    """Sıralı listede en yakın sıra yöntemiyle q yüzdeliği"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))]
+
+
+def load_slo(path):
+    if not path:
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def route_slo(name, declared, overrides):
+    slo = {**DEFAULT_SLO, **declared}
+    slo.update(overrides.get('*', {}))
+    slo.update(overrides.get(name, {}))
+    return slo
+
+
+async def probe_route(client, semaphore, base_url, headers, route, rate, duration):
+    """Rotayı duration sn boyunca rate istek/sn ile yoklar; her isteğin (gecikme ms, durum, bayt, hata) kaydı"""
+    method, path, body = route.method, route.path, route.body
+    if route.max_rate:
+        rate = min(rate, route.max_rate)
+    samples = []
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    async def one(scheduled):
+        async with semaphore:
+            try:
+                response = await client.request(method, f"{base_url}{path}", headers=headers, json=body)
+                samples.append(((loop.time() - scheduled) * 1000, response.status_code, len(response.content), None))
+            except httpx.HTTPError as error:
+                samples.append(((loop.time() - scheduled) * 1000, None, 0, f"{type(error).__name__}: {error}"))
+
+    tasks = []
+    for index in range(max(1, int(rate * duration))):
+        scheduled = started + index / rate
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(scheduled)))
+    await asyncio.gather(*tasks)
+    return samples
+
+
+def summarize(route, samples, overrides):
+    name = route_name(route.method, route.path)
+    latencies = sorted(sample[0] for sample in samples)
+    statuses = Counter(str(sample[1]) if sample[1] is not None else 'hata' for sample in samples)
+    errors = [sample for sample in samples if sample[1] not in route.expected]
+    sizes = [sample[2] for sample in samples if sample[1] is not None]
+    slo = route_slo(name, route.slo, overrides)
+    summary = {
+        'requests': len(samples),
+        'errors': len(errors),
+        'errorRate': round(len(errors) / len(samples), 4) if samples else 0.0,
+        'statusCounts': dict(statuses),
+        'p50Ms': round(percentile(latencies, 0.50), 1),
+        'p95Ms': round(percentile(latencies, 0.95), 1),
+        'p99Ms': round(percentile(latencies, 0.99), 1),
+        'maxMs': round(latencies[-1], 1) if latencies else 0.0,
+        'bytes': {
+            'mean': round(sum(sizes) / len(sizes)) if sizes else 0,
+            'max': max(sizes) if sizes else 0,
+        },
+        'lastError': next((sample[3] for sample in reversed(errors) if sample[3]), None),
+        'slo': slo,
+    }
+    violations = []
+    if summary['p95Ms'] > slo['p95_ms']:
+        violations.append(f"p95 {summary['p95Ms']:.0f} ms > {slo['p95_ms']} ms")
+    if summary['p99Ms'] > slo['p99_ms']:
+        violations.append(f"p99 {summary['p99Ms']:.0f} ms > {slo['p99_ms']} ms")
+    if summary['errorRate'] > slo['max_error_rate']:
+        violations.append(f"hata oranı {summary['errorRate']:.2%} > {slo['max_error_rate']:.2%}")
+    summary['violations'] = violations
+    return name, summary
+
+
+async def run_probe(base_url, headers, routes, args, overrides):
+    semaphore = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        results = await asyncio.gather(*(
+            probe_route(client, semaphore, base_url, headers, route, args.rate, args.duration) for route in routes
+        ))
+    return dict(summarize(route, samples, overrides) for route, samples in zip(routes, results))
+
+
+def select_routes(args):
+    routes = READ_ROUTES + (WRITE_ROUTES if args.include_writes else [])
+    if args.route:
+        wanted = set(args.route)
+        routes = [route for route in routes if route.path in wanted or route_name(route.method, route.path) in wanted]
+        if not routes:
+            raise SystemExit(f"Eşleşen rota yok: {', '.join(args.route)}")
+    return routes
+
+
+def _headers(args, shop_url=None, token=None, feed_url=None):
+    headers = {'Content-Type': 'application/json'}
+    if shop_url or args.shop_url:
+        headers['X-Shopify-Shop-Url'] = shop_url or args.shop_url
+    if token or args.token:
+        headers['X-Shopify-Access-Token'] = token or args.token
+    if feed_url or args.feed_url:
+        headers['X-XML-Feed-Url'] = feed_url or args.feed_url
+    return headers
+
+
+def probe_local(routes, args, overrides):
+    """Yerel function + sentetik feed + sahte Shopify'a karşı yoklar (ağ gerekmez)"""
+    from benchmarks.analyze_xml_bench import serve_directory, write_synthetic_feed
+    from benchmarks.sync_load import start_function_server
+    from shopify_tools import MockShopify
+
+    with tempfile.TemporaryDirectory() as workdir:
+        write_synthetic_feed(os.path.join(workdir, 'feed.xml'), args.products, args.variants)
+        feed_server, feed_base = serve_directory(workdir)
+        shop = MockShopify(latency=args.shop_latency, access_token=ACCESS_TOKEN,
+                           rest_bucket_size=args.shop_bucket_size, rest_leak_rate=args.shop_leak_rate)
+        shop.start()
+        env = dict(os.environ, FEED_CACHE_DIR=os.path.join(workdir, 'feed-cache'),
+                   SYNC_JOB_DIR=os.path.join(workdir, 'jobs'))
+        function_process, function_base = start_function_server(env=env)
+        try:
+            headers = _headers(args, shop.base_url, ACCESS_TOKEN, f"{feed_base}/feed.xml")
+            return f"{function_base}/api", asyncio.run(run_probe(f"{function_base}/api", headers, routes, args, overrides))
+        finally:
+            function_process.terminate()
+            function_process.wait()
+            shop.stop()
+            feed_server.shutdown()
+
+
+def print_report(report):
+    print(f"Hedef: {report['target']}  süre: {report['durationS']} sn  hız: {report['ratePerRoute']} istek/sn/rota")
+    print(f"\n{'rota':<22} {'istek':>6} {'hata %':>7} {'p50':>7} {'p95':>7} {'p99':>7} {'ort bayt':>9}  SLO")
+    for name, row in report['routes'].items():
+        status = 'OK' if not row['violations'] else 'AŞILDI: ' + '; '.join(row['violations'])
+        print(f"{name:<22} {row['requests']:>6} {row['errorRate'] * 100:>7.1f} {row['p50Ms']:>7.0f} "
+              f"{row['p95Ms']:>7.0f} {row['p99Ms']:>7.0f} {row['bytes']['mean']:>9}  {status}")
+        if row['lastError']:
+            print(f"{'':<22} son hata: {row['lastError'][:100]}")
+    failed = [name for name, row in report['routes'].items() if row['violations']]
+    print(f"\nSLO: {'tüm rotalar eşik içinde' if not failed else f'{len(failed)} rota eşiği aştı'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--base-url', default=os.environ.get('SYNC_API_URL', BASE_URL), help="Function kök adresi")
+    parser.add_argument('--local', action='store_true',
+                        help="Yerel function, sentetik feed ve sahte Shopify başlatıp onlara karşı yokla")
+    parser.add_argument('--duration', type=float, default=10, help="Yoklama süresi (sn)")
+    parser.add_argument('--rate', type=float, default=2, help="Rota başına istek/sn")
+    parser.add_argument('--concurrency', type=int, default=50, help="En fazla eşzamanlı istek")
+    parser.add_argument('--timeout', type=float, default=30, help="İstek zaman aşımı (sn)")
+    parser.add_argument('--route', action='append', help="Sadece bu rota (\"/xml/stats\" ya da \"GET /xml/stats\"); tekrarlanabilir")
+    parser.add_argument('--include-writes', action='store_true',
+                        help="Shopify'a yazan rotaları da yokla (gerçek mağazada ürün oluşturur/siler)")
+    parser.add_argument('--slo', metavar='DOSYA', help="SLO eşikleri (JSON: {\"GET /xml/stats\": {\"p95_ms\": 300}, \"*\": {...}})")
+    parser.add_argument('--json', metavar='DOSYA', help="Raporu JSON olarak yaz ('-': standart çıktı)")
+    parser.add_argument('--shop-url', default=os.environ.get('SHOPIFY_STORE_URL'))
+    parser.add_argument('--token', default=os.environ.get('SHOPIFY_ADMIN_API_TOKEN'))
+    parser.add_argument('--feed-url', default=os.environ.get('XML_FEED_URL'))
+    parser.add_argument('--products', type=int, default=200, help="--local: sentetik feed'deki ürün sayısı")
+    parser.add_argument('--variants', type=int, default=3, help="--local: ürün başına varyant sayısı")
+    parser.add_argument('--shop-latency', type=float, default=0.02, help="--local: sahte Shopify yanıt gecikmesi (sn)")
+    # Varsayılan Plus kovası: standart planda (40 / 2) /shopify/* rotaları 429 alır, yoklama bunu ölçer
+    parser.add_argument('--shop-bucket-size', type=int, default=400, help="--local: sahte Shopify REST kova kapasitesi")
+    parser.add_argument('--shop-leak-rate', type=float, default=20.0, help="--local: REST kova boşalma hızı (istek/sn)")
+    args = parser.parse_args()
+
+    routes = select_routes(args)
+    overrides = load_slo(args.slo)
+    started_at = datetime.now(timezone.utc).isoformat()
+    start = time.perf_counter()
+    if args.local:
+        target, results = probe_local(routes, args, overrides)
+    else:
+        target = args.base_url.rstrip('/')
+        results = asyncio.run(run_probe(target, _headers(args), routes, args, overrides))
+
+    report = {
+        'startedAt': started_at,
+        'target': target,
+        'local': args.local,
+        'durationS': args.duration,
+        'elapsedS': round(time.perf_counter() - start, 2),
+        'ratePerRoute': args.rate,
+        'passed': not any(row['violations'] for row in results.values()),
+        'routes': results,
+    }
+    if args.json == '-':
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print_report(report)
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0 if report['passed'] else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
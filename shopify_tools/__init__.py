@@ -0,0 +1,21 @@
+"""Shopify Admin API tarafı için Python araçları"""
+from .batch import BatchResult, PriceChange, QuantityChange, VariantBatchWriter
+from .bulk import SkuEntry, StoreSnapshot, export_store_snapshot, run_bulk_query
+from .client import ShopifyAPIError, ShopifyClient, shop_base_url
+from .mock_server import LeakyBucket, MockShopify
+
+__all__ = [
+    'BatchResult',
+    'LeakyBucket',
+    'MockShopify',
+    'PriceChange',
+    'QuantityChange',
+    'ShopifyAPIError',
+    'ShopifyClient',
+    'SkuEntry',
+    'StoreSnapshot',
+    'VariantBatchWriter',
+    'export_store_snapshot',
+    'run_bulk_query',
+    'shop_base_url',
+]
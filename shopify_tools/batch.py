@@ -0,0 +1,210 @@
+"""Varyant fiyat ve stok değişiklikleri için toplu GraphQL yazma yolu.
+
+Değişiklikler kuyruğa alınır ve az sayıda istekle gönderilir:
+
+* Fiyatlar: ürün başına bir productVariantsBulkUpdate alanı; birden çok ürünün
+  alanları takma adlarla (p0:, p1:, ...) tek bir belgede, maliyet bütçesine
+  (max_products_per_request * 10 puan) kadar birleştirilir.
+* Stoklar: inventorySetQuantities ile istek başına en fazla 250 kalem.
+
+Hatalar kalem bazında raporlanır; bir kalemin hatası aynı istekteki diğer
+kalemlerin güncellenmesini engellemez. inventorySetQuantities atomik olduğu
+için hatalı kalemler ayıklanıp geri kalanlar bir kez daha gönderilir.
+TypeScript karşılığı: src/services/shopifyBatchWriter.ts
+"""
+import collections
+
+from .client import ShopifyAPIError
+
+MAX_QUANTITIES_PER_REQUEST = 250
+
+# Alanı değiştirme (None ise liste fiyatı silinir)
+KEEP = object()
+
+PriceChange = collections.namedtuple('PriceChange', ['product_id', 'variant_id', 'sku', 'price', 'compare_at_price'],
+                                     defaults=(KEEP, KEEP))
+QuantityChange = collections.namedtuple('QuantityChange', ['inventory_item_id', 'sku', 'quantity'])
+
+LOCATIONS_QUERY = "query { locations(first: 1) { edges { node { id } } } }"
+
+SET_QUANTITIES_MUTATION = """
+mutation setQuantities($input: InventorySetQuantitiesInput!) {
+  inventorySetQuantities(input: $input) {
+    inventoryAdjustmentGroup { reason }
+    userErrors { field message code }
+  }
+}
+"""
+
+
+class BatchResult:
+    """Toplu yazmanın sonucu: başarılı SKU'lar, kalem bazında hatalar, istek sayısı"""
+
+    __slots__ = ('updated', 'failed', 'requests')
+
+    def __init__(self):
+        self.updated = []
+        self.failed = []
+        self.requests = 0
+
+    def fail(self, sku, message):
+        self.failed.append((sku, message))
+
+
+def build_variants_bulk_document(product_count):
+    """product_count adet productVariantsBulkUpdate alanı içeren mutasyon belgesi"""
+    arguments = ', '.join(f"$p{i}: ID!, $v{i}: [ProductVariantsBulkInput!]!" for i in range(product_count))
+    fields = '\n'.join(
+        f"  p{i}: productVariantsBulkUpdate(productId: $p{i}, variants: $v{i}, allowPartialUpdates: true) {{\n"
+        f"    productVariants {{ id }}\n"
+        f"    userErrors {{ field message code }}\n"
+        f"  }}"
+        for i in range(product_count)
+    )
+    return f"mutation bulkVariants({arguments}) {{\n{fields}\n}}"
+
+
+def _error_index(error, position):
+    """userErrors.field içindeki kalem sırasını bulur (['variants', '3', 'price'] -> 3)"""
+    field = error.get('field') or []
+    if len(field) > position and str(field[position]).isdigit():
+        return int(field[position])
+    return None
+
+
+class VariantBatchWriter:
+    """Fiyat ve stok değişikliklerini kuyruğa alıp toplu mutasyonlarla gönderir"""
+
+    def __init__(self, client, location_id=None, max_products_per_request=25,
+                 max_quantities_per_request=MAX_QUANTITIES_PER_REQUEST):
+        self.client = client
+        self.location_id = location_id
+        self.max_products_per_request = max_products_per_request
+        self.max_quantities_per_request = max_quantities_per_request
+        self.result = BatchResult()
+        self._prices = collections.OrderedDict()
+        self._quantities = []
+
+    def queue_price(self, change):
+        self._prices.setdefault(change.product_id, []).append(change)
+
+    def queue_quantity(self, change):
+        self._quantities.append(change)
+
+    async def flush_if_full(self):
+        """Bir isteği dolduracak kadar değişiklik biriktiyse gönderir"""
+        if len(self._prices) >= self.max_products_per_request:
+            await self._flush_prices()
+        if len(self._quantities) >= self.max_quantities_per_request:
+            await self._flush_quantities()
+
+    async def flush(self):
+        await self._flush_prices()
+        await self._flush_quantities()
+        return self.result
+
+    async def _flush_prices(self):
+        while self._prices:
+            batch = []
+            while self._prices and len(batch) < self.max_products_per_request:
+                batch.append(self._prices.popitem(last=False))
+            await self._send_prices(batch)
+
+    async def _send_prices(self, batch):
+        variables = {}
+        for i, (product_id, changes) in enumerate(batch):
+            variables[f"p{i}"] = product_id
+            variables[f"v{i}"] = [_variant_input(change) for change in changes]
+
+        self.result.requests += 1
+        try:
+            data = await self.client.graphql(build_variants_bulk_document(len(batch)), variables,
+                                             cost=10 * len(batch))
+        except ShopifyAPIError as error:
+            for _, changes in batch:
+                for change in changes:
+                    self.result.fail(change.sku, str(error))
+            return
+
+        for i, (_, changes) in enumerate(batch):
+            payload = data.get(f"p{i}") or {}
+            failed = {}
+            for error in payload.get('userErrors') or []:
+                index = _error_index(error, 1)
+                if index is None:
+                    # Ürün düzeyinde hata (ör. ürün silinmiş): tüm varyantları başarısız say
+                    failed.update({n: error['message'] for n in range(len(changes))})
+                else:
+                    failed[index] = error['message']
+            for index, change in enumerate(changes):
+                if index in failed:
+                    self.result.fail(change.sku, failed[index])
+                else:
+                    self.result.updated.append(change.sku)
+
+    async def _flush_quantities(self):
+        if not self._quantities:
+            return
+        if self.location_id is None:
+            data = await self.client.graphql(LOCATIONS_QUERY)
+            self.result.requests += 1
+            edges = data['locations']['edges']
+            if not edges:
+                for change in self._quantities:
+                    self.result.fail(change.sku, 'Mağazada stok lokasyonu bulunamadı')
+                self._quantities = []
+                return
+            self.location_id = edges[0]['node']['id']
+
+        pending, self._quantities = self._quantities, []
+        for start in range(0, len(pending), self.max_quantities_per_request):
+            await self._send_quantities(pending[start:start + self.max_quantities_per_request], retry=True)
+
+    async def _send_quantities(self, changes, retry):
+        variables = {'input': {
+            'name': 'available',
+            'reason': 'correction',
+            'ignoreCompareQuantity': True,
+            'quantities': [
+                {'inventoryItemId': change.inventory_item_id, 'locationId': self.location_id,
+                 'quantity': change.quantity}
+                for change in changes
+            ],
+        }}
+        self.result.requests += 1
+        try:
+            data = await self.client.graphql(SET_QUANTITIES_MUTATION, variables)
+        except ShopifyAPIError as error:
+            for change in changes:
+                self.result.fail(change.sku, str(error))
+            return
+
+        errors = data['inventorySetQuantities']['userErrors']
+        if not errors:
+            self.result.updated.extend(change.sku for change in changes)
+            return
+
+        failed = {}
+        for error in errors:
+            index = _error_index(error, 2)
+            if index is not None:
+                failed[index] = error['message']
+        if not failed or not retry:
+            for change in changes:
+                self.result.fail(change.sku, errors[0]['message'])
+            return
+        # Mutasyon atomik: hatalı kalemleri ayıkla, kalanları bir kez daha gönder
+        for index, message in failed.items():
+            self.result.fail(changes[index].sku, message)
+        remaining = [change for index, change in enumerate(changes) if index not in failed]
+        if remaining:
+            await self._send_quantities(remaining, retry=False)
+
+
+def _variant_input(change):
+    variant_input = {'id': change.variant_id}
+    if change.price is not KEEP:
+        variant_input['price'] = change.price
+    if change.compare_at_price is not KEEP:
+        variant_input['compareAtPrice'] = change.compare_at_price
+    return variant_input
@@ -0,0 +1,173 @@
+"""Bulk Operations (bulkOperationRunQuery) ile tüm mağazanın tek işte dışa aktarılması.
+
+Sayfalı products(first: 50) sorguları yerine tek bir bulk işi başlatılır,
+bitene kadar currentBulkOperation ile beklenir ve sonuç JSONL dosyası satır
+satır okunarak SKU -> varyant indeksi kurulur. JSONL'de ürünler ve
+varyantlar ayrı satırlardır; varyant satırları __parentId ile ürüne bağlanır.
+"""
+import asyncio
+import collections
+import json
+import time
+
+import httpx
+
+from .client import ShopifyAPIError
+
+BULK_PRODUCTS_QUERY = """
+{
+  products {
+    edges {
+      node {
+        id
+        handle
+        title
+        variants {
+          edges {
+            node {
+              id
+              sku
+              barcode
+              price
+              compareAtPrice
+              inventoryQuantity
+              inventoryItem { id }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+RUN_MUTATION = """
+mutation bulkRun($query: String!) {
+  bulkOperationRunQuery(query: $query) {
+    bulkOperation { id status }
+    userErrors { field message }
+  }
+}
+"""
+
+CURRENT_OPERATION_QUERY = """
+query {
+  currentBulkOperation {
+    id
+    status
+    errorCode
+    objectCount
+    url
+    partialDataUrl
+  }
+}
+"""
+
+SkuEntry = collections.namedtuple(
+    'SkuEntry',
+    ['product_id', 'handle', 'variant_id', 'inventory_item_id', 'price', 'compare_at_price', 'inventory_quantity'],
+)
+
+
+class StoreSnapshot:
+    """Bulk export sonucu: ürün listesi ve SKU indeksi"""
+
+    __slots__ = ('products', 'sku_index', 'duplicate_skus', 'object_count', 'fetched_at')
+
+    def __init__(self):
+        self.products = {}
+        self.sku_index = {}
+        self.duplicate_skus = set()
+        self.object_count = 0
+        self.fetched_at = time.time()
+
+    @property
+    def variant_count(self):
+        return sum(len(product['variants']) for product in self.products.values())
+
+    def add_record(self, record):
+        """JSONL'deki tek bir satırı (ürün ya da varyant) snapshot'a ekler"""
+        self.object_count += 1
+        parent_id = record.get('__parentId')
+        if parent_id is None:
+            record['variants'] = []
+            self.products[record['id']] = record
+            return
+
+        product = self.products.get(parent_id)
+        if product is None:
+            # Shopify çocukları ebeveynden sonra yazar; tersi bozuk dosya demektir
+            raise ShopifyAPIError(f"Bulk JSONL: {record['id']} için ebeveyn {parent_id} bulunamadı")
+        product['variants'].append(record)
+
+        sku = record.get('sku')
+        if not sku:
+            return
+        if sku in self.sku_index:
+            self.duplicate_skus.add(sku)
+            return
+        self.sku_index[sku] = SkuEntry(
+            product['id'], product.get('handle'), record['id'],
+            (record.get('inventoryItem') or {}).get('id'),
+            record.get('price'), record.get('compareAtPrice'), record.get('inventoryQuantity'),
+        )
+
+
+async def run_bulk_query(client, query, poll_interval=0.5, max_poll_interval=10.0, timeout=3600):
+    """Bulk sorguyu başlatır, bitmesini bekler ve sonuç URL'ini döndürür.
+
+    Mağazada hiç kayıt yoksa Shopify URL vermez, bu durumda None döner.
+    Başka bir bulk işi sürüyorsa önce onun bitmesi beklenir.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        data = await client.graphql(RUN_MUTATION, {'query': query})
+        result = data['bulkOperationRunQuery']
+        if not result['userErrors']:
+            break
+        message = result['userErrors'][0]['message']
+        if 'already in progress' not in message:
+            raise ShopifyAPIError(f"bulkOperationRunQuery: {message}", errors=result['userErrors'])
+        await _wait_for_current(client, poll_interval, max_poll_interval, deadline)
+
+    operation = await _wait_for_current(client, poll_interval, max_poll_interval, deadline)
+    if operation['status'] != 'COMPLETED':
+        raise ShopifyAPIError(f"Bulk işi {operation['status']} ile bitti ({operation.get('errorCode')})",
+                              errors=operation)
+    return operation.get('url')
+
+
+async def _wait_for_current(client, poll_interval, max_poll_interval, deadline):
+    interval = poll_interval
+    while True:
+        data = await client.graphql(CURRENT_OPERATION_QUERY)
+        operation = data['currentBulkOperation']
+        if operation is None or operation['status'] not in ('CREATED', 'RUNNING', 'CANCELING'):
+            return operation or {'status': 'COMPLETED', 'url': None}
+        if time.monotonic() > deadline:
+            raise ShopifyAPIError(f"Bulk işi zaman aşımına uğradı: {operation['id']}")
+        await asyncio.sleep(interval)
+        interval = min(max_poll_interval, interval * 1.5)
+
+
+async def iter_jsonl(url, transport=None, timeout=60.0):
+    """Sonuç dosyasını indirirken satır satır JSON nesnesi üretir.
+
+    Dosya imzalı bir depolama URL'idir; Shopify erişim anahtarı gönderilmez.
+    """
+    async with httpx.AsyncClient(timeout=timeout, transport=transport) as http:
+        async with http.stream('GET', url) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line.strip():
+                    yield json.loads(line)
+
+
+async def export_store_snapshot(client, query=BULK_PRODUCTS_QUERY, transport=None):
+    """Tüm ürün ve varyantları tek bulk işiyle çekip StoreSnapshot döndürür"""
+    snapshot = StoreSnapshot()
+    url = await run_bulk_query(client, query)
+    if url:
+        async for record in iter_jsonl(url, transport=transport):
+            snapshot.add_record(record)
+    return snapshot
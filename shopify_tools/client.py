@@ -0,0 +1,311 @@
+"""Shopify Admin API için asyncio istemcisi.
+
+Tek bir keep-alive bağlantı havuzu (httpx.AsyncClient) üzerinden çalışır ve
+eşzamanlılığı sabit beklemelerle değil Shopify'ın geri bildirimiyle ayarlar:
+
+* REST: her yanıttaki X-Shopify-Shop-Api-Call-Limit ("32/40") başlığından
+  kovanın doluluğu takip edilir. Kovada yer olduğu sürece istekler paralel
+  gönderilir, dolmaya yaklaşınca boşalma hızına (leak_rate) göre beklenir.
+* GraphQL: extensions.cost.throttleStatus'tan kalan puan ve yenilenme hızı
+  okunur; sorgu maliyeti kadar puan birikene kadar beklenir.
+
+429 ve 5xx yanıtları (GraphQL'de THROTTLED hatası) Retry-After ya da üstel
+geri çekilme ile yeniden denenir.
+
+Kullanım:
+    async with ShopifyClient('magaza.myshopify.com', token) as client:
+        shop = await client.get('shop.json')
+        results = await client.map(push_product, products)
+"""
+import asyncio
+import random
+import time
+
+import httpx
+
+DEFAULT_API_VERSION = '2024-07'
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class ShopifyAPIError(Exception):
+    """Yeniden denemelerden sonra da başarısız olan Shopify isteği"""
+
+    def __init__(self, message, status=None, errors=None):
+        super().__init__(message)
+        self.status = status
+        self.errors = errors
+
+
+def shop_base_url(shop_url):
+    """'magaza.myshopify.com' ya da tam URL'den şemalı taban adres üretir"""
+    shop_url = str(shop_url).strip().rstrip('/')
+    if shop_url.startswith(('http://', 'https://')):
+        return shop_url
+    return f"https://{shop_url}"
+
+
+def parse_call_limit(value):
+    """'32/40' -> (32, 40); başlık yoksa ya da bozuksa None"""
+    try:
+        used, size = value.split('/')
+        return int(used), int(size)
+    except (AttributeError, ValueError):
+        return None
+
+
+class RestBucketLimiter:
+    """REST kovasının tahmini doluluğuna göre aynı anda kaç istek gideceğini belirler.
+
+    Kova seviyesi son görülen başlıktan, geçen süre boyunca leak_rate ile
+    boşaldığı varsayılarak tahmin edilir. Yanıtı beklenen istekler de kovada
+    yer kaplıyormuş gibi sayılır; böylece eşzamanlılık kovadaki boş yer kadar
+    büyür ve kova doldukça kendiliğinden daralır.
+    """
+
+    def __init__(self, bucket_size=40, leak_rate=2.0, max_concurrency=20, headroom=2):
+        self.bucket_size = bucket_size
+        self.leak_rate = leak_rate
+        self.max_concurrency = max_concurrency
+        self.headroom = headroom
+        self.level = 0.0
+        self.in_flight = 0
+        self.throttled_seconds = 0.0
+        self._updated = time.monotonic()
+        self._condition = asyncio.Condition()
+
+    def _estimated_level(self):
+        elapsed = time.monotonic() - self._updated
+        return max(0.0, self.level - elapsed * self.leak_rate)
+
+    def _free_slots(self):
+        free = self.bucket_size - self.headroom - self._estimated_level() - self.in_flight
+        return min(free, self.max_concurrency - self.in_flight)
+
+    async def acquire(self):
+        async with self._condition:
+            while self._free_slots() < 1:
+                wait = max(0.05, (1 - self._free_slots()) / self.leak_rate)
+                try:
+                    await asyncio.wait_for(self._condition.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+            self.in_flight += 1
+
+    async def release(self, call_limit=None):
+        async with self._condition:
+            self.in_flight -= 1
+            if call_limit:
+                used, size = call_limit
+                # Yanıtlar sırasız gelebilir; eski (daha boş) bir başlık tahmini aşağı çekmesin
+                level = max(float(used), self._estimated_level() + 1)
+                self.bucket_size = size
+                self.level = min(level, float(size))
+                self._updated = time.monotonic()
+            self._condition.notify_all()
+
+    async def throttled(self, retry_after):
+        """429 alındı: kova dolu kabul edilir ve Retry-After kadar beklenir"""
+        async with self._condition:
+            self.level = float(self.bucket_size)
+            self._updated = time.monotonic()
+        self.throttled_seconds += retry_after
+        await asyncio.sleep(retry_after)
+
+
+class GraphQLCostLimiter:
+    """GraphQL maliyet kovası: throttleStatus geri bildirimine göre bekler"""
+
+    def __init__(self, maximum_available=1000.0, restore_rate=50.0):
+        self.maximum_available = maximum_available
+        self.restore_rate = restore_rate
+        self.available = maximum_available
+        self.reserved = 0.0
+        self.throttled_seconds = 0.0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _estimated_available(self):
+        elapsed = time.monotonic() - self._updated
+        return min(self.maximum_available, self.available + elapsed * self.restore_rate)
+
+    async def acquire(self, cost):
+        cost = min(cost, self.maximum_available)
+        async with self._lock:
+            while True:
+                missing = cost - (self._estimated_available() - self.reserved)
+                if missing <= 0:
+                    break
+                # Kısa dilimlerle bekle: arada gelen yanıtlar tahmini güncelleyebilir
+                await asyncio.sleep(min(missing / self.restore_rate, 0.25))
+            self.reserved += cost
+        return cost
+
+    def release(self, reserved, throttle_status=None, actual_cost=None):
+        self.reserved -= reserved
+        if throttle_status:
+            self.maximum_available = float(throttle_status.get('maximumAvailable', self.maximum_available))
+            self.restore_rate = float(throttle_status.get('restoreRate', self.restore_rate))
+            reported = float(throttle_status.get('currentlyAvailable', self.available))
+            # Yanıtlar sırasız gelebilir; eski (daha dolu) bir değer tahmini yukarı çekmesin
+            expected = self._estimated_available() - (actual_cost or 0)
+            self.available = min(reported, expected)
+            self._updated = time.monotonic()
+
+    async def throttled(self, cost):
+        wait = cost / self.restore_rate
+        self.throttled_seconds += wait
+        await asyncio.sleep(wait)
+
+
+class ShopifyClient:
+    """Adaptif hız sınırlamalı, bağlantı havuzlu async Shopify Admin API istemcisi"""
+
+    def __init__(self, shop_url, access_token, api_version=DEFAULT_API_VERSION, max_concurrency=20,
+                 max_retries=5, timeout=30.0, bucket_size=40, leak_rate=2.0, transport=None):
+        self.base_url = f"{shop_base_url(shop_url)}/admin/api/{api_version}"
+        self.max_retries = max_retries
+        self.rest_limiter = RestBucketLimiter(bucket_size, leak_rate, max_concurrency)
+        self.graphql_limiter = GraphQLCostLimiter()
+        self.request_count = 0
+        self.retry_count = 0
+        self._query_costs = {}
+        self._http = httpx.AsyncClient(
+            headers={'X-Shopify-Access-Token': access_token, 'Content-Type': 'application/json'},
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+            transport=transport,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        await self._http.aclose()
+
+    @property
+    def throttled_seconds(self):
+        return self.rest_limiter.throttled_seconds + self.graphql_limiter.throttled_seconds
+
+    def _backoff(self, attempt):
+        return min(30.0, 0.5 * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+    async def _send(self, method, url, **kwargs):
+        """Tek bir HTTP denemesi; ağ hatasında None döner"""
+        self.request_count += 1
+        try:
+            return await self._http.request(method, url, **kwargs)
+        except httpx.TransportError:
+            return None
+
+    async def request(self, method, path, json=None, params=None):
+        """REST isteği gönderir, JSON gövdeyi döndürür"""
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        for attempt in range(self.max_retries + 1):
+            await self.rest_limiter.acquire()
+            response = await self._send(method, url, json=json, params=params)
+            call_limit = parse_call_limit(response.headers.get('X-Shopify-Shop-Api-Call-Limit')) if response else None
+            await self.rest_limiter.release(call_limit)
+
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                if response.status_code >= 400:
+                    raise ShopifyAPIError(f"{method} {path}: HTTP {response.status_code}",
+                                          response.status_code, _errors(response))
+                if not response.content:
+                    return {}
+                # Yazma gerçekleşmiş olabilir: geçersiz gövde tekrar denenmez, hata olarak bildirilir
+                try:
+                    return response.json()
+                except ValueError:
+                    raise ShopifyAPIError(f"{method} {path}: geçersiz JSON yanıtı", response.status_code,
+                                          response.text[:200]) from None
+
+            if attempt == self.max_retries:
+                break
+            self.retry_count += 1
+            if response is not None and response.status_code == 429:
+                retry_after = float(response.headers.get('Retry-After') or 2.0)
+                await self.rest_limiter.throttled(retry_after)
+            else:
+                await asyncio.sleep(self._backoff(attempt))
+
+        status = response.status_code if response is not None else None
+        raise ShopifyAPIError(f"{method} {path}: {self.max_retries} yeniden denemeden sonra başarısız",
+                              status, _errors(response) if response is not None else None)
+
+    async def get(self, path, params=None):
+        return await self.request('GET', path, params=params)
+
+    async def post(self, path, json=None):
+        return await self.request('POST', path, json=json)
+
+    async def put(self, path, json=None):
+        return await self.request('PUT', path, json=json)
+
+    async def delete(self, path):
+        return await self.request('DELETE', path)
+
+    async def graphql(self, query, variables=None, cost=None):
+        """GraphQL sorgusu çalıştırır ve data alanını döndürür.
+
+        cost verilmezse aynı sorgu için son gözlenen requestedQueryCost'a göre yer ayrılır;
+        THROTTLED hatasında maliyet kadar puan birikmesi beklenip tekrar denenir.
+        """
+        url = f"{self.base_url}/graphql.json"
+        payload = {'query': query, 'variables': variables or {}}
+        estimated = cost or self._query_costs.get(query, 10)
+        for attempt in range(self.max_retries + 1):
+            reserved = await self.graphql_limiter.acquire(estimated)
+            response = await self._send('POST', url, json=payload)
+            body, malformed = {}, False
+            if response is not None and response.status_code == 200:
+                # Proxy/bakım sayfası gibi JSON olmayan 200 yanıtları geçici hata sayılır
+                try:
+                    body = response.json()
+                except ValueError:
+                    malformed = True
+                if not isinstance(body, dict):
+                    body, malformed = {}, True
+            query_cost = body.get('extensions', {}).get('cost', {})
+            self.graphql_limiter.release(reserved, query_cost.get('throttleStatus'), query_cost.get('actualQueryCost'))
+            if query_cost.get('requestedQueryCost'):
+                estimated = self._query_costs[query] = query_cost['requestedQueryCost']
+
+            errors = body.get('errors') or []
+            throttled = any((error.get('extensions') or {}).get('code') == 'THROTTLED' for error in errors)
+            if response is not None and response.status_code == 200 and not throttled and not malformed:
+                if errors:
+                    raise ShopifyAPIError(f"GraphQL hatası: {errors[0].get('message')}", 200, errors)
+                return body.get('data')
+            if response is not None and response.status_code not in RETRY_STATUSES and not throttled and not malformed:
+                raise ShopifyAPIError(f"GraphQL: HTTP {response.status_code}", response.status_code, _errors(response))
+
+            if attempt == self.max_retries:
+                break
+            self.retry_count += 1
+            if throttled:
+                await self.graphql_limiter.throttled(estimated)
+            else:
+                await asyncio.sleep(self._backoff(attempt))
+
+        if malformed:
+            raise ShopifyAPIError(f"GraphQL: {self.max_retries} yeniden denemeden sonra geçersiz JSON yanıtı", 200,
+                                  response.text[:200])
+        raise ShopifyAPIError(f"GraphQL: {self.max_retries} yeniden denemeden sonra başarısız")
+
+    async def map(self, func, items, return_exceptions=True):
+        """func(client, item) çağrılarını eşzamanlı çalıştırır, sonuçları sırayla döndürür.
+
+        Eşzamanlılığı limiter belirler; burada sadece tüm işler kuyruğa alınır.
+        """
+        return await asyncio.gather(*(func(self, item) for item in items), return_exceptions=return_exceptions)
+
+
+def _errors(response):
+    try:
+        body = response.json()
+    except ValueError:
+        return response.text[:200]
+    return body.get('errors') if isinstance(body, dict) else body
@@ -0,0 +1,800 @@
+"""Shopify Admin API (REST + GraphQL) için süreç içi sahte sunucu.
+
+Kodun çağırdığı uç noktaları taklit eder:
+    GET    /admin/api/<sürüm>/shop.json
+    GET    /admin/api/<sürüm>/products/count.json
+    GET    /admin/api/<sürüm>/products.json            (title, vendor, handle, limit, since_id, fields)
+    POST   /admin/api/<sürüm>/products.json
+    GET/PUT/DELETE /admin/api/<sürüm>/products/{id}.json
+    POST   /admin/api/<sürüm>/products/{id}/variants.json
+    GET/PUT /admin/api/<sürüm>/variants/{id}.json
+    POST   /admin/api/<sürüm>/graphql.json             (productByHandle, products, productVariants, locations,
+                                                        productVariantUpdate, productVariantsBulkUpdate,
+                                                        inventorySetQuantities, bulkOperationRunQuery,
+                                                        currentBulkOperation, nodes(ids:) InventoryItem)
+    GET    /bulk/<n>.jsonl                             (tamamlanan bulk operasyonunun JSONL sonucu)
+
+REST ürün gövdelerindeki metafields saklanır; GraphQL products sorgusu
+metafield(namespace, key), legacyResourceId, nodes/edges, after imleci ve
+query: title:"..." aramasını destekler (netlify/lib/productFingerprint.js).
+
+REST istekleri Shopify'daki gibi sızdıran kova (leaky bucket) ile sınırlanır:
+kova doluysa 429 + Retry-After döner, her yanıtta X-Shopify-Shop-Api-Call-Limit
+başlığı bulunur. GraphQL istekleri maliyet puanı kovasıyla sınırlanır ve
+kısıtlandığında THROTTLED hatası döner.
+
+Kullanım:
+    with MockShopify(latency=0.05) as shop:
+        requests.get(f"{shop.base_url}/admin/api/2024-07/shop.json",
+                     headers={'X-Shopify-Access-Token': 'test'})
+        print(shop.stats())
+"""
+import http.server
+import json
+import re
+import threading
+import time
+import urllib.parse
+
+
+class LeakyBucket:
+    """Shopify'ın hız sınırlama modeli: kapasite dolunca istek reddedilir, kova sabit hızla boşalır"""
+
+    def __init__(self, size, leak_rate):
+        self.size = size
+        self.leak_rate = leak_rate
+        self.level = 0.0
+        self._last = time.monotonic()
+        self._full_since = None
+        self.throttled_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def _leak(self, now):
+        self.level = max(0.0, self.level - (now - self._last) * self.leak_rate)
+        self._last = now
+
+    def try_acquire(self, cost=1):
+        """Yer varsa cost kadar doldurur; (kabul edildi_mi, güncel_seviye) döndürür"""
+        with self._lock:
+            now = time.monotonic()
+            self._leak(now)
+            if self.level + cost > self.size:
+                if self._full_since is None:
+                    self._full_since = now
+                return False, self.level
+            if self._full_since is not None:
+                self.throttled_seconds += now - self._full_since
+                self._full_since = None
+            self.level += cost
+            return True, self.level
+
+    def available(self):
+        with self._lock:
+            self._leak(time.monotonic())
+            return self.size - self.level
+
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _slugify(text):
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+class MockShopify:
+    """Arka plan thread'inde çalışan sahte Shopify mağazası"""
+
+    ROUTES = [
+        ('GET', re.compile(r'/shop\.json$'), 'shop'),
+        ('GET', re.compile(r'/products/count\.json$'), 'product_count'),
+        ('GET', re.compile(r'/products\.json$'), 'list_products'),
+        ('POST', re.compile(r'/products\.json$'), 'create_product'),
+        ('GET', re.compile(r'/products/(\d+)\.json$'), 'get_product'),
+        ('PUT', re.compile(r'/products/(\d+)\.json$'), 'update_product'),
+        ('DELETE', re.compile(r'/products/(\d+)\.json$'), 'delete_product'),
+        ('POST', re.compile(r'/products/(\d+)/variants\.json$'), 'create_variant'),
+        ('GET', re.compile(r'/variants/(\d+)\.json$'), 'get_variant'),
+        ('PUT', re.compile(r'/variants/(\d+)\.json$'), 'update_variant'),
+        ('POST', re.compile(r'/graphql\.json$'), 'graphql'),
+    ]
+
+    def __init__(self, latency=0.0, access_token=None, rest_bucket_size=40, rest_leak_rate=2.0,
+                 graphql_bucket_size=1000, graphql_restore_rate=50.0, api_version='2024-07',
+                 bulk_duration=0.5):
+        self.latency = latency
+        self.bulk_duration = bulk_duration
+        self.access_token = access_token
+        self.api_prefix = f"/admin/api/{api_version}"
+        self.rest_bucket = LeakyBucket(rest_bucket_size, rest_leak_rate)
+        self.graphql_bucket = LeakyBucket(graphql_bucket_size, graphql_restore_rate)
+
+        self.products = {}
+        self.variants = {}
+        self.inventory_items = {}
+        # ürün id -> {(namespace, key): metafield}; REST ürün gövdesindeki metafields ile yazılır
+        self.metafields = {}
+        self.location_id = 'gid://shopify/Location/1'
+        self._next_id = 1000000
+        self._state_lock = threading.Lock()
+        self._log = []
+        self._log_lock = threading.Lock()
+        self.bulk_operations = []
+        self._server = None
+        self.base_url = None
+
+    # --- yaşam döngüsü ---
+
+    def start(self, host='127.0.0.1', port=0):
+        mock = self
+
+        class Handler(_MockHandler):
+            shop = mock
+
+        self._server = http.server.ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self.base_url = f"http://{host}:{self._server.server_address[1]}"
+        return self.base_url
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # --- ölçüm ---
+
+    def record(self, route, status, seconds):
+        with self._log_lock:
+            self._log.append((route, status, seconds))
+
+    def reset_stats(self):
+        with self._log_lock:
+            self._log = []
+
+    def stats(self):
+        """Rota bazında istek sayısı, 429 sayısı ve p50/p99 gecikme (sn)"""
+        with self._log_lock:
+            log = list(self._log)
+
+        routes = {}
+        for route, status, seconds in log:
+            entry = routes.setdefault(route, {'count': 0, 'throttled': 0, 'errors': 0, 'latencies': []})
+            entry['count'] += 1
+            if status == 429:
+                entry['throttled'] += 1
+            elif status >= 400:
+                entry['errors'] += 1
+            entry['latencies'].append(seconds)
+
+        all_latencies = [seconds for _, _, seconds in log]
+        return {
+            'requests': len(log),
+            'throttled': sum(1 for _, status, _ in log if status == 429),
+            'throttled_seconds': round(self.rest_bucket.throttled_seconds + self.graphql_bucket.throttled_seconds, 3),
+            'p50': _percentile(all_latencies, 0.50),
+            'p99': _percentile(all_latencies, 0.99),
+            'routes': {
+                route: {
+                    'count': entry['count'],
+                    'throttled': entry['throttled'],
+                    'errors': entry['errors'],
+                    'p50': _percentile(entry['latencies'], 0.50),
+                    'p99': _percentile(entry['latencies'], 0.99),
+                }
+                for route, entry in sorted(routes.items())
+            },
+        }
+
+    # --- mağaza durumu ---
+
+    def _new_id(self):
+        self._next_id += 1
+        return self._next_id
+
+    def _build_variant(self, product_id, payload, position):
+        variant_id = self._new_id()
+        variant = {
+            'id': variant_id,
+            'product_id': product_id,
+            'admin_graphql_api_id': f"gid://shopify/ProductVariant/{variant_id}",
+            'title': payload.get('title') or ' / '.join(
+                str(payload[key]) for key in ('option1', 'option2', 'option3') if payload.get(key)) or 'Default Title',
+            'price': str(payload.get('price', '0.00')),
+            'compare_at_price': payload.get('compare_at_price'),
+            'sku': payload.get('sku', ''),
+            'barcode': payload.get('barcode', ''),
+            'position': position,
+            'inventory_item_id': self._new_id(),
+            'inventory_quantity': int(payload.get('inventory_quantity') or 0),
+            'inventory_management': payload.get('inventory_management'),
+            'option1': payload.get('option1'),
+            'option2': payload.get('option2'),
+            'option3': payload.get('option3'),
+        }
+        self.variants[variant_id] = variant
+        self.inventory_items[variant['inventory_item_id']] = variant_id
+        return variant
+
+    def create_product(self, payload):
+        """REST ürün oluşturma ile aynı mantıkla ürünü mağazaya ekler"""
+        with self._state_lock:
+            product_id = self._new_id()
+            variants_payload = payload.get('variants') or [{}]
+            product = {
+                'id': product_id,
+                'admin_graphql_api_id': f"gid://shopify/Product/{product_id}",
+                'title': payload.get('title', ''),
+                'handle': payload.get('handle') or _slugify(payload.get('title', '')) or str(product_id),
+                'body_html': payload.get('body_html', ''),
+                'vendor': payload.get('vendor', ''),
+                'product_type': payload.get('product_type', ''),
+                'status': payload.get('status', 'active'),
+                'tags': payload.get('tags', ''),
+                'options': payload.get('options') or [],
+                'images': [
+                    {'id': self._new_id(), 'product_id': product_id, 'position': index + 1, 'src': image.get('src')}
+                    for index, image in enumerate(payload.get('images') or [])
+                ],
+                'variants': [],
+            }
+            product['variants'] = [
+                self._build_variant(product_id, variant, index + 1)
+                for index, variant in enumerate(variants_payload)
+            ]
+            self.products[product_id] = product
+            self._write_metafields(product_id, payload.get('metafields') or [])
+            return product
+
+    def update_product(self, product_id, payload):
+        with self._state_lock:
+            product = self.products.get(product_id)
+            if product is None:
+                return None
+            for key, value in payload.items():
+                if key in ('id', 'variants', 'images', 'metafields'):
+                    continue
+                product[key] = value
+            if 'images' in payload:
+                product['images'] = [
+                    {'id': self._new_id(), 'product_id': product_id, 'position': index + 1, 'src': image.get('src')}
+                    for index, image in enumerate(payload['images'] or [])
+                ]
+            for variant_payload in payload.get('variants') or []:
+                variant = self.variants.get(int(variant_payload.get('id') or 0))
+                if variant and variant['product_id'] == product_id:
+                    self._apply_variant(variant, variant_payload)
+            self._write_metafields(product_id, payload.get('metafields') or [])
+            return product
+
+    def _write_metafields(self, product_id, metafields):
+        """Shopify gibi: id verilen metafield güncellenir, namespace/key verilen eklenir ya da güncellenir"""
+        stored = self.metafields.setdefault(product_id, {})
+        for payload in metafields:
+            if payload.get('id'):
+                existing = next((m for m in stored.values() if m['id'] == int(payload['id'])), None)
+                if existing:
+                    existing['value'] = str(payload.get('value', existing['value']))
+                continue
+            key = (payload.get('namespace'), payload.get('key'))
+            if not all(key):
+                continue
+            existing = stored.get(key)
+            if existing:
+                existing['value'] = str(payload.get('value', ''))
+            else:
+                stored[key] = {'id': self._new_id(), 'namespace': key[0], 'key': key[1],
+                               'value': str(payload.get('value', '')), 'type': payload.get('type', 'single_line_text_field')}
+
+    def product_metafield(self, product_id, namespace, key):
+        with self._state_lock:
+            metafield = self.metafields.get(product_id, {}).get((namespace, key))
+            return dict(metafield) if metafield else None
+
+    def _apply_variant(self, variant, payload):
+        for key, value in payload.items():
+            if key == 'id':
+                continue
+            if key == 'price':
+                value = str(value)
+            elif key == 'inventory_quantity':
+                value = int(value or 0)
+            variant[key] = value
+
+    def add_variant(self, product_id, payload):
+        with self._state_lock:
+            product = self.products.get(product_id)
+            if product is None:
+                return None
+            variant = self._build_variant(product_id, payload, len(product['variants']) + 1)
+            product['variants'].append(variant)
+            return variant
+
+    def update_variant(self, variant_id, payload):
+        with self._state_lock:
+            variant = self.variants.get(variant_id)
+            if variant is None:
+                return None
+            self._apply_variant(variant, payload)
+            return variant
+
+    def delete_product(self, product_id):
+        with self._state_lock:
+            product = self.products.pop(product_id, None)
+            self.metafields.pop(product_id, None)
+            if product:
+                for variant in product['variants']:
+                    self.variants.pop(variant['id'], None)
+                    self.inventory_items.pop(variant['inventory_item_id'], None)
+            return product
+
+    def run_bulk_query(self):
+        """Mağazanın o anki ürün/varyantlarını Shopify bulk JSONL biçiminde dondurur"""
+        with self._state_lock:
+            lines = []
+            for _, product in sorted(self.products.items()):
+                lines.append(json.dumps({'id': product['admin_graphql_api_id'], 'handle': product['handle'],
+                                         'title': product['title']}, ensure_ascii=False))
+                for variant in product['variants']:
+                    lines.append(json.dumps({
+                        'id': variant['admin_graphql_api_id'],
+                        'sku': variant['sku'],
+                        'barcode': variant['barcode'],
+                        'price': variant['price'],
+                        'compareAtPrice': variant['compare_at_price'],
+                        'inventoryQuantity': variant['inventory_quantity'],
+                        'inventoryItem': {'id': f"gid://shopify/InventoryItem/{variant['inventory_item_id']}"},
+                        '__parentId': product['admin_graphql_api_id'],
+                    }, ensure_ascii=False))
+            operation = {
+                'id': f"gid://shopify/BulkOperation/{len(self.bulk_operations) + 1}",
+                'number': len(self.bulk_operations) + 1,
+                'started': time.monotonic(),
+                'jsonl': ''.join(line + '\n' for line in lines).encode('utf-8'),
+                'object_count': len(lines),
+            }
+            self.bulk_operations.append(operation)
+            return operation
+
+    def bulk_status(self, operation):
+        if operation is None:
+            return None
+        done = time.monotonic() - operation['started'] >= self.bulk_duration
+        return {
+            'id': operation['id'],
+            'status': 'COMPLETED' if done else 'RUNNING',
+            'errorCode': None,
+            'objectCount': str(operation['object_count'] if done else 0),
+            'fileSize': str(len(operation['jsonl'])) if done else None,
+            'url': f"{self.base_url}/bulk/{operation['number']}.jsonl" if done and operation['object_count'] else None,
+            'partialDataUrl': None,
+        }
+
+    def find_by_handle(self, handle):
+        with self._state_lock:
+            for product in self.products.values():
+                if product['handle'] == handle:
+                    return product
+        return None
+
+
+def _route_label(pattern):
+    """'/products/(\\d+)\\.json$' -> '/products/{id}.json'"""
+    return pattern.pattern.replace(r'(\d+)', '{id}').replace('\\', '').rstrip('$')
+
+
+def _gid_number(gid):
+    return int(str(gid).rsplit('/', 1)[-1])
+
+
+MUTATION_FIELDS = re.compile(
+    r'(?<!mutation )\b(productVariantUpdate|productVariantsBulkUpdate|inventorySetQuantities|bulkOperationRunQuery)\s*\(')
+
+
+def _query_cost(query):
+    """GraphQL maliyet tahmini: her mutasyon alanı 10, sorgular 1 + bağlantı boyutları"""
+    if query.lstrip().startswith('mutation'):
+        return 10 * max(1, len(MUTATION_FIELDS.findall(query)))
+    sizes = [int(n) for n in re.findall(r'first:\s*(\d+)', query)]
+    cost = 1
+    multiplier = 1
+    for size in sizes:
+        multiplier *= size
+        cost += multiplier
+    return min(cost, 1000)
+
+
+class _MockHandler(http.server.BaseHTTPRequestHandler):
+    shop = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, extra_headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (extra_headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+        return status
+
+    def _read_json(self):
+        # Gövde bir kez okunur; 401/429 yanıtlarında da okunmalı, yoksa keep-alive bağlantıda
+        # sonraki istek okunmamış gövdeden başlar
+        if getattr(self, '_body', None) is None:
+            length = int(self.headers.get('Content-Length') or 0)
+            try:
+                self._body = json.loads(self.rfile.read(length)) if length else {}
+            except ValueError:
+                self._body = {}
+        return self._body
+
+    def _dispatch(self, method):
+        started = time.perf_counter()
+        self._body = None
+        parsed = urllib.parse.urlsplit(self.path)
+        route_name = 'not_found'
+        status = 404
+        try:
+            shop = self.shop
+            path = parsed.path
+            bulk_match = re.match(r'/bulk/(\d+)\.jsonl$', path)
+            if bulk_match and method == 'GET':
+                route_name = 'GET /bulk/{id}.jsonl'
+                status = self._send_bulk_file(int(bulk_match.group(1)))
+            elif path.startswith(shop.api_prefix):
+                path = path[len(shop.api_prefix):]
+                for route_method, pattern, name in shop.ROUTES:
+                    match = pattern.match(path) if route_method == method else None
+                    if match:
+                        route_name = f"{method} {_route_label(pattern)}"
+                        if shop.latency:
+                            time.sleep(shop.latency)
+                        status = self._handle(name, match, urllib.parse.parse_qs(parsed.query))
+                        break
+            if route_name == 'not_found':
+                status = self._send_json(404, {'errors': 'Not Found'})
+        finally:
+            self.shop.record(route_name, status, time.perf_counter() - started)
+
+    def _send_bulk_file(self, number):
+        operations = self.shop.bulk_operations
+        if not 0 < number <= len(operations):
+            return self._send_json(404, {'errors': 'Not Found'})
+        body = operations[number - 1]['jsonl']
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/jsonl')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        return 200
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def _handle(self, name, match, query):
+        shop = self.shop
+        body = self._read_json()
+        token = self.headers.get('X-Shopify-Access-Token')
+        if not token or (shop.access_token and token != shop.access_token):
+            return self._send_json(401, {'errors': '[API] Invalid API key or access token (unrecognized login or wrong password)'})
+
+        if name == 'graphql':
+            return self._graphql(body)
+
+        accepted, level = shop.rest_bucket.try_acquire()
+        limit_header = {'X-Shopify-Shop-Api-Call-Limit': f"{int(round(level))}/{shop.rest_bucket.size}"}
+        if not accepted:
+            limit_header['Retry-After'] = '1.0'
+            return self._send_json(429, {'errors': 'Exceeded 2 calls per second for api client. Reduce request rates to resume uninterrupted service.'}, limit_header)
+
+        handler = getattr(self, f"_rest_{name}")
+        status, payload = handler(match, query)
+        return self._send_json(status, payload, limit_header)
+
+    # --- REST ---
+
+    def _rest_shop(self, match, query):
+        return 200, {'shop': {'id': 1, 'name': 'Mock Store', 'email': 'mock@example.com',
+                              'domain': 'mock-store.myshopify.com', 'currency': 'TRY',
+                              'timezone': 'Europe/Istanbul', 'plan_name': 'mock'}}
+
+    def _rest_product_count(self, match, query):
+        return 200, {'count': len(self.shop.products)}
+
+    def _rest_list_products(self, match, query):
+        limit = min(int(query.get('limit', ['50'])[0]), 250)
+        since_id = int(query.get('since_id', ['0'])[0])
+        filters = {key: query[key][0] for key in ('title', 'vendor', 'handle') if key in query}
+        fields = query['fields'][0].split(',') if 'fields' in query else None
+
+        with self.shop._state_lock:
+            products = [p for _, p in sorted(self.shop.products.items()) if p['id'] > since_id]
+        for key, value in filters.items():
+            products = [p for p in products if p.get(key) == value]
+        products = products[:limit]
+        if fields:
+            products = [{key: p[key] for key in fields if key in p} for p in products]
+        return 200, {'products': products}
+
+    def _rest_create_product(self, match, query):
+        payload = self._read_json().get('product')
+        if not payload or not payload.get('title'):
+            return 422, {'errors': {'title': ["can't be blank"]}}
+        return 201, {'product': self.shop.create_product(payload)}
+
+    def _rest_get_product(self, match, query):
+        product = self.shop.products.get(int(match.group(1)))
+        return (200, {'product': product}) if product else (404, {'errors': 'Not Found'})
+
+    def _rest_update_product(self, match, query):
+        product = self.shop.update_product(int(match.group(1)), self._read_json().get('product') or {})
+        return (200, {'product': product}) if product else (404, {'errors': 'Not Found'})
+
+    def _rest_delete_product(self, match, query):
+        product = self.shop.delete_product(int(match.group(1)))
+        return (200, {}) if product else (404, {'errors': 'Not Found'})
+
+    def _rest_create_variant(self, match, query):
+        variant = self.shop.add_variant(int(match.group(1)), self._read_json().get('variant') or {})
+        return (201, {'variant': variant}) if variant else (404, {'errors': 'Not Found'})
+
+    def _rest_get_variant(self, match, query):
+        variant = self.shop.variants.get(int(match.group(1)))
+        return (200, {'variant': variant}) if variant else (404, {'errors': 'Not Found'})
+
+    def _rest_update_variant(self, match, query):
+        variant = self.shop.update_variant(int(match.group(1)), self._read_json().get('variant') or {})
+        return (200, {'variant': variant}) if variant else (404, {'errors': 'Not Found'})
+
+    # --- GraphQL ---
+
+    def _graphql(self, body):
+        shop = self.shop
+        query = body.get('query') or ''
+        variables = body.get('variables') or {}
+        cost = _query_cost(query)
+        accepted, _ = shop.graphql_bucket.try_acquire(cost)
+        extensions = {'cost': {
+            'requestedQueryCost': cost,
+            'actualQueryCost': cost if accepted else None,
+            'throttleStatus': {
+                'maximumAvailable': float(shop.graphql_bucket.size),
+                'currentlyAvailable': int(shop.graphql_bucket.available()),
+                'restoreRate': float(shop.graphql_bucket.leak_rate),
+            },
+        }}
+        if not accepted:
+            return self._send_json(200, {'errors': [{'message': 'Throttled', 'extensions': {'code': 'THROTTLED'}}],
+                                         'extensions': extensions})
+
+        if 'bulkOperationRunQuery' in query:
+            data = self._gql_bulk_run()
+        elif 'currentBulkOperation' in query:
+            operations = self.shop.bulk_operations
+            data = {'currentBulkOperation': self.shop.bulk_status(operations[-1] if operations else None)}
+        elif 'productByHandle' in query:
+            data = self._gql_product_by_handle(query, variables)
+        elif 'productVariantsBulkUpdate' in query or 'inventorySetQuantities' in query:
+            data = self._gql_batch_mutations(query, variables)
+        elif 'productVariantUpdate' in query:
+            data = self._gql_variant_update(variables)
+        elif re.search(r'\bproductVariants\s*\(', query):
+            data = self._gql_product_variants(query, variables)
+        elif re.search(r'\bnodes\s*\(\s*ids:', query):
+            data = self._gql_inventory_nodes(variables)
+        elif re.search(r'\blocations\s*\(', query):
+            location = {'id': shop.location_id, 'name': 'Mock Depo'}
+            data = {'locations': {'edges': [{'node': location}], 'nodes': [location]}}
+        elif re.search(r'\bproducts\s*\(', query):
+            data = self._gql_products(query, variables)
+        else:
+            return self._send_json(200, {'errors': [{'message': 'Mock sunucu bu sorguyu desteklemiyor'}],
+                                         'extensions': extensions})
+        return self._send_json(200, {'data': data, 'extensions': extensions})
+
+    def _gql_bulk_run(self):
+        operations = self.shop.bulk_operations
+        current = self.shop.bulk_status(operations[-1]) if operations else None
+        if current and current['status'] == 'RUNNING':
+            return {'bulkOperationRunQuery': {'bulkOperation': None, 'userErrors': [{
+                'field': None,
+                'message': 'A bulk query operation for this app and shop is already in progress: '
+                           f"{current['id']}.",
+            }]}}
+        operation = self.shop.run_bulk_query()
+        return {'bulkOperationRunQuery': {'bulkOperation': {'id': operation['id'], 'status': 'CREATED'},
+                                          'userErrors': []}}
+
+    def _gql_variant_node(self, variant):
+        return {
+            'id': variant['admin_graphql_api_id'],
+            'legacyResourceId': str(variant['id']),
+            'title': variant['title'],
+            'sku': variant['sku'],
+            'barcode': variant['barcode'],
+            'price': variant['price'],
+            'compareAtPrice': variant['compare_at_price'],
+            'inventoryQuantity': variant['inventory_quantity'],
+            'inventoryItem': {'id': f"gid://shopify/InventoryItem/{variant['inventory_item_id']}"},
+        }
+
+    def _gql_product_node(self, product, variant_limit, metafield=None):
+        variants = [self._gql_variant_node(v) for v in product['variants'][:variant_limit]]
+        node = {
+            'id': product['admin_graphql_api_id'],
+            'legacyResourceId': str(product['id']),
+            'handle': product['handle'],
+            'title': product['title'],
+            'variants': {'edges': [{'node': v} for v in variants], 'nodes': variants},
+        }
+        if metafield:
+            found = self.shop.product_metafield(product['id'], *metafield)
+            node['metafield'] = {'legacyResourceId': str(found['id']), 'value': found['value']} if found else None
+        return node
+
+    def _variant_limit(self, query):
+        match = re.search(r'variants\s*\(\s*first:\s*(\d+)', query)
+        return int(match.group(1)) if match else 250
+
+    def _gql_product_by_handle(self, query, variables):
+        product = self.shop.find_by_handle(variables.get('handle'))
+        return {'productByHandle': self._gql_product_node(product, self._variant_limit(query)) if product else None}
+
+    def _gql_products(self, query, variables):
+        match = re.search(r'\bproducts\s*\(\s*first:\s*(\d+)', query)
+        page_size = int(match.group(1)) if match else 50
+        start = int(variables.get('after') or variables.get('cursor') or 0)
+        with self.shop._state_lock:
+            products = [p for _, p in sorted(self.shop.products.items())]
+        # Arama sözdiziminin sadece title:"..." kısmı (tam eşleşme) desteklenir
+        search = variables.get('query') or ''
+        title_match = re.match(r'title:"((?:[^"\\]|\\.)*)"$', search)
+        if title_match:
+            title = re.sub(r'\\(.)', r'\1', title_match.group(1))
+            products = [p for p in products if p['title'] == title]
+        page = products[start:start + page_size]
+        end = start + len(page)
+        variant_limit = self._variant_limit(query)
+        metafield_match = re.search(r'metafield\s*\(\s*namespace:\s*"([^"]+)"\s*,\s*key:\s*"([^"]+)"', query)
+        metafield = metafield_match.groups() if metafield_match else None
+        nodes = [self._gql_product_node(p, variant_limit, metafield) for p in page]
+        return {'products': {
+            'pageInfo': {'hasNextPage': end < len(products), 'endCursor': str(end) if page else None},
+            'edges': [{'cursor': str(start + i + 1), 'node': node} for i, node in enumerate(nodes)],
+            'nodes': nodes,
+        }}
+
+    def _gql_product_variants(self, query, variables):
+        # netlify/lib/stockSync.js'in stok eşlemesi sorgusu (nodes, $after imleci)
+        match = re.search(r'\bproductVariants\s*\(\s*first:\s*(\d+)', query)
+        page_size = int(match.group(1)) if match else 50
+        start = int(variables.get('after') or 0)
+        with self.shop._state_lock:
+            variants = [v for _, v in sorted(self.shop.variants.items())]
+        page = variants[start:start + page_size]
+        end = start + len(page)
+        return {'productVariants': {
+            'pageInfo': {'hasNextPage': end < len(variants), 'endCursor': str(end) if page else None},
+            'nodes': [self._gql_variant_node(v) for v in page],
+        }}
+
+    def _gql_inventory_nodes(self, variables):
+        # netlify/lib/stockSync.js'in lokasyon miktarı sorgusu; tek lokasyon vardır,
+        # başka lokasyonda kalem stoklanmıyor sayılır (inventoryLevel: null)
+        shop = self.shop
+        nodes = []
+        for gid in variables.get('ids') or []:
+            with shop._state_lock:
+                variant = shop.variants.get(shop.inventory_items.get(_gid_number(gid)))
+                quantity = variant['inventory_quantity'] if variant else None
+            if variant is None:
+                nodes.append(None)
+                continue
+            level = None
+            if variables.get('locationId') == shop.location_id:
+                level = {'quantities': [{'name': 'available', 'quantity': quantity}]}
+            nodes.append({'id': gid, 'inventoryLevel': level})
+        return {'nodes': nodes}
+
+    def _gql_variant_update(self, variables):
+        variant_input = dict(variables.get('input') or {})
+        variant_id = _gid_number(variant_input.pop('id', '0'))
+        if 'compareAtPrice' in variant_input:
+            variant_input['compare_at_price'] = variant_input.pop('compareAtPrice')
+        if 'price' in variant_input and float(variant_input['price']) < 0:
+            return {'productVariantUpdate': {'productVariant': None, 'userErrors': [
+                {'field': ['price'], 'message': 'Price must be greater than or equal to 0'}]}}
+        variant = self.shop.update_variant(variant_id, variant_input)
+        if variant is None:
+            return {'productVariantUpdate': {'productVariant': None,
+                                             'userErrors': [{'field': ['id'], 'message': 'Product variant does not exist'}]}}
+        return {'productVariantUpdate': {'productVariant': {'id': variant['admin_graphql_api_id'],
+                                                            'price': variant['price'],
+                                                            'compareAtPrice': variant['compare_at_price']},
+                                         'userErrors': []}}
+
+    def _gql_batch_mutations(self, query, variables):
+        """Takma adlarla (p0: ..., p1: ...) tek belgede gönderilen toplu mutasyonları işler"""
+        data = {}
+        pattern = re.compile(r'(?:(\w+)\s*:\s*)?(productVariantsBulkUpdate|inventorySetQuantities)\s*\(([^)]*)\)')
+        for alias, field, arguments in pattern.findall(query):
+            names = dict(re.findall(r'(\w+)\s*:\s*\$(\w+)', arguments))
+            if field == 'productVariantsBulkUpdate':
+                result = self._variants_bulk_update(variables.get(names.get('productId')),
+                                                    variables.get(names.get('variants')) or [])
+            else:
+                result = self._set_quantities(variables.get(names.get('input')) or {})
+            data[alias or field] = result
+        return data
+
+    def _variants_bulk_update(self, product_gid, variant_inputs):
+        shop = self.shop
+        product = shop.products.get(_gid_number(product_gid or '0'))
+        if product is None:
+            return {'product': None, 'productVariants': [],
+                    'userErrors': [{'field': ['productId'], 'message': 'Product does not exist', 'code': 'PRODUCT_DOES_NOT_EXIST'}]}
+
+        updated, errors = [], []
+        for index, variant_input in enumerate(variant_inputs):
+            variant_input = dict(variant_input)
+            variant = shop.variants.get(_gid_number(variant_input.pop('id', '0')))
+            if variant is None or variant['product_id'] != product['id']:
+                errors.append({'field': ['variants', str(index), 'id'], 'message': 'Product variant does not exist',
+                               'code': 'PRODUCT_VARIANT_DOES_NOT_EXIST'})
+                continue
+            if 'price' in variant_input and float(variant_input['price']) < 0:
+                errors.append({'field': ['variants', str(index), 'price'],
+                               'message': 'Price must be greater than or equal to 0', 'code': 'GREATER_THAN_OR_EQUAL_TO'})
+                continue
+            if 'compareAtPrice' in variant_input:
+                variant_input['compare_at_price'] = variant_input.pop('compareAtPrice')
+            shop.update_variant(variant['id'], variant_input)
+            updated.append({'id': variant['admin_graphql_api_id'], 'price': variant['price'],
+                            'compareAtPrice': variant['compare_at_price']})
+        return {'product': {'id': product['admin_graphql_api_id']}, 'productVariants': updated, 'userErrors': errors}
+
+    def _set_quantities(self, set_input):
+        shop = self.shop
+        errors, changes = [], []
+        for index, item in enumerate(set_input.get('quantities') or []):
+            variant_id = shop.inventory_items.get(_gid_number(item.get('inventoryItemId', '0')))
+            if variant_id is None:
+                errors.append({'field': ['input', 'quantities', str(index), 'inventoryItemId'],
+                               'message': 'The specified inventory item could not be found.', 'code': 'INVALID_INVENTORY_ITEM'})
+            elif item.get('locationId') != shop.location_id:
+                errors.append({'field': ['input', 'quantities', str(index), 'locationId'],
+                               'message': 'The specified location could not be found.', 'code': 'INVALID_LOCATION'})
+            else:
+                changes.append((variant_id, int(item['quantity'])))
+        # Shopify bu mutasyonu atomik uygular: tek bir hata bile tüm değişiklikleri geri alır
+        if not errors:
+            for variant_id, quantity in changes:
+                shop.update_variant(variant_id, {'inventory_quantity': quantity})
+        return {'inventoryAdjustmentGroup': None if errors else {'reason': set_input.get('reason')},
+                'userErrors': errors}
@@ -0,0 +1,194 @@
+"""Shopify yanıtlarını kaydeden ve ağ olmadan geri oynatan httpx transport'ları.
+
+RecordingTransport gerçek (ya da MockShopify'a giden) istekleri iletir ve
+her etkileşimi bir kasete yazar. ReplayTransport aynı istekleri kasetten
+yanıtlar; böylece benchmark'lar ağ gecikmesinden bağımsız, tekrarlanabilir
+ve çevrimdışı çalışır. İstekler (metot, yol + sorgu, gövde özeti) ile
+eşleştirilir, host yok sayılır; aynı anahtar birden çok kez kaydedildiyse
+(ör. currentBulkOperation yoklaması) yanıtlar kayıt sırasıyla verilir,
+tükenince sonuncusu tekrarlanır. Kaset gzip'li JSON Lines dosyasıdır.
+
+    transport = RecordingTransport()
+    async with ShopifyClient(shop, token, transport=transport) as client: ...
+    transport.save('sync.jsonl.gz')
+
+    replay = ReplayTransport.load('sync.jsonl.gz')
+    async with ShopifyClient(shop, token, transport=replay) as client: ...
+
+Python dışındaki istemciler (ör. netlify/local-server.js'teki Node function'ı)
+aynı transport'lara TransportServer üzerinden bağlanır: sunucu yerel bir HTTP
+adresi açar ve gelen her isteği transport'a iletir.
+
+    with TransportServer(ReplayTransport.load('node.jsonl.gz')) as server:
+        ...  # mağaza adresi olarak server.base_url verilir
+"""
+import asyncio
+import collections
+import gzip
+import hashlib
+import http.server
+import json
+import threading
+import time
+
+import httpx
+
+# Yanıt gövdesi çözülmüş halde saklandığı için bunlar yeniden hesaplanır
+_DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'date'}
+# TransportServer'ın transport'a iletmediği istek başlıkları (gövde sıkıştırılmadan alınır)
+_HOP_HEADERS = {'host', 'content-length', 'connection', 'keep-alive', 'accept-encoding', 'transfer-encoding'}
+
+
+def request_key(method, url, body):
+    """Eşleştirme anahtarı: host'suz URL ve gövdenin sha1 özeti"""
+    url = httpx.URL(url)
+    target = url.raw_path.decode('ascii')
+    digest = hashlib.sha1(body).hexdigest() if body else ''
+    return f"{method.upper()} {target} {digest}"
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """İstekleri `inner` transport'a iletir ve etkileşimleri bellekte biriktirir.
+
+    Birden çok istemcinin aynı kasete yazması için `interactions` listesi paylaşılabilir.
+    """
+
+    def __init__(self, inner=None, interactions=None):
+        self.inner = inner or httpx.AsyncHTTPTransport()
+        self.interactions = interactions if interactions is not None else []
+        self.request_count = 0
+
+    async def handle_async_request(self, request):
+        body = await request.aread()
+        start = time.perf_counter()
+        response = await self.inner.handle_async_request(request)
+        content = await response.aread()
+        self.request_count += 1
+        self.interactions.append({
+            'key': request_key(request.method, str(request.url), body),
+            'status': response.status_code,
+            'headers': [[k, v] for k, v in response.headers.multi_items() if k.lower() not in _DROPPED_HEADERS],
+            'body': content.decode('utf-8', errors='replace'),
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 2),
+        })
+        return httpx.Response(response.status_code, headers=response.headers, content=content,
+                              extensions=response.extensions)
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+    def save(self, path):
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            for interaction in self.interactions:
+                f.write(json.dumps(interaction, ensure_ascii=False) + '\n')
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Kasetteki yanıtları döndürür; kayıtta olmayan istek 599 ile yanıtlanır ve `misses`'e yazılır.
+
+    latency_scale > 0 ise kayıttaki süre bu katsayıyla beklenir (0: beklemeden).
+    """
+
+    def __init__(self, interactions, latency_scale=0.0):
+        self.latency_scale = latency_scale
+        self.request_count = 0
+        self.misses = []
+        self._responses = collections.defaultdict(collections.deque)
+        self._last = {}
+        for interaction in interactions:
+            self._responses[interaction['key']].append(interaction)
+
+    @classmethod
+    def load(cls, path, latency_scale=0.0):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return cls([json.loads(line) for line in f], latency_scale)
+
+    def _next(self, key):
+        queue = self._responses.get(key)
+        if queue:
+            self._last[key] = queue.popleft()
+        return self._last.get(key)
+
+    async def handle_async_request(self, request):
+        body = await request.aread()
+        key = request_key(request.method, str(request.url), body)
+        self.request_count += 1
+        interaction = self._next(key)
+        if interaction is None:
+            self.misses.append(key)
+            return httpx.Response(599, json={'errors': f"Kasette yok: {key}"})
+        if self.latency_scale:
+            await asyncio.sleep(interaction['elapsed_ms'] / 1000 * self.latency_scale)
+        return httpx.Response(interaction['status'], headers=interaction['headers'],
+                              content=interaction['body'].encode('utf-8'))
+
+
+class TransportServer:
+    """Gelen HTTP isteklerini bir httpx transport'una ileten yerel sunucu.
+
+    upstream verilirse istek bu adrese yönlendirilmiş gibi iletilir (kayıtta
+    RecordingTransport'un MockShopify'a ulaşması için); verilmezse host önemsizdir
+    (ReplayTransport host'u yok sayar). Transport tek bir olay döngüsünde çalışır.
+    """
+
+    def __init__(self, transport, upstream=None):
+        self.transport = transport
+        self.upstream = upstream.rstrip('/') if upstream else None
+        self._loop = asyncio.new_event_loop()
+        self._server = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def _forward(self, method, path, headers, body):
+        request = httpx.Request(method, f"{self.upstream or self.base_url}{path}", headers=headers, content=body)
+
+        async def handle():
+            response = await self.transport.handle_async_request(request)
+            return response.status_code, response.headers.multi_items(), await response.aread()
+
+        return asyncio.run_coroutine_threadsafe(handle(), self._loop).result()
+
+    def start(self):
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Başlık ve gövde ayrı yazılır; keep-alive bağlantıda Nagle gecikmesi olmasın
+            disable_nagle_algorithm = True
+
+            def _handle(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                headers = [(k, v) for k, v in self.headers.items() if k.lower() not in _HOP_HEADERS]
+                status, response_headers, content = server._forward(self.command, self.path, headers, body)
+                self.send_response(status)
+                for key, value in response_headers:
+                    if key.lower() not in _DROPPED_HEADERS:
+                        self.send_header(key, value)
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        self._server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        asyncio.run_coroutine_threadsafe(self.transport.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
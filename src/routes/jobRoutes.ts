@@ -0,0 +1,46 @@
+import express from 'express';
+import { JOB_TYPES, getJobSystem, jobSystemError, jobView } from '../services/jobService.js';
+
+const router = express.Router();
+
+// İş kuyruğu yoksa (Node 22.5 öncesi) 503
+router.use((req, res, next) => {
+    if (getJobSystem()) return next();
+    res.status(503).json({ success: false, message: `İş kuyruğu kullanılamıyor: ${jobSystemError() || 'başlatılmadı'}` });
+});
+
+// İş listesi: ?status=running&type=sync&limit=20
+router.get('/', (req, res) => {
+    const jobs = getJobSystem()!.store.list({
+        status: req.query.status ? String(req.query.status) : undefined,
+        type: req.query.type ? String(req.query.type) : undefined,
+        limit: Math.min(Number(req.query.limit) || 50, 500),
+    });
+    res.json({ success: true, jobs: jobs.map(job => jobView(job)) });
+});
+
+// İş durumu; ?logs=1 ile son log satırları da döner
+router.get('/:id', (req, res) => {
+    const job = getJobSystem()!.store.get(req.params.id);
+    if (!job) return res.status(404).json({ success: false, message: `İş bulunamadı: ${req.params.id}` });
+    res.json({ success: true, job: jobView(job, req.query.logs === '1' || req.query.logs === 'true') });
+});
+
+// Yeni iş: { type: 'sync' | 'price-update' | 'xml-stats', payload: {...} }
+router.post('/', (req, res) => {
+    const { type, payload } = req.body || {};
+    if (!JOB_TYPES.includes(type)) {
+        return res.status(400).json({ success: false, message: `Geçersiz iş türü. Geçerli türler: ${JOB_TYPES.join(', ')}` });
+    }
+    const { job, duplicate } = getJobSystem()!.enqueue(type, payload || {});
+    res.status(202).json({ success: true, jobId: job.id, duplicate, job: jobView(job) });
+});
+
+// Sadece kuyrukta bekleyen işler iptal edilebilir
+router.post('/:id/cancel', (req, res) => {
+    const cancelled = getJobSystem()!.store.cancel(req.params.id);
+    if (!cancelled) return res.status(409).json({ success: false, message: 'İş bulunamadı ya da çoktan başlamış.' });
+    res.json({ success: true });
+});
+
+export default router;
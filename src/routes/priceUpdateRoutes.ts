@@ -1,5 +1,6 @@
 import express from 'express';
 import { runPriceUpdateFromSheet } from '../services/priceUpdateService';
+import { getJobSystem } from '../services/jobService.js';
 
 const router = express.Router();
 
@@ -11,6 +12,14 @@ router.post('/run', async (req, res) => {
     
     // Şimdilik basit bir şekilde çalıştırıyoruz.
     console.log('Fiyat güncelleme isteği alındı.');
+
+    // İş kuyruğu varsa iş eklenip hemen dönülür (senkronizasyonla üst üste çalışmaz)
+    const jobSystem = getJobSystem();
+    if (jobSystem) {
+        const { job, duplicate } = jobSystem.enqueue('price-update');
+        res.status(202).json({ success: true, message: 'Fiyat güncelleme kuyruğa eklendi.', jobId: job.id, duplicate, statusUrl: `/api/jobs/${job.id}` });
+        return;
+    }
     
     // İstemciye hemen yanıt ver
     res.json({ success: true, message: 'Fiyat güncelleme işlemi başlatıldı. Lütfen sunucu loglarını kontrol edin.' });
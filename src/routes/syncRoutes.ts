@@ -1,15 +1,29 @@
 import express from 'express';
 import { runSync, getLatestSyncSummary } from '../services/syncService';
+import { getJobSystem } from '../services/jobService.js';
 
 const router = express.Router();
 
-// Senkronizasyonu başlatan endpoint
+// Senkronizasyonu başlatan endpoint: iş kuyruğa eklenir ve hemen döner.
+// Aynı seçeneklerle bekleyen/çalışan bir iş varsa yeni iş açılmaz, mevcut işin kimliği döner.
 router.post('/run', (req, res) => {
     const options = req.body.options || { full: true }; // İstemciden gelen seçenekleri al
     
     console.log('Senkronizasyon isteği alındı. Seçenekler:', options);
 
-    // İstemciye hemen yanıt ver, senkronizasyon arka planda çalışsın
+    const jobSystem = getJobSystem();
+    if (jobSystem) {
+        const { job, duplicate } = jobSystem.enqueue('sync', { options });
+        res.status(202).json({
+            message: duplicate ? 'Aynı senkronizasyon zaten kuyrukta/çalışıyor.' : 'Senkronizasyon kuyruğa eklendi.',
+            jobId: job.id,
+            duplicate,
+            statusUrl: `/api/jobs/${job.id}`,
+        });
+        return;
+    }
+
+    // İş kuyruğu yoksa eski davranış: istek içinde arka planda çalıştır
     res.status(202).json({ message: 'Senkronizasyon başlatıldı. Durumu loglardan veya özet endpointinden takip edebilirsiniz.' });
 
     // Senkronizasyonu asenkron olarak çalıştır
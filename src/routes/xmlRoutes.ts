@@ -1,5 +1,7 @@
 import express from 'express';
 import { checkXmlConnection, getXmlStats } from '../services/xmlService';
+import { getJobSystem } from '../services/jobService.js';
+import { invalidateFeedCache } from '../utils/feedCache.js';
 
 const router = express.Router();
 
@@ -9,10 +11,32 @@ router.get('/check', async (req, res) => {
     res.json(result);
 });
 
-// XML istatistiklerini al
+// Bu süreden yeni istatistikler yeniden hesaplanmaz
+const STATS_MAX_AGE_MS = 5 * 60 * 1000;
+
+// XML istatistiklerini al: iş kuyruğu varsa son hesaplanan sonuç hemen döner, eskiyse
+// arka planda yenileme işi eklenir (stale: true). Hiç sonuç yoksa 202 ve iş kimliği döner.
 router.get('/stats', async (req, res) => {
-    const result = await getXmlStats();
-    res.json(result);
+    const jobSystem = getJobSystem();
+    if (!jobSystem) {
+        const result = await getXmlStats();
+        res.json(result);
+        return;
+    }
+    const last = jobSystem.store.lastDone('xml-stats');
+    const fresh = last && last.finishedAt !== null && Date.now() - last.finishedAt < STATS_MAX_AGE_MS;
+    const refresh = fresh ? null : jobSystem.enqueue('xml-stats').job;
+    if (last) {
+        res.json({ ...last.result, computedAt: last.finishedAt, stale: !fresh, refreshJobId: refresh?.id ?? null });
+        return;
+    }
+    res.status(202).json({ success: false, pending: true, jobId: refresh!.id, statusUrl: `/api/jobs/${refresh!.id}` });
+});
+
+// Feed önbelleğini boşaltır; bir sonraki istek feed'i yeniden indirip parse eder
+router.delete('/cache', async (req, res) => {
+    const count = await invalidateFeedCache(req.query.url ? String(req.query.url) : process.env.XML_FEED_URL);
+    res.json({ success: true, message: `${count} feed önbellekten silindi` });
 });
 
 export default router;
@@ -8,6 +8,8 @@ import shopifyRoutes from './routes/shopifyRoutes.js';
 import xmlRoutes from './routes/xmlRoutes.js';
 import syncRoutes from './routes/syncRoutes.js';
 import googleRoutes from './routes/googleRoutes.js';
+import jobRoutes from './routes/jobRoutes.js';
+import { startJobSystem } from './services/jobService.js';
 // import priceUpdateRoutes from './routes/priceUpdateRoutes.js'; // Henüz kullanılmıyor
 
 dotenv.config();
@@ -30,6 +32,7 @@ app.use('/api/shopify', shopifyRoutes);
 app.use('/api/xml', xmlRoutes);
 app.use('/api/sync', syncRoutes);
 app.use('/api/google', googleRoutes);
+app.use('/api/jobs', jobRoutes);
 // app.use('/api/price-update', priceUpdateRoutes);
 
 // Genel bir config endpoint'i (isteğe bağlı, .env'i yönetmek için)
@@ -46,6 +49,9 @@ app.get('*', (req, res) => {
   res.sendFile(path.join(__dirname, '../public/index.html'));
 });
 
+// Arka plan iş kuyruğu, çalışanlar ve zamanlayıcı (JOB_WORKERS, JOB_SCHEDULE)
+startJobSystem();
+
 // Sunucuyu başlat
 app.listen(port, () => {
   console.log(`Sunucu http://localhost:${port} adresinde çalışıyor`);
@@ -1,10 +1,66 @@
 import { google } from 'googleapis';
 import { getAuthenticatedClient } from './googleAuthService.js';
-import { fetchAllShopifyProducts } from './shopifyService.js';
+import { getStoreSnapshot } from './shopifyService.js';
 import { updateEnvFile } from '../utils/envHelper.js';
+import { FIRST_DATA_ROW, SHEET_NAME, SheetMirror, SheetRow, loadSheetMirror, rowFromValues } from '../utils/sheetMirror.js';
 import { Product } from '../types/product.d';
 
+type GoogleAuth = NonNullable<ReturnType<typeof getAuthenticatedClient>>;
+
+// Drive dosya sürümü; sayfadaki her değişiklikte artar. drive.file yetkisi sadece uygulamanın
+// oluşturduğu dosyaları kapsar; başka bir sayfa bağlandıysa sürüm okunamaz ve null döner
+// (sayfa her seferinde tam okunur)
+async function currentRevision(auth: GoogleAuth, spreadsheetId: string): Promise<string | null> {
+    const drive = google.drive({ version: 'v3', auth });
+    try {
+        const { data } = await drive.files.get({ fileId: spreadsheetId, fields: 'version' });
+        return data.version || null;
+    } catch {
+        return null;
+    }
+}
+
+/**
+ * Sayfa, aynanın bildiği sürümden bu yana değiştiyse A:H bir kez okunur ve aynaya uygulanır.
+ * Değişmediyse sayfa hiç okunmaz. İçeriği değişen SKU'ları döndürür.
+ */
+export async function refreshSheetMirror(auth: GoogleAuth, mirror: SheetMirror): Promise<{ read: boolean; changed: string[] }> {
+    const revision = await currentRevision(auth, mirror.spreadsheetId);
+    if (revision && revision === mirror.revision) {
+        return { read: false, changed: [] };
+    }
+    const sheets = google.sheets({ version: 'v4', auth });
+    const response = await sheets.spreadsheets.values.get({
+        spreadsheetId: mirror.spreadsheetId,
+        range: `${SHEET_NAME}!A${FIRST_DATA_ROW}:H`,
+    });
+    const rows = (response.data.values ?? []).map((values, i) => rowFromValues(values, FIRST_DATA_ROW + i));
+    return { read: true, changed: mirror.applyRows(rows, revision) };
+}
+
+/**
+ * Kendi yazmamızdan sonra aynayı yeni sürüme taşır. before, aynanın tutarlı olduğu (yazmadan önceki)
+ * sürümdür; sürüm bizim writes isteğimizden fazla ilerlediyse araya başka bir düzenleme girmiştir.
+ * O durumda (ya da sürüm okunamazsa) ayna eski sürümde bırakılır ve sonraki yenilemede sayfa tam okunur.
+ */
+async function adoptOwnWrite(auth: GoogleAuth, mirror: SheetMirror, before: string | null, writes: number): Promise<void> {
+    const after = await currentRevision(auth, mirror.spreadsheetId);
+    if (before && after && Number(after) - Number(before) <= writes) {
+        mirror.setRevision(after);
+    } else {
+        mirror.setRevision(null);
+    }
+}
+
+// "Sayfa1!A120:H125" -> 120
+function firstRowOf(range: string | null | undefined): number | null {
+    const match = /![A-Z]+(\d+)/.exec(range || '');
+    return match ? Number(match[1]) : null;
+}
+
 // Mevcut Google Sheet'i yeni ürünlerle güncelleme fonksiyonu
+// Sayfa yerel aynayla karşılaştırılır: yeni SKU'lar sona eklenir, handle/başlığı değişen satırların
+// sadece o hücreleri values.batchUpdate ile yazılır
 export async function updateProductSheetWithNewItems(productsFromXml: Product[], logCallback: (message: string, level: 'info' | 'success' | 'warn') => void): Promise<number> {
     const spreadsheetId = process.env.GOOGLE_SHEET_ID;
     if (!spreadsheetId) {
@@ -21,44 +77,69 @@ export async function updateProductSheetWithNewItems(productsFromXml: Product[],
     const sheets = google.sheets({ version: 'v4', auth: authClient });
 
     try {
-        const response = await sheets.spreadsheets.values.get({
-            spreadsheetId,
-            range: 'Sayfa1!E:E', // SKU sütunu
-        });
-
-        const existingSkus = new Set(response.data.values?.flat() ?? []);
-        if (existingSkus.has('SKU')) existingSkus.delete('SKU');
-
-        const newRows: any[][] = [];
+        const mirror = await loadSheetMirror(spreadsheetId);
+        const { read } = await refreshSheetMirror(authClient, mirror);
+        if (read) logCallback(`Google Sheet değişmiş, yerel ayna yenilendi (${mirror.size} SKU).`, 'info');
+        const revisionBeforeWrite = mirror.revision;
+
+        const newRows: SheetRow[] = [];
+        const cellUpdates: { range: string; values: any[][] }[] = [];
+        const updatedRows: SheetRow[] = [];
+        const seen = new Set<string>();
         for (const product of productsFromXml) {
             for (const variant of product.variants) {
-                if (variant.sku && !existingSkus.has(variant.sku)) {
-                    newRows.push([
-                        '', // Shopify Product ID
-                        product.handle,
-                        product.title,
-                        '', // Variant ID
-                        variant.sku,
-                        '', '', '' // Fiyat alanları boş
-                    ]);
-                    existingSkus.add(variant.sku);
+                if (!variant.sku || seen.has(variant.sku)) continue;
+                seen.add(variant.sku);
+                const existing = mirror.get(variant.sku);
+                if (!existing) {
+                    newRows.push({
+                        row: 0, productId: '', handle: product.handle, title: product.title,
+                        variantId: '', sku: variant.sku, price: null, compareAtPrice: null,
+                    });
+                } else if (existing.handle !== product.handle || existing.title !== product.title) {
+                    cellUpdates.push({ range: `${SHEET_NAME}!B${existing.row}:C${existing.row}`, values: [[product.handle, product.title]] });
+                    updatedRows.push({ ...existing, handle: product.handle, title: product.title });
                 }
             }
         }
 
         if (newRows.length > 0) {
-            await sheets.spreadsheets.values.append({
+            const response = await sheets.spreadsheets.values.append({
                 spreadsheetId,
-                range: 'Sayfa1!A1',
+                range: `${SHEET_NAME}!A1`,
                 valueInputOption: 'USER_ENTERED',
+                insertDataOption: 'INSERT_ROWS',
                 requestBody: {
-                    values: newRows,
+                    // Shopify ID'leri ve fiyat alanları boş
+                    values: newRows.map(row => ['', row.handle, row.title, '', row.sku, '', '', '']),
                 },
             });
+            const firstRow = firstRowOf(response.data.updates?.updatedRange) ?? mirror.lastRow + 1;
+            newRows.forEach((row, i) => mirror.upsert({ ...row, row: firstRow + i }));
+        }
+
+        if (cellUpdates.length > 0) {
+            await sheets.spreadsheets.values.batchUpdate({
+                spreadsheetId,
+                requestBody: { valueInputOption: 'USER_ENTERED', data: cellUpdates },
+            });
+            for (const row of updatedRows) mirror.upsert(row);
+        }
+
+        if (newRows.length > 0 || cellUpdates.length > 0) {
+            const writes = (newRows.length > 0 ? 1 : 0) + (cellUpdates.length > 0 ? 1 : 0);
+            await adoptOwnWrite(authClient, mirror, revisionBeforeWrite, writes);
+        }
+        await mirror.save();
+
+        if (cellUpdates.length > 0) {
+            logCallback(`Google Sheet: ${cellUpdates.length} satırın handle/başlık hücreleri güncellendi.`, 'info');
+        }
+        if (newRows.length > 0) {
             logCallback(`Google Sheet güncellendi: ${newRows.length} yeni varyant eklendi.`, 'success');
             return newRows.length;
         }
-        
+
         logCallback('Google Sheet\'te eklenecek yeni ürün bulunamadı.', 'info');
         return 0;
     } catch (error: any) {
@@ -85,23 +166,23 @@ export async function createProductSheet(): Promise<{url: string, id: string}> {
     if (!authClient) throw new Error('Kullanıcı kimliği doğrulanmamış.');
 
     const sheets = google.sheets({ version: 'v4', auth: authClient });
-    const products = await fetchAllShopifyProducts();
-    
+    const snapshot = await getStoreSnapshot(0);
+
     const rows = [
         ['Shopify Product ID', 'Product Handle', 'Product Title', 'Variant ID', 'SKU', 'Maliyet Fiyatı (TL)', 'Satış Fiyatı (TL)', 'Liste Fiyatı (TL - Üstü Çizili)']
     ];
 
-    for (const product of products) {
+    for (const product of snapshot.products) {
         for (const variant of product.variants) {
             rows.push([
-                String(product.id), 
-                product.handle, 
-                product.title, 
+                String(product.id),
+                product.handle,
+                product.title,
                 String(variant.id),
-                variant.sku, 
+                variant.sku || '',
                 '', // Maliyet
-                String(variant.price), 
-                String(variant.compareAtPrice || '') 
+                String(variant.price),
+                String(variant.compareAtPrice || '')
             ]);
         }
     }
@@ -116,6 +197,7 @@ export async function createProductSheet(): Promise<{url: string, id: string}> {
     const spreadsheetId = spreadsheet.data.spreadsheetId;
     const spreadsheetUrl = spreadsheet.data.spreadsheetUrl;
     if (!spreadsheetId || !spreadsheetUrl) throw new Error('Spreadsheet ID veya URL alınamadı.');
+    const createdRevision = await currentRevision(authClient, spreadsheetId);
 
     await sheets.spreadsheets.values.update({
         spreadsheetId,
@@ -124,6 +206,17 @@ export async function createProductSheet(): Promise<{url: string, id: string}> {
         requestBody: { values: rows },
     });
 
+    // Yazılan satırlar aynı zamanda Shopify'daki güncel fiyatlardır; fiyat senkronizasyonu
+    // sadece bundan sonra sayfada değiştirilen satırları gönderir
+    const mirror = await loadSheetMirror(spreadsheetId);
+    rows.slice(1).forEach((values, i) => {
+        const row = rowFromValues(values, FIRST_DATA_ROW + i);
+        if (row.sku) mirror.upsert(row, { price: row.price, compareAtPrice: row.compareAtPrice });
+    });
+    mirror.markReconciled(snapshot.fetchedAt);
+    await adoptOwnWrite(authClient, mirror, createdRevision, 1);
+    await mirror.save();
+
     await updateEnvFile('GOOGLE_SHEET_ID', spreadsheetId);
     process.env.GOOGLE_SHEET_ID = spreadsheetId;
 
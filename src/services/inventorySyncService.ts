@@ -0,0 +1,125 @@
+// Sadece stok senkronizasyonu için hızlı yol: ürün belgeleri hiç parse edilmez, ürün PUT'u yapılmaz.
+// Feed stockScanner ile taranır (stok_kodu, barkod, stok), SKU/barkod ID indeksinden inventory item'a
+// eşlenir ve mutlak miktarlar inventorySetQuantities ile 250'lik gruplar halinde yazılır.
+// En son yazılan miktarlar diskte tutulur; sadece değişen kalemler gönderilir. Feed gövdesi (sha256)
+// son başarılı koşudan beri değişmediyse Shopify'a hiç istek atılmaz.
+import crypto from 'crypto';
+import fs from 'fs/promises';
+import path from 'path';
+import { getStoreSnapshot, getShopifyApiClient, logBatchResult } from './shopifyService.js';
+import { VariantBatchWriter } from './shopifyBatchWriter.js';
+import { fetchFeedXml } from '../utils/feedCache.js';
+import { loadShopifyIdIndex } from '../utils/shopifyIdIndex.js';
+import { scanStock } from '../utils/stockScanner.js';
+import { activeTelemetry, timeStage } from '../utils/telemetry.js';
+
+const STATE_VERSION = 1;
+const stateDir = path.resolve(process.cwd(), process.env.SHOPIFY_INDEX_DIR || '.shopify-index');
+// Bu süreden eski durumda tüm miktarlar yeniden yazılır (Shopify'da elle yapılan düzeltmeleri ezer)
+const FULL_PUSH_MAX_AGE_MS = Number(process.env.STOCK_FULL_PUSH_MAX_AGE_MS || 24 * 60 * 60 * 1000);
+
+interface StockState {
+    version: number;
+    store: string;
+    feedSha256: string | null;
+    fullPushAt: number | null;
+    // inventoryItemId -> en son yazılan miktar
+    quantities: Record<string, number>;
+}
+
+async function loadState(filePath: string, store: string): Promise<StockState> {
+    const empty: StockState = { version: STATE_VERSION, store, feedSha256: null, fullPushAt: null, quantities: {} };
+    try {
+        const data: StockState = JSON.parse(await fs.readFile(filePath, 'utf-8'));
+        return data.version === STATE_VERSION && data.store === store ? data : empty;
+    } catch {
+        return empty;
+    }
+}
+
+function statePathOf(store: string): string {
+    const key = crypto.createHash('sha1').update(store).digest('hex').slice(0, 16);
+    return path.join(stateDir, `stock-${key}.json`);
+}
+
+async function saveState(filePath: string, state: StockState): Promise<void> {
+    await fs.mkdir(path.dirname(filePath), { recursive: true });
+    const tmpPath = `${filePath}.${process.pid}.tmp`;
+    await fs.writeFile(tmpPath, JSON.stringify(state));
+    await fs.rename(tmpPath, filePath);
+}
+
+// Stokları başka bir yol (tam senkronizasyon) yazdıysa bilinen miktarlar geçersizdir;
+// bir sonraki hızlı koşu tüm miktarları yeniden yazar
+export async function resetInventorySyncState(store = process.env.SHOPIFY_STORE_URL || ''): Promise<void> {
+    await fs.rm(statePathOf(store), { force: true });
+}
+
+export async function runInventorySync(
+    logCallback: (message: string, level: 'info' | 'success' | 'error' | 'warn') => void,
+    options: { force?: boolean } = {}
+): Promise<string> {
+    const url = process.env.XML_FEED_URL;
+    if (!url) throw new Error("XML URL'i .env dosyasında bulunamadı.");
+    const store = process.env.SHOPIFY_STORE_URL || '';
+    const startTime = Date.now();
+    const telemetry = activeTelemetry();
+
+    const statePath = statePathOf(store);
+    const state = await loadState(statePath, store);
+    const fullPush = options.force || state.fullPushAt === null || Date.now() - state.fullPushAt > FULL_PUSH_MAX_AGE_MS;
+
+    logCallback('Stok senkronizasyonu (hızlı yol): XML verisi indiriliyor...', 'info');
+    const feed = await timeStage('fetch', () => fetchFeedXml(url));
+    if (!fullPush && feed.sha256 === state.feedSha256) {
+        const summary = 'Stok senkronizasyonu: feed son koşudan beri değişmedi, Shopify\'a istek atılmadı.';
+        logCallback(summary, 'success');
+        return summary;
+    }
+
+    // Sadece stok alanları; aynı SKU birden çok kez geçerse son değer geçerli
+    const { records, products } = await timeStage('parse', () => scanStock(feed.xml));
+    const stockBySku = new Map(records.map(record => [record.sku, record]));
+    logCallback(`${products} üründe ${stockBySku.size} stok kodu tarandı.`, 'info');
+
+    const idIndex = await timeStage('lookup', () => loadShopifyIdIndex(store, () => getStoreSnapshot(0)));
+    const writer = new VariantBatchWriter(getShopifyApiClient());
+    const queued = new Map<string, { inventoryItemId: string; quantity: number }>();
+    let unmatched = 0;
+    let unchanged = 0;
+    for (const [sku, { barcode, stock }] of stockBySku) {
+        const variant = idIndex.findVariant(sku, barcode);
+        if (!variant?.inventoryItemId) {
+            unmatched++;
+            continue;
+        }
+        if (!fullPush && state.quantities[variant.inventoryItemId] === stock) {
+            unchanged++;
+            continue;
+        }
+        writer.queueQuantity({ inventoryItemId: variant.inventoryItemId, sku, quantity: stock });
+        queued.set(sku, { inventoryItemId: variant.inventoryItemId, quantity: stock });
+        await timeStage('write', () => writer.flushIfFull());
+    }
+    const batch = await timeStage('write', () => writer.flush());
+    logBatchResult(batch, logCallback);
+
+    for (const sku of batch.updated) {
+        const change = queued.get(sku);
+        if (change) state.quantities[change.inventoryItemId] = change.quantity;
+    }
+    // Başarısız kalem varsa feed özeti yazılmaz; bir sonraki koşu aynı feed'i yeniden dener
+    state.feedSha256 = batch.failed.length === 0 ? feed.sha256 : null;
+    if (fullPush && batch.failed.length === 0) state.fullPushAt = Date.now();
+    await saveState(statePath, state);
+
+    telemetry?.count('variant_writes', batch.updated.length);
+    telemetry?.count('variant_write_failures', batch.failed.length);
+    telemetry?.count('stock_unchanged', unchanged);
+    telemetry?.count('stock_unmatched', unmatched);
+
+    const duration = (Date.now() - startTime) / 1000;
+    const summary = `Stok senkronizasyonu tamamlandı! Süre: ${duration.toFixed(2)}s. Yazılan: ${batch.updated.length}, Değişmeyen: ${unchanged}, Eşleşmeyen SKU: ${unmatched}, Hata: ${batch.failed.length}, İstek: ${batch.requests}${fullPush ? ' (tam yazım)' : ''}.`;
+    logCallback(summary, batch.failed.length ? 'warn' : 'success');
+    return summary;
+}
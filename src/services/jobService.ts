@@ -0,0 +1,245 @@
+// Arka plan iş sistemi: HTTP rotaları işi kuyruğa ekleyip hemen döner, işler bu süreçteki
+// çalışan havuzunda yürütülür. Zamanlayıcı JOB_SCHEDULE ile tanımlanan periyodik işleri
+// (tam, stok, fiyat) ekler. Kuyruk diskte olduğundan sunucu yeniden başlasa da işler kaybolmaz.
+//   JOB_WORKERS=2                          aynı anda çalışabilecek iş sayısı (varsayılan 1)
+//   JOB_SCHEDULE=full=24h,stock=15m,price=1h
+import os from 'os';
+import { JobLogLine, JobRecord, JobStore, NewJob, openJobStore } from '../utils/jobStore.js';
+import { runSync } from './syncService.js';
+import { runPriceUpdateFromSheet } from './priceUpdateService.js';
+import { getXmlStats } from './xmlService.js';
+
+type LogCallback = (message: string, level: 'info' | 'success' | 'error' | 'warn') => void;
+
+// Shopify'a yazan işler aynı kilidi paylaşır: iki senkronizasyon (ya da senkronizasyon ve
+// fiyat güncellemesi) hiçbir zaman üst üste çalışmaz
+const SHOPIFY_WRITE_LOCK = 'shopify-write';
+const HEARTBEAT_MS = 5_000;
+const STALE_AFTER_MS = 60_000;
+const SCHEDULER_TICK_MS = 30_000;
+const RETENTION_MS = Number(process.env.JOB_RETENTION_DAYS || 14) * 24 * 60 * 60 * 1000;
+
+interface JobHandler {
+    run: (payload: any, log: LogCallback) => Promise<any>;
+    // Aynı içerikli işleri tekilleştiren anahtar ve eşzamanlılık kilidi
+    keys: (payload: any) => { dedupeKey: string | null; lockKey: string | null };
+}
+
+const SYNC_OPTION_NAMES = ['full', 'price', 'inventory', 'details', 'images'] as const;
+
+function syncOptions(payload: any) {
+    const options = payload?.options || { full: true };
+    return {
+        full: !!options.full,
+        price: !!options.price,
+        inventory: !!options.inventory,
+        details: !!options.details,
+        images: !!options.images,
+    };
+}
+
+const handlers: Record<string, JobHandler> = {
+    sync: {
+        run: async (payload, log) => ({ summary: await runSync(log, syncOptions(payload)) }),
+        keys: payload => {
+            const options = syncOptions(payload);
+            const enabled = SYNC_OPTION_NAMES.filter(name => options[name]).join('+') || 'none';
+            return { dedupeKey: `sync:${enabled}`, lockKey: SHOPIFY_WRITE_LOCK };
+        },
+    },
+    'price-update': {
+        run: async (_payload, log) => ({ summary: await runPriceUpdateFromSheet(log) }),
+        keys: () => ({ dedupeKey: 'price-update', lockKey: SHOPIFY_WRITE_LOCK }),
+    },
+    'xml-stats': {
+        run: async () => getXmlStats(),
+        keys: () => ({ dedupeKey: 'xml-stats', lockKey: null }),
+    },
+};
+
+export const JOB_TYPES = Object.keys(handlers);
+
+// Zamanlayıcı girdileri: ad -> eklenecek iş
+const SCHEDULE_JOBS: Record<string, { type: string; payload: any }> = {
+    full: { type: 'sync', payload: { options: { full: true } } },
+    stock: { type: 'sync', payload: { options: { inventory: true } } },
+    price: { type: 'price-update', payload: {} },
+};
+
+// "15m" / "1h" / "24h" / "30s" / "90000" (ms) -> ms
+export function parseInterval(value: string): number | null {
+    const match = /^(\d+(?:\.\d+)?)\s*(ms|s|m|h|d)?$/.exec(value.trim());
+    if (!match) return null;
+    const units: Record<string, number> = { ms: 1, s: 1000, m: 60_000, h: 3_600_000, d: 86_400_000 };
+    return Math.round(Number(match[1]) * units[match[2] || 'ms']);
+}
+
+export function parseSchedule(spec: string): { name: string; everyMs: number }[] {
+    const entries: { name: string; everyMs: number }[] = [];
+    for (const part of spec.split(',').map(p => p.trim()).filter(Boolean)) {
+        const [name, interval] = part.split('=');
+        const everyMs = interval ? parseInterval(interval) : null;
+        if (!SCHEDULE_JOBS[name] || !everyMs) {
+            console.warn(`[JOBS] Geçersiz zamanlama girdisi atlandı: '${part}'`);
+            continue;
+        }
+        entries.push({ name, everyMs });
+    }
+    return entries;
+}
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+export class JobSystem {
+    readonly store: JobStore;
+    private readonly workers: number;
+    private readonly schedule: { name: string; everyMs: number }[];
+    private readonly pollMs: number;
+    private running = false;
+    private wakeUp: (() => void)[] = [];
+    private timers: NodeJS.Timeout[] = [];
+
+    constructor(store: JobStore, options: { workers?: number; schedule?: string; pollMs?: number } = {}) {
+        this.store = store;
+        this.workers = Math.max(1, options.workers ?? 1);
+        this.schedule = parseSchedule(options.schedule ?? '');
+        this.pollMs = options.pollMs ?? 1000;
+    }
+
+    enqueue(type: string, payload: any = {}, extra: Partial<NewJob> = {}): { job: JobRecord; duplicate: boolean } {
+        const handler = handlers[type];
+        if (!handler) throw new Error(`Bilinmeyen iş türü: ${type}`);
+        const result = this.store.enqueue({ type, payload, ...handler.keys(payload), ...extra });
+        if (!result.duplicate) this.notify();
+        return result;
+    }
+
+    start(): void {
+        if (this.running) return;
+        this.running = true;
+        const recovered = this.store.recoverStale(STALE_AFTER_MS);
+        if (recovered) console.warn(`[JOBS] Yanıt vermeyen ${recovered} iş yeniden kuyruğa alındı/başarısız sayıldı.`);
+        this.store.prune(RETENTION_MS);
+        for (let i = 0; i < this.workers; i++) {
+            this.workerLoop(`${os.hostname()}:${process.pid}:${i}`).catch(error =>
+                console.error(`[JOBS] Çalışan ${i} durdu: ${error.message}`));
+        }
+        if (this.schedule.length) {
+            this.scheduleTick();
+            this.timers.push(setInterval(() => this.scheduleTick(), SCHEDULER_TICK_MS));
+            console.log(`[JOBS] Zamanlayıcı: ${this.schedule.map(e => `${e.name} her ${e.everyMs / 60_000} dk`).join(', ')}`);
+        }
+        // Başka süreçlerin (ör. aynı veritabanını kullanan ikinci sunucu) çökmüş işlerini de topla
+        this.timers.push(setInterval(() => this.store.recoverStale(STALE_AFTER_MS), STALE_AFTER_MS));
+    }
+
+    async stop(): Promise<void> {
+        this.running = false;
+        this.timers.forEach(timer => clearInterval(timer));
+        this.timers = [];
+        this.notify();
+    }
+
+    private notify(): void {
+        const waiting = this.wakeUp;
+        this.wakeUp = [];
+        waiting.forEach(resolve => resolve());
+    }
+
+    private idle(): Promise<void> {
+        return new Promise(resolve => {
+            this.wakeUp.push(resolve);
+            setTimeout(resolve, this.pollMs);
+        });
+    }
+
+    private scheduleTick(): void {
+        const now = Date.now();
+        for (const entry of this.schedule) {
+            const last = this.store.lastScheduledAt(entry.name);
+            if (last !== null && now - last < entry.everyMs) continue;
+            const { type, payload } = SCHEDULE_JOBS[entry.name];
+            try {
+                const { job, duplicate } = this.enqueue(type, payload, { schedule: entry.name });
+                if (!duplicate) console.log(`[JOBS] Zamanlanmış iş eklendi: ${entry.name} (${job.id})`);
+            } catch (error: any) {
+                console.error(`[JOBS] Zamanlanmış iş eklenemedi (${entry.name}): ${error.message}`);
+            }
+        }
+    }
+
+    private async workerLoop(worker: string): Promise<void> {
+        while (this.running) {
+            const job = this.store.claim(worker);
+            if (!job) {
+                await this.idle();
+                continue;
+            }
+            await this.execute(job);
+            // Biten iş bir kilidi bırakmış olabilir; bekleyen diğer çalışanlar da denesin
+            this.notify();
+        }
+    }
+
+    private async execute(job: JobRecord): Promise<void> {
+        const handler = handlers[job.type];
+        let pending: JobLogLine[] = [];
+        const log: LogCallback = (message, level) => {
+            console.log(`[JOB ${job.id} ${job.type} - ${level.toUpperCase()}] ${message}`);
+            pending.push({ at: Date.now(), level, message });
+        };
+        const flushLogs = () => {
+            const lines = pending;
+            pending = [];
+            this.store.heartbeat(job.id, lines);
+        };
+        const heartbeat = setInterval(flushLogs, HEARTBEAT_MS);
+        try {
+            if (!handler) throw new Error(`Bilinmeyen iş türü: ${job.type}`);
+            const result = await handler.run(job.payload, log);
+            flushLogs();
+            this.store.complete(job.id, result);
+        } catch (error: any) {
+            log(error.message, 'error');
+            flushLogs();
+            this.store.fail(job.id, error.message);
+        } finally {
+            clearInterval(heartbeat);
+        }
+    }
+}
+
+let jobSystem: JobSystem | null = null;
+let startError: string | null = null;
+
+/** Kuyruğu açar, çalışanları ve zamanlayıcıyı başlatır. Açılamazsa null döner (eski davranış). */
+export async function startJobSystem(): Promise<JobSystem | null> {
+    if (jobSystem) return jobSystem;
+    try {
+        const store = await openJobStore();
+        jobSystem = new JobSystem(store, {
+            workers: Number(process.env.JOB_WORKERS) || 1,
+            schedule: process.env.JOB_SCHEDULE || '',
+        });
+        jobSystem.start();
+        return jobSystem;
+    } catch (error: any) {
+        startError = error.message;
+        console.warn(`[JOBS] İş kuyruğu başlatılamadı, işler istek içinde çalışacak: ${error.message}`);
+        return null;
+    }
+}
+
+export function getJobSystem(): JobSystem | null {
+    return jobSystem;
+}
+
+export function jobSystemError(): string | null {
+    return startError;
+}
+
+// API yanıtı: loglar isteğe bağlı (uzun olabilir)
+export function jobView(job: JobRecord, withLogs = false) {
+    const { logs, ...rest } = job;
+    return withLogs ? job : { ...rest, lastLog: logs[logs.length - 1] || null };
+}
@@ -1,176 +1,99 @@
-import { google } from 'googleapis';
 import { oAuth2Client } from './googleAuthService.js';
-import { getShopifyApiClient } from './shopifyService.js';
+import { refreshSheetMirror } from './googleSheetsService.js';
+import { getShopifyApiClient, getStoreSnapshot } from './shopifyService.js';
+import { VariantBatchWriter } from './shopifyBatchWriter.js';
+import { MirrorEntry, SheetMirror, loadSheetMirror, normalizePrice } from '../utils/sheetMirror.js';
+import { toGid } from '../utils/shopifyIdIndex.js';
 import { AxiosInstance } from 'axios';
 
-type PriceData = {
-    sku: string;
-    price: string | null;
-    compareAtPrice: string | null;
-};
+// Sayfadaki fiyatlarla Shopify'daki bilinen fiyatlar bu süreden eskiyse bulk snapshot ile doğrulanır
+// (Shopify panelinden elle yapılan fiyat değişiklikleri aynada görünmez)
+const RECONCILE_MAX_AGE_MS = Number(process.env.SHEET_RECONCILE_MAX_AGE_MS || 24 * 60 * 60 * 1000);
 
-// Adım 1: Google Sheet'ten verileri oku
-async function getPricesFromSheet(spreadsheetId: string): Promise<PriceData[]> {
-    const sheets = google.sheets({ version: 'v4', auth: oAuth2Client });
-
-    const response = await sheets.spreadsheets.values.get({
-        spreadsheetId,
-        range: 'Sayfa1!E:H', // SKU, Maliyet, Satış Fiyatı, Liste Fiyatı sütunları
-    });
-
-    const rows = response.data.values;
-    if (!rows || rows.length === 0) return [];
-
-    // Başlık satırını atla ve veriyi işle
-    return rows.slice(1).map(row => ({
-        sku: row[0], // E sütunu
-        price: row[2] || null, // G sütunu (Satış Fiyatı)
-        compareAtPrice: row[3] || null, // H sütunu (Liste Fiyatı)
-    })).filter(item => item.sku && (item.price !== null || item.compareAtPrice !== null)); // SKU'su olan ve en az bir fiyatı olanları al
+// Aynadaki Shopify fiyatlarını ve eksik ürün/varyant ID'lerini tek bir bulk export ile doldurur
+async function reconcileWithShopify(
+    mirror: SheetMirror,
+    logCallback: (message: string, level: 'info' | 'success' | 'error' | 'warn') => void
+): Promise<void> {
+    logCallback("Shopify'dan mevcut ürün ve varyant bilgileri alınıyor...", 'info');
+    const snapshot = await getStoreSnapshot(0);
+    logCallback(`Shopify'dan ${snapshot.skuIndex.size} adet SKU bilgisi alındı.`, 'info');
+    for (const entry of mirror.entries()) {
+        const variant = snapshot.skuIndex.get(entry.sku);
+        if (!variant) continue;
+        mirror.setShopifyPrices(entry.sku, normalizePrice(variant.price), normalizePrice(variant.compareAtPrice), {
+            productId: variant.productId,
+            variantId: variant.variantId,
+        });
+    }
+    mirror.markReconciled(snapshot.fetchedAt);
 }
 
-
-// Adım 2: Shopify'da varyantları bul ve güncelle
+// Sayfada Shopify'dakinden farklı olan fiyatları toplu yazar; sadece bu satırlar için istek atılır
 async function updatePricesInShopify(
     shopifyApi: AxiosInstance,
-    priceData: PriceData[],
+    mirror: SheetMirror,
     logCallback: (message: string, level: 'info' | 'success' | 'error' | 'warn') => void
 ): Promise<{ updated: number; notFound: number; unchanged: number }> {
-    let updatedCount = 0;
     let notFoundCount = 0;
     let unchangedCount = 0;
 
-    // GraphQL sorgusu ile SKU'ları ve varyant ID'lerini toplu olarak al
-    const skuToVariantMap = new Map<string, { id: string; price: string; compareAtPrice: string | null }>();
-
-    let hasNextPage = true;
-    let cursor = null;
-    const query = `
-      query getProducts($cursor: String) {
-        products(first: 50, after: $cursor) {
-          pageInfo {
-            hasNextPage
-            endCursor
-          }
-          edges {
-            node {
-              variants(first: 50) {
-                edges {
-                  node {
-                    id
-                    sku
-                    price
-                    compareAtPrice
-                  }
-                }
-              }
-            }
-          }
-        }
-      }`;
-
-    logCallback("Shopify'dan mevcut ürün ve varyant bilgileri alınıyor...", 'info');
-    while (hasNextPage) {
-        const response: any = await shopifyApi.post('/graphql.json', {
-            query,
-            variables: { cursor },
-        });
-        const products: any = response.data.data.products;
-        products.edges.forEach((productEdge: any) => {
-            productEdge.node.variants.edges.forEach((variantEdge: any) => {
-                const variant = variantEdge.node;
-                if (variant.sku) {
-                    skuToVariantMap.set(variant.sku, {
-                        id: variant.id,
-                        price: variant.price,
-                        compareAtPrice: variant.compareAtPrice
-                    });
-                }
-            });
-        });
-        hasNextPage = products.pageInfo.hasNextPage;
-        cursor = products.pageInfo.endCursor;
+    const stale = mirror.reconciledAt === null || Date.now() - mirror.reconciledAt > RECONCILE_MAX_AGE_MS;
+    const unknown = () => Array.from(mirror.entries()).some(entry =>
+        mirror.needsPush(entry) && (!entry.variantId || entry.shopifyPrice === undefined));
+    if (stale || unknown()) {
+        await reconcileWithShopify(mirror, logCallback);
+    } else {
+        logCallback('Shopify fiyatları yerel aynadan alındı, tam tarama yapılmadı.', 'info');
     }
-    logCallback(`Shopify'dan ${skuToVariantMap.size} adet SKU bilgisi alındı.`, 'info');
 
-
-    const mutations = [];
-    for (const item of priceData) {
-        const shopifyVariant = skuToVariantMap.get(item.sku);
-        if (!shopifyVariant) {
+    // Değişiklikler ürün başına productVariantsBulkUpdate alanlarıyla toplu gönderilir
+    const writer = new VariantBatchWriter(shopifyApi);
+    const queued: MirrorEntry[] = [];
+    for (const entry of mirror.entries()) {
+        if (entry.price === null && entry.compareAtPrice === null) continue;
+        if (!mirror.needsPush(entry)) {
+            unchangedCount++;
+            continue;
+        }
+        if (!entry.variantId || !entry.productId || entry.shopifyPrice === undefined) {
             notFoundCount++;
-            logCallback(`SKU bulunamadı: ${item.sku}`, 'warn');
+            logCallback(`SKU bulunamadı: ${entry.sku}`, 'warn');
             continue;
         }
 
-        // Fiyatları normalleştirerek karşılaştır
-        const sheetPrice = item.price ? parseFloat(item.price.replace(',', '.')).toFixed(2) : null;
-        const sheetComparePrice = item.compareAtPrice ? parseFloat(item.compareAtPrice.replace(',', '.')).toFixed(2) : null;
-        const shopifyPrice = parseFloat(shopifyVariant.price).toFixed(2);
-        const shopifyComparePrice = shopifyVariant.compareAtPrice ? parseFloat(shopifyVariant.compareAtPrice).toFixed(2) : null;
-
-        const isPriceChanged = sheetPrice !== null && sheetPrice !== shopifyPrice;
-        const isComparePriceChanged = sheetComparePrice !== shopifyComparePrice;
-
-
-        if (isPriceChanged || isComparePriceChanged) {
-            const variantInput: any = {
-                id: shopifyVariant.id,
-            };
-            if (isPriceChanged) variantInput.price = sheetPrice;
-            if (isComparePriceChanged) variantInput.compareAtPrice = sheetComparePrice;
-
-            mutations.push({
-                mutation: `
-          mutation productVariantUpdate($input: ProductVariantInput!) {
-            productVariantUpdate(input: $input) {
-              productVariant {
-                id
-                price
-                compareAtPrice
-              }
-              userErrors {
-                field
-                message
-              }
-            }
-          }
-        `,
-                variables: { input: variantInput },
-                sku: item.sku // Hata takibi için
-            });
-            updatedCount++;
-        } else {
-            unchangedCount++;
-        }
+        const isPriceChanged = entry.price !== null && entry.price !== entry.shopifyPrice;
+        const isComparePriceChanged = entry.compareAtPrice !== entry.shopifyCompareAtPrice;
+        writer.queuePrice({
+            productId: toGid('Product', entry.productId),
+            variantId: toGid('ProductVariant', entry.variantId),
+            sku: entry.sku,
+            price: isPriceChanged ? (entry.price as string) : undefined,
+            compareAtPrice: isComparePriceChanged ? entry.compareAtPrice : undefined,
+        });
+        queued.push(entry);
     }
 
-    if (mutations.length === 0) {
+    if (queued.length === 0) {
         logCallback("Shopify'da güncellenecek fiyat bulunamadı.", 'info');
         return { updated: 0, notFound: notFoundCount, unchanged: unchangedCount };
     }
 
-    logCallback(`${mutations.length} varyant için fiyat güncelleme isteği gönderiliyor...`, 'info');
+    logCallback(`${queued.length} varyant için fiyat güncelleme isteği gönderiliyor...`, 'info');
 
-    // GraphQL mutasyonlarını toplu olarak gönder
-    for (const m of mutations) {
-        try {
-            const response = await shopifyApi.post('/graphql.json', { query: m.mutation, variables: m.variables });
-            const userErrors = response.data.data?.productVariantUpdate?.userErrors;
-            if (userErrors && userErrors.length > 0) {
-                logCallback(`SKU ${m.sku} güncellenirken hata: ${userErrors.map((e: any) => e.message).join(', ')}`, 'error');
-                updatedCount--; // Başarısız olduğu için sayacı geri al
-            } else {
-                 logCallback(`SKU güncellendi: ${m.sku}`, 'info');
-            }
-        } catch (error: any) {
-            logCallback(`GraphQL isteği sırasında hata (SKU: ${m.sku}): ${error.message}`, 'error');
-            updatedCount--; // Başarısız olduğu için sayacı geri al
+    const batch = await writer.flush();
+    for (const { sku, message } of batch.failed) {
+        logCallback(`SKU ${sku} güncellenirken hata: ${message}`, 'error');
+    }
+    const updated = new Set(batch.updated);
+    for (const entry of queued) {
+        if (updated.has(entry.sku)) {
+            mirror.setShopifyPrices(entry.sku, entry.price ?? entry.shopifyPrice ?? null, entry.compareAtPrice);
         }
     }
+    logCallback(`${batch.updated.length} varyant ${batch.requests} istekte güncellendi.`, 'info');
 
-
-    return { updated: updatedCount, notFound: notFoundCount, unchanged: unchangedCount };
+    return { updated: batch.updated.length, notFound: notFoundCount, unchanged: unchangedCount };
 }
 
 // Ana orkestrasyon fonksiyonu
@@ -188,10 +111,15 @@ export async function runPriceUpdateFromSheet(logCallback: (message: string, lev
     }
 
     const shopifyApi = getShopifyApiClient();
-    const priceData = await getPricesFromSheet(spreadsheetId);
-    logCallback(`${priceData.length} adet fiyat bilgisi okundu. Shopify ile karşılaştırılıyor...`, 'info');
-
-    const result = await updatePricesInShopify(shopifyApi, priceData, logCallback);
+    const mirror = await loadSheetMirror(spreadsheetId);
+    const { read, changed } = await refreshSheetMirror(oAuth2Client, mirror);
+    logCallback(read
+        ? `Google Sheet okundu: ${mirror.size} SKU, ${changed.length} satır değişmiş. Shopify ile karşılaştırılıyor...`
+        : 'Google Sheet son okumadan bu yana değişmemiş, yerel ayna kullanılıyor.', 'info');
+
+    const result = await updatePricesInShopify(shopifyApi, mirror, logCallback);
+    await mirror.save();
     const summary = `Fiyat güncelleme tamamlandı! ${result.updated} varyant güncellendi, ${result.notFound} SKU bulunamadı, ${result.unchanged} varyantta değişiklik yok.`;
     logCallback(summary, 'success');
+    return summary;
 }
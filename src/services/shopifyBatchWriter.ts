@@ -0,0 +1,285 @@
+// Varyant fiyat ve stok değişiklikleri için toplu GraphQL yazma yolu.
+// Fiyatlar ürün başına bir productVariantsBulkUpdate alanıyla, birden çok ürünün alanları
+// takma adlarla (p0:, p1:, ...) tek belgede maliyet bütçesine kadar birleştirilerek gönderilir.
+// Stoklar inventorySetQuantities ile istek başına en fazla 250 kalem olarak yazılır.
+// Hatalar kalem bazında raporlanır; bir kalemin hatası diğerlerini düşürmez.
+// Kısıtlama (HTTP 429 ya da GraphQL THROTTLED) ve 5xx yanıtlarında istek bekleyip tekrar gönderilir:
+// THROTTLED'da eksik puan throttleStatus'taki yenilenme hızıyla, 429'da Retry-After ile beklenir.
+// Python karşılığı: shopify_tools/batch.py (yeniden deneme shopify_tools/client.py'de)
+import { AxiosInstance } from 'axios';
+
+const MAX_QUANTITIES_PER_REQUEST = 250;
+const MAX_RETRIES = 5;
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+export interface PriceChange {
+    productId: string;
+    variantId: string;
+    sku: string;
+    price?: string;
+    // null liste fiyatını siler, undefined dokunmaz
+    compareAtPrice?: string | null;
+}
+
+export interface QuantityChange {
+    inventoryItemId: string;
+    sku: string;
+    quantity: number;
+}
+
+export interface BatchResult {
+    updated: string[];
+    failed: { sku: string; message: string }[];
+    requests: number;
+    // Kısıtlama/5xx nedeniyle tekrar gönderilen istekler
+    retries: number;
+}
+
+interface GraphqlResponse {
+    data: any;
+    // Takma ada (p0, p1, ...) bağlı üst düzey hatalar: sadece o alanın kalemleri başarısız sayılır
+    aliasErrors: Map<string, string>;
+}
+
+const LOCATIONS_QUERY = `query { locations(first: 1) { edges { node { id } } } }`;
+
+const SET_QUANTITIES_MUTATION = `
+mutation setQuantities($input: InventorySetQuantitiesInput!) {
+  inventorySetQuantities(input: $input) {
+    inventoryAdjustmentGroup { reason }
+    userErrors { field message code }
+  }
+}`;
+
+export function buildVariantsBulkDocument(productCount: number): string {
+    const args: string[] = [];
+    const fields: string[] = [];
+    for (let i = 0; i < productCount; i++) {
+        args.push(`$p${i}: ID!, $v${i}: [ProductVariantsBulkInput!]!`);
+        fields.push(
+            `  p${i}: productVariantsBulkUpdate(productId: $p${i}, variants: $v${i}, allowPartialUpdates: true) {\n` +
+            `    productVariants { id }\n` +
+            `    userErrors { field message code }\n` +
+            `  }`
+        );
+    }
+    return `mutation bulkVariants(${args.join(', ')}) {\n${fields.join('\n')}\n}`;
+}
+
+// userErrors.field içindeki kalem sırası: ['variants', '3', 'price'] -> 3
+function errorIndex(error: any, position: number): number | null {
+    const field: string[] = error.field || [];
+    const value = field[position];
+    return value !== undefined && /^\d+$/.test(String(value)) ? Number(value) : null;
+}
+
+export class VariantBatchWriter {
+    private readonly shopifyApi: AxiosInstance;
+    private readonly maxProductsPerRequest: number;
+    private locationId: string | null;
+    private prices = new Map<string, PriceChange[]>();
+    private quantities: QuantityChange[] = [];
+    readonly result: BatchResult = { updated: [], failed: [], requests: 0, retries: 0 };
+
+    constructor(shopifyApi: AxiosInstance, options: { locationId?: string; maxProductsPerRequest?: number } = {}) {
+        this.shopifyApi = shopifyApi;
+        this.locationId = options.locationId || process.env.SHOPIFY_LOCATION_ID || null;
+        // productVariantsBulkUpdate alanı başına ~10 puan; 25 ürün = 250 puanlık istek
+        this.maxProductsPerRequest = options.maxProductsPerRequest || 25;
+    }
+
+    queuePrice(change: PriceChange): void {
+        const changes = this.prices.get(change.productId);
+        if (changes) changes.push(change);
+        else this.prices.set(change.productId, [change]);
+    }
+
+    queueQuantity(change: QuantityChange): void {
+        this.quantities.push(change);
+    }
+
+    // Bir isteği dolduracak kadar değişiklik biriktiyse gönderir
+    async flushIfFull(): Promise<void> {
+        if (this.prices.size >= this.maxProductsPerRequest) await this.flushPrices();
+        if (this.quantities.length >= MAX_QUANTITIES_PER_REQUEST) await this.flushQuantities();
+    }
+
+    async flush(): Promise<BatchResult> {
+        await this.flushPrices();
+        await this.flushQuantities();
+        return this.result;
+    }
+
+    private fail(sku: string, message: string): void {
+        this.result.failed.push({ sku, message });
+    }
+
+    /**
+     * GraphQL isteği; kısıtlanırsa bekleyip tekrar gönderir. path'i bir takma ada işaret eden
+     * hatalar aliasErrors'ta döner, diğer üst düzey hatalar (tüm istek başarısız) fırlatılır.
+     */
+    private async graphql(query: string, variables: Record<string, any> = {}): Promise<GraphqlResponse> {
+        for (let attempt = 0; ; attempt++) {
+            this.result.requests++;
+            let body: any;
+            try {
+                body = (await this.shopifyApi.post('/graphql.json', { query, variables })).data;
+            } catch (error: any) {
+                const status = error.response?.status;
+                if ((status === 429 || status >= 500) && attempt < MAX_RETRIES) {
+                    const retryAfter = Number(error.response.headers?.['retry-after']);
+                    await this.retryAfter(retryAfter > 0 ? retryAfter * 1000 : 1000 * 2 ** attempt);
+                    continue;
+                }
+                throw error;
+            }
+
+            const errors: any[] = body.errors || [];
+            const throttled = errors.some(error => error.extensions?.code === 'THROTTLED');
+            if (throttled && attempt < MAX_RETRIES) {
+                const cost = body.extensions?.cost;
+                const status = cost?.throttleStatus;
+                const missing = status ? (cost.requestedQueryCost || 0) - status.currentlyAvailable : 100;
+                await this.retryAfter(Math.max(500, (missing / (status?.restoreRate || 50)) * 1000));
+                continue;
+            }
+
+            const aliasErrors = new Map<string, string>();
+            const requestErrors: any[] = [];
+            for (const error of errors) {
+                const alias = Array.isArray(error.path) && body.data ? error.path[0] : null;
+                if (alias && error.extensions?.code !== 'THROTTLED') aliasErrors.set(alias, error.message);
+                else requestErrors.push(error);
+            }
+            if (requestErrors.length || !body.data) {
+                throw new Error(`Shopify GraphQL hatası: ${JSON.stringify(requestErrors.length ? requestErrors : errors)}`);
+            }
+            return { data: body.data, aliasErrors };
+        }
+    }
+
+    private async retryAfter(ms: number): Promise<void> {
+        this.result.retries++;
+        await sleep(ms);
+    }
+
+    private async flushPrices(): Promise<void> {
+        const entries = Array.from(this.prices.entries());
+        this.prices.clear();
+        for (let start = 0; start < entries.length; start += this.maxProductsPerRequest) {
+            await this.sendPrices(entries.slice(start, start + this.maxProductsPerRequest));
+        }
+    }
+
+    private async sendPrices(batch: [string, PriceChange[]][]): Promise<void> {
+        const variables: Record<string, any> = {};
+        batch.forEach(([productId, changes], i) => {
+            variables[`p${i}`] = productId;
+            variables[`v${i}`] = changes.map(change => {
+                const input: Record<string, any> = { id: change.variantId };
+                if (change.price !== undefined) input.price = change.price;
+                if (change.compareAtPrice !== undefined) input.compareAtPrice = change.compareAtPrice;
+                return input;
+            });
+        });
+
+        let response: GraphqlResponse;
+        try {
+            response = await this.graphql(buildVariantsBulkDocument(batch.length), variables);
+        } catch (error: any) {
+            batch.forEach(([, changes]) => changes.forEach(change => this.fail(change.sku, error.message)));
+            return;
+        }
+        const { data, aliasErrors } = response;
+
+        batch.forEach(([, changes], i) => {
+            const aliasError = aliasErrors.get(`p${i}`);
+            if (aliasError) {
+                changes.forEach(change => this.fail(change.sku, aliasError));
+                return;
+            }
+            const failed = new Map<number, string>();
+            for (const error of data[`p${i}`]?.userErrors || []) {
+                const index = errorIndex(error, 1);
+                if (index === null) {
+                    // Ürün düzeyinde hata (ör. ürün silinmiş): tüm varyantları başarısız say
+                    changes.forEach((_, n) => failed.set(n, error.message));
+                } else {
+                    failed.set(index, error.message);
+                }
+            }
+            changes.forEach((change, index) => {
+                if (failed.has(index)) this.fail(change.sku, failed.get(index) as string);
+                else this.result.updated.push(change.sku);
+            });
+        });
+    }
+
+    private async flushQuantities(): Promise<void> {
+        if (this.quantities.length === 0) return;
+        const pending = this.quantities;
+        this.quantities = [];
+
+        if (!this.locationId) {
+            // Lokasyon okunamazsa bekleyen kalemler tek tek başarısız sayılır; flush() fırlamaz
+            let edges: any[];
+            try {
+                const { data } = await this.graphql(LOCATIONS_QUERY);
+                edges = data.locations.edges;
+            } catch (error: any) {
+                pending.forEach(change => this.fail(change.sku, `Stok lokasyonu okunamadı: ${error.message}`));
+                return;
+            }
+            if (!edges.length) {
+                pending.forEach(change => this.fail(change.sku, 'Mağazada stok lokasyonu bulunamadı'));
+                return;
+            }
+            this.locationId = edges[0].node.id as string;
+        }
+
+        for (let start = 0; start < pending.length; start += MAX_QUANTITIES_PER_REQUEST) {
+            await this.sendQuantities(pending.slice(start, start + MAX_QUANTITIES_PER_REQUEST), true);
+        }
+    }
+
+    private async sendQuantities(changes: QuantityChange[], retry: boolean): Promise<void> {
+        let data: any;
+        try {
+            ({ data } = await this.graphql(SET_QUANTITIES_MUTATION, {
+                input: {
+                    name: 'available',
+                    reason: 'correction',
+                    ignoreCompareQuantity: true,
+                    quantities: changes.map(change => ({
+                        inventoryItemId: change.inventoryItemId,
+                        locationId: this.locationId,
+                        quantity: change.quantity,
+                    })),
+                },
+            }));
+        } catch (error: any) {
+            changes.forEach(change => this.fail(change.sku, error.message));
+            return;
+        }
+
+        const errors: any[] = data.inventorySetQuantities.userErrors;
+        if (errors.length === 0) {
+            changes.forEach(change => this.result.updated.push(change.sku));
+            return;
+        }
+
+        const failed = new Map<number, string>();
+        for (const error of errors) {
+            const index = errorIndex(error, 2);
+            if (index !== null) failed.set(index, error.message);
+        }
+        if (failed.size === 0 || !retry) {
+            changes.forEach(change => this.fail(change.sku, errors[0].message));
+            return;
+        }
+        // Mutasyon atomik: hatalı kalemleri ayıkla, kalanları bir kez daha gönder
+        failed.forEach((message, index) => this.fail(changes[index].sku, message));
+        const remaining = changes.filter((_, index) => !failed.has(index));
+        if (remaining.length) await this.sendQuantities(remaining, false);
+    }
+}
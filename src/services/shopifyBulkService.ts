@@ -0,0 +1,210 @@
+// Bulk Operations (bulkOperationRunQuery) ile tüm mağazanın tek işte dışa aktarılması.
+// Sayfalı products(first: 50) sorguları yerine tek bir bulk işi başlatılır, bitene kadar
+// currentBulkOperation ile beklenir ve sonuç JSONL dosyası akış olarak satır satır okunur.
+// JSONL'de ürünler ve varyantlar ayrı satırlardır; varyantlar __parentId ile ürüne bağlanır.
+// Python karşılığı: shopify_tools/bulk.py
+import axios, { AxiosInstance } from 'axios';
+import readline from 'readline';
+
+export const BULK_PRODUCTS_QUERY = `
+{
+  products {
+    edges {
+      node {
+        id
+        handle
+        title
+        variants {
+          edges {
+            node {
+              id
+              sku
+              barcode
+              price
+              compareAtPrice
+              inventoryQuantity
+              inventoryItem { id }
+            }
+          }
+        }
+      }
+    }
+  }
+}`;
+
+const RUN_MUTATION = `
+mutation bulkRun($query: String!) {
+  bulkOperationRunQuery(query: $query) {
+    bulkOperation { id status }
+    userErrors { field message }
+  }
+}`;
+
+const CURRENT_OPERATION_QUERY = `
+query {
+  currentBulkOperation { id status errorCode objectCount url partialDataUrl }
+}`;
+
+export interface BulkVariant {
+    id: string;
+    sku: string | null;
+    barcode: string | null;
+    price: string;
+    compareAtPrice: string | null;
+    inventoryQuantity: number | null;
+    inventoryItem?: { id: string } | null;
+}
+
+export interface BulkProduct {
+    id: string;
+    handle: string;
+    title: string;
+    variants: BulkVariant[];
+}
+
+export interface SkuIndexEntry {
+    productId: string;
+    handle: string;
+    variantId: string;
+    inventoryItemId: string | null;
+    price: string;
+    compareAtPrice: string | null;
+    inventoryQuantity: number | null;
+}
+
+export interface StoreSnapshot {
+    products: BulkProduct[];
+    skuIndex: Map<string, SkuIndexEntry>;
+    duplicateSkus: string[];
+    objectCount: number;
+    fetchedAt: number;
+}
+
+interface BulkOperation {
+    id: string;
+    status: string;
+    errorCode: string | null;
+    objectCount: string;
+    url: string | null;
+}
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+async function graphql(shopifyApi: AxiosInstance, query: string, variables: Record<string, any> = {}): Promise<any> {
+    const response = await shopifyApi.post('/graphql.json', { query, variables });
+    if (response.data.errors) {
+        throw new Error(`Shopify GraphQL hatası: ${JSON.stringify(response.data.errors)}`);
+    }
+    return response.data.data;
+}
+
+async function waitForCurrentOperation(shopifyApi: AxiosInstance, deadline: number): Promise<BulkOperation | null> {
+    let interval = 500;
+    while (true) {
+        const data = await graphql(shopifyApi, CURRENT_OPERATION_QUERY);
+        const operation: BulkOperation | null = data.currentBulkOperation;
+        if (!operation || !['CREATED', 'RUNNING', 'CANCELING'].includes(operation.status)) {
+            return operation;
+        }
+        if (Date.now() > deadline) {
+            throw new Error(`Bulk işi zaman aşımına uğradı: ${operation.id}`);
+        }
+        await sleep(interval);
+        interval = Math.min(10000, interval * 1.5);
+    }
+}
+
+/**
+ * Bulk sorguyu başlatır, bitmesini bekler ve sonuç dosyasının URL'ini döndürür.
+ * Mağazada kayıt yoksa Shopify URL vermez, bu durumda null döner.
+ * Başka bir bulk işi sürüyorsa önce onun bitmesi beklenir.
+ */
+export async function runBulkQuery(shopifyApi: AxiosInstance, query: string, timeoutMs = 3600000): Promise<string | null> {
+    const deadline = Date.now() + timeoutMs;
+    while (true) {
+        const data = await graphql(shopifyApi, RUN_MUTATION, { query });
+        const { userErrors } = data.bulkOperationRunQuery;
+        if (!userErrors.length) break;
+        if (!String(userErrors[0].message).includes('already in progress')) {
+            throw new Error(`bulkOperationRunQuery hatası: ${userErrors[0].message}`);
+        }
+        await waitForCurrentOperation(shopifyApi, deadline);
+    }
+
+    const operation = await waitForCurrentOperation(shopifyApi, deadline);
+    if (operation && operation.status !== 'COMPLETED') {
+        throw new Error(`Bulk işi ${operation.status} ile bitti (${operation.errorCode})`);
+    }
+    return operation?.url || null;
+}
+
+/**
+ * JSONL sonuç dosyasını indirirken her satırı parse edip onRecord'a verir.
+ * Dosya imzalı bir depolama URL'idir; Shopify erişim anahtarı gönderilmez.
+ */
+export async function streamBulkJsonl(url: string, onRecord: (record: any) => void): Promise<number> {
+    const response = await axios.get(url, { responseType: 'stream' });
+    const lines = readline.createInterface({ input: response.data, crlfDelay: Infinity });
+    let count = 0;
+    for await (const line of lines) {
+        if (!line.trim()) continue;
+        onRecord(JSON.parse(line));
+        count++;
+    }
+    return count;
+}
+
+/**
+ * Tüm ürün ve varyantları tek bulk işiyle çeker; SKU -> varyant indeksi de kurulur.
+ * Varyant sayısında sınır yoktur (sayfalı sorgudaki variants(first: 10) kesmesi olmaz).
+ */
+export async function exportStoreSnapshot(shopifyApi: AxiosInstance): Promise<StoreSnapshot> {
+    const productsById = new Map<string, BulkProduct>();
+    const skuIndex = new Map<string, SkuIndexEntry>();
+    const duplicateSkus = new Set<string>();
+
+    const url = await runBulkQuery(shopifyApi, BULK_PRODUCTS_QUERY);
+    let objectCount = 0;
+    if (url) {
+        objectCount = await streamBulkJsonl(url, record => {
+            if (!record.__parentId) {
+                productsById.set(record.id, { id: record.id, handle: record.handle, title: record.title, variants: [] });
+                return;
+            }
+            const product = productsById.get(record.__parentId);
+            if (!product) {
+                // Shopify çocukları ebeveynden sonra yazar; tersi bozuk dosya demektir
+                throw new Error(`Bulk JSONL: ${record.id} için ebeveyn ${record.__parentId} bulunamadı`);
+            }
+            const { __parentId, ...variant } = record;
+            product.variants.push(variant);
+
+            if (!variant.sku) return;
+            if (skuIndex.has(variant.sku)) {
+                duplicateSkus.add(variant.sku);
+                return;
+            }
+            skuIndex.set(variant.sku, {
+                productId: product.id,
+                handle: product.handle,
+                variantId: variant.id,
+                inventoryItemId: variant.inventoryItem?.id || null,
+                price: variant.price,
+                compareAtPrice: variant.compareAtPrice,
+                inventoryQuantity: variant.inventoryQuantity,
+            });
+        });
+    }
+
+    if (duplicateSkus.size > 0) {
+        console.warn(`Shopify'da ${duplicateSkus.size} SKU birden fazla varyantta kullanılıyor, ilk eşleşme indekslendi.`);
+    }
+
+    return {
+        products: Array.from(productsById.values()),
+        skuIndex,
+        duplicateSkus: Array.from(duplicateSkus),
+        objectCount,
+        fetchedAt: Date.now(),
+    };
+}
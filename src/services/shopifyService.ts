@@ -1,24 +1,13 @@
 import axios, { AxiosInstance } from 'axios';
 import { Product } from '../types/product.d';
 import dotenv from 'dotenv';
+import { exportStoreSnapshot, StoreSnapshot } from './shopifyBulkService.js';
+import { BatchResult, VariantBatchWriter } from './shopifyBatchWriter.js';
+import { toGid } from '../utils/shopifyIdIndex.js';
+import { instrumentAxios } from '../utils/telemetry.js';
 
 dotenv.config();
 
-// DÜZELTME: GraphQL yanıtı için tipler tanımlandı
-interface PageInfo {
-    hasNextPage: boolean;
-    endCursor: string | null;
-}
-
-interface ShopifyGraphQLResponse {
-    data: {
-        products: {
-            pageInfo: PageInfo;
-            edges: any[];
-        }
-    }
-}
-
 const apiVersion = '2024-07';
 
 export function getShopifyApiClient(): AxiosInstance {
@@ -29,10 +18,11 @@ export function getShopifyApiClient(): AxiosInstance {
         throw new Error("Shopify mağaza URL'si veya API anahtarı .env dosyasında bulunamadı.");
     }
 
-    return axios.create({
+    // Gecikme/hata/bayt ölçümleri aktif senkronizasyon koşusunun telemetrisine yazılır
+    return instrumentAxios(axios.create({
         baseURL: `https://${storeUrl}/admin/api/${apiVersion}`,
         headers: { 'X-Shopify-Access-Token': accessToken, 'Content-Type': 'application/json' },
-    });
+    }));
 }
 
 // YENİ: Rota dosyasının beklediği, mağaza bilgilerini getiren fonksiyon
@@ -53,60 +43,31 @@ export async function getShopifyStoreInfo() {
     }
 }
 
+// Son bulk export; aynı süreçte kısa aralıklarla gelen istekler yeni iş başlatmasın diye saklanır
+let cachedSnapshot: StoreSnapshot | null = null;
+let pendingSnapshot: Promise<StoreSnapshot> | null = null;
+
+/**
+ * Mağazanın tüm ürün/varyantlarını tek bir bulk işiyle çeker (SKU indeksi dahil).
+ * maxAgeMs içinde alınmış bir snapshot varsa yeniden iş başlatılmaz.
+ */
+export async function getStoreSnapshot(maxAgeMs = 5 * 60 * 1000): Promise<StoreSnapshot> {
+    if (cachedSnapshot && Date.now() - cachedSnapshot.fetchedAt < maxAgeMs) {
+        return cachedSnapshot;
+    }
+    if (!pendingSnapshot) {
+        pendingSnapshot = exportStoreSnapshot(getShopifyApiClient())
+            .then(snapshot => (cachedSnapshot = snapshot))
+            .finally(() => { pendingSnapshot = null; });
+    }
+    return pendingSnapshot;
+}
+
 // YENİ: Google Sheets oluşturmak için gereken, tüm ürünleri getiren fonksiyon
+// Bulk export kullanır: sayfalama turu yok ve 10'dan fazla varyantı olan ürünler kesilmez
 export async function fetchAllShopifyProducts(): Promise<any[]> {
-    const shopifyApi = getShopifyApiClient();
-    let allProducts: any[] = [];
-    let nextPageInfo: string | null = null;
-
-    const query = `
-      query getAllProducts($cursor: String) {
-        products(first: 50, after: $cursor) {
-          pageInfo {
-            hasNextPage
-            endCursor
-          }
-          edges {
-            node {
-              id
-              handle
-              title
-              variants(first: 10) {
-                edges {
-                  node {
-                    id
-                    sku
-                    price
-                    compareAtPrice
-                  }
-                }
-              }
-            }
-          }
-        }
-      }`;
-
-    do {
-        const response: { data: ShopifyGraphQLResponse } = await shopifyApi.post('/graphql.json', {
-            query,
-            variables: { cursor: nextPageInfo },
-        });
-
-        const productsData = response.data.data.products;
-
-        const products = productsData.edges.map((edge: any) => ({
-            ...edge.node,
-            variants: edge.node.variants.edges.map((vEdge: any) => vEdge.node)
-        }));
-        
-        allProducts = allProducts.concat(products);
-        
-        const pageInfo: PageInfo = productsData.pageInfo;
-        nextPageInfo = pageInfo.hasNextPage ? pageInfo.endCursor : null;
-
-    } while (nextPageInfo);
-
-    return allProducts;
+    const snapshot = await getStoreSnapshot(0);
+    return snapshot.products;
 }
 
 
@@ -133,21 +94,26 @@ export async function checkShopifyConnection(): Promise<{ success: boolean; mess
     }
 }
 
-export async function findProductByHandle(handle: string): Promise<{ id: string; variants: { id: string, sku: string }[] } | null> {
+export async function findProductByHandle(handle: string): Promise<{ id: string; variants: { id: string, sku: string, inventoryItemId: string | null }[] } | null> {
     const shopifyApi = getShopifyApiClient();
-    const query = `query($handle: String!) { productByHandle(handle: $handle) { id variants(first: 50) { edges { node { id sku } } } } }`;
+    const query = `query($handle: String!) { productByHandle(handle: $handle) { id variants(first: 50) { edges { node { id sku inventoryItem { id } } } } } }`;
     const response = await shopifyApi.post('/graphql.json', { query, variables: { handle } });
     const product = response.data.data.productByHandle;
     if (product) {
         return {
             id: product.id,
-            variants: product.variants.edges.map((e: any) => e.node)
+            variants: product.variants.edges.map((e: any) => ({
+                id: e.node.id,
+                sku: e.node.sku,
+                inventoryItemId: e.node.inventoryItem?.id || null,
+            }))
         };
     }
     return null;
 }
 
-export async function createShopifyProduct(product: Product, logCallback: (message: string, level: 'info' | 'success' | 'warn') => void) {
+// Oluşturulan ürünün REST gösterimini (ID'ler indekse yazılsın diye) döndürür, hata olursa null
+export async function createShopifyProduct(product: Product, logCallback: (message: string, level: 'info' | 'success' | 'warn') => void): Promise<any | null> {
     const shopifyApi = getShopifyApiClient();
     
     // GQL ID'sini REST ID'sine dönüştür
@@ -178,23 +144,38 @@ export async function createShopifyProduct(product: Product, logCallback: (messa
         }
     };
     try {
-        await shopifyApi.post('/products.json', payload);
+        const response = await shopifyApi.post('/products.json', payload);
         logCallback(`-> Ürün '${product.title}' (${product.variants.length} varyant ile) başarıyla oluşturuldu.`, 'success');
+        return response.data.product;
     } catch (error: any) {
         const errorMessages = error.response?.data?.errors ? JSON.stringify(error.response.data.errors) : error.message;
         logCallback(`-> Ürün '${product.title}' oluşturulurken HATA: ${errorMessages}`, 'warn');
+        return null;
     }
 }
 
+export interface UpdateResult {
+    // Ürüne eklenen yeni varyantların REST gösterimi
+    addedVariants: any[];
+    // Shopify ürünü bulamadı (404): yerel indeks bayat
+    notFound: boolean;
+    // Ana ürün PUT isteği başarısız oldu (detay/resim güncellenmedi)
+    productError: boolean;
+}
+
 export async function updateShopifyProduct(
     productId: string, 
-    existingVariants: { id: string, sku: string }[], 
+    existingVariants: { id: string, sku: string, inventoryItemId?: string | null }[], 
     product: Product,
     options: { full: boolean; price: boolean; inventory: boolean; details: boolean; images: boolean },
-    logCallback: (message: string, level: 'info' | 'success' | 'warn') => void
-) {
+    logCallback: (message: string, level: 'info' | 'success' | 'warn') => void,
+    // Paylaşılan yazıcı verilirse fiyat/stok değişiklikleri kuyruğa alınır, gönderim çağırana kalır
+    batchWriter?: VariantBatchWriter
+): Promise<UpdateResult> {
     const shopifyApi = getShopifyApiClient();
+    const writer = batchWriter || new VariantBatchWriter(shopifyApi);
     const productIdNumber = productId.split('/').pop();
+    const result: UpdateResult = { addedVariants: [], notFound: false, productError: false };
 
     const productUpdatePayload: any = { product: { id: productIdNumber } };
     let updatedFields: string[] = [];
@@ -229,40 +210,53 @@ export async function updateShopifyProduct(
         } catch (error: any) {
             const errorMessages = error.response?.data?.errors ? JSON.stringify(error.response.data.errors) : error.message;
             logCallback(`-> Ana ürün güncellenirken HATA: ${errorMessages}`, 'warn');
+            result.productError = true;
+            if (error.response?.status === 404) {
+                result.notFound = true;
+                return result;
+            }
         }
     }
 
-    // Varyantları güncelle
+    // Varyantları güncelle: fiyat ve stok toplu GraphQL mutasyonlarıyla yazılır
+    const variantsBySku = new Map(existingVariants.map(v => [v.sku, v]));
     for (const xmlVariant of product.variants) {
-        const shopifyVariant = existingVariants.find(v => v.sku === xmlVariant.sku);
+        const shopifyVariant = variantsBySku.get(xmlVariant.sku);
         const variantIdNumber = shopifyVariant?.id.split('/').pop();
 
         if (shopifyVariant && variantIdNumber) {
-            const variantPayload: any = {};
-            let variantUpdated = false;
-
             if (options.full || options.price) {
-                variantPayload.price = String(xmlVariant.price);
-                variantUpdated = true;
+                writer.queuePrice({
+                    productId: toGid('Product', productId),
+                    variantId: toGid('ProductVariant', shopifyVariant.id),
+                    sku: xmlVariant.sku,
+                    price: String(xmlVariant.price),
+                });
             }
+            // Sadece stok seçiliyse runSync buraya gelmez (inventorySyncService hızlı yolu)
             if (options.full || options.inventory) {
-                variantPayload.inventory_quantity = xmlVariant.inventory_quantity;
-                variantUpdated = true;
-            }
-
-            if (variantUpdated) {
-                try {
-                    await shopifyApi.put(`/variants/${variantIdNumber}.json`, { variant: { id: variantIdNumber, ...variantPayload } });
-                    logCallback(`  - Varyant güncellendi (SKU: ${xmlVariant.sku})`, 'info');
-                } catch (error: any) {
-                    const errorMessages = error.response?.data?.errors ? JSON.stringify(error.response.data.errors) : error.message;
-                    logCallback(`  - Varyant güncellenirken HATA (SKU: ${xmlVariant.sku}): ${errorMessages}`, 'warn');
+                if (shopifyVariant.inventoryItemId) {
+                    writer.queueQuantity({
+                        inventoryItemId: shopifyVariant.inventoryItemId,
+                        sku: xmlVariant.sku,
+                        quantity: xmlVariant.inventory_quantity,
+                    });
+                } else {
+                    // inventory item ID'si bilinmiyorsa eski REST yoluna düş
+                    try {
+                        await shopifyApi.put(`/variants/${variantIdNumber}.json`, {
+                            variant: { id: variantIdNumber, inventory_quantity: xmlVariant.inventory_quantity }
+                        });
+                    } catch (error: any) {
+                        const errorMessages = error.response?.data?.errors ? JSON.stringify(error.response.data.errors) : error.message;
+                        logCallback(`  - Varyant stoğu güncellenirken HATA (SKU: ${xmlVariant.sku}): ${errorMessages}`, 'warn');
+                    }
                 }
             }
         } else {
             // Shopify'da olmayan yeni varyantı ürüne ekle
             try {
-                await shopifyApi.post(`/products/${productIdNumber}/variants.json`, {
+                const response = await shopifyApi.post(`/products/${productIdNumber}/variants.json`, {
                     variant: {
                         price: String(xmlVariant.price),
                         sku: xmlVariant.sku,
@@ -270,13 +264,37 @@ export async function updateShopifyProduct(
                         option1: xmlVariant.option1,
                     }
                 });
+                result.addedVariants.push(response.data.variant);
                 logCallback(`  + Yeni varyant eklendi (SKU: ${xmlVariant.sku})`, 'success');
             } catch (error: any) {
                 const errorMessages = error.response?.data?.errors ? JSON.stringify(error.response.data.errors) : error.message;
                 logCallback(`  + Yeni varyant eklenirken HATA (SKU: ${xmlVariant.sku}): ${errorMessages}`, 'warn');
+                if (error.response?.status === 404) result.notFound = true;
             }
         }
     }
+
+    if (!batchWriter) {
+        const batch = await writer.flush();
+        logBatchResult(batch, logCallback);
+    }
+    return result;
+}
+
+// Toplu yazma sonucunu özetler; hatalar kalem bazında raporlanır
+export function logBatchResult(
+    batch: BatchResult,
+    logCallback: (message: string, level: 'info' | 'success' | 'warn') => void
+): void {
+    if (batch.updated.length) {
+        logCallback(`  - ${batch.updated.length} varyant fiyat/stok kalemi güncellendi (${batch.requests} istek).`, 'info');
+    }
+    if (batch.retries) {
+        logCallback(`  - Shopify kısıtlaması nedeniyle ${batch.retries} istek beklenip tekrar gönderildi.`, 'info');
+    }
+    for (const { sku, message } of batch.failed) {
+        logCallback(`  - Varyant güncellenirken HATA (SKU: ${sku}): ${message}`, 'warn');
+    }
 }
 
 export async function getShopInfo(): Promise<{ name: string; email: string }> {
@@ -294,22 +312,14 @@ export async function getShopifyProductCount(): Promise<number> {
     return response.data.count;
 }
 
-export async function getShopifyStats(): Promise<{ productCount: number; variantCount: number }> {
-    const shopifyApi = getShopifyApiClient();
-    const productCountResponse = await shopifyApi.get('/products/count.json');
-    const productCount = productCountResponse.data.count;
-
-    let variantCount = 0;
-    if (productCount > 0) {
-        // Not: Bu yöntem büyük mağazalarda yavaş olabilir.
-        // Daha performanslı bir yöntem için GraphQL kullanılabilir.
-        const response = await shopifyApi.get('/products.json?limit=250&fields=variants');
-        response.data.products.forEach((product: any) => {
-            if (product.variants) {
-                variantCount += product.variants.length;
-            }
-        });
-    }
+export async function getShopifyStats(): Promise<{ productCount: number; variantCount: number | null }> {
+    // Ürün sayısı ucuz count çağrısıyla alınır. Bulk export burada başlatılmaz (süresi dakikaları
+    // bulabilir ve mağaza başına tek bulk işi olduğundan çalışan senkronizasyonla çakışır);
+    // varyant sayısı sadece bellekte bir snapshot varsa verilir, yoksa null'dır.
+    const productCount = await getShopifyProductCount();
+    const variantCount = cachedSnapshot
+        ? cachedSnapshot.products.reduce((total, product) => total + product.variants.length, 0)
+        : null;
     return { productCount, variantCount };
 }
 
@@ -1,5 +1,10 @@
 import { getProductsFromXml } from './xmlService.js';
-import { findProductByHandle, createShopifyProduct, updateShopifyProduct } from './shopifyService.js';
+import { findProductByHandle, createShopifyProduct, updateShopifyProduct, getStoreSnapshot, getShopifyApiClient, logBatchResult } from './shopifyService.js';
+import { VariantBatchWriter } from './shopifyBatchWriter.js';
+import { resetInventorySyncState, runInventorySync } from './inventorySyncService.js';
+import { loadShopifyIdIndex, ShopifyIdIndex, IndexedProduct, toGid } from '../utils/shopifyIdIndex.js';
+import { collectImageUrls, loadImageIndex, probeImages } from '../utils/imageIndex.js';
+import { SyncTelemetry, endTelemetry, runWithTelemetry, timeStage } from '../utils/telemetry.js';
 import { updateProductSheetWithNewItems } from './googleSheetsService.js';
 import { Product } from '../types/product.d';
 
@@ -22,18 +27,37 @@ export interface SyncOptions {
 export async function runSync(
     logCallback: (message: string, level: 'info' | 'success' | 'error' | 'warn') => void,
     options: SyncOptions = { full: true, price: false, inventory: false, details: false, images: false }
+): Promise<string> {
+    // Aşama süreleri, Shopify gecikmeleri ve sayaçlar koşu raporuna yazılır (.sync-reports/).
+    // Telemetri bu koşunun async bağlamına bağlanır; eşzamanlı koşuların ölçümleri karışmaz
+    const enabledOptions = Object.entries(options).filter(([, enabled]) => enabled).map(([name]) => name);
+    const telemetry = new SyncTelemetry({ options: enabledOptions.join('+') || 'none' });
+    return runWithTelemetry(telemetry, () => syncProducts(logCallback, options, telemetry));
+}
+
+async function syncProducts(
+    logCallback: (message: string, level: 'info' | 'success' | 'error' | 'warn') => void,
+    options: SyncOptions,
+    telemetry: SyncTelemetry
 ): Promise<string> {
     logCallback('Senkronizasyon başlatıldı...', 'warn');
     const startTime = Date.now();
 
     try {
+        // Sadece stok seçiliyse ürün belgeleri parse edilmez; hızlı yol stokları doğrudan yazar
+        if (options.inventory && !options.full && !options.price && !options.details && !options.images) {
+            const summary = await runInventorySync(logCallback);
+            latestSummary = summary;
+            return summary;
+        }
+
         const productsFromXml: Product[] = await getProductsFromXml(logCallback);
         logCallback(`XML kaynağından ${productsFromXml.length} ana ürün bulundu.`, 'info');
 
         // Google Sheet güncellemesi sadece tam senkronizasyonda mantıklı
         if (options.full) {
             try {
-                await updateProductSheetWithNewItems(productsFromXml, logCallback);
+                await timeStage('sheet', () => updateProductSheetWithNewItems(productsFromXml, logCallback));
             } catch (googleError: any) {
                 logCallback(`Google Sheet güncellenirken bir hata oluştu: ${googleError.message}`, 'error');
             }
@@ -41,28 +65,89 @@ export async function runSync(
 
         let createdCount = 0;
         let updatedCount = 0;
+        let remoteLookups = 0;
 
-        for (const product of productsFromXml) {
-            try {
-                const existingProduct = await findProductByHandle(product.handle);
-                if (existingProduct) {
-                    logCallback(`Ürün bulundu, güncelleniyor: '${product.title}'`, 'info');
-                    // Seçenekleri güncelleme fonksiyonuna iletiyoruz
-                    await updateShopifyProduct(existingProduct.id, existingProduct.variants, product, options, logCallback);
-                    updatedCount++;
-                } else {
-                    logCallback(`Yeni ürün oluşturuluyor: '${product.title}'`, 'info');
-                    // Yeni ürünler her zaman tam olarak oluşturulur
-                    await createShopifyProduct(product, logCallback);
-                    createdCount++;
+        // Handle/SKU -> Shopify ID indeksi: ürün başına findProductByHandle çağrısının yerini alır
+        const idIndex = await timeStage('lookup', () =>
+            loadShopifyIdIndex(process.env.SHOPIFY_STORE_URL || '', () => getStoreSnapshot(0)));
+        logCallback(`Shopify ID indeksi hazır (${idIndex.size} ürün).`, 'info');
+
+        // Resimler feed genelinde tekilleştirilip HEAD ile yoklanır; değişmeyenler tekrar yüklenmez
+        const imageIndex = await loadImageIndex();
+        const syncImages = options.full || options.images;
+        if (syncImages) {
+            const imageUrls = collectImageUrls(productsFromXml);
+            const probe = await timeStage('images', () => probeImages(imageIndex, imageUrls));
+            logCallback(`${imageUrls.length} tekil resim yoklandı: ${probe.changed.length} yeni/değişmiş, ${probe.unchanged} değişmemiş, ${probe.failed.length} hata.`, 'info');
+        }
+        let skippedImageUploads = 0;
+
+        // Fiyat/stok değişiklikleri ürünler arası toplanıp toplu mutasyonlarla gönderilir
+        const batchWriter = new VariantBatchWriter(getShopifyApiClient());
+
+        const createAndIndex = async (product: Product) => {
+            const created = await timeStage('write', () => createShopifyProduct(product, logCallback));
+            if (created) {
+                idIndex.upsertFromRest(created);
+                imageIndex.markUploaded(product.handle, product.images.map(i => i.src));
+            }
+        };
+
+        try {
+            for (const product of productsFromXml) {
+                try {
+                    const existingProduct = await timeStage('lookup', () => findExistingProduct(idIndex, product));
+                    if (existingProduct.remote) remoteLookups++;
+                    if (existingProduct.product) {
+                        const { id, variants } = existingProduct.product;
+                        logCallback(`Ürün bulundu, güncelleniyor: '${product.title}'`, 'info');
+                        const imageUrls = product.images.map(i => i.src);
+                        const imagesChanged = syncImages && imageIndex.needsUpload(product.handle, imageUrls);
+                        if (syncImages && !imagesChanged) skippedImageUploads++;
+                        // Resimler değişmediyse ürün PUT'undan çıkarılır (boş liste gönderilmez)
+                        const productToSend = imagesChanged ? product : { ...product, images: [] };
+                        // Seçenekleri güncelleme fonksiyonuna iletiyoruz
+                        const result = await timeStage('write', () =>
+                            updateShopifyProduct(id, variants, productToSend, options, logCallback, batchWriter));
+                        if (result.notFound) {
+                            // İndeks bayat: ürün Shopify'dan silinmiş, yeniden oluştur
+                            idIndex.remove(id);
+                            logCallback(`'${product.title}' Shopify'da artık yok, yeniden oluşturuluyor.`, 'warn');
+                            await createAndIndex(product);
+                            createdCount++;
+                            continue;
+                        }
+                        idIndex.addVariantsFromRest(id, result.addedVariants);
+                        if (imagesChanged && !result.productError) imageIndex.markUploaded(product.handle, imageUrls);
+                        updatedCount++;
+                        await timeStage('write', () => batchWriter.flushIfFull());
+                    } else {
+                        logCallback(`Yeni ürün oluşturuluyor: '${product.title}'`, 'info');
+                        // Yeni ürünler her zaman tam olarak oluşturulur
+                        await createAndIndex(product);
+                        createdCount++;
+                    }
+                } catch (productError: any) {
+                    logCallback(`'${product.title}' ürünü işlenirken hata: ${productError.message}`, 'error');
                 }
-            } catch (productError: any) {
-                logCallback(`'${product.title}' ürünü işlenirken hata: ${productError.message}`, 'error');
             }
+            const batch = await timeStage('write', () => batchWriter.flush());
+            telemetry.count('variant_writes', batch.updated.length);
+            telemetry.count('variant_write_failures', batch.failed.length);
+            logBatchResult(batch, logCallback);
+            if (options.full || options.inventory) await resetInventorySyncState();
+        } finally {
+            await idIndex.save();
+            await imageIndex.save();
         }
 
+        telemetry.count('products_created', createdCount);
+        telemetry.count('products_updated', updatedCount);
+        telemetry.count('remote_lookups', remoteLookups);
+        telemetry.count('image_uploads_skipped', skippedImageUploads);
+
         const duration = (Date.now() - startTime) / 1000;
-        const summary = `Senkronizasyon tamamlandı! Süre: ${duration.toFixed(2)}s. Oluşturulan: ${createdCount}, Güncellenen: ${updatedCount}.`;
+        const summary = `Senkronizasyon tamamlandı! Süre: ${duration.toFixed(2)}s. Oluşturulan: ${createdCount}, Güncellenen: ${updatedCount}, Uzak arama: ${remoteLookups}, Atlanan resim yüklemesi: ${skippedImageUploads}.`;
         logCallback(summary, 'success');
         
         latestSummary = summary;
@@ -73,6 +158,44 @@ export async function runSync(
         logCallback(summary, 'error');
         
         latestSummary = summary;
+        telemetry.count('failed_runs');
         throw new Error(summary);
+    } finally {
+        endTelemetry(telemetry);
+        try {
+            logCallback(`Koşu raporu: ${await telemetry.write()}`, 'info');
+        } catch (reportError: any) {
+            logCallback(`Koşu raporu yazılamadı: ${reportError.message}`, 'warn');
+        }
+    }
+}
+
+/**
+ * Ürünü önce yerel indekste (handle, stok kodu, barkod) arar. Bulunamazsa oluşturmadan önce
+ * findProductByHandle ile Shopify'a sorulur ve sonuç indekse yazılır: indeks tam bir bulk
+ * snapshot'tan kurulmuş olsa da o andan sonra başka yerden (admin, başka araç) eklenen ürünleri
+ * bilmez, güvenip oluşturmak kopya ürün açar. Arama sadece indekste olmayan ürünler için yapılır.
+ */
+async function findExistingProduct(
+    idIndex: ShopifyIdIndex,
+    product: Product
+): Promise<{ product: IndexedProduct | null; remote: boolean }> {
+    const skus = product.variants.map(v => v.sku);
+    const barcodes = product.variants.map(v => v.barcode || '');
+    const indexed = idIndex.find(product.handle, skus, barcodes);
+    if (indexed) {
+        return { product: indexed, remote: false };
+    }
+
+    const remote = await findProductByHandle(product.handle);
+    if (!remote) {
+        return { product: null, remote: true };
     }
+    const entry: IndexedProduct = {
+        id: remote.id,
+        handle: product.handle,
+        variants: remote.variants.map(v => ({ id: toGid('ProductVariant', v.id), sku: v.sku, barcode: null, inventoryItemId: v.inventoryItemId })),
+    };
+    idIndex.upsert(entry);
+    return { product: entry, remote: true };
 }
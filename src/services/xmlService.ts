@@ -1,18 +1,14 @@
-import axios from 'axios';
-import { parseStringPromise } from 'xml2js';
 import { Product, ProductVariant } from '../types/product.d';
-import slugify from 'slugify';
-import { getShopifyCategoryId } from '../utils/categoryMapper';
-import iconv from 'iconv-lite';
+import { loadTransformCache } from '../utils/transformCache.js';
+import { getFeedSnapshot } from '../utils/feedCache.js';
+import { activeTelemetry } from '../utils/telemetry.js';
 
 // Bu fonksiyonu olduğu gibi bırakıyoruz.
 export async function checkXmlConnection(): Promise<{ success: boolean; message: string }> {
     const url = process.env.XML_FEED_URL;
     if (!url) return { success: false, message: 'XML URL bulunamadı' };
     try {
-        const response = await axios.get(url, { responseType: 'arraybuffer' });
-        const data = iconv.decode(response.data, 'utf-8');
-        await parseStringPromise(data);
+        await getFeedSnapshot(url);
         return { success: true, message: 'Başarılı' };
     } catch (error) {
         console.error('XML Bağlantı Hatası:', error);
@@ -25,20 +21,20 @@ export async function getProductsFromXml(logCallback: (message: string, level: '
     const url = process.env.XML_FEED_URL;
     if (!url) throw new Error("XML URL'i .env dosyasında bulunamadı.");
 
-    logCallback("XML verisi indiriliyor...", 'info');
-    const response = await axios.get(url, { responseType: 'arraybuffer' });
-    const data = iconv.decode(response.data, 'utf-8');
-    
-    logCallback("XML verisi parse ediliyor...", 'info');
-    const parsed = await parseStringPromise(data, { explicitArray: false, trim: true, charkey: 'text' });
+    logCallback("XML verisi alınıyor...", 'info');
+    // İstatistik ve kontrol uçlarıyla paylaşılan parse sonucu (TTL + koşullu indirme)
+    const snapshot = await getFeedSnapshot(url);
+    if (snapshot.source !== 'updated') {
+        logCallback(`XML verisi değişmemiş, önbellekteki parse sonucu kullanılıyor (${snapshot.source}).`, 'info');
+    }
 
-    if (!parsed.Urunler || !parsed.Urunler.Urun) {
+    if (snapshot.products.length === 0) {
         logCallback("XML dosyasında işlenecek ürün bulunamadı.", 'warn');
         return [];
     }
 
     const allProducts: Product[] = [];
-    const xmlProducts = Array.isArray(parsed.Urunler.Urun) ? parsed.Urunler.Urun : [parsed.Urunler.Urun];
+    const xmlProducts = snapshot.products;
 
     const getVal = (node: any): string => (node && typeof node === 'object' ? node.text : node) || '';
 
@@ -50,13 +46,16 @@ export async function getProductsFromXml(logCallback: (message: string, level: '
     };
 
     logCallback(`${xmlProducts.length} ürün işlenmeye başlanıyor...`, 'info');
+    // Kategori ID'leri ve handle'lar girdi metnine göre kalıcı olarak önbelleklenir
+    const transformCache = await loadTransformCache();
+    const transformStart = performance.now();
     for (const p of xmlProducts) {
         const anaUrunAdi = getVal(p.urunismi);
         if (!anaUrunAdi) continue;
 
         const anaMarka = 'Vervegrand';
         const anaKategori = getVal(p.kategori_ismi);
-        const shopifyCategoryId = getShopifyCategoryId(anaKategori);
+        const shopifyCategoryId = transformCache.categoryId(anaKategori);
         const anaAciklama = getVal(p.detayaciklama);
 
         const satisFiyati = parsePrice(getVal(p.satis_fiyati));
@@ -74,6 +73,8 @@ export async function getProductsFromXml(logCallback: (message: string, level: '
 
         const productVariants: ProductVariant[] = [];
         const productImages: { src: string }[] = [];
+        // Aynı resim URL'si rengin tüm varyantlarında tekrar eder: O(1) tekilleştirme
+        const seenImages = new Set<string>();
         const optionValues: string[] = [];
 
         for (const v of varyantlar) {
@@ -97,7 +98,8 @@ export async function getProductsFromXml(logCallback: (message: string, level: '
                 const resimList = Array.isArray(resimler) ? resimler : [resimler];
                 resimList.forEach((r: any) => {
                     const resimUrl = getVal(r);
-                    if (resimUrl && productImages.findIndex(img => img.src === resimUrl) === -1) {
+                    if (resimUrl && !seenImages.has(resimUrl)) {
+                        seenImages.add(resimUrl);
                         productImages.push({ src: resimUrl });
                     }
                 });
@@ -106,14 +108,8 @@ export async function getProductsFromXml(logCallback: (message: string, level: '
 
         if (productVariants.length === 0) continue;
 
-        const handle = slugify(anaUrunAdi, {
-            lower: true,
-            strict: true,
-            remove: /[*+~.()'"!:@]/g
-        }) + '-' + getVal(p.id);
-
         const newProduct: Product = {
-            handle: slugify(anaUrunAdi, { lower: true, strict: true }),
+            handle: transformCache.handle(anaUrunAdi),
             title: anaUrunAdi,
             body_html: anaAciklama,
             vendor: anaMarka,
@@ -126,6 +122,16 @@ export async function getProductsFromXml(logCallback: (message: string, level: '
         };
         allProducts.push(newProduct);
     }
+    activeTelemetry()?.recordStage('transform', performance.now() - transformStart);
+    const unmappedReport = transformCache.unmappedReport();
+    if (unmappedReport) logCallback(unmappedReport, 'warn');
+    activeTelemetry()?.count('unmapped_categories', transformCache.unmapped.size);
+    activeTelemetry()?.count('transform_cache_misses', transformCache.misses);
+    try {
+        await transformCache.save();
+    } catch (error: any) {
+        logCallback(`Dönüşüm önbelleği yazılamadı: ${error.message}`, 'warn');
+    }
     logCallback(`XML'den ${allProducts.length} ürün başarıyla işlendi.`, 'info');
     return allProducts;
 }
@@ -135,23 +141,14 @@ export async function getXmlStats(): Promise<{ success: boolean, url: string | u
     try {
         if (!url) throw new Error("XML URL'i .env dosyasında bulunamadı.");
 
-        const response = await axios.get(url, { responseType: 'arraybuffer' });
-        const data = iconv.decode(response.data, 'utf-8');
-        const parsed = await parseStringPromise(data, { explicitArray: false });
-
-        const products = parsed.Urunler?.Urun ? (Array.isArray(parsed.Urunler.Urun) ? parsed.Urunler.Urun : [parsed.Urunler.Urun]) : [];
-        let variantCount = 0;
-        products.forEach((p: any) => {
-            const variants = p.Varyantlar?.Varyant;
-            if (variants) {
-                variantCount += Array.isArray(variants) ? variants.length : 1;
-            }
-        });
+        // İstatistikler anlık görüntüyle birlikte bir kez hesaplanır
+        const { stats } = await getFeedSnapshot(url);
+        const { productCount, variantCount } = stats;
 
         return { 
             success: true,
             url: url,
-            productCount: products.length, 
+            productCount: productCount, 
             variantCount: variantCount 
         };
     } catch (error: any) {
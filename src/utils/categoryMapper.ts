@@ -31,19 +31,78 @@ const categoryMap: { [key: string]: string } = {
     "KADIN > GİYİM > Kaban": "gid://shopify/ProductCategory/5336",     // Apparel & Accessories > Clothing > Outerwear > Coats & Jackets
 };
 
+// Karşılaştırma anahtarı: Türkçe küçük harf (İ -> i, I -> ı), ardından ASCII'ye katlama ve
+// boşlukların sadeleştirilmesi. "KADIN > GİYİM", "Kadin > giyim " ve "kadın>giyim" aynı anahtarı verir.
+const ASCII_FOLD: { [char: string]: string } = { 'ı': 'i', 'ş': 's', 'ğ': 'g', 'ü': 'u', 'ö': 'o', 'ç': 'c', 'â': 'a', 'î': 'i', 'û': 'u' };
+
+export function normalizeCategorySegment(segment: string): string {
+    return segment
+        .toLocaleLowerCase('tr-TR')
+        .replace(/[ışğüöçâîû]/g, char => ASCII_FOLD[char])
+        .replace(/\s+/g, ' ')
+        .trim();
+}
+
+export function categorySegments(categoryPath: string): string[] {
+    return categoryPath.split('>').map(normalizeCategorySegment).filter(Boolean);
+}
+
+interface TrieNode {
+    id?: number;
+    children: Map<string, TrieNode>;
+}
+
+// categoryMap'ten bir kez kurulan önek ağacı ve son segment (yaprak) dizini
+function buildIndex(): { root: TrieNode; byLeaf: Map<string, number | null> } {
+    const root: TrieNode = { children: new Map() };
+    // Aynı yaprak adı farklı ID'lere gidiyorsa belirsizdir (null) ve kullanılmaz
+    const byLeaf = new Map<string, number | null>();
+    for (const [categoryPath, gid] of Object.entries(categoryMap)) {
+        const id = parseInt(gid.split('/').pop() || '', 10);
+        if (!Number.isFinite(id)) continue;
+        const segments = categorySegments(categoryPath);
+        let node = root;
+        for (const segment of segments) {
+            let child = node.children.get(segment);
+            if (!child) {
+                child = { children: new Map() };
+                node.children.set(segment, child);
+            }
+            node = child;
+        }
+        node.id = id;
+        const leaf = segments[segments.length - 1];
+        if (leaf) byLeaf.set(leaf, byLeaf.has(leaf) && byLeaf.get(leaf) !== id ? null : id);
+    }
+    return { root, byLeaf };
+}
+
+let index: ReturnType<typeof buildIndex> | null = null;
+
+// Eşleme tablosu değişince kalıcı önbellekler geçersiz olsun diye kullanılan özet
+export const CATEGORY_MAP_FINGERPRINT = Object.entries(categoryMap).map(([key, gid]) => `${key}=${gid}`).join('|');
+
 /**
  * Verilen bir kategori yolunu (ör: "KADIN > GİYİM > Elbise") alır
  * ve eşleşen Shopify Product Category ID'sini döndürür.
+ * Yol, normalize edilmiş segmentlerle önek ağacında yürünür ve ID'si olan en derin ata
+ * kazanır ("KADIN > GİYİM > Elbise > Midi" -> Elbise). Hiçbir ata eşleşmezse son segment
+ * tablodaki tek bir yaprakla eşleşiyorsa o kullanılır ("Giyim > Büyük Beden > Pantolon").
  * Eşleşme bulunamazsa undefined döndürür.
  * @param categoryPath - XML'den gelen kategori yolu.
  * @returns Eşleşen Shopify kategori ID'si veya undefined.
  */
 export function getShopifyCategoryId(categoryPath: string): number | undefined {
-    const trimmedPath = categoryPath.trim();
-    const gid = categoryMap[trimmedPath];
-    if (gid) {
-        const id = gid.split('/').pop();
-        return id ? parseInt(id, 10) : undefined;
+    if (!index) index = buildIndex();
+    const segments = categorySegments(categoryPath);
+    let node: TrieNode | undefined = index.root;
+    let match: number | undefined;
+    for (const segment of segments) {
+        node = node.children.get(segment);
+        if (!node) break;
+        if (node.id !== undefined) match = node.id;
     }
-    return undefined;
+    if (match !== undefined) return match;
+    const leaf = segments[segments.length - 1];
+    return (leaf && index.byLeaf.get(leaf)) || undefined;
 }
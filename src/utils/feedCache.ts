@@ -0,0 +1,321 @@
+// XML feed'ini koşullu (ETag / Last-Modified) indiren ve diskte önbellekleyen yardımcı.
+// Önbellek dosyaları Python tarafındaki feed/fetch.py ile aynı düzendedir
+// (<anahtar>.xml.gz + <anahtar>.meta.json), böylece iki taraf aynı kopyayı kullanabilir.
+// Gövdenin sha256'sı değişmediyse parse sonucu da önbellekten döner.
+// getFeedSnapshot parse edilmiş ürün listesini ve önceden hesaplanmış istatistikleri TTL ile
+// paylaşır (<anahtar>.snapshot.json.gz); düzen netlify/lib/feedSnapshot.js ile aynıdır ve
+// analyze_xml.py --snapshot aynı dosyayı okur.
+import axios from 'axios';
+import crypto from 'crypto';
+import fs from 'fs/promises';
+import path from 'path';
+import zlib from 'zlib';
+import { promisify } from 'util';
+import iconv from 'iconv-lite';
+import { parseStringPromise, ParserOptions } from 'xml2js';
+import { addTransferredBytes, countEvent, timeStage } from './telemetry.js';
+
+const gzip = promisify(zlib.gzip);
+const gunzip = promisify(zlib.gunzip);
+
+const cacheDir = path.resolve(process.cwd(), process.env.FEED_CACHE_DIR || '.feed-cache');
+
+interface FeedMeta {
+    url: string;
+    etag: string | null;
+    last_modified: string | null;
+    sha256: string;
+}
+
+export interface FeedBody {
+    url: string;
+    xml: string;
+    sha256: string;
+    // 'not-modified': 304 geldi, indirme yapılmadı
+    // 'unchanged': 200 geldi ama gövde aynı
+    // 'updated': yeni gövde indirildi
+    status: 'not-modified' | 'unchanged' | 'updated';
+}
+
+// Aynı süreç içinde parse edilmiş feed'ler: URL -> o URL'in güncel gövdesi (sha256) ve parser
+// seçeneklerine göre sonuçlar. Bir feed'in gövdesi değişince sadece o feed'in eski sonuçları düşer.
+const parsedCache = new Map<string, { sha256: string; byOptions: Map<string, any> }>();
+
+function cachePath(url: string, suffix: string): string {
+    const key = crypto.createHash('sha1').update(url).digest('hex').slice(0, 16);
+    return path.join(cacheDir, key + suffix);
+}
+
+async function readMeta(url: string): Promise<FeedMeta | null> {
+    try {
+        return JSON.parse(await fs.readFile(cachePath(url, '.meta.json'), 'utf-8'));
+    } catch {
+        return null;
+    }
+}
+
+async function atomicWrite(filePath: string, data: string | Buffer): Promise<void> {
+    await fs.mkdir(cacheDir, { recursive: true });
+    const tmpPath = `${filePath}.${process.pid}.tmp`;
+    await fs.writeFile(tmpPath, data);
+    await fs.rename(tmpPath, filePath);
+}
+
+async function readCachedBody(url: string): Promise<string | null> {
+    try {
+        return iconv.decode(await gunzip(await fs.readFile(cachePath(url, '.xml.gz'))), 'utf-8');
+    } catch {
+        return null;
+    }
+}
+
+/**
+ * Feed'i koşullu olarak indirir. Önbellekte gövde varsa If-None-Match /
+ * If-Modified-Since gönderilir; 304 gelirse diskteki kopya döndürülür.
+ */
+export async function fetchFeedXml(url: string): Promise<FeedBody> {
+    const meta = await readMeta(url);
+    const cachedXml = meta ? await timeStage('decode', () => readCachedBody(url)) : null;
+
+    const headers: Record<string, string> = { 'Accept-Encoding': 'gzip, deflate' };
+    if (meta && cachedXml !== null) {
+        if (meta.etag) headers['If-None-Match'] = meta.etag;
+        if (meta.last_modified) headers['If-Modified-Since'] = meta.last_modified;
+    }
+
+    const response = await timeStage('download', () => axios.get(url, {
+        responseType: 'arraybuffer',
+        headers,
+        validateStatus: status => (status >= 200 && status < 300) || status === 304,
+    }));
+
+    if (response.status === 304 && meta && cachedXml !== null) {
+        countEvent('feed_not_modified');
+        return { url, xml: cachedXml, sha256: meta.sha256, status: 'not-modified' };
+    }
+
+    const body = Buffer.from(response.data);
+    addTransferredBytes(0, body.length);
+    const sha256 = crypto.createHash('sha256').update(body).digest('hex');
+    const unchanged = !!meta && cachedXml !== null && meta.sha256 === sha256;
+
+    if (!unchanged) {
+        await atomicWrite(cachePath(url, '.xml.gz'), await gzip(body));
+    }
+    const newMeta: FeedMeta = {
+        url,
+        etag: (response.headers['etag'] as string) || null,
+        last_modified: (response.headers['last-modified'] as string) || null,
+        sha256,
+    };
+    await atomicWrite(cachePath(url, '.meta.json'), JSON.stringify(newMeta));
+
+    countEvent(unchanged ? 'feed_unchanged' : 'feed_updated');
+    return {
+        url,
+        xml: unchanged && cachedXml !== null ? cachedXml : await timeStage('decode', () => iconv.decode(body, 'utf-8')),
+        sha256,
+        status: unchanged ? 'unchanged' : 'updated',
+    };
+}
+
+/**
+ * Feed gövdesini xml2js ile parse eder. Aynı gövde (sha256) ve aynı seçenekler
+ * için önceki sonuç bellekten, süreç yeniden başladıysa diskten döner.
+ */
+export async function parseFeedXml(feed: FeedBody, options: ParserOptions = {}): Promise<any> {
+    const optionsKey = crypto.createHash('sha1').update(JSON.stringify(options)).digest('hex').slice(0, 8);
+    const cachedEntry = parsedCache.get(feed.url);
+    if (cachedEntry && cachedEntry.sha256 === feed.sha256 && cachedEntry.byOptions.has(optionsKey)) {
+        countEvent('parse_cache_hits');
+        return cachedEntry.byOptions.get(optionsKey);
+    }
+
+    // Her URL + seçenek için diskte tek bir parse sonucu tutulur, gövde değişince üzerine yazılır
+    const parsedPath = cachePath(feed.url, `-${optionsKey}.parsed.json.gz`);
+    let parsed: any = null;
+    try {
+        const cached = JSON.parse((await gunzip(await fs.readFile(parsedPath))).toString('utf-8'));
+        if (cached.sha256 === feed.sha256) parsed = cached.parsed;
+    } catch {
+        parsed = null;
+    }
+    if (parsed === null) {
+        parsed = await timeStage('parse', () => parseStringPromise(feed.xml, options));
+        await atomicWrite(parsedPath, await gzip(JSON.stringify({ sha256: feed.sha256, parsed })));
+    }
+
+    // Bu URL için sadece güncel gövdenin sonuçlarını bellekte tut; diğer feed'lere dokunulmaz
+    let entry = parsedCache.get(feed.url);
+    if (!entry || entry.sha256 !== feed.sha256) {
+        entry = { sha256: feed.sha256, byOptions: new Map() };
+        parsedCache.set(feed.url, entry);
+    }
+    entry.byOptions.set(optionsKey, parsed);
+    return parsed;
+}
+
+export async function getParsedFeed(url: string, options: ParserOptions = {}): Promise<{ feed: FeedBody; parsed: any }> {
+    const feed = await fetchFeedXml(url);
+    const parsed = await parseFeedXml(feed, options);
+    return { feed, parsed };
+}
+
+const SNAPSHOT_VERSION = 1;
+const DEFAULT_SNAPSHOT_TTL_MS = 5 * 60 * 1000;
+
+export interface FeedStats {
+    productCount: number;
+    variantCount: number;
+    totalStock: number;
+    categoryCount: number;
+    topCategories: { name: string; products: number }[];
+    samples: { id: any; name: any; price: any; variants: number }[];
+    sampleProductKeys: string[];
+    productAnalysis: Record<string, any>;
+}
+
+export interface FeedSnapshot {
+    version: number;
+    url: string;
+    sha256: string;
+    etag: string | null;
+    lastModified: string | null;
+    fetchedAt: number;
+    dataLength: number;
+    parsedAt: number;
+    stats: FeedStats;
+    // xml2js { explicitArray: false, trim: true } ile parse edilmiş <Urun> düğümleri (her zaman dizi)
+    products: any[];
+    source?: 'memory' | 'disk' | 'not-modified' | 'unchanged' | 'updated';
+}
+
+const snapshots = new Map<string, FeedSnapshot>();
+const pendingSnapshots = new Map<string, Promise<FeedSnapshot>>();
+
+const asArray = (value: any): any[] => (value === undefined || value === null || value === '' ? [] : Array.isArray(value) ? value : [value]);
+
+export function computeFeedStats(products: any[]): FeedStats {
+    let variantCount = 0;
+    let totalStock = 0;
+    const categories = new Map<string, number>();
+    for (const product of products) {
+        const variants = asArray(product.Varyantlar?.Varyant);
+        // Varyantı olmayan ürün kendisi bir varyant sayılır
+        variantCount += variants.length || 1;
+        for (const variant of variants.length ? variants : [product]) totalStock += parseInt(variant.stok, 10) || 0;
+        const category = product.kategori_ismi || '';
+        categories.set(category, (categories.get(category) || 0) + 1);
+    }
+
+    const sample = products[0] || null;
+    return {
+        productCount: products.length,
+        variantCount,
+        totalStock,
+        categoryCount: categories.size,
+        topCategories: Array.from(categories.entries()).sort((a, b) => b[1] - a[1]).slice(0, 10)
+            .map(([name, count]) => ({ name, products: count })),
+        samples: products.slice(0, 5).map(p => ({
+            id: p.id,
+            name: p.urunismi,
+            price: p.satis_fiyati || p.alis_fiyati,
+            variants: asArray(p.Varyantlar?.Varyant).length || 1,
+        })),
+        sampleProductKeys: sample ? Object.keys(sample) : [],
+        productAnalysis: sample ? {
+            totalFields: Object.keys(sample).length,
+            fieldNames: Object.keys(sample).slice(0, 10),
+            hasId: !!sample.id,
+            hasName: !!sample.urunismi,
+            hasPrice: !!(sample.alis_fiyati || sample.satis_fiyati),
+            hasStock: !!sample.stok,
+            hasCategory: !!sample.kategori_ismi,
+            hasImage: !!sample.resimler,
+            hasVariants: !!sample.Varyantlar,
+            xmlFormat: 'Sentos XML Format',
+            variantStructure: 'Nested Varyantlar/Varyant',
+        } : {},
+    };
+}
+
+async function readSnapshot(url: string): Promise<FeedSnapshot | null> {
+    try {
+        const snapshot: FeedSnapshot = JSON.parse((await gunzip(await fs.readFile(cachePath(url, '.snapshot.json.gz')))).toString('utf-8'));
+        return snapshot.version === SNAPSHOT_VERSION && snapshot.url === url ? snapshot : null;
+    } catch {
+        return null;
+    }
+}
+
+async function loadSnapshot(url: string, previous: FeedSnapshot | null, force: boolean): Promise<FeedSnapshot> {
+    const feed = await fetchFeedXml(url);
+    const meta = await readMeta(url);
+    let snapshot: FeedSnapshot;
+    if (previous && previous.sha256 === feed.sha256 && !force) {
+        snapshot = { ...previous, fetchedAt: Date.now(), source: feed.status === 'not-modified' ? 'not-modified' : 'unchanged' };
+    } else {
+        const parsed = await timeStage('parse', () => parseStringPromise(feed.xml, { explicitArray: false, trim: true }));
+        const products = asArray(parsed?.Urunler?.Urun);
+        snapshot = {
+            version: SNAPSHOT_VERSION,
+            url,
+            sha256: feed.sha256,
+            etag: meta?.etag ?? null,
+            lastModified: meta?.last_modified ?? null,
+            fetchedAt: Date.now(),
+            dataLength: Buffer.byteLength(feed.xml),
+            parsedAt: Date.now(),
+            stats: computeFeedStats(products),
+            products,
+            source: 'updated',
+        };
+    }
+    await atomicWrite(cachePath(url, '.snapshot.json.gz'), await gzip(JSON.stringify(snapshot)));
+    snapshots.set(url, snapshot);
+    return snapshot;
+}
+
+/**
+ * Feed'in parse edilmiş ürün listesi ve önceden hesaplanmış istatistikleri. ttlMs
+ * (FEED_CACHE_TTL_MS, varsayılan 5 dk) içinde alınmış bir görüntü varsa feed'e gidilmez;
+ * sonra koşullu istek atılır ve gövde değişmediyse yeniden parse edilmez.
+ */
+export async function getFeedSnapshot(url: string, options: { ttlMs?: number; force?: boolean } = {}): Promise<FeedSnapshot> {
+    const ttl = options.ttlMs ?? (Number(process.env.FEED_CACHE_TTL_MS) || DEFAULT_SNAPSHOT_TTL_MS);
+    let previous = snapshots.get(url) || null;
+    if (!options.force) {
+        if (previous && Date.now() - previous.fetchedAt < ttl) {
+            countEvent('feed_snapshot_hits');
+            return { ...previous, source: 'memory' };
+        }
+        if (!previous) {
+            previous = await readSnapshot(url);
+            if (previous) {
+                snapshots.set(url, previous);
+                if (Date.now() - previous.fetchedAt < ttl) {
+                    countEvent('feed_snapshot_hits');
+                    return { ...previous, source: 'disk' };
+                }
+            }
+        }
+    }
+    let pending = pendingSnapshots.get(url);
+    if (!pending) {
+        pending = loadSnapshot(url, previous, !!options.force).finally(() => pendingSnapshots.delete(url));
+        pendingSnapshots.set(url, pending);
+    }
+    return pending;
+}
+
+// Önbelleği boşaltır: bellek, anlık görüntü ve parse sonuçları; url verilmezse bilinen tüm feed'ler
+export async function invalidateFeedCache(url?: string): Promise<number> {
+    const urls = url ? [url] : Array.from(snapshots.keys());
+    for (const item of urls) {
+        snapshots.delete(item);
+        await fs.rm(cachePath(item, '.snapshot.json.gz'), { force: true });
+    }
+    if (url) parsedCache.delete(url);
+    else parsedCache.clear();
+    return urls.length;
+}
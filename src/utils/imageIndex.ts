@@ -0,0 +1,184 @@
+// Feed'deki resim URL'leri için kalıcı indeks ve eşzamanlı HEAD yoklayıcısı.
+// Aynı urunres/... adresleri bir rengin tüm varyantlarında tekrar ettiği için URL'ler tüm feed
+// genelinde bir Set ile tekilleştirilir. Her URL'nin ETag / Last-Modified / Content-Length
+// bilgisi sınırlı eşzamanlılıkla HEAD istekleriyle toplanır ve diske yazılır. Ürün başına
+// son yüklenen resimlerin parmak izi tutulur; değişmemiş resimler Shopify'a tekrar gönderilmez.
+// Python karşılığı: feed/images.py
+import axios from 'axios';
+import crypto from 'crypto';
+import fs from 'fs/promises';
+import path from 'path';
+import { Product } from '../types/product.d';
+
+const INDEX_VERSION = 1;
+const indexDir = path.resolve(process.cwd(), process.env.IMAGE_INDEX_DIR || '.image-index');
+
+export interface ImageRecord {
+    etag: string | null;
+    lastModified: string | null;
+    contentLength: number | null;
+    checkedAt: number;
+}
+
+export interface ProbeResult {
+    probed: number;
+    changed: string[];
+    unchanged: number;
+    failed: string[];
+}
+
+interface IndexFile {
+    version: number;
+    images: Record<string, ImageRecord>;
+    // handle -> son yüklenen resim listesinin parmak izi
+    products: Record<string, string>;
+}
+
+// Feed'deki tüm resim URL'lerini ilk görülme sırasıyla, tekrarsız döndürür
+export function collectImageUrls(products: Product[]): string[] {
+    const urls = new Set<string>();
+    for (const product of products) {
+        for (const image of product.images) urls.add(image.src);
+    }
+    return Array.from(urls);
+}
+
+export class ImageIndex {
+    private images = new Map<string, ImageRecord>();
+    private products = new Map<string, string>();
+    private dirty = false;
+    private readonly filePath: string;
+
+    constructor(filePath: string) {
+        this.filePath = filePath;
+    }
+
+    get size(): number {
+        return this.images.size;
+    }
+
+    async load(): Promise<void> {
+        let data: IndexFile;
+        try {
+            data = JSON.parse(await fs.readFile(this.filePath, 'utf-8'));
+        } catch {
+            return;
+        }
+        if (data.version !== INDEX_VERSION) return;
+        this.images = new Map(Object.entries(data.images));
+        this.products = new Map(Object.entries(data.products));
+    }
+
+    async save(): Promise<void> {
+        if (!this.dirty) return;
+        const data: IndexFile = {
+            version: INDEX_VERSION,
+            images: Object.fromEntries(this.images),
+            products: Object.fromEntries(this.products),
+        };
+        await fs.mkdir(path.dirname(this.filePath), { recursive: true });
+        const tmpPath = `${this.filePath}.${process.pid}.tmp`;
+        await fs.writeFile(tmpPath, JSON.stringify(data));
+        await fs.rename(tmpPath, this.filePath);
+        this.dirty = false;
+    }
+
+    get(url: string): ImageRecord | undefined {
+        return this.images.get(url);
+    }
+
+    // Kaydı günceller; içerik sürümü değiştiyse true döner
+    record(url: string, record: ImageRecord): boolean {
+        const previous = this.images.get(url);
+        this.images.set(url, record);
+        this.dirty = true;
+        return !previous || imageVersion(previous) !== imageVersion(record);
+    }
+
+    // Resim listesinin (sıra, URL ve içerik sürümü) parmak izi
+    fingerprint(urls: string[]): string {
+        const hash = crypto.createHash('sha1');
+        for (const url of urls) {
+            const record = this.images.get(url);
+            hash.update(`${url}|${record ? imageVersion(record) : '?'}\n`);
+        }
+        return hash.digest('hex');
+    }
+
+    // Ürünün resimleri son yüklemeden bu yana değiştiyse (ya da hiç yüklenmediyse) true
+    needsUpload(handle: string, urls: string[]): boolean {
+        return this.products.get(handle) !== this.fingerprint(urls);
+    }
+
+    markUploaded(handle: string, urls: string[]): void {
+        this.products.set(handle, this.fingerprint(urls));
+        this.dirty = true;
+    }
+}
+
+function imageVersion(record: ImageRecord): string {
+    return record.etag || record.lastModified || String(record.contentLength ?? '');
+}
+
+export async function loadImageIndex(name = 'images'): Promise<ImageIndex> {
+    const index = new ImageIndex(path.join(indexDir, `${name}.json`));
+    await index.load();
+    return index;
+}
+
+/**
+ * URL'leri en fazla `concurrency` eşzamanlı HEAD isteğiyle yoklar. Bilinen ETag varsa
+ * If-None-Match gönderilir; 304 değişmemiş sayılır. Yoklanamayan URL'lerin eski kaydı
+ * korunur (geçici bir hata tüm resimlerin yeniden yüklenmesine yol açmasın diye).
+ */
+export async function probeImages(
+    index: ImageIndex,
+    urls: string[],
+    options: { concurrency?: number; timeoutMs?: number } = {}
+): Promise<ProbeResult> {
+    const concurrency = options.concurrency || 16;
+    const result: ProbeResult = { probed: 0, changed: [], unchanged: 0, failed: [] };
+    let next = 0;
+
+    const probe = async (url: string) => {
+        const previous = index.get(url);
+        const headers: Record<string, string> = {};
+        if (previous?.etag) headers['If-None-Match'] = previous.etag;
+        try {
+            const response = await axios.head(url, {
+                headers,
+                timeout: options.timeoutMs || 10000,
+                validateStatus: () => true,
+            });
+            result.probed++;
+            if (response.status === 304 && previous) {
+                index.record(url, { ...previous, checkedAt: Date.now() });
+                result.unchanged++;
+                return;
+            }
+            if (response.status >= 400) {
+                result.failed.push(url);
+                return;
+            }
+            const length = response.headers['content-length'];
+            const changed = index.record(url, {
+                etag: response.headers['etag'] || null,
+                lastModified: response.headers['last-modified'] || null,
+                contentLength: length !== undefined ? Number(length) : null,
+                checkedAt: Date.now(),
+            });
+            if (changed) result.changed.push(url);
+            else result.unchanged++;
+        } catch {
+            result.failed.push(url);
+        }
+    };
+
+    const workers = Array.from({ length: Math.min(concurrency, urls.length) }, async () => {
+        while (next < urls.length) {
+            await probe(urls[next++]);
+        }
+    });
+    await Promise.all(workers);
+    return result;
+}
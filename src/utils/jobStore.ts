@@ -0,0 +1,264 @@
+// Arka plan işleri için kalıcı, SQLite tabanlı kuyruk (Node'un yerleşik node:sqlite modülü).
+// Her iş bir satırdır: queued -> running -> done | failed | cancelled. Aynı dedupe anahtarına
+// sahip bekleyen/çalışan bir iş varsa yeni iş eklenmez, mevcut iş döner. Aynı kilit anahtarını
+// (ör. Shopify'a yazan işler) taşıyan işlerden aynı anda sadece biri çalışır. Çalışanlar
+// heartbeat yazar; süreç çökerse yanıt vermeyen işler yeniden kuyruğa alınır.
+import crypto from 'crypto';
+import fs from 'fs';
+import path from 'path';
+import type { DatabaseSync } from 'node:sqlite';
+
+const jobDbPath = path.resolve(process.cwd(), process.env.JOB_DB_PATH || path.join('.jobs', 'jobs.sqlite'));
+// İş başına saklanan son log satırı sayısı
+const MAX_LOG_LINES = 200;
+
+export type JobStatus = 'queued' | 'running' | 'done' | 'failed' | 'cancelled';
+
+export interface JobLogLine {
+    at: number;
+    level: string;
+    message: string;
+}
+
+export interface JobRecord {
+    id: string;
+    type: string;
+    payload: any;
+    status: JobStatus;
+    dedupeKey: string | null;
+    lockKey: string | null;
+    schedule: string | null;
+    attempts: number;
+    maxAttempts: number;
+    runAfter: number;
+    createdAt: number;
+    startedAt: number | null;
+    heartbeatAt: number | null;
+    finishedAt: number | null;
+    worker: string | null;
+    result: any;
+    error: string | null;
+    logs: JobLogLine[];
+}
+
+export interface NewJob {
+    type: string;
+    payload?: any;
+    dedupeKey?: string | null;
+    lockKey?: string | null;
+    schedule?: string | null;
+    maxAttempts?: number;
+    runAfter?: number;
+}
+
+const SCHEMA = `
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    payload TEXT NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL,
+    dedupe_key TEXT,
+    lock_key TEXT,
+    schedule TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 1,
+    run_after INTEGER NOT NULL,
+    created_at INTEGER NOT NULL,
+    started_at INTEGER,
+    heartbeat_at INTEGER,
+    finished_at INTEGER,
+    worker TEXT,
+    result TEXT,
+    error TEXT,
+    logs TEXT NOT NULL DEFAULT '[]'
+);
+CREATE UNIQUE INDEX IF NOT EXISTS jobs_active_dedupe ON jobs (dedupe_key)
+    WHERE dedupe_key IS NOT NULL AND status IN ('queued', 'running');
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, run_after, created_at);
+CREATE INDEX IF NOT EXISTS jobs_schedule ON jobs (schedule, created_at);
+`;
+
+function toRecord(row: any): JobRecord {
+    return {
+        id: row.id,
+        type: row.type,
+        payload: JSON.parse(row.payload),
+        status: row.status,
+        dedupeKey: row.dedupe_key,
+        lockKey: row.lock_key,
+        schedule: row.schedule,
+        attempts: row.attempts,
+        maxAttempts: row.max_attempts,
+        runAfter: row.run_after,
+        createdAt: row.created_at,
+        startedAt: row.started_at,
+        heartbeatAt: row.heartbeat_at,
+        finishedAt: row.finished_at,
+        worker: row.worker,
+        result: row.result === null ? null : JSON.parse(row.result),
+        error: row.error,
+        logs: JSON.parse(row.logs),
+    };
+}
+
+export class JobStore {
+    private readonly db: DatabaseSync;
+
+    constructor(db: DatabaseSync) {
+        this.db = db;
+        this.db.exec('PRAGMA journal_mode = WAL; PRAGMA busy_timeout = 5000;');
+        this.db.exec(SCHEMA);
+    }
+
+    private transaction<T>(fn: () => T): T {
+        this.db.exec('BEGIN IMMEDIATE');
+        try {
+            const value = fn();
+            this.db.exec('COMMIT');
+            return value;
+        } catch (error) {
+            this.db.exec('ROLLBACK');
+            throw error;
+        }
+    }
+
+    /** İşi kuyruğa ekler; aynı dedupe anahtarıyla bekleyen/çalışan iş varsa onu döndürür. */
+    enqueue(job: NewJob, now = Date.now()): { job: JobRecord; duplicate: boolean } {
+        return this.transaction(() => {
+            if (job.dedupeKey) {
+                const existing = this.db.prepare(
+                    `SELECT * FROM jobs WHERE dedupe_key = ? AND status IN ('queued', 'running')`
+                ).get(job.dedupeKey);
+                if (existing) return { job: toRecord(existing), duplicate: true };
+            }
+            const id = crypto.randomBytes(8).toString('hex');
+            this.db.prepare(
+                `INSERT INTO jobs (id, type, payload, status, dedupe_key, lock_key, schedule, max_attempts, run_after, created_at)
+                 VALUES (?, ?, ?, 'queued', ?, ?, ?, ?, ?, ?)`
+            ).run(id, job.type, JSON.stringify(job.payload ?? {}), job.dedupeKey ?? null, job.lockKey ?? null,
+                job.schedule ?? null, job.maxAttempts ?? 1, job.runAfter ?? now, now);
+            return { job: this.get(id) as JobRecord, duplicate: false };
+        });
+    }
+
+    /**
+     * Sıradaki çalıştırılabilir işi atomik olarak alır: zamanı gelmiş, kilidi başka bir
+     * çalışan işte tutulmayan en eski iş. Yoksa null.
+     */
+    claim(worker: string, now = Date.now()): JobRecord | null {
+        const row = this.db.prepare(
+            `UPDATE jobs SET status = 'running', attempts = attempts + 1, started_at = ?, heartbeat_at = ?,
+                 worker = ?, error = NULL
+             WHERE id = (
+                 SELECT id FROM jobs
+                 WHERE status = 'queued' AND run_after <= ?
+                   AND (lock_key IS NULL OR lock_key NOT IN (
+                       SELECT lock_key FROM jobs WHERE status = 'running' AND lock_key IS NOT NULL))
+                 ORDER BY run_after, created_at
+                 LIMIT 1)
+             RETURNING *`
+        ).get(now, now, worker, now);
+        return row ? toRecord(row) : null;
+    }
+
+    // Çalışan işin canlı olduğunu bildirir ve biriken log satırlarını ekler
+    heartbeat(id: string, lines: JobLogLine[] = [], now = Date.now()): void {
+        this.transaction(() => {
+            const row: any = this.db.prepare(`SELECT logs FROM jobs WHERE id = ?`).get(id);
+            if (!row) return;
+            const logs = lines.length ? JSON.parse(row.logs).concat(lines).slice(-MAX_LOG_LINES) : null;
+            this.db.prepare(`UPDATE jobs SET heartbeat_at = ?, logs = COALESCE(?, logs) WHERE id = ?`)
+                .run(now, logs ? JSON.stringify(logs) : null, id);
+        });
+    }
+
+    complete(id: string, result: any, now = Date.now()): void {
+        this.db.prepare(`UPDATE jobs SET status = 'done', finished_at = ?, result = ? WHERE id = ? AND status = 'running'`)
+            .run(now, JSON.stringify(result ?? null), id);
+    }
+
+    /** Deneme hakkı kaldıysa işi retryDelayMs sonra yeniden kuyruğa alır, yoksa başarısız sayar. */
+    fail(id: string, error: string, retryDelayMs = 60_000, now = Date.now()): void {
+        this.db.prepare(
+            `UPDATE jobs SET
+                 status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END,
+                 run_after = CASE WHEN attempts < max_attempts THEN ? ELSE run_after END,
+                 finished_at = CASE WHEN attempts < max_attempts THEN NULL ELSE ? END,
+                 error = ?
+             WHERE id = ? AND status = 'running'`
+        ).run(now + retryDelayMs, now, error, id);
+    }
+
+    // Sadece henüz başlamamış işler iptal edilebilir
+    cancel(id: string, now = Date.now()): boolean {
+        const result = this.db.prepare(
+            `UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status = 'queued'`
+        ).run(now, id);
+        return Number(result.changes) > 0;
+    }
+
+    /** staleMs boyunca heartbeat yazmamış çalışan işleri (çöken süreç) başarısız sayar / yeniden kuyruğa alır. */
+    recoverStale(staleMs: number, now = Date.now()): number {
+        const stale = this.db.prepare(
+            `SELECT id FROM jobs WHERE status = 'running' AND heartbeat_at < ?`
+        ).all(now - staleMs) as any[];
+        for (const row of stale) this.fail(row.id, 'Çalışan yanıt vermedi (süreç yeniden başlatılmış olabilir)', 0, now);
+        return stale.length;
+    }
+
+    get(id: string): JobRecord | null {
+        const row = this.db.prepare(`SELECT * FROM jobs WHERE id = ?`).get(id);
+        return row ? toRecord(row) : null;
+    }
+
+    list(filter: { status?: string; type?: string; limit?: number } = {}): JobRecord[] {
+        const rows = this.db.prepare(
+            `SELECT * FROM jobs
+             WHERE (?1 IS NULL OR status = ?1) AND (?2 IS NULL OR type = ?2)
+             ORDER BY created_at DESC LIMIT ?3`
+        ).all(filter.status ?? null, filter.type ?? null, filter.limit ?? 50);
+        return rows.map(toRecord);
+    }
+
+    // Bu türün en son başarıyla biten işi (ör. önbelleklenmiş XML istatistikleri)
+    lastDone(type: string): JobRecord | null {
+        const row = this.db.prepare(
+            `SELECT * FROM jobs WHERE type = ? AND status = 'done' ORDER BY finished_at DESC LIMIT 1`
+        ).get(type);
+        return row ? toRecord(row) : null;
+    }
+
+    // Zamanlayıcının bu girdi için en son iş eklediği an
+    lastScheduledAt(schedule: string): number | null {
+        const row: any = this.db.prepare(`SELECT MAX(created_at) AS at FROM jobs WHERE schedule = ?`).get(schedule);
+        return row?.at ?? null;
+    }
+
+    // Biten işlerden retentionMs'ten eski olanları siler
+    prune(retentionMs: number, now = Date.now()): number {
+        const result = this.db.prepare(
+            `DELETE FROM jobs WHERE status IN ('done', 'failed', 'cancelled') AND finished_at < ?`
+        ).run(now - retentionMs);
+        return Number(result.changes);
+    }
+
+    close(): void {
+        this.db.close();
+    }
+}
+
+/**
+ * Kuyruk veritabanını açar (JOB_DB_PATH, varsayılan: .jobs/jobs.sqlite). node:sqlite
+ * bayraksız Node 22.13+ ister (22.5-22.12'de --experimental-sqlite gerekir); daha eski
+ * sürümlerde hata fırlatılır ve çağıran eski davranışa düşer.
+ */
+export async function openJobStore(filePath = jobDbPath): Promise<JobStore> {
+    let sqlite: typeof import('node:sqlite');
+    try {
+        sqlite = await import('node:sqlite');
+    } catch {
+        throw new Error(`İş kuyruğu için node:sqlite gerekli (Node 22.13+), mevcut sürüm: ${process.version}`);
+    }
+    if (filePath !== ':memory:') fs.mkdirSync(path.dirname(filePath), { recursive: true });
+    return new JobStore(new sqlite.DatabaseSync(filePath));
+}
@@ -0,0 +1,209 @@
+// Google Sheet fiyat listesinin yerel aynası: SKU -> satır numarası, ürün/varyant ID'leri, sayfadaki
+// fiyat ve liste fiyatı, Shopify'a en son yazılan (ya da Shopify'da görülen) fiyatlar ve satırın
+// görüldüğü sayfa sürümü. Sayfa, Drive dosya sürümü değişmedikçe yeniden okunmaz; fiyat
+// senkronizasyonu da sadece sayfadaki değeri Shopify'daki bilinen değerden farklı satırları gönderir.
+import fs from 'fs/promises';
+import path from 'path';
+
+const MIRROR_VERSION = 1;
+const mirrorDir = path.resolve(process.cwd(), process.env.SHEET_MIRROR_DIR || '.sheet-mirror');
+
+// Sayfa düzeni (createProductSheet): A ürün ID, B handle, C başlık, D varyant ID, E SKU,
+// F maliyet, G satış fiyatı, H liste fiyatı. Veri 2. satırdan başlar.
+export const SHEET_NAME = 'Sayfa1';
+export const FIRST_DATA_ROW = 2;
+
+export interface SheetRow {
+    row: number;
+    productId: string;
+    handle: string;
+    title: string;
+    variantId: string;
+    sku: string;
+    price: string | null;
+    compareAtPrice: string | null;
+}
+
+export interface MirrorEntry extends SheetRow {
+    // Shopify'daki bilinen fiyatlar; undefined ise bilinmiyor (ilk okuma ya da eski kayıt)
+    shopifyPrice?: string | null;
+    shopifyCompareAtPrice?: string | null;
+    // Satırın en son değiştiği görülen sayfa sürümü
+    seenRevision: string | null;
+}
+
+interface MirrorFile {
+    version: number;
+    spreadsheetId: string;
+    revision: string | null;
+    reconciledAt: number | null;
+    rows: MirrorEntry[];
+}
+
+// "1.234,50" / "1234.5" / "" -> "1234.50" / null
+export function normalizePrice(value: any): string | null {
+    if (value === undefined || value === null || String(value).trim() === '') return null;
+    let text = String(value).trim();
+    if (text.includes(',')) text = text.replace(/\./g, '').replace(',', '.');
+    const number = parseFloat(text);
+    return Number.isFinite(number) ? number.toFixed(2) : null;
+}
+
+export function rowFromValues(values: any[], row: number): SheetRow {
+    const cell = (i: number) => (values[i] === undefined || values[i] === null ? '' : String(values[i]).trim());
+    return {
+        row,
+        productId: cell(0),
+        handle: cell(1),
+        title: cell(2),
+        variantId: cell(3),
+        sku: cell(4),
+        price: normalizePrice(values[6]),
+        compareAtPrice: normalizePrice(values[7]),
+    };
+}
+
+export class SheetMirror {
+    private bySku = new Map<string, MirrorEntry>();
+    private dirty = false;
+    private readonly filePath: string;
+    readonly spreadsheetId: string;
+    revision: string | null = null;
+    // Shopify fiyatlarının bulk snapshot ile son doğrulandığı zaman
+    reconciledAt: number | null = null;
+
+    constructor(filePath: string, spreadsheetId: string) {
+        this.filePath = filePath;
+        this.spreadsheetId = spreadsheetId;
+    }
+
+    get size(): number {
+        return this.bySku.size;
+    }
+
+    get lastRow(): number {
+        let last = FIRST_DATA_ROW - 1;
+        for (const entry of this.bySku.values()) last = Math.max(last, entry.row);
+        return last;
+    }
+
+    async load(): Promise<void> {
+        let data: MirrorFile;
+        try {
+            data = JSON.parse(await fs.readFile(this.filePath, 'utf-8'));
+        } catch {
+            return;
+        }
+        if (data.version !== MIRROR_VERSION || data.spreadsheetId !== this.spreadsheetId) return;
+        this.revision = data.revision;
+        this.reconciledAt = data.reconciledAt;
+        this.bySku = new Map(data.rows.map(entry => [entry.sku, entry]));
+    }
+
+    async save(): Promise<void> {
+        if (!this.dirty) return;
+        const data: MirrorFile = {
+            version: MIRROR_VERSION,
+            spreadsheetId: this.spreadsheetId,
+            revision: this.revision,
+            reconciledAt: this.reconciledAt,
+            rows: Array.from(this.bySku.values()),
+        };
+        await fs.mkdir(path.dirname(this.filePath), { recursive: true });
+        const tmpPath = `${this.filePath}.${process.pid}.tmp`;
+        await fs.writeFile(tmpPath, JSON.stringify(data));
+        await fs.rename(tmpPath, this.filePath);
+        this.dirty = false;
+    }
+
+    get(sku: string): MirrorEntry | undefined {
+        return this.bySku.get(sku);
+    }
+
+    entries(): IterableIterator<MirrorEntry> {
+        return this.bySku.values();
+    }
+
+    setRevision(revision: string | null): void {
+        this.revision = revision;
+        this.dirty = true;
+    }
+
+    /**
+     * Sayfanın tam okumasını aynaya uygular; satır numaraları yeniden kurulur, sayfadan silinen
+     * SKU'lar düşer. İçeriği (ID, başlık ya da fiyat) değişen SKU'ları döndürür.
+     */
+    applyRows(rows: SheetRow[], revision: string | null): string[] {
+        const changed: string[] = [];
+        const next = new Map<string, MirrorEntry>();
+        for (const row of rows) {
+            if (!row.sku || next.has(row.sku)) continue;
+            const previous = this.bySku.get(row.sku);
+            // Sayfada boş kalan ID'ler bulk snapshot'tan öğrenilmiş olabilir; onları koru
+            const merged: SheetRow = {
+                ...row,
+                productId: row.productId || previous?.productId || '',
+                variantId: row.variantId || previous?.variantId || '',
+            };
+            const same = previous
+                && previous.productId === merged.productId && previous.variantId === merged.variantId
+                && previous.handle === merged.handle && previous.title === merged.title
+                && previous.price === merged.price && previous.compareAtPrice === merged.compareAtPrice;
+            if (!same) changed.push(row.sku);
+            next.set(row.sku, {
+                ...previous,
+                ...merged,
+                seenRevision: same ? previous!.seenRevision : revision,
+            });
+        }
+        this.bySku = next;
+        this.revision = revision;
+        this.dirty = true;
+        return changed;
+    }
+
+    // Bu süreç tarafından sayfaya yazılan satırı (ekleme ya da hücre güncellemesi) aynaya işler
+    upsert(row: SheetRow, shopify?: { price: string | null; compareAtPrice: string | null }): void {
+        const previous = this.bySku.get(row.sku);
+        this.bySku.set(row.sku, {
+            ...previous,
+            ...row,
+            ...(shopify ? { shopifyPrice: shopify.price, shopifyCompareAtPrice: shopify.compareAtPrice } : {}),
+            seenRevision: this.revision,
+        });
+        this.dirty = true;
+    }
+
+    // ids verilirse (bulk snapshot'tan) sayfada boş kalmış ürün/varyant ID'leri de aynaya yazılır
+    setShopifyPrices(sku: string, price: string | null, compareAtPrice: string | null,
+                     ids?: { productId: string; variantId: string }): void {
+        const entry = this.bySku.get(sku);
+        if (!entry) return;
+        if (ids) {
+            entry.productId = ids.productId;
+            entry.variantId = ids.variantId;
+        }
+        entry.shopifyPrice = price;
+        entry.shopifyCompareAtPrice = compareAtPrice;
+        this.dirty = true;
+    }
+
+    markReconciled(at = Date.now()): void {
+        this.reconciledAt = at;
+        this.dirty = true;
+    }
+
+    // Sayfadaki fiyat Shopify'daki bilinen fiyattan farklı (ya da Shopify fiyatı bilinmiyor) mu?
+    needsPush(entry: MirrorEntry): boolean {
+        if (entry.price === null && entry.compareAtPrice === null) return false;
+        if (entry.shopifyPrice === undefined || entry.shopifyCompareAtPrice === undefined) return true;
+        return (entry.price !== null && entry.price !== entry.shopifyPrice)
+            || entry.compareAtPrice !== entry.shopifyCompareAtPrice;
+    }
+}
+
+export async function loadSheetMirror(spreadsheetId: string): Promise<SheetMirror> {
+    const mirror = new SheetMirror(path.join(mirrorDir, `${spreadsheetId}.json`), spreadsheetId);
+    await mirror.load();
+    return mirror;
+}
@@ -0,0 +1,222 @@
+// Handle / SKU / barkod -> Shopify ürün, varyant ve inventory item ID'lerini tutan kalıcı indeks.
+// Bir kez bulk export ile doldurulur, senkronizasyon sırasında oluşturma/güncelleme yanıtlarıyla
+// güncellenir ve diske yazılır. runSync her ürün için findProductByHandle çağırmak yerine önce
+// buraya bakar; uzak arama sadece indekste bulunamayan (yeni ya da indeksten sonra eklenmiş) ürünler
+// için yapılır.
+import crypto from 'crypto';
+import fs from 'fs/promises';
+import path from 'path';
+import { StoreSnapshot } from '../services/shopifyBulkService.js';
+
+const INDEX_VERSION = 1;
+const indexDir = path.resolve(process.cwd(), process.env.SHOPIFY_INDEX_DIR || '.shopify-index');
+
+export interface IndexedVariant {
+    id: string;
+    sku: string;
+    barcode: string | null;
+    inventoryItemId: string | null;
+}
+
+export interface IndexedProduct {
+    id: string;
+    handle: string;
+    variants: IndexedVariant[];
+}
+
+interface IndexFile {
+    version: number;
+    store: string;
+    // Son bulk doldurma zamanı; null ise indeks sadece kısmi bilgiye sahip
+    filledAt: number | null;
+    products: IndexedProduct[];
+}
+
+// REST yanıtlarındaki sayısal ID'leri GraphQL GID biçimine çevirir
+export function toGid(type: string, id: string | number): string {
+    const value = String(id);
+    return value.startsWith('gid://') ? value : `gid://shopify/${type}/${value}`;
+}
+
+export class ShopifyIdIndex {
+    private byId = new Map<string, IndexedProduct>();
+    private byHandle = new Map<string, IndexedProduct>();
+    private bySku = new Map<string, IndexedProduct>();
+    private byBarcode = new Map<string, IndexedProduct>();
+    private dirty = false;
+    private readonly filePath: string;
+    private readonly store: string;
+    filledAt: number | null = null;
+
+    constructor(filePath: string, store: string) {
+        this.filePath = filePath;
+        this.store = store;
+    }
+
+    get size(): number {
+        return this.byId.size;
+    }
+
+    // Tam bir bulk snapshot'tan kuruldu mu (filledAt anındaki mağazayı kapsar; sonradan
+    // başka yerden eklenen ürünler indekste olmayabilir)
+    get isComplete(): boolean {
+        return this.filledAt !== null;
+    }
+
+    async load(): Promise<void> {
+        let data: IndexFile;
+        try {
+            data = JSON.parse(await fs.readFile(this.filePath, 'utf-8'));
+        } catch {
+            return;
+        }
+        if (data.version !== INDEX_VERSION || data.store !== this.store) return;
+        this.filledAt = data.filledAt;
+        for (const product of data.products) this.upsert(product);
+        this.dirty = false;
+    }
+
+    async save(): Promise<void> {
+        if (!this.dirty) return;
+        const data: IndexFile = {
+            version: INDEX_VERSION,
+            store: this.store,
+            filledAt: this.filledAt,
+            products: Array.from(this.byId.values()),
+        };
+        await fs.mkdir(path.dirname(this.filePath), { recursive: true });
+        const tmpPath = `${this.filePath}.${process.pid}.tmp`;
+        await fs.writeFile(tmpPath, JSON.stringify(data));
+        await fs.rename(tmpPath, this.filePath);
+        this.dirty = false;
+    }
+
+    // Bulk export sonucuyla indeksi baştan kurar
+    fillFromSnapshot(snapshot: StoreSnapshot): void {
+        this.byId.clear();
+        this.byHandle.clear();
+        this.bySku.clear();
+        this.byBarcode.clear();
+        for (const product of snapshot.products) {
+            this.upsert({
+                id: product.id,
+                handle: product.handle,
+                variants: product.variants.map(v => ({
+                    id: v.id,
+                    sku: v.sku || '',
+                    barcode: v.barcode || null,
+                    inventoryItemId: v.inventoryItem?.id || null,
+                })),
+            });
+        }
+        this.filledAt = snapshot.fetchedAt;
+        this.dirty = true;
+    }
+
+    upsert(product: IndexedProduct): void {
+        // Aynı ürünün eski kaydı (handle değişmiş olabilir) ve aynı handle'ı kullanan kayıt silinir
+        for (const previous of [this.byId.get(product.id), this.byHandle.get(product.handle)]) {
+            if (previous) this.unlink(previous);
+        }
+        this.byId.set(product.id, product);
+        this.byHandle.set(product.handle, product);
+        for (const variant of product.variants) {
+            if (variant.sku && !this.bySku.has(variant.sku)) this.bySku.set(variant.sku, product);
+            if (variant.barcode && !this.byBarcode.has(variant.barcode)) this.byBarcode.set(variant.barcode, product);
+        }
+        this.dirty = true;
+    }
+
+    // REST products.json / variants.json yanıtından indeksi günceller
+    upsertFromRest(restProduct: any): IndexedProduct {
+        const product: IndexedProduct = {
+            id: toGid('Product', restProduct.id),
+            handle: restProduct.handle,
+            variants: (restProduct.variants || []).map((v: any) => this.variantFromRest(v)),
+        };
+        this.upsert(product);
+        return product;
+    }
+
+    addVariantsFromRest(productId: string, restVariants: any[]): void {
+        const product = this.byId.get(productId);
+        if (!product || restVariants.length === 0) return;
+        this.upsert({ ...product, variants: [...product.variants, ...restVariants.map(v => this.variantFromRest(v))] });
+    }
+
+    remove(productId: string): void {
+        const product = this.byId.get(productId);
+        if (!product) return;
+        this.unlink(product);
+        this.dirty = true;
+    }
+
+    /**
+     * Önce handle'a, bulunamazsa varyantların stok kodu ve barkoduna göre ürünü arar.
+     * Handle değişmiş ama SKU'su aynı kalmış ürünler de böylece eşleşir.
+     */
+    find(handle: string, skus: string[] = [], barcodes: string[] = []): IndexedProduct | null {
+        const byHandle = this.byHandle.get(handle);
+        if (byHandle) return byHandle;
+        for (const sku of skus) {
+            const product = sku && this.bySku.get(sku);
+            if (product) return product;
+        }
+        for (const barcode of barcodes) {
+            const product = barcode && this.byBarcode.get(barcode);
+            if (product) return product;
+        }
+        return null;
+    }
+
+    // Stok kodu, bulunamazsa barkoda göre tek bir varyantı döndürür (stok senkronizasyonu)
+    findVariant(sku: string, barcode = ''): IndexedVariant | null {
+        const bySku = sku ? this.bySku.get(sku) : undefined;
+        const variant = bySku?.variants.find(v => v.sku === sku);
+        if (variant) return variant;
+        const byBarcode = barcode ? this.byBarcode.get(barcode) : undefined;
+        return byBarcode?.variants.find(v => v.barcode === barcode) || null;
+    }
+
+    private variantFromRest(variant: any): IndexedVariant {
+        return {
+            id: toGid('ProductVariant', variant.id),
+            sku: variant.sku || '',
+            barcode: variant.barcode || null,
+            inventoryItemId: variant.inventory_item_id ? toGid('InventoryItem', variant.inventory_item_id) : null,
+        };
+    }
+
+    private unlink(product: IndexedProduct): void {
+        this.byId.delete(product.id);
+        if (this.byHandle.get(product.handle) === product) this.byHandle.delete(product.handle);
+        for (const variant of product.variants) {
+            if (variant.sku && this.bySku.get(variant.sku) === product) this.bySku.delete(variant.sku);
+            if (variant.barcode && this.byBarcode.get(variant.barcode) === product) this.byBarcode.delete(variant.barcode);
+        }
+    }
+}
+
+/**
+ * Mağaza için indeksi diskten yükler. Hiç doldurulmamışsa ya da maxAgeMs'ten eskiyse
+ * fill ile (tek bir bulk export) yeniden doldurur. Doldurma başarısız olursa eldeki
+ * kısmi indeks döner.
+ */
+export async function loadShopifyIdIndex(
+    store: string,
+    fill: () => Promise<StoreSnapshot>,
+    maxAgeMs = 24 * 60 * 60 * 1000
+): Promise<ShopifyIdIndex> {
+    const key = crypto.createHash('sha1').update(store).digest('hex').slice(0, 16);
+    const index = new ShopifyIdIndex(path.join(indexDir, `${key}.json`), store);
+    await index.load();
+    if (!index.isComplete || Date.now() - (index.filledAt as number) > maxAgeMs) {
+        try {
+            index.fillFromSnapshot(await fill());
+            await index.save();
+        } catch (error: any) {
+            console.warn(`Shopify ID indeksi bulk export ile doldurulamadı: ${error.message}`);
+        }
+    }
+    return index;
+}
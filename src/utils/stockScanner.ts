@@ -0,0 +1,97 @@
+// Feed'den sadece stok bilgisini (stok_kodu, barkod, stok) çıkaran hafif, akış tabanlı tarayıcı.
+// XML ağacı kurulmaz: metin parça parça verilir, her tamamlanan <Urun> bloğunda <Varyant>
+// düğümlerinin alanları düz metin aramasıyla okunur. Büyük detayaciklama CDATA'sı hiç taranmaz.
+// Varyantı olmayan ürünler ürün düzeyindeki stok_kodu / barkod / stok ile tek kayıt verir.
+// JavaScript karşılığı: netlify/lib/stockSync.js
+export interface StockRecord {
+    sku: string;
+    barcode: string;
+    stock: number;
+}
+
+// <tag>değer</tag> ya da <tag><![CDATA[değer]]></tag>; <tag/> boş sayılır
+function field(block: string, tag: string, from = 0, to = block.length): string {
+    const open = block.indexOf(`<${tag}>`, from);
+    if (open === -1 || open >= to) return '';
+    const start = open + tag.length + 2;
+    const close = block.indexOf(`</${tag}>`, start);
+    if (close === -1) return '';
+    let value = block.slice(start, close).trim();
+    if (value.startsWith('<![CDATA[') && value.endsWith(']]>')) value = value.slice(9, -3).trim();
+    return value;
+}
+
+function parseStock(value: string): number {
+    const stock = parseInt(value, 10);
+    return Number.isFinite(stock) ? stock : 0;
+}
+
+// Tek bir <Urun>...</Urun> bloğunun stok kayıtları
+export function stockRecordsOfProduct(block: string): StockRecord[] {
+    const records: StockRecord[] = [];
+    const variantsStart = block.indexOf('<Varyantlar>');
+    let position = variantsStart === -1 ? -1 : variantsStart;
+    while (position !== -1) {
+        const open = block.indexOf('<Varyant>', position);
+        if (open === -1) break;
+        const close = block.indexOf('</Varyant>', open);
+        if (close === -1) break;
+        const sku = field(block, 'stok_kodu', open, close);
+        if (sku) records.push({ sku, barcode: field(block, 'barkod', open, close), stock: parseStock(field(block, 'stok', open, close)) });
+        position = close;
+    }
+    if (records.length > 0) return records;
+
+    // Varyantsız ürün: alanlar açıklamanın dışında aranır (açıklama HTML'i <stok> içerebilir)
+    const descriptionStart = block.indexOf('<detayaciklama>');
+    const descriptionEnd = block.indexOf('</detayaciklama>');
+    const head = descriptionStart === -1 ? block : block.slice(0, descriptionStart);
+    const tail = descriptionEnd === -1 ? '' : block.slice(descriptionEnd);
+    const sku = field(head, 'stok_kodu') || field(tail, 'stok_kodu');
+    if (sku) {
+        records.push({
+            sku,
+            barcode: field(head, 'barkod') || field(tail, 'barkod'),
+            stock: parseStock(field(head, 'stok') || field(tail, 'stok')),
+        });
+    }
+    return records;
+}
+
+export class StockScanner {
+    private buffer = '';
+    private readonly onRecord: (record: StockRecord) => void;
+    products = 0;
+
+    constructor(onRecord: (record: StockRecord) => void) {
+        this.onRecord = onRecord;
+    }
+
+    push(chunk: string): void {
+        this.buffer += chunk;
+        let consumed = 0;
+        while (true) {
+            const open = this.buffer.indexOf('<Urun>', consumed);
+            if (open === -1) break;
+            const close = this.buffer.indexOf('</Urun>', open);
+            if (close === -1) {
+                consumed = open;
+                break;
+            }
+            this.products++;
+            for (const record of stockRecordsOfProduct(this.buffer.slice(open, close))) this.onRecord(record);
+            consumed = close + 7;
+        }
+        // Tamamlanmamış son ürün bir sonraki parçayı bekler; ürünler arası boşluk atılır
+        const pending = this.buffer.indexOf('<Urun>', consumed);
+        this.buffer = pending === -1 ? this.buffer.slice(Math.max(consumed, this.buffer.length - 5)) : this.buffer.slice(pending);
+    }
+}
+
+// Tüm metni 1 MB'lık parçalarla tarar
+export function scanStock(xml: string, chunkSize = 1 << 20): { records: StockRecord[]; products: number } {
+    const records: StockRecord[] = [];
+    const scanner = new StockScanner(record => records.push(record));
+    for (let i = 0; i < xml.length; i += chunkSize) scanner.push(xml.slice(i, i + chunkSize));
+    return { records, products: scanner.products };
+}
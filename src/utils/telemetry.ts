@@ -0,0 +1,254 @@
+// Senkronizasyon telemetrisi: aşama süreleri, sayaçlar, Shopify uç noktası başına gecikme
+// histogramları ve aktarılan bayt. Her koşu SYNC_REPORT_DIR (varsayılan: .sync-reports) altına
+// <runId>.json ve Prometheus metin biçiminde <runId>.prom olarak yazılır; debug_sync.py iki
+// koşuyu karşılaştırır. Aktif koşu runWithTelemetry ile AsyncLocalStorage'a bağlanır: eşzamanlı
+// koşular (ör. iki iş) birbirinin ölçümlerini görmez. Aktif koşu yoksa yardımcılar no-op'tur.
+import { AsyncLocalStorage } from 'async_hooks';
+import crypto from 'crypto';
+import fs from 'fs/promises';
+import path from 'path';
+import { AxiosInstance } from 'axios';
+
+const REPORT_VERSION = 1;
+const reportDir = path.resolve(process.cwd(), process.env.SYNC_REPORT_DIR || '.sync-reports');
+
+// Gecikme histogramı üst sınırları (ms); son kova +Inf
+export const LATENCY_BUCKETS_MS = [25, 50, 100, 250, 500, 1000, 2500, 5000, 10000];
+
+interface StageStats {
+    count: number;
+    totalMs: number;
+    maxMs: number;
+}
+
+interface EndpointStats {
+    count: number;
+    errors: number;
+    totalMs: number;
+    buckets: number[];
+}
+
+export interface RunReport {
+    version: number;
+    runId: string;
+    startedAt: string;
+    finishedAt: string | null;
+    durationMs: number;
+    labels: Record<string, string>;
+    stages: Record<string, StageStats>;
+    counters: Record<string, number>;
+    bytes: { sent: number; received: number };
+    latencyBucketsMs: number[];
+    endpoints: Record<string, EndpointStats>;
+}
+
+export class SyncTelemetry {
+    readonly runId: string;
+    readonly labels: Record<string, string>;
+    private readonly started = Date.now();
+    private finished: number | null = null;
+    private stages = new Map<string, StageStats>();
+    private counters = new Map<string, number>();
+    private endpoints = new Map<string, EndpointStats>();
+    private bytes = { sent: 0, received: 0 };
+
+    constructor(labels: Record<string, string> = {}) {
+        const stamp = new Date(this.started).toISOString().replace(/[-:]/g, '').replace(/\.\d+Z$/, 'Z');
+        this.runId = `${stamp}-${crypto.randomBytes(3).toString('hex')}`;
+        this.labels = labels;
+    }
+
+    recordStage(stage: string, ms: number): void {
+        const stats = this.stages.get(stage) || { count: 0, totalMs: 0, maxMs: 0 };
+        stats.count++;
+        stats.totalMs += ms;
+        stats.maxMs = Math.max(stats.maxMs, ms);
+        this.stages.set(stage, stats);
+    }
+
+    async time<T>(stage: string, fn: () => Promise<T> | T): Promise<T> {
+        const start = performance.now();
+        try {
+            return await fn();
+        } finally {
+            this.recordStage(stage, performance.now() - start);
+        }
+    }
+
+    count(name: string, n = 1): void {
+        this.counters.set(name, (this.counters.get(name) || 0) + n);
+    }
+
+    addBytes(sent: number, received: number): void {
+        this.bytes.sent += sent;
+        this.bytes.received += received;
+    }
+
+    observeRequest(endpoint: string, ms: number, failed: boolean): void {
+        let stats = this.endpoints.get(endpoint);
+        if (!stats) {
+            stats = { count: 0, errors: 0, totalMs: 0, buckets: new Array(LATENCY_BUCKETS_MS.length + 1).fill(0) };
+            this.endpoints.set(endpoint, stats);
+        }
+        stats.count++;
+        stats.totalMs += ms;
+        if (failed) stats.errors++;
+        const bucket = LATENCY_BUCKETS_MS.findIndex(limit => ms <= limit);
+        stats.buckets[bucket === -1 ? LATENCY_BUCKETS_MS.length : bucket]++;
+    }
+
+    finish(): RunReport {
+        this.finished = this.finished ?? Date.now();
+        return this.toJSON();
+    }
+
+    toJSON(): RunReport {
+        const end = this.finished ?? Date.now();
+        return {
+            version: REPORT_VERSION,
+            runId: this.runId,
+            startedAt: new Date(this.started).toISOString(),
+            finishedAt: this.finished ? new Date(this.finished).toISOString() : null,
+            durationMs: end - this.started,
+            labels: this.labels,
+            stages: Object.fromEntries(this.stages),
+            counters: Object.fromEntries(this.counters),
+            bytes: { ...this.bytes },
+            latencyBucketsMs: LATENCY_BUCKETS_MS,
+            endpoints: Object.fromEntries(this.endpoints),
+        };
+    }
+
+    toPrometheus(): string {
+        const report = this.toJSON();
+        const run = `run="${report.runId}"`;
+        const lines: string[] = [
+            '# TYPE sync_duration_seconds gauge',
+            `sync_duration_seconds{${run}} ${report.durationMs / 1000}`,
+            '# TYPE sync_stage_seconds_total counter',
+        ];
+        for (const [stage, stats] of Object.entries(report.stages)) {
+            lines.push(`sync_stage_seconds_total{${run},stage="${stage}"} ${stats.totalMs / 1000}`);
+        }
+        lines.push('# TYPE sync_events_total counter');
+        for (const [name, value] of Object.entries(report.counters)) {
+            lines.push(`sync_events_total{${run},event="${name}"} ${value}`);
+        }
+        lines.push('# TYPE sync_bytes_total counter');
+        lines.push(`sync_bytes_total{${run},direction="sent"} ${report.bytes.sent}`);
+        lines.push(`sync_bytes_total{${run},direction="received"} ${report.bytes.received}`);
+        lines.push('# TYPE shopify_request_duration_seconds histogram');
+        for (const [endpoint, stats] of Object.entries(report.endpoints)) {
+            const labels = `${run},endpoint="${endpoint.replace(/"/g, '\\"')}"`;
+            let cumulative = 0;
+            LATENCY_BUCKETS_MS.forEach((limit, i) => {
+                cumulative += stats.buckets[i];
+                lines.push(`shopify_request_duration_seconds_bucket{${labels},le="${limit / 1000}"} ${cumulative}`);
+            });
+            lines.push(`shopify_request_duration_seconds_bucket{${labels},le="+Inf"} ${stats.count}`);
+            lines.push(`shopify_request_duration_seconds_sum{${labels}} ${stats.totalMs / 1000}`);
+            lines.push(`shopify_request_duration_seconds_count{${labels}} ${stats.count}`);
+        }
+        return lines.join('\n') + '\n';
+    }
+
+    // Raporu <runId>.json ve <runId>.prom olarak yazar, JSON yolunu döndürür
+    async write(dir = reportDir): Promise<string> {
+        await fs.mkdir(dir, { recursive: true });
+        const jsonPath = path.join(dir, `${this.runId}.json`);
+        await fs.writeFile(jsonPath, JSON.stringify(this.toJSON(), null, 2));
+        await fs.writeFile(path.join(dir, `${this.runId}.prom`), this.toPrometheus());
+        return jsonPath;
+    }
+}
+
+const activeRun = new AsyncLocalStorage<SyncTelemetry>();
+
+// fn ve başlattığı tüm async işler (axios istekleri dahil) telemetry'ye ölçüm yazar
+export function runWithTelemetry<T>(telemetry: SyncTelemetry, fn: () => Promise<T>): Promise<T> {
+    return activeRun.run(telemetry, fn);
+}
+
+export function endTelemetry(telemetry: SyncTelemetry): void {
+    telemetry.finish();
+}
+
+export function activeTelemetry(): SyncTelemetry | null {
+    return activeRun.getStore() ?? null;
+}
+
+// Aktif koşu varsa fn'in süresini aşamaya ekler
+export async function timeStage<T>(stage: string, fn: () => Promise<T> | T): Promise<T> {
+    const telemetry = activeTelemetry();
+    return telemetry ? telemetry.time(stage, fn) : fn();
+}
+
+export function countEvent(name: string, n = 1): void {
+    activeTelemetry()?.count(name, n);
+}
+
+export function addTransferredBytes(sent: number, received: number): void {
+    activeTelemetry()?.addBytes(sent, received);
+}
+
+// "/admin/api/2024-07/products/123/variants.json" -> "GET /products/{id}/variants.json"
+// GraphQL istekleri ilk alan adıyla etiketlenir: "POST graphql:productVariantsBulkUpdate"
+export function endpointLabel(method: string, url: string, body?: any): string {
+    const pathname = url.replace(/^https?:\/\/[^/]+/, '').replace(/\?.*$/, '').replace(/^\/admin\/api\/[^/]+/, '');
+    if (pathname.endsWith('/graphql.json')) {
+        const query = typeof body === 'string' ? safeParse(body)?.query : body?.query;
+        const match = /{\s*(?:\w+\s*:\s*)?(\w+)/.exec(String(query || ''));
+        return `${method.toUpperCase()} graphql:${match ? match[1] : '?'}`;
+    }
+    return `${method.toUpperCase()} ${pathname.replace(/\/\d+(?=[/.])/g, '/{id}')}`;
+}
+
+function safeParse(text: string): any {
+    try {
+        return JSON.parse(text);
+    } catch {
+        return null;
+    }
+}
+
+function byteLength(data: any): number {
+    if (data === undefined || data === null) return 0;
+    if (typeof data === 'string') return Buffer.byteLength(data);
+    if (Buffer.isBuffer(data) || data instanceof ArrayBuffer) return data.byteLength;
+    return Buffer.byteLength(JSON.stringify(data));
+}
+
+/**
+ * Axios örneğine gecikme, hata, 429/THROTTLED ve bayt ölçen interceptor'lar ekler.
+ * Ölçümler isteği başlatan koşuya (async bağlamındaki aktif koşu) yazılır.
+ */
+export function instrumentAxios(instance: AxiosInstance): AxiosInstance {
+    instance.interceptors.request.use(config => {
+        (config as any).metadata = { start: performance.now() };
+        return config;
+    });
+    const observe = (config: any, status: number | undefined, headers: any, data: any, failed: boolean) => {
+        const telemetry = activeTelemetry();
+        if (!telemetry || !config) return;
+        const ms = performance.now() - (config.metadata?.start ?? performance.now());
+        const endpoint = endpointLabel(config.method || 'get', `${config.baseURL || ''}${config.url || ''}`, config.data);
+        telemetry.observeRequest(endpoint, ms, failed);
+        telemetry.count('shopify_requests');
+        if (status === 429) telemetry.count('shopify_throttled_429');
+        if (data?.errors && JSON.stringify(data.errors).includes('THROTTLED')) telemetry.count('shopify_throttled_graphql');
+        if (failed) telemetry.count('shopify_errors');
+        const received = headers?.['content-length'] !== undefined ? Number(headers['content-length']) : byteLength(data);
+        telemetry.addBytes(byteLength(config.data), received);
+    };
+    instance.interceptors.response.use(
+        response => {
+            observe(response.config, response.status, response.headers, response.data, false);
+            return response;
+        },
+        error => {
+            observe(error.config, error.response?.status, error.response?.headers, error.response?.data, true);
+            return Promise.reject(error);
+        }
+    );
+    return instance;
+}
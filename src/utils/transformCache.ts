@@ -0,0 +1,118 @@
+// XML -> Shopify dönüşümünde girdi metnine bağlı, saf hesaplamaların kalıcı önbelleği:
+// kategori yolu -> Shopify kategori ID'si (null: eşlenmedi) ve ürün adı -> handle.
+// Tekrarlanan senkronizasyonlarda aynı kategori ve ürün adları yeniden hesaplanmaz.
+// Kategori tablosu ya da handle kuralları değişirse (parmak izi farklı) önbellek boş başlar.
+import crypto from 'crypto';
+import fs from 'fs/promises';
+import path from 'path';
+import slugify from 'slugify';
+import { CATEGORY_MAP_FINGERPRINT, getShopifyCategoryId } from './categoryMapper.js';
+
+const CACHE_VERSION = 1;
+// productHandle'daki slugify seçenekleri değişirse artırılmalı
+const HANDLE_RULES_VERSION = 1;
+const cacheDir = path.resolve(process.cwd(), process.env.TRANSFORM_CACHE_DIR || '.transform-cache');
+
+interface CacheFile {
+    version: number;
+    fingerprint: string;
+    categories: [string, number | null][];
+    handles: [string, string][];
+}
+
+function cacheFingerprint(): string {
+    return crypto.createHash('sha1')
+        .update(`${CATEGORY_MAP_FINGERPRINT}\n${HANDLE_RULES_VERSION}`)
+        .digest('hex');
+}
+
+export function productHandle(name: string): string {
+    return slugify(name, { lower: true, strict: true });
+}
+
+export class TransformCache {
+    private categories = new Map<string, number | null>();
+    private handles = new Map<string, string>();
+    private dirty = false;
+    private readonly filePath: string;
+    private readonly fingerprint = cacheFingerprint();
+    // Bu koşuda eşlenemeyen kategori yolları ve ürün sayıları (toplu raporlama için)
+    readonly unmapped = new Map<string, number>();
+    hits = 0;
+    misses = 0;
+
+    constructor(filePath: string) {
+        this.filePath = filePath;
+    }
+
+    async load(): Promise<void> {
+        let data: CacheFile;
+        try {
+            data = JSON.parse(await fs.readFile(this.filePath, 'utf-8'));
+        } catch {
+            return;
+        }
+        if (data.version !== CACHE_VERSION || data.fingerprint !== this.fingerprint) return;
+        this.categories = new Map(data.categories);
+        this.handles = new Map(data.handles);
+    }
+
+    async save(): Promise<void> {
+        if (!this.dirty) return;
+        const data: CacheFile = {
+            version: CACHE_VERSION,
+            fingerprint: this.fingerprint,
+            categories: Array.from(this.categories.entries()),
+            handles: Array.from(this.handles.entries()),
+        };
+        await fs.mkdir(path.dirname(this.filePath), { recursive: true });
+        const tmpPath = `${this.filePath}.${process.pid}.tmp`;
+        await fs.writeFile(tmpPath, JSON.stringify(data));
+        await fs.rename(tmpPath, this.filePath);
+        this.dirty = false;
+    }
+
+    categoryId(categoryPath: string): number | undefined {
+        let id = this.categories.get(categoryPath);
+        if (id === undefined) {
+            this.misses++;
+            id = getShopifyCategoryId(categoryPath) ?? null;
+            this.categories.set(categoryPath, id);
+            this.dirty = true;
+        } else {
+            this.hits++;
+        }
+        if (id === null && categoryPath.trim()) {
+            this.unmapped.set(categoryPath, (this.unmapped.get(categoryPath) || 0) + 1);
+        }
+        return id ?? undefined;
+    }
+
+    handle(name: string): string {
+        let handle = this.handles.get(name);
+        if (handle === undefined) {
+            this.misses++;
+            handle = productHandle(name);
+            this.handles.set(name, handle);
+            this.dirty = true;
+        } else {
+            this.hits++;
+        }
+        return handle;
+    }
+
+    // "N kategori eşlenemedi: yol (ürün sayısı), ..." — en çok ürünü olanlar önce
+    unmappedReport(limit = 20): string | null {
+        if (this.unmapped.size === 0) return null;
+        const entries = Array.from(this.unmapped.entries()).sort((a, b) => b[1] - a[1]);
+        const shown = entries.slice(0, limit).map(([categoryPath, count]) => `${categoryPath} (${count})`).join(', ');
+        const more = entries.length > limit ? `, ... +${entries.length - limit}` : '';
+        return `${entries.length} kategori Shopify kategorisine eşlenemedi: ${shown}${more}`;
+    }
+}
+
+export async function loadTransformCache(): Promise<TransformCache> {
+    const cache = new TransformCache(path.join(cacheDir, 'transform.json'));
+    await cache.load();
+    return cache;
+}
@@ -0,0 +1,332 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import requests
+
+BASE_URL = "https://vervegranxml.netlify.app/.netlify/functions/api"
+# Express sunucusunun iş kuyruğu API'si (/api/jobs)
+SERVER_URL = "http://localhost:3000/api"
+FINISHED = {'done', 'failed', 'cancelled'}
+
+
+def _headers(args):
+    headers = {'Content-Type': 'application/json'}
+    if getattr(args, 'shop_url', None):
+        headers['X-Shopify-Shop-Url'] = args.shop_url
+    if getattr(args, 'token', None):
+        headers['X-Shopify-Access-Token'] = args.token
+    if getattr(args, 'feed_url', None):
+        headers['X-XML-Feed-Url'] = args.feed_url
+    return headers
+
+
+def print_job(job):
+    print(f"İş {job['id']}: {job['status']} - {job['cursor']}/{job['total']} ürün, "
+          f"{job['invocations']} çağrı")
+    counts = job['counts']
+    print(f"   Oluşturulan: {counts['created']}, Güncellenen: {counts['updated']}, "
+          f"Hata: {counts['errors']}, Atlanan: {counts['skipped']}")
+    for error in job['errors'][-5:]:
+        print(f"   ❌ {error['key']}: {error['message']}")
+
+
+def job_status(args):
+    """İşin durumunu (jobId verilmezse mağazanın son işini) yazdırır"""
+    params = {'jobId': args.job_id} if args.job_id else {}
+    response = requests.get(f"{args.base_url}/sync/status", params=params, headers=_headers(args), timeout=30)
+    data = response.json()
+    if not data.get('success'):
+        print(f"❌ {data.get('message')}")
+        return 1
+    if args.json:
+        print(json.dumps(data['job'], indent=2, ensure_ascii=False))
+    else:
+        print_job(data['job'])
+    return 0
+
+
+def run_job(args):
+    """/sync/start'ı iş bitene kadar tekrar tekrar çağırır; her çağrı imleçten devam eder"""
+    payload = {'jobId': args.job_id} if args.job_id else {'restart': args.restart}
+
+    while True:
+        payload['onFingerprintsUnavailable'] = args.on_fingerprints_unavailable
+        if args.budget:
+            payload['budgetMs'] = int(args.budget * 1000)
+        start = time.perf_counter()
+        response = requests.post(f"{args.base_url}/sync/start", json=payload, headers=_headers(args),
+                                 timeout=args.timeout)
+        data = response.json()
+        if not data.get('success'):
+            print(f"❌ {data.get('message')}")
+            return 1
+        print(f"{data['jobId']}: {data['cursor']}/{data['xmlProducts']} "
+              f"(+{data['createdCount']} oluşturulan, {data['updatedCount']} güncellenen, "
+              f"{data['errorCount']} hata) {time.perf_counter() - start:.1f} sn")
+        if data.get('fingerprints') == 'unavailable':
+            print("   ⚠️ Parmak izleri okunamadı, ürünler karşılaştırılmadan yeniden yazıldı")
+        if data['done']:
+            print(f"✅ {data['message']}")
+            return 0
+        # resumeToken: sonraki çağrı başka bir function kapsayıcısına düşse de iş devam eder
+        payload = {'jobId': data['jobId'], 'resumeToken': data.get('resumeToken')}
+
+
+def plan_sync(args):
+    """/sync/plan ile tam senkronizasyonun işini ve maliyetini yazmadan gösterir.
+
+    --max-calls / --max-seconds aşılırsa 2 ile çıkar (ör. büyük koşuları gece saatine ertelemek
+    ya da çağrı sayısını katlayan bir değişikliği yayından önce yakalamak için).
+    """
+    params = {'maxProducts': args.max_products} if args.max_products else {}
+    params['onFingerprintsUnavailable'] = args.on_fingerprints_unavailable
+    response = requests.post(f"{args.base_url}/sync/plan", json=params, headers=_headers(args), timeout=args.timeout)
+    data = response.json()
+    if not data.get('success'):
+        print(f"❌ {data.get('message')}")
+        return 1
+    if args.json:
+        print(json.dumps(data, indent=2, ensure_ascii=False))
+    else:
+        feed, store, plan = data['feed'], data['store'], data['plan']
+        rest, calls = store['rest'], plan['restCalls']
+        print(f"Feed: {feed['products']} ürün, {feed['variants']} varyant, {feed['images']} resim")
+        print(f"Mağaza: {store['shop']} ({store['remoteProducts']} ürün, parmak izleri {store['fingerprints']})")
+        print(f"   REST kova {rest['bucketSize']} / {rest['leakRate']:g} istek/sn, gecikme {rest['latencyMs']} ms")
+        print(f"Plan: {plan['creates']} oluşturma, {plan['updates']} güncelleme, {plan['unchanged']} değişmeyen")
+        if plan.get('unresolvedLookups'):
+            print(f"   ⚠️ {plan['unresolvedLookups']} ürünün başlık araması başarısız, oluşturma olarak sayıldı")
+        print(f"   Varyant yazma: {plan['variantWrites']}, resim yükleme: {plan['imageUploads']}, "
+              f"metafield: {plan['metafieldWrites']}")
+        print(f"   REST: {calls['total']} çağrı (GET {calls['GET']}, POST {calls['POST']}, PUT {calls['PUT']}), "
+              f"GraphQL: {plan['graphql']['queries']} sorgu / {plan['graphql']['costPoints']} puan")
+        seconds = plan['projectedSeconds']
+        print(f"   Tahmini süre: {seconds['total']} sn (GraphQL {seconds['graphql']} sn, REST {seconds['rest']} sn)")
+        for sample in data['samples']:
+            print(f"   {sample['action']:>8}: {sample['title']}")
+
+    plan = data['plan']
+    if args.max_calls is not None and plan['restCalls']['total'] > args.max_calls:
+        print(f"⚠️ REST çağrısı sınırı aşıldı: {plan['restCalls']['total']} > {args.max_calls}")
+        return 2
+    if args.max_seconds is not None and plan['projectedSeconds']['total'] > args.max_seconds:
+        print(f"⚠️ Süre sınırı aşıldı: {plan['projectedSeconds']['total']} sn > {args.max_seconds} sn")
+        return 2
+    return 0
+
+
+def load_fanout_plan(path):
+    """Fan-out plan dosyası: {"feeds": [...], "stores": [{"shopUrl", "accessToken" | "accessTokenEnv", "feeds"?}]}
+
+    Erişim anahtarı dosyaya yazılmak istenmezse accessTokenEnv ile ortam değişkeninden okunur.
+    """
+    with open(path, encoding='utf-8') as f:
+        plan = json.load(f)
+    for store in plan.get('stores', []):
+        env_name = store.pop('accessTokenEnv', None)
+        if env_name and not store.get('accessToken'):
+            store['accessToken'] = os.environ.get(env_name)
+            if not store['accessToken']:
+                raise SystemExit(f"❌ {store.get('shopUrl')}: {env_name} ortam değişkeni tanımlı değil")
+    return plan
+
+
+def run_fanout(args):
+    """/sync/fanout'u tüm (feed, mağaza) çiftleri bitene kadar tekrar tekrar çağırır"""
+    plan = load_fanout_plan(args.plan)
+    payload = dict(plan, restart=args.restart)
+    while True:
+        payload['onFingerprintsUnavailable'] = args.on_fingerprints_unavailable
+        if args.budget:
+            payload['budgetMs'] = int(args.budget * 1000)
+        start = time.perf_counter()
+        response = requests.post(f"{args.base_url}/sync/fanout", json=payload, timeout=args.timeout)
+        data = response.json()
+        if 'stores' not in data:
+            print(f"❌ {data.get('message')}")
+            return 1
+        print(f"Fan-out {data['fanoutId']} ({time.perf_counter() - start:.1f} sn):")
+        for store in data['stores']:
+            if store.get('error'):
+                print(f"   ❌ {store['shop']}: {store['error']}")
+                continue
+            if store.get('fingerprints') == 'unavailable':
+                print(f"   ⚠️ {store['shop']}: parmak izleri okunamadı, ürünler yeniden yazılıyor")
+            for feed in store['feeds']:
+                counts = feed.get('counts', {})
+                print(f"   {store['shop']} <- {feed['feedUrl']}: {feed.get('cursor', 0)}/{feed.get('total', '?')} "
+                      f"(+{counts.get('created', 0)} oluşturulan, {counts.get('updated', 0)} güncellenen, "
+                      f"{counts.get('unchanged', 0)} değişmeyen, {counts.get('errors', 0)} hata)")
+        if data['done']:
+            print(f"{'✅' if data['success'] else '⚠️'} {data['message']}")
+            return 0 if data['success'] else 1
+        # Kalan mağazaların hepsi hata verdiyse tekrar denemek ilerleme sağlamaz
+        if all(store['done'] or store.get('error') for store in data['stores']):
+            print(f"❌ {data['message']}")
+            return 1
+        payload = dict(plan, fanoutId=data['fanoutId'], resumeToken=data.get('resumeToken'))
+
+
+def print_queue_job(job):
+    finished = job.get('finishedAt') or time.time() * 1000
+    started = job.get('startedAt')
+    elapsed = f", {(finished - started) / 1000:.1f} sn" if started else ''
+    print(f"İş {job['id']} ({job['type']}): {job['status']}, deneme {job['attempts']}/{job['maxAttempts']}{elapsed}")
+    if job.get('error'):
+        print(f"   ❌ {job['error']}")
+    if job.get('result') is not None:
+        result = job['result']
+        print(f"   {result.get('summary') if isinstance(result, dict) and 'summary' in result else json.dumps(result, ensure_ascii=False)}")
+
+
+def wait_queue_job(args, job_id):
+    """İş bitene kadar /jobs/<id>'yi yoklar, yeni log satırlarını yazdırır"""
+    last_at, printed_at_last = 0, 0
+    deadline = time.monotonic() + args.wait_timeout if args.wait_timeout else None
+    while True:
+        response = requests.get(f"{args.server_url}/jobs/{job_id}", params={'logs': 1}, timeout=30)
+        data = response.json()
+        if not data.get('success'):
+            print(f"❌ {data.get('message')}")
+            return 1
+        job = data['job']
+        # Sunucu son 200 satırı tutar: satırlar zaman damgasına göre takip edilir
+        same_ms = 0
+        for line in job['logs']:
+            if line['at'] < last_at:
+                continue
+            if line['at'] == last_at:
+                same_ms += 1
+                if same_ms <= printed_at_last:
+                    continue
+            else:
+                last_at, same_ms = line['at'], 1
+            printed_at_last = same_ms
+            print(f"   [{line['level']}] {line['message']}")
+        if job['status'] in FINISHED:
+            print_queue_job(job)
+            return 0 if job['status'] == 'done' else 1
+        if deadline and time.monotonic() > deadline:
+            print(f"⏱ İş hâlâ {job['status']}; daha sonra: sync_job.py jobs {job_id}")
+            return 2
+        time.sleep(args.interval)
+
+
+def enqueue_job(args):
+    """Sunucudaki kuyruğa iş ekler; --wait ile bitene kadar izler"""
+    payload = {}
+    if args.type == 'sync':
+        payload['options'] = {name: True for name in (args.options or 'full').split('+')}
+    response = requests.post(f"{args.server_url}/jobs", json={'type': args.type, 'payload': payload}, timeout=30)
+    data = response.json()
+    if not data.get('success'):
+        print(f"❌ {data.get('message')}")
+        return 1
+    note = ' (aynı iş zaten kuyrukta/çalışıyor)' if data['duplicate'] else ''
+    print(f"İş kuyruğa eklendi: {data['jobId']}{note}")
+    return wait_queue_job(args, data['jobId']) if args.wait else 0
+
+
+def list_queue_jobs(args):
+    """Kuyruktaki işleri ya da tek bir işin durumunu yazdırır"""
+    if args.job_id:
+        if args.wait:
+            return wait_queue_job(args, args.job_id)
+        response = requests.get(f"{args.server_url}/jobs/{args.job_id}", params={'logs': 1}, timeout=30)
+        data = response.json()
+        if not data.get('success'):
+            print(f"❌ {data.get('message')}")
+            return 1
+        if args.json:
+            print(json.dumps(data['job'], indent=2, ensure_ascii=False))
+        else:
+            print_queue_job(data['job'])
+        return 0
+    params = {k: v for k, v in (('status', args.status), ('type', args.type)) if v}
+    data = requests.get(f"{args.server_url}/jobs", params=params, timeout=30).json()
+    if not data.get('success'):
+        print(f"❌ {data.get('message')}")
+        return 1
+    for job in data['jobs']:
+        print_queue_job(job)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parçalı senkronizasyon işlerini başlatır, devam ettirir ve izler")
+    parser.add_argument('--base-url', default=os.environ.get('SYNC_API_URL', BASE_URL),
+                        help="Function adresi (yerel: http://127.0.0.1:8888/api)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="İşi başlatır ya da devam ettirir, bitene kadar çağırır")
+    run_parser.add_argument('--job-id', help="Devam ettirilecek iş (verilmezse yarım kalan son iş)")
+    run_parser.add_argument('--restart', action='store_true', help="Yarım kalan işi yok say, yeni iş başlat")
+    run_parser.add_argument('--budget', type=float, help="Çağrı başına süre bütçesi (sn)")
+    run_parser.add_argument('--on-fingerprints-unavailable', choices=['fail', 'rewrite'], default='fail',
+                            help="Parmak izleri okunamazsa dur (fail) ya da tüm ürünleri yeniden yaz (rewrite)")
+    run_parser.add_argument('--timeout', type=float, default=60, help="HTTP zaman aşımı (sn)")
+    run_parser.add_argument('--shop-url', default=os.environ.get('SHOPIFY_STORE_URL'))
+    run_parser.add_argument('--token', default=os.environ.get('SHOPIFY_ADMIN_API_TOKEN'))
+    run_parser.add_argument('--feed-url', default=os.environ.get('XML_FEED_URL'))
+    run_parser.set_defaults(func=run_job)
+
+    plan_parser = subparsers.add_parser('plan', help="Senkronizasyonu çalıştırmadan işini ve maliyetini gösterir")
+    plan_parser.add_argument('--max-products', type=int, help="Sadece ilk N ürünü planla")
+    plan_parser.add_argument('--max-calls', type=int, help="REST çağrısı bu sayıyı aşarsa 2 ile çık")
+    plan_parser.add_argument('--max-seconds', type=float, help="Tahmini süre bunu aşarsa 2 ile çık")
+    plan_parser.add_argument('--on-fingerprints-unavailable', choices=['fail', 'rewrite'], default='fail',
+                             help="Parmak izleri okunamazsa dur (fail) ya da tam yeniden yazmayı planla (rewrite)")
+    plan_parser.add_argument('--json', action='store_true', help="Ham JSON çıktısı")
+    plan_parser.add_argument('--timeout', type=float, default=60, help="HTTP zaman aşımı (sn)")
+    plan_parser.add_argument('--shop-url', default=os.environ.get('SHOPIFY_STORE_URL'))
+    plan_parser.add_argument('--token', default=os.environ.get('SHOPIFY_ADMIN_API_TOKEN'))
+    plan_parser.add_argument('--feed-url', default=os.environ.get('XML_FEED_URL'))
+    plan_parser.set_defaults(func=plan_sync)
+
+    fanout_parser = subparsers.add_parser('fanout', help="Birden çok feed'i birden çok mağazaya senkronize eder")
+    fanout_parser.add_argument('plan', help="Plan dosyası (JSON: feeds, stores)")
+    fanout_parser.add_argument('--restart', action='store_true', help="Yarım kalan fan-out'u yok say, yeni başlat")
+    fanout_parser.add_argument('--budget', type=float, help="Çağrı başına süre bütçesi (sn)")
+    fanout_parser.add_argument('--on-fingerprints-unavailable', choices=['fail', 'rewrite'], default='fail',
+                               help="Parmak izleri okunamazsa mağazayı durdur (fail) ya da yeniden yaz (rewrite)")
+    fanout_parser.add_argument('--timeout', type=float, default=60, help="HTTP zaman aşımı (sn)")
+    fanout_parser.set_defaults(func=run_fanout)
+
+    status_parser = subparsers.add_parser('status', help="İş durumunu gösterir")
+    status_parser.add_argument('job_id', nargs='?', help="İş kimliği (verilmezse son iş)")
+    status_parser.add_argument('--json', action='store_true', help="Ham JSON çıktısı")
+    status_parser.add_argument('--shop-url', default=os.environ.get('SHOPIFY_STORE_URL'),
+                               help="Sadece bu mağazanın işleri görülür")
+    status_parser.set_defaults(func=job_status)
+
+    def add_server_args(sub):
+        sub.add_argument('--server-url', default=os.environ.get('SYNC_SERVER_URL', SERVER_URL),
+                         help="Express sunucusunun API adresi")
+        sub.add_argument('--interval', type=float, default=2, help="Yoklama aralığı (sn)")
+        sub.add_argument('--wait-timeout', type=float, default=0, help="En fazla bekleme (sn, 0: sınırsız)")
+
+    enqueue_parser = subparsers.add_parser('enqueue', help="Sunucu kuyruğuna iş ekler (sync, price-update, xml-stats)")
+    enqueue_parser.add_argument('type', choices=['sync', 'price-update', 'xml-stats'])
+    enqueue_parser.add_argument('--options', help="sync seçenekleri, ör. full ya da price+inventory")
+    enqueue_parser.add_argument('--wait', action='store_true', help="İş bitene kadar izle")
+    add_server_args(enqueue_parser)
+    enqueue_parser.set_defaults(func=enqueue_job)
+
+    jobs_parser = subparsers.add_parser('jobs', help="Sunucu kuyruğundaki işleri ya da tek işi gösterir")
+    jobs_parser.add_argument('job_id', nargs='?')
+    jobs_parser.add_argument('--status', choices=['queued', 'running', 'done', 'failed', 'cancelled'])
+    jobs_parser.add_argument('--type')
+    jobs_parser.add_argument('--wait', action='store_true', help="İş bitene kadar izle")
+    jobs_parser.add_argument('--json', action='store_true', help="Ham JSON çıktısı")
+    add_server_args(jobs_parser)
+    jobs_parser.set_defaults(func=list_queue_jobs)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
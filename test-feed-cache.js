@@ -0,0 +1,91 @@
+// src/utils/feedCache.ts kontrolü: koşullu indirme (304 / unchanged / updated) ve parse önbelleği.
+// Feed'ler yerel bir HTTP sunucusundan ETag ile sunulur, ağa çıkılmaz.
+// Kullanım: npm run build && node test-feed-cache.js
+const http = require('http');
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+// Önbellek dizini modül yüklenirken okunur
+process.env.FEED_CACHE_DIR = fs.mkdtempSync(path.join(os.tmpdir(), 'feed-cache-test-'));
+const { fetchFeedXml, parseFeedXml } = require('./dist/utils/feedCache.js');
+
+const feedXml = (name, price) =>
+  `<?xml version="1.0" encoding="UTF-8"?><Urunler><Urun><urunismi>${name}</urunismi><satis_fiyati>${price}</satis_fiyati></Urun></Urunler>`;
+
+// yol -> { body, etag, conditional: If-None-Match'e 304 ile yanıt verilsin mi }
+const feeds = {
+  '/a.xml': { body: feedXml('A', '100'), etag: '"a1"', conditional: true },
+  '/b.xml': { body: feedXml('B', '200'), etag: '"b1"', conditional: true }
+};
+const requests = [];
+
+const server = http.createServer((req, res) => {
+  const feed = feeds[req.url];
+  if (!feed) {
+    res.writeHead(404);
+    return res.end();
+  }
+  const notModified = feed.conditional && req.headers['if-none-match'] === feed.etag;
+  requests.push(`${req.url} ${notModified ? 304 : 200}`);
+  if (notModified) {
+    res.writeHead(304, { ETag: feed.etag });
+    return res.end();
+  }
+  res.writeHead(200, { 'Content-Type': 'application/xml', ETag: feed.etag });
+  res.end(feed.body);
+});
+
+let failures = 0;
+function check(label, condition, detail = '') {
+  console.log(`${condition ? '✅' : '❌'} ${label}${detail ? ` (${detail})` : ''}`);
+  if (!condition) failures++;
+}
+
+async function testFeedCache(base) {
+  console.log('=== FEED ÖNBELLEĞİ TESTİ ===\n');
+
+  const first = await fetchFeedXml(`${base}/a.xml`);
+  check('İlk indirme: updated', first.status === 'updated', first.status);
+
+  const second = await fetchFeedXml(`${base}/a.xml`);
+  check('ETag aynı: 304, not-modified', second.status === 'not-modified' && second.xml === first.xml, second.status);
+
+  // Koşullu isteği yok sayan sunucu: gövde aynı geldiği için yeniden yazılmaz
+  feeds['/a.xml'].conditional = false;
+  const third = await fetchFeedXml(`${base}/a.xml`);
+  check('200 ama gövde aynı: unchanged', third.status === 'unchanged' && third.sha256 === first.sha256, third.status);
+
+  feeds['/a.xml'] = { body: feedXml('A', '150'), etag: '"a2"', conditional: true };
+  const fourth = await fetchFeedXml(`${base}/a.xml`);
+  check('Gövde değişti: updated', fourth.status === 'updated' && fourth.sha256 !== first.sha256, fourth.status);
+
+  // Parse önbelleği URL başına tutulur: B'nin parse'ı A'nın bellekteki sonucunu düşürmemeli
+  const parsedA = await parseFeedXml(fourth);
+  const feedB = await fetchFeedXml(`${base}/b.xml`);
+  const parsedB = await parseFeedXml(feedB);
+  check('A bellekten döner (B parse edildikten sonra)', (await parseFeedXml(fourth)) === parsedA);
+
+  feeds['/a.xml'] = { body: feedXml('A', '175'), etag: '"a3"', conditional: true };
+  const fifth = await fetchFeedXml(`${base}/a.xml`);
+  const parsedA2 = await parseFeedXml(fifth);
+  check('A değişince yeni gövde parse edilir', parsedA2.Urunler.Urun[0].satis_fiyati[0] === '175');
+  check('A değişince B bellekte kalır', (await parseFeedXml(feedB)) === parsedB);
+
+  console.log(`\nİstekler: ${requests.join(', ')}`);
+}
+
+server.listen(0, '127.0.0.1', async () => {
+  const base = `http://127.0.0.1:${server.address().port}`;
+  try {
+    await testFeedCache(base);
+  } catch (error) {
+    console.log('❌ Test hatası:', error.message);
+    failures++;
+  } finally {
+    server.close();
+    fs.rmSync(process.env.FEED_CACHE_DIR, { recursive: true, force: true });
+  }
+  console.log(failures ? `\n${failures} kontrol başarısız` : '\nTüm kontroller geçti');
+  process.exitCode = failures ? 1 : 0;
+});